@@ -6,18 +6,23 @@ import json
 import os
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import re
 # Removed FastMCP import
 import xml.etree.ElementTree as ET
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
 from PIL import Image
 import io
+import heapq
+from collections import deque
 from functools import reduce
 from hashlib import md5
 import urllib.parse
 import subprocess
 import shutil
+import threading
+from dataclasses import dataclass, field
 # --- Logging Setup ---
 # Log to stderr to avoid interfering with stdout communication
 # Use a custom handler to ensure UTF-8 output even on Windows
@@ -64,6 +69,75 @@ NAV_API_URL = "https://api.bilibili.com/x/web-interface/nav"
 PBP_API_URL = "https://bvc.bilivideo.com/pbp/data"
 VIEW_API_URL = "https://api.bilibili.com/x/web-interface/view"
 SUMMARY_API_URL = "https://api.bilibili.com/x/web-interface/view/conclusion/get"
+DANMAKU_SEG_API_URL = "https://api.bilibili.com/x/v2/dm/web/seg.so"
+DANMAKU_XML_API_URL = "https://api.bilibili.com/x/v1/dm/list.so"
+
+# --- HTTP Session ---
+# 所有请求共用一个 requests.Session：并发抓取之间复用 TCP/TLS 连接。
+
+HTTP_POOL_CONNECTIONS = 8   # 缓存连接池的主机数
+HTTP_POOL_MAXSIZE = 16      # 每个主机保留的连接数，覆盖 ThreadPoolExecutor 的并发
+
+_session = None
+_session_lock = threading.Lock()
+_http_stats = {'requests': 0, 'elapsed': 0.0}
+
+
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def _connection_pools(host: str | None = None) -> list:
+    """共享 Session 中（指定主机的）urllib3 连接池，用于统计请求数与新建连接数。"""
+    pools = []
+    session = _session
+    if session is None:
+        return pools
+    for adapter in {id(a): a for a in session.adapters.values()}.values():
+        container = adapter.poolmanager.pools
+        for key in container.keys():
+            pool = container.get(key)
+            if pool is not None and (host is None or pool.host == host):
+                pools.append(pool)
+    return pools
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """共享 Session 上的 GET，记录耗时与连接复用情况。"""
+    started = time.perf_counter()
+    resp = get_session().get(url, **kwargs)
+    elapsed = time.perf_counter() - started
+    with _session_lock:
+        _http_stats['requests'] += 1
+        _http_stats['elapsed'] += elapsed
+    parsed = urllib.parse.urlsplit(url)
+    pools = _connection_pools(parsed.hostname)
+    pool_info = ""
+    if pools:
+        pool_info = f", host pool {sum(p.num_requests for p in pools)} req / {sum(p.num_connections for p in pools)} conn"
+    logging.info(f"HTTP GET {parsed.netloc}{parsed.path} -> {resp.status_code} in {elapsed * 1000:.0f}ms{pool_info}")
+    return resp
+
+
+def log_http_stats() -> None:
+    """输出本次运行的请求总数、总耗时与新建连接数（其余请求均复用连接）。"""
+    with _session_lock:
+        count, elapsed = _http_stats['requests'], _http_stats['elapsed']
+    if not count:
+        return
+    connections = sum(pool.num_connections for pool in _connection_pools())
+    logging.info(f"HTTP summary: {count} requests in {elapsed * 1000:.0f}ms total, {connections} connections opened, {max(0, count - connections)} reused")
 
 # --- WBI Signing Logic ---
 
@@ -95,10 +169,42 @@ def encWbi(params: dict, img_key: str, sub_key: str):
     params['w_rid'] = wbi_sign
     return params
 
-def getWbiKeys(headers: dict) -> tuple[str, str]:
-    """获取最新的 img_key 和 sub_key"""
+# WBI 的 img_key/sub_key 每天才轮换一次，缓存到磁盘供后续进程复用；
+# 签名被拒（-403/-352）时强制刷新后重签一次。
+WBI_KEY_TTL_SECONDS = 6 * 3600
+WBI_REJECT_CODES = (-403, -352)
+CACHE_DIR = os.environ.get('BILIBILI_CACHE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+WBI_KEY_CACHE_FILE = os.path.join(CACHE_DIR, 'wbi_keys.json')
+
+_wbi_lock = threading.Lock()
+_wbi_cache: dict = {}
+
+
+def _load_wbi_cache() -> dict:
+    try:
+        with open(WBI_KEY_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('img_key') and cached.get('sub_key'):
+            return cached
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _save_wbi_cache(cached: dict) -> None:
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{WBI_KEY_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cached, f)
+        os.replace(tmp_path, WBI_KEY_CACHE_FILE)
+    except OSError as e:
+        logging.warning(f"Could not write WBI key cache: {e}")
+
+
+def _fetch_wbi_keys(headers: dict) -> tuple[str, str]:
     try:
-        resp = requests.get(NAV_API_URL, headers=headers, timeout=10)
+        resp = http_get(NAV_API_URL, headers=headers, timeout=10)
         resp.raise_for_status()
         json_content = resp.json()
         wbi_img = json_content.get('data', {}).get('wbi_img', {})
@@ -114,6 +220,47 @@ def getWbiKeys(headers: dict) -> tuple[str, str]:
         logging.error(f"Error getting WBI keys: {e}")
         return "", ""
 
+
+def getWbiKeys(headers: dict, force_refresh: bool = False) -> tuple[str, str]:
+    """获取最新的 img_key 和 sub_key（内存 → 磁盘缓存 → nav API）"""
+    global _wbi_cache
+    with _wbi_lock:
+        now = time.time()
+        if not force_refresh:
+            cached = _wbi_cache or _load_wbi_cache()
+            if cached and now - cached.get('fetched_at', 0) < WBI_KEY_TTL_SECONDS:
+                _wbi_cache = cached
+                return cached['img_key'], cached['sub_key']
+        logging.info("Fetching WBI keys from nav API" + (" (forced refresh)" if force_refresh else ""))
+        img_key, sub_key = _fetch_wbi_keys(headers)
+        if img_key and sub_key:
+            _wbi_cache = {'img_key': img_key, 'sub_key': sub_key, 'fetched_at': now}
+            _save_wbi_cache(_wbi_cache)
+        return img_key, sub_key
+
+
+def wbi_signed_get(url: str, params: dict, headers: dict, timeout: float = 10, key_source=None) -> dict:
+    """
+    发送 WBI 签名的 GET 并返回 JSON。签名被拒时刷新密钥重签一次。
+    key_source(refresh) 可替换密钥来源（如 VideoContext.wbi_keys）。
+    """
+    if key_source is None:
+        key_source = lambda refresh: getWbiKeys(headers, force_refresh=refresh)
+    data: dict = {}
+    for attempt in range(2):
+        img_key, sub_key = key_source(attempt > 0)
+        if img_key and sub_key:
+            signed = encWbi(dict(params), img_key, sub_key)
+        else:
+            signed = {**params, 'wts': int(time.time())}
+        resp = http_get(url, params=signed, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+        data = resp.json()
+        if data.get('code') not in WBI_REJECT_CODES:
+            break
+        logging.warning(f"WBI signature rejected by {url} (code {data.get('code')}), refreshing keys")
+    return data
+
 # --- Helper Functions ---
 
 def extract_bvid_and_page(video_input: str) -> 'tuple[str | None, int]':
@@ -133,24 +280,76 @@ def extract_bvid_and_page(video_input: str) -> 'tuple[str | None, int]':
     return bvid, page
 
 
-def get_cid_for_page(bvid: str, page: int, headers: dict) -> str | None:
-    """Fetches CID for a specific page of a multi-part video via pagelist API."""
+@dataclass
+class VideoContext:
+    """
+    一次请求内解析一次的视频元数据，传给所有下游抓取函数共用。
+
+    View API 的一次响应就包含 aid、默认 cid、全部分P的 cid、标题、作者和字幕列表，
+    下游不必再各自请求 view/pagelist；WBI 密钥首次用到时才取（见 getWbiKeys 的缓存），之后复用。
+    """
+    bvid: str
+    page: int
+    headers: dict
+    aid: str | None = None
+    cid: str | None = None
+    title: str | None = None
+    author: str | None = None
+    pages: list = field(default_factory=list)
+    duration: int | None = None  # 当前分P时长（秒），决定弹幕分段数
+    # View API 字幕列表只对应默认分P；请求其他分P时为空，由 WBI Player API 按 cid 获取。
+    subtitles: list = field(default_factory=list)
+    _wbi_keys: tuple | None = field(default=None, repr=False)
+    _wbi_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def wbi_keys(self, refresh: bool = False) -> tuple[str, str]:
+        """本请求内只取一次 WBI 密钥（磁盘缓存优先）；refresh=True 时强制重新获取。"""
+        with self._wbi_lock:
+            if self._wbi_keys is None or refresh:
+                self._wbi_keys = getWbiKeys(self.headers, force_refresh=refresh)
+            return self._wbi_keys
+
+
+def resolve_video_context(bvid: str, page: int, headers: dict) -> VideoContext:
+    """通过 View API（失败时退回 pagelist）一次性解析视频上下文。"""
+    ctx = VideoContext(bvid=bvid, page=page, headers=headers)
     try:
-        logging.info(f"Fetching CID for BVID: {bvid}, page: {page}")
-        resp = requests.get(PAGELIST_API_URL, params={'bvid': bvid}, headers=headers, timeout=10)
-        data = resp.json()
-        if data.get('code') == 0 and data.get('data'):
-            pl = data['data']
-            idx = page - 1
-            if 0 <= idx < len(pl):
-                logging.info(f"Found CID {pl[idx]['cid']} for page {page}")
-                return str(pl[idx]['cid'])
-            else:
-                logging.warning(f"Page {page} out of range, using page 1")
-                return str(pl[0]['cid']) if pl else None
+        logging.info(f"Resolving video context via View API: {bvid}")
+        view_resp = http_get(VIEW_API_URL, params={'bvid': bvid}, headers=headers, timeout=10)
+        view_data = view_resp.json()
+        if view_data.get('code') == 0:
+            data = view_data.get('data', {})
+            ctx.aid = str(data.get('aid'))
+            ctx.cid = str(data.get('cid'))
+            ctx.title = data.get('title')
+            ctx.author = data.get('owner', {}).get('name')
+            ctx.pages = data.get('pages') or []
+            ctx.duration = data.get('duration')
+            ctx.subtitles = data.get('subtitle', {}).get('list', []) or []
+            logging.info(f"Found AID: {ctx.aid}, CID: {ctx.cid}, Title: {ctx.title}, Author: {ctx.author} via View API")
+        else:
+            logging.warning(f"View API failed (code {view_data.get('code')}), attempting pagelist for CID")
+            page_resp = http_get(PAGELIST_API_URL, params={'bvid': bvid}, headers=headers, timeout=10)
+            page_data = page_resp.json()
+            if page_data.get('code') == 0 and page_data.get('data'):
+                ctx.pages = page_data['data']
+                ctx.cid = str(ctx.pages[0]['cid'])
+                ctx.duration = ctx.pages[0].get('duration')
     except Exception as e:
-        logging.error(f"Error fetching CID for page {page}: {e}")
-    return None
+        logging.error(f"Error resolving video context: {e}")
+
+    if page > 1 and ctx.pages:
+        idx = page - 1
+        if idx >= len(ctx.pages):
+            logging.warning(f"Page {page} out of range, using page 1")
+            idx = 0
+        page_cid = str(ctx.pages[idx]['cid'])
+        ctx.duration = ctx.pages[idx].get('duration') or ctx.duration
+        if page_cid != ctx.cid:
+            ctx.subtitles = []
+        ctx.cid = page_cid
+        logging.info(f"Using CID {ctx.cid} for page {page}")
+    return ctx
 
 
 def extract_bvid(video_input: str) -> str | None:
@@ -158,13 +357,14 @@ def extract_bvid(video_input: str) -> str | None:
     bvid, _ = extract_bvid_and_page(video_input)
     return bvid
 
-def get_subtitle_json_string(bvid: str, user_cookie: str | None, lang_code: str | None = None, target_cid: str | None = None) -> str:
+def get_subtitle_json_string(bvid: str, user_cookie: str | None, lang_code: str | None = None, target_cid: str | None = None, context: VideoContext | None = None) -> str:
     """
     Fetches subtitle JSON for a given BVID, allowing language selection.
     Tries multiple sources:
     1. View API (data.subtitle.list)
     2. Player WBI API (data.subtitle.subtitles)
     3. AI Summary API (data.model_result.subtitle) - Ultimate fallback
+    A resolved VideoContext skips the View/pagelist lookups and shares its WBI keys.
     Returns the subtitle content as a JSON string or '{"body":[]}' if none found or error.
     """
     logging.info(f"Attempting to fetch subtitles for BVID: {bvid}")
@@ -177,44 +377,19 @@ def get_subtitle_json_string(bvid: str, user_cookie: str | None, lang_code: str
     if user_cookie:
         headers['Cookie'] = user_cookie
 
-    aid, cid = None, None
-    subtitles_from_apis = [] # List of subtitle objects from various APIs
-
-    # --- Step 1: Get Video Info & Subtitles from View API ---
-    try:
-        logging.info(f"Step 1: Fetching video info via View API: {bvid}")
-        view_resp = requests.get(VIEW_API_URL, params={'bvid': bvid}, headers=headers, timeout=10)
-        view_data = view_resp.json()
-        if view_data.get('code') == 0:
-            data = view_data.get('data', {})
-            aid = str(data.get('aid'))
-            cid = str(data.get('cid'))
-            view_subs = data.get('subtitle', {}).get('list', [])
-            if view_subs:
-                subtitles_from_apis.extend(view_subs)
-                logging.info(f"Step 1: Found {len(view_subs)} subtitles via View API.")
-        else:
-            logging.warning(f"Step 1: View API returned error {view_data.get('code')}: {view_data.get('message')}")
-    except Exception as e:
-        logging.warning(f"Step 1: Error fetching via View API: {e}")
-
-   # --- Step 1.5: Override CID for multi-part video ---
-    if target_cid:
-        logging.info(f"Overriding CID with target_cid: {target_cid}")
-        cid = target_cid
-        subtitles_from_apis = []
-
-    # --- Step 2: Get CID from Pagelist (if View API failed to provide CID) ---
-    if not cid:
-        try:
-            logging.info(f"Step 2: Fetching CID from pagelist API for {bvid}")
-            page_resp = requests.get(PAGELIST_API_URL, params={'bvid': bvid}, headers=headers, timeout=10)
-            page_data = page_resp.json()
-            if page_data.get('code') == 0 and page_data.get('data'):
-                cid = str(page_data['data'][0]['cid'])
-                logging.info(f"Step 2: Found CID via pagelist fallback: {cid}")
-        except Exception as e:
-            logging.error(f"Step 2: Error fetching pagelist: {e}")
+    # --- Step 1/2: Video info, CID and View API subtitles (one View call, pagelist only as fallback) ---
+    if context is None:
+        context = resolve_video_context(bvid, 1, headers)
+        # --- Override CID for multi-part video ---
+        if target_cid:
+            logging.info(f"Overriding CID with target_cid: {target_cid}")
+            context.cid = target_cid
+            context.subtitles = []
+
+    aid, cid = context.aid, context.cid
+    subtitles_from_apis = list(context.subtitles) # List of subtitle objects from various APIs
+    if subtitles_from_apis:
+        logging.info(f"Step 1: Found {len(subtitles_from_apis)} subtitles via View API.")
 
     if not cid:
         logging.error("Could not obtain CID, cannot proceed with subtitle fetching.")
@@ -223,17 +398,10 @@ def get_subtitle_json_string(bvid: str, user_cookie: str | None, lang_code: str
     # --- Step 3: Get Subtitles from Player WBI API ---
     try:
         logging.info("Step 3: Fetching subtitle list using WBI Player API...")
-        img_key, sub_key = getWbiKeys(headers)
         wbi_params = {'cid': cid, 'bvid': bvid, 'isGaiaAvoided': 'false', 'web_location': '1315873'}
         if aid: wbi_params['aid'] = aid
-        
-        if img_key and sub_key:
-            wbi_params = encWbi(wbi_params, img_key, sub_key)
-        else:
-            wbi_params['wts'] = int(time.time())
 
-        wbi_resp = requests.get(PLAYER_WBI_API_URL, params=wbi_params, headers=headers, timeout=15)
-        wbi_data = wbi_resp.json()
+        wbi_data = wbi_signed_get(PLAYER_WBI_API_URL, wbi_params, headers, timeout=15, key_source=context.wbi_keys)
         if wbi_data.get('code') == 0:
             wbi_subs = wbi_data.get('data', {}).get('subtitle', {}).get('subtitles', [])
             if wbi_subs:
@@ -281,7 +449,7 @@ def get_subtitle_json_string(bvid: str, user_cookie: str | None, lang_code: str
     if subtitle_url:
         try:
             logging.info(f"Fetching subtitle content from: {subtitle_url}")
-            resp = requests.get(subtitle_url, headers=headers, timeout=15)
+            resp = http_get(subtitle_url, headers=headers, timeout=15)
             if resp.ok and 'body' in resp.json():
                 return resp.text
         except Exception as e:
@@ -290,17 +458,10 @@ def get_subtitle_json_string(bvid: str, user_cookie: str | None, lang_code: str
     # --- Step 5: Ultimate Fallback - AI Summary API ---
     logging.info("Step 5: No CC subtitles found, attempting AI Summary API...")
     try:
-        img_key, sub_key = getWbiKeys(headers)
         sum_params = {'cid': cid, 'bvid': bvid}
         if aid: sum_params['aid'] = aid
-        
-        if img_key and sub_key:
-            sum_params = encWbi(sum_params, img_key, sub_key)
-        else:
-            sum_params['wts'] = int(time.time())
 
-        sum_resp = requests.get(SUMMARY_API_URL, params=sum_params, headers=headers, timeout=15)
-        sum_data = sum_resp.json()
+        sum_data = wbi_signed_get(SUMMARY_API_URL, sum_params, headers, timeout=15, key_source=context.wbi_keys)
         if sum_data.get('code') == 0:
             model_result = sum_data.get('data', {}).get('model_result', {})
             ai_subs_list = model_result.get('subtitle', [])
@@ -330,28 +491,281 @@ def resolve_short_url(url: str) -> str:
     if 'b23.tv' in url:
         try:
             # Use stream=True to follow redirects without downloading the body
-            resp = requests.get(url, allow_redirects=True, timeout=5, stream=True)
+            resp = http_get(url, allow_redirects=True, timeout=5, stream=True)
+            resp.close()
             logging.info(f"Resolved short URL {url} to {resp.url}")
             return resp.url
         except Exception as e:
             logging.error(f"Error resolving short URL {url}: {e}")
     return url
 
-def fetch_danmaku(cid: str, num: int, headers: dict) -> list:
-    """Fetches danmaku (bullet comments) for a given cid."""
-    if not cid or num <= 0:
-        return []
+# --- Danmaku ---
+# 弹幕走分段 protobuf 接口 seg.so：每段 6 分钟，各段并发拉取、边下载边解析，
+# 每段只汇总成「内容 -> 次数」的计数表再合并，不保留逐条弹幕。
+# 全局计数表的条目数有上限，超过时只保留出现次数最多的一半，几小时的直播回放内存也保持平稳。
+
+DANMAKU_SEGMENT_SECONDS = 360
+DANMAKU_SEGMENT_WORKERS = 4
+DANMAKU_MAX_SEGMENTS = 240        # 时长未知时最多探测 24 小时
+DANMAKU_MAX_TRACKED = 20000       # 全局计数表保留的不同弹幕条数上限
+DANMAKU_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _read_varint(stream) -> int | None:
+    """从流中读取一个 protobuf varint；流结束时返回 None。"""
+    result = shift = 0
+    while True:
+        b = stream.read(1)
+        if not b:
+            if shift:
+                raise ValueError("Truncated varint in danmaku segment")
+            return None
+        result |= (b[0] & 0x7F) << shift
+        if b[0] < 0x80:
+            return result
+        shift += 7
+
+
+def _skip_field(stream, wire_type: int) -> None:
+    if wire_type == 0:
+        _read_varint(stream)
+    elif wire_type == 1:
+        stream.read(8)
+    elif wire_type == 2:
+        stream.read(_read_varint(stream) or 0)
+    elif wire_type == 5:
+        stream.read(4)
+    else:
+        raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+
+
+def _parse_danmaku_elem(buf: bytes) -> tuple[int, str]:
+    """解析 DanmakuElem，只取 progress（2，毫秒）和 content（7）。"""
+    stream = io.BytesIO(buf)
+    progress, content = 0, ''
+    while True:
+        key = _read_varint(stream)
+        if key is None:
+            return progress, content
+        field_no, wire_type = key >> 3, key & 0x07
+        if field_no == 2 and wire_type == 0:
+            progress = _read_varint(stream) or 0
+        elif field_no == 7 and wire_type == 2:
+            content = stream.read(_read_varint(stream) or 0).decode('utf-8', errors='ignore')
+        else:
+            _skip_field(stream, wire_type)
+
+
+def iter_danmaku_segment(stream):
+    """逐条产出 DmSegMobileReply 中的 (progress_ms, content)，一次只读入一条弹幕。"""
+    while True:
+        key = _read_varint(stream)
+        if key is None:
+            return
+        field_no, wire_type = key >> 3, key & 0x07
+        if field_no == 1 and wire_type == 2:
+            length = _read_varint(stream) or 0
+            buf = stream.read(length)
+            if len(buf) < length:
+                raise ValueError("Truncated danmaku element")
+            yield _parse_danmaku_elem(buf)
+        else:
+            _skip_field(stream, wire_type)
+
+
+class _ChunkReader:
+    """把 iter_content 的分块包装成 read(n)，供 protobuf 解析按需读取（已解压）。"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buf = bytearray()
+        self._pos = 0
+
+    def read(self, n: int) -> bytes:
+        while len(self._buf) - self._pos < n:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            del self._buf[:self._pos]
+            self._pos = 0
+            self._buf += chunk
+        data = bytes(self._buf[self._pos:self._pos + n])
+        self._pos += len(data)
+        return data
+
+
+def parse_time_point(value) -> float | None:
+    """'90'、'1:30'、'1:02:03' 转为秒；空值返回 None。"""
+    if value is None or str(value).strip() == '':
+        return None
+    seconds = 0.0
+    for part in str(value).strip().split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def format_time_point(seconds: float) -> str:
+    seconds = int(seconds)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
+
+
+class DanmakuTally:
+    """弹幕去重计数：归一化内容 -> [次数, 首次出现毫秒, 原文]。
+
+    total 只计入通过时间范围与空白过滤的弹幕；decoded 是解析出的原始条数，用来判断分段是否为空。
+    """
+
+    def __init__(self, max_tracked: int = DANMAKU_MAX_TRACKED):
+        self.max_tracked = max_tracked
+        self.entries = {}
+        self.total = 0
+        self.decoded = 0
+        self.pruned = False
+
+    def add(self, content: str, progress_ms: int, count: int = 1) -> None:
+        key = DANMAKU_WHITESPACE_RE.sub(' ', content).strip().casefold()
+        if not key:
+            return
+        self.total += count
+        entry = self.entries.get(key)
+        if entry is None:
+            self.entries[key] = [count, progress_ms, content.strip()]
+            if len(self.entries) > self.max_tracked:
+                self._prune()
+        else:
+            entry[0] += count
+            if progress_ms < entry[1]:
+                entry[1] = progress_ms
+
+    def merge(self, other: 'DanmakuTally') -> None:
+        self.total += other.total
+        self.decoded += other.decoded
+        self.pruned = self.pruned or other.pruned
+        for key, (count, progress_ms, content) in other.entries.items():
+            entry = self.entries.get(key)
+            if entry is None:
+                self.entries[key] = [count, progress_ms, content]
+            else:
+                entry[0] += count
+                entry[1] = min(entry[1], progress_ms)
+        if len(self.entries) > self.max_tracked:
+            self._prune()
+
+    def _prune(self) -> None:
+        # 只出现过零星几次的弹幕被丢弃；之后再出现会从头计数，热门弹幕的排名不受影响。
+        keep = heapq.nlargest(self.max_tracked // 2, self.entries.items(), key=lambda item: item[1][0])
+        self.entries = dict(keep)
+        self.pruned = True
+
+    def top(self, num: int) -> list:
+        """按出现次数取前 num 条（有界堆，不对全表排序），返回 [(内容, 次数, 首次出现秒)]。"""
+        best = heapq.nlargest(num, self.entries.values(), key=lambda entry: (entry[0], -entry[1]))
+        return [(content, count, progress_ms / 1000) for count, progress_ms, content in best]
+
+
+def fetch_danmaku_segment(cid: str, segment_index: int, headers: dict, aid: str | None = None,
+                          start_ms: int = 0, end_ms: int | None = None) -> DanmakuTally | None:
+    """拉取并流式解析一个 6 分钟分段；请求失败返回 None，分段为空返回空计数表。"""
+    params = {'type': 1, 'oid': cid, 'segment_index': segment_index}
+    if aid:
+        params['pid'] = aid
+    tally = DanmakuTally()
+    try:
+        with http_get(DANMAKU_SEG_API_URL, params=params, headers=headers, timeout=10, stream=True) as resp:
+            if resp.status_code != 200:
+                logging.warning(f"Danmaku segment {segment_index} returned HTTP {resp.status_code}")
+                return None
+            for progress_ms, content in iter_danmaku_segment(_ChunkReader(resp.iter_content(chunk_size=16384))):
+                tally.decoded += 1
+                if progress_ms < start_ms or (end_ms is not None and progress_ms > end_ms):
+                    continue
+                tally.add(content, progress_ms)
+    except Exception as e:
+        logging.error(f"Error fetching danmaku segment {segment_index}: {e}")
+        return None
+    return tally
+
+
+def fetch_danmaku_xml(cid: str, headers: dict, start_ms: int = 0, end_ms: int | None = None) -> DanmakuTally | None:
+    """旧版 list.so XML 接口（seg.so 不可用时的后备），用 iterparse 逐条处理。"""
+    tally = DanmakuTally()
     try:
-        logging.info(f"Fetching up to {num} danmaku for CID: {cid}")
-        params = {'oid': cid}
-        resp = requests.get("https://api.bilibili.com/x/v1/dm/list.so", params=params, headers=headers, timeout=10)
-        content = resp.content.decode('utf-8', errors='ignore')
-        root = ET.fromstring(content)
-        danmaku_list = [d.text for d in root.findall('d') if d.text]
-        return danmaku_list[:num]
+        resp = http_get(DANMAKU_XML_API_URL, params={'oid': cid}, headers=headers, timeout=10)
+        for _, elem in ET.iterparse(io.BytesIO(resp.content)):
+            if elem.tag == 'd':
+                tally.decoded += 1
+                progress_ms = int(float((elem.get('p') or '0').split(',')[0]) * 1000)
+                if elem.text and progress_ms >= start_ms and (end_ms is None or progress_ms <= end_ms):
+                    tally.add(elem.text, progress_ms)
+            elem.clear()
     except Exception as e:
-        logging.error(f"Error fetching danmaku: {e}")
+        logging.error(f"Error fetching XML danmaku: {e}")
+        return None
+    return tally
+
+
+def fetch_danmaku(cid: str, num: int, headers: dict, aid: str | None = None, duration: float | None = None,
+                  start: float | None = None, end: float | None = None) -> list:
+    """
+    Fetches the top `num` danmaku by frequency for a given cid, optionally within [start, end] seconds.
+
+    返回 "[mm:ss] 内容 ×次数" 形式的字符串列表，按出现次数降序。
+    """
+    if not cid or num <= 0:
+        return []
+    start_s = max(0.0, start or 0.0)
+    end_s = end if end is not None else duration
+    if end is not None and duration:
+        # 显式 end 会关闭空分段提前停止，必须截到视频时长，否则超长 end 会把请求打到几十上百个空分段。
+        end_s = min(end, duration)
+    if end_s is not None and end_s < start_s:
         return []
+    start_ms, end_ms = int(start_s * 1000), (int(end_s * 1000) if end_s is not None else None)
+
+    first = int(start_s // DANMAKU_SEGMENT_SECONDS) + 1
+    if end_s is not None:
+        last = min(int(end_s // DANMAKU_SEGMENT_SECONDS) + 1, first + DANMAKU_MAX_SEGMENTS - 1)
+    else:
+        last = first + DANMAKU_MAX_SEGMENTS - 1
+    logging.info(f"Fetching top {num} danmaku for CID {cid} from segments {first}-{last if end_s is not None else '?'}")
+
+    tally = DanmakuTally()
+    fetched = failed = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=DANMAKU_SEGMENT_WORKERS) as executor:
+        # 滑动窗口：同时在途的分段不超过并发数的两倍，按顺序合并后即释放。
+        # 时长未知时只保留并发数个在途分段，遇到空分段即停止提交。
+        window = DANMAKU_SEGMENT_WORKERS * 2 if end_s is not None else DANMAKU_SEGMENT_WORKERS
+        pending = deque()
+        index, reached_end = first, False
+        while pending or (index <= last and not reached_end):
+            while index <= last and not reached_end and len(pending) < window:
+                pending.append(executor.submit(fetch_danmaku_segment, cid, index, headers, aid, start_ms, end_ms))
+                index += 1
+            part = pending.popleft().result()
+            if part is None:
+                failed += 1
+                continue
+            fetched += 1
+            # 以解析出的原始条数判断空分段：整段弹幕都在 start 之前或被过滤时不能当作视频结尾。
+            if not part.decoded and end_s is None:
+                reached_end = True
+            tally.merge(part)
+
+    if not tally.decoded:
+        logging.warning("No danmaku from seg.so, falling back to XML danmaku")
+        tally = fetch_danmaku_xml(cid, headers, start_ms, end_ms) or DanmakuTally()
+
+    logging.info(f"Danmaku: {tally.total} parsed, {len(tally.entries)} distinct, {fetched} segments "
+                 f"({failed} failed) in {(time.perf_counter() - started) * 1000:.0f}ms"
+                 f"{', low-frequency entries pruned' if tally.pruned else ''}")
+    lines = []
+    for content, count, at in tally.top(num):
+        suffix = f" ×{count}" if count > 1 else ""
+        lines.append(f"[{format_time_point(at)}] {content}{suffix}")
+    return lines
 
 def fetch_comments(aid: str, num: int, headers: dict) -> list:
     """Fetches hot comments for a given aid."""
@@ -360,7 +774,7 @@ def fetch_comments(aid: str, num: int, headers: dict) -> list:
     try:
         logging.info(f"Fetching up to {num} hot comments for AID: {aid}")
         params = {'type': 1, 'oid': aid, 'sort': 2}  # sort=2 fetches hot comments
-        resp = requests.get("https://api.bilibili.com/x/v2/reply", params=params, headers=headers, timeout=10)
+        resp = http_get("https://api.bilibili.com/x/v2/reply", params=params, headers=headers, timeout=10)
         data = resp.json()
         comments_list = []
         if data.get('code') == 0 and data.get('data', {}).get('replies'):
@@ -387,7 +801,7 @@ def fetch_videoshot(bvid: str, aid: str, cid: str, headers: dict) -> dict:
             'cid': cid,
             'index': 1
         }
-        resp = requests.get("https://api.bilibili.com/x/player/videoshot", params=params, headers=headers, timeout=10)
+        resp = http_get("https://api.bilibili.com/x/player/videoshot", params=params, headers=headers, timeout=10)
         data = resp.json()
         if data.get('code') == 0:
             return data.get('data', {})
@@ -398,7 +812,7 @@ def fetch_videoshot(bvid: str, aid: str, cid: str, headers: dict) -> dict:
     return {}
     
 def get_video_stream_url(bvid: str, cid: str, headers: dict) -> tuple:
-    """通过 playurl API 获取视频流地址（取最高画质）"""
+    """通过 playurl API 获取视频流地址（取最高画质），返回 (url, 宽, 高, 画质 qn)"""
     try:
         params = {
             'bvid': bvid,
@@ -407,7 +821,7 @@ def get_video_stream_url(bvid: str, cid: str, headers: dict) -> tuple:
             'qn': 127,
             'fourk': 1
         }
-        resp = requests.get(
+        resp = http_get(
             "https://api.bilibili.com/x/player/playurl",
             params=params,
             headers=headers,
@@ -427,55 +841,185 @@ def get_video_stream_url(bvid: str, cid: str, headers: dict) -> tuple:
                 w = best.get('width', 0)
                 h = best.get('height', 0)
                 logging.info(f"Best stream: {w}x{h}, bw={best.get('bandwidth')}")
-                return url, w, h
+                return url, w, h, best.get('id', 0)
     except Exception as e:
         logging.error(f"Error getting video stream URL: {e}")
-    return None, 0, 0
+    return None, 0, 0, 0
 
 
-def fetch_hd_snapshot(bvid: str, cid: str, timestamp: float, img_dir: str, headers: dict) -> str | None:
-    """用 ffmpeg 从视频流中抽取指定时间点的高清帧"""
-    ffmpeg_cmd = get_ffmpeg_path()
-    if ffmpeg_cmd == 'ffmpeg' and not shutil.which('ffmpeg'):
-        logging.warning("ffmpeg not found, cannot fetch HD snapshot")
-        return None
+# HD 抽帧：每个视频只解析一次流地址，所有时间点按顺序分给不超过 CPU 核数的 ffmpeg 进程，
+# 每个进程对同一流地址做多路 -ss 输入寻址，一次运行输出多帧。
+# 抽出的帧按 (cid, 毫秒时间点, 画质) 缓存在 CACHE_DIR/frames 下，再次请求同一时间点不再访问视频流。
+HD_FRAME_CACHE_DIR = os.path.join(CACHE_DIR, 'frames')
+HD_FRAME_CACHE_MAX_FILES = 500
+HD_FFMPEG_TIMEOUT = 30          # 单个 ffmpeg 进程的基础超时（秒）
+HD_FFMPEG_TIMEOUT_PER_FRAME = 5  # 每多抽一帧增加的超时（秒）
+HD_FFMPEG_MIN_TIMEOUT = 3       # 剩余时间不足该值时不再启动 ffmpeg
+HD_SPRITE_RESERVE_SECONDS = 5   # 给雪碧图降级与输出结果预留的时间
+
+# 本次调用的截止时间（单调时钟）。manifest 超时为 60s，单个任务默认与批量截止时间同为 50s；
+# 批量模式按其 deadline 重设。ffmpeg 的超时不超过剩余时间，避免拖过宿主超时。
+REQUEST_BUDGET_SECONDS = 50.0
+_request_deadline = time.monotonic() + REQUEST_BUDGET_SECONDS
+
 
-    stream_url, w, h = get_video_stream_url(bvid, cid, headers)
-    if not stream_url:
-        logging.warning("Failed to get video stream URL")
+def set_request_deadline(seconds: float) -> None:
+    global _request_deadline
+    _request_deadline = time.monotonic() + seconds
+
+
+def request_time_left() -> float:
+    return _request_deadline - time.monotonic()
+
+
+def _frame_cache_lookup(cid: str, ms: int) -> str | None:
+    """返回该 cid/时间点画质最高的缓存帧路径，并刷新其修改时间（LRU）。"""
+    prefix = f"{cid}_{ms}_q"
+    best_path, best_qn = None, -1
+    try:
+        names = os.listdir(HD_FRAME_CACHE_DIR)
+    except OSError:
         return None
+    for name in names:
+        if name.startswith(prefix) and name.endswith('.jpg'):
+            try:
+                qn = int(name[len(prefix):-4])
+            except ValueError:
+                continue
+            if qn > best_qn:
+                best_path, best_qn = os.path.join(HD_FRAME_CACHE_DIR, name), qn
+    if best_path:
+        try:
+            os.utime(best_path)
+        except OSError:
+            pass
+    return best_path
 
-    out_path = os.path.join(
-        img_dir,
-        f"hd_snapshot_{bvid}_{int(timestamp)}s.jpg"
-    )
-    referer = f"https://www.bilibili.com/video/{bvid}/"
-    user_agent = headers.get('User-Agent', 'Mozilla/5.0')
-
-    cmd = [
-        ffmpeg_cmd, '-y',
-        '-headers', f"Referer: {referer}\r\nUser-Agent: {user_agent}\r\n",
-        '-ss', str(timestamp),
-        '-i', stream_url,
-        '-frames:v', '1',
-        '-q:v', '2',
-        out_path
-    ]
 
+def _prune_frame_cache() -> None:
     try:
-        result = subprocess.run(cmd, capture_output=True, timeout=30)
-        if result.returncode == 0 and os.path.exists(out_path):
-            size = os.path.getsize(out_path)
-            logging.info(f"HD snapshot saved: {out_path} ({w}x{h}, {size}B)")
-            return out_path
-        else:
+        entries = [os.path.join(HD_FRAME_CACHE_DIR, n) for n in os.listdir(HD_FRAME_CACHE_DIR) if n.endswith('.jpg')]
+        if len(entries) <= HD_FRAME_CACHE_MAX_FILES:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - HD_FRAME_CACHE_MAX_FILES]:
+            os.remove(path)
+    except OSError as e:
+        logging.warning(f"Failed to prune frame cache: {e}")
+
+
+def _extract_frames(ffmpeg_cmd: str, stream_url: str, header_blob: str, jobs: list) -> bool:
+    """一个 ffmpeg 进程抽取多帧：jobs 为按时间排序的 [(秒, 输出路径)]，每帧一路带 -ss 的输入。
+
+    超时取按帧数估算值与本次调用剩余时间中的较小者。失败时删除本次的全部输出（可能是半截图片）并返回 False。
+    """
+    timeout = min(HD_FFMPEG_TIMEOUT + HD_FFMPEG_TIMEOUT_PER_FRAME * (len(jobs) - 1),
+                  request_time_left() - HD_SPRITE_RESERVE_SECONDS)
+    if timeout < HD_FFMPEG_MIN_TIMEOUT:
+        logging.warning(f"Skipping ffmpeg for {len(jobs)} frames: only {max(timeout, 0):.0f}s left in the request budget")
+        return False
+    cmd = [ffmpeg_cmd, '-y', '-loglevel', 'error']
+    for t, _ in jobs:
+        cmd += ['-headers', header_blob, '-ss', str(t), '-i', stream_url]
+    for i, (_, out_path) in enumerate(jobs):
+        cmd += ['-map', f'{i}:v:0', '-frames:v', '1', '-q:v', '2', out_path]
+    ok = False
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+        if result.returncode != 0:
             stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
-            logging.error(f"ffmpeg failed (rc={result.returncode}): {stderr}")
+            logging.error(f"ffmpeg failed (rc={result.returncode}) for {len(jobs)} frames: {stderr}")
+        else:
+            ok = True
     except subprocess.TimeoutExpired:
-        logging.error("ffmpeg timed out after 30s")
+        logging.error(f"ffmpeg timed out after {timeout:.0f}s for {len(jobs)} frames")
     except Exception as e:
         logging.error(f"Error running ffmpeg: {e}")
-    return None
+    if not ok:
+        for _, out_path in jobs:
+            try:
+                os.remove(out_path)
+            except OSError:
+                pass
+    return ok
+
+
+def fetch_hd_snapshots(bvid: str, cid: str, timestamps: list, img_dir: str, headers: dict) -> dict:
+    """用 ffmpeg 从视频流中批量抽取高清帧，返回 {时间点: 图片路径}；失败的时间点不在结果中。"""
+    wanted = sorted(set(float(t) for t in timestamps))
+    if not wanted:
+        return {}
+
+    frames = {}
+    missing = []
+    for t in wanted:
+        cached = _frame_cache_lookup(cid, int(round(t * 1000)))
+        if cached:
+            frames[t] = cached
+        else:
+            missing.append(t)
+    if frames:
+        logging.info(f"HD frame cache hit for {len(frames)}/{len(wanted)} timestamps")
+
+    if missing:
+        ffmpeg_cmd = get_ffmpeg_path()
+        if ffmpeg_cmd == 'ffmpeg' and not shutil.which('ffmpeg'):
+            logging.warning("ffmpeg not found, cannot fetch HD snapshot")
+        else:
+            stream_url, w, h, qn = get_video_stream_url(bvid, cid, headers)
+            if not stream_url:
+                logging.warning("Failed to get video stream URL")
+            else:
+                os.makedirs(HD_FRAME_CACHE_DIR, exist_ok=True)
+                referer = f"https://www.bilibili.com/video/{bvid}/"
+                user_agent = headers.get('User-Agent', 'Mozilla/5.0')
+                header_blob = f"Referer: {referer}\r\nUser-Agent: {user_agent}\r\n"
+
+                # 先写临时文件，成功后原子替换进缓存，避免并发请求读到半截图片。
+                token = f"{os.getpid()}_{threading.get_ident()}"
+                targets = {}
+                for t in missing:
+                    name = f"{cid}_{int(round(t * 1000))}_q{qn}.jpg"
+                    targets[t] = (os.path.join(HD_FRAME_CACHE_DIR, f".{token}_{name}"), os.path.join(HD_FRAME_CACHE_DIR, name))
+
+                workers = max(1, min(len(missing), os.cpu_count() or 1))
+                groups = [missing[i::workers] for i in range(workers)]
+                started = time.perf_counter()
+
+                def run_groups(groups: list) -> list:
+                    """并发运行各组，返回失败的组。"""
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = [executor.submit(_extract_frames, ffmpeg_cmd, stream_url, header_blob,
+                                                   [(t, targets[t][0]) for t in group]) for group in groups]
+                    return [group for group, future in zip(groups, futures) if not future.result()]
+
+                # 多帧进程失败时整组输出作废；逐帧单独重试，仍失败的时间点由调用方降级到雪碧图。
+                retry = [t for group in run_groups(groups) if len(group) > 1 for t in group]
+                if retry:
+                    logging.warning(f"Retrying {len(retry)} HD frames one per ffmpeg process")
+                    run_groups([[t] for t in retry])
+
+                extracted = 0
+                for t, (tmp_path, final_path) in targets.items():
+                    if os.path.exists(tmp_path) and os.path.getsize(tmp_path) > 0:
+                        os.replace(tmp_path, final_path)
+                        frames[t] = final_path
+                        extracted += 1
+                    elif os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                logging.info(f"HD frames extracted: {extracted}/{len(missing)} ({w}x{h}, qn={qn}) "
+                             f"by {workers} ffmpeg process(es) in {(time.perf_counter() - started) * 1000:.0f}ms")
+                _prune_frame_cache()
+
+    results = {}
+    for t, cached_path in frames.items():
+        out_path = os.path.join(img_dir, f"hd_snapshot_{bvid}_{int(t)}s.jpg")
+        try:
+            shutil.copyfile(cached_path, out_path)
+            results[t] = out_path
+        except OSError as e:
+            logging.error(f"Failed to copy HD frame to {out_path}: {e}")
+    return results
 
 
 def fetch_pbp(cid: str, aid: str = None, bvid: str = None) -> str:
@@ -491,7 +1035,7 @@ def fetch_pbp(cid: str, aid: str = None, bvid: str = None) -> str:
             'Referer': 'https://www.bilibili.com/'
         }
         
-        resp = requests.get(PBP_API_URL, params=params, headers=headers, timeout=10)
+        resp = http_get(PBP_API_URL, params=params, headers=headers, timeout=10)
         data = resp.json()
         
         # 检查是否为有效数据（排除空壳响应）
@@ -592,7 +1136,7 @@ def get_accessible_url(local_path: str) -> str:
     file_path = os.path.abspath(local_path).replace("\\", "/")
     return "file:///" + urllib.parse.quote(file_path, safe='/:')
 
-def process_bilibili_enhanced(video_input: str, lang_code: str | None = None, danmaku_num: int = 0, comment_num: int = 0, snapshot_at_times: list | None = None, need_subs: bool = True, need_pbp: bool = True, hd_snapshot: bool = False) -> dict:
+def process_bilibili_enhanced(video_input: str, lang_code: str | None = None, danmaku_num: int = 0, comment_num: int = 0, snapshot_at_times: list | None = None, need_subs: bool = True, need_pbp: bool = True, hd_snapshot: bool = False, danmaku_start: float | None = None, danmaku_end: float | None = None) -> dict:
     """
     Enhanced version of process_bilibili_url that handles short URLs, fetches danmaku/comments, snapshots, and PBP.
     Returns a dictionary suitable for VCP multimodal output.
@@ -614,49 +1158,19 @@ def process_bilibili_enhanced(video_input: str, lang_code: str | None = None, da
     if user_cookie:
         headers['Cookie'] = user_cookie
 
-    # 3. Get Video Info (AID, CID, Title, Author)
-    aid, cid = None, None
-    video_title, video_author = None, None
-    try:
-        # We can use the view API to get both IDs and metadata
-        view_resp = requests.get("https://api.bilibili.com/x/web-interface/view", params={'bvid': bvid}, headers=headers, timeout=10)
-        view_data = view_resp.json()
-        if view_data.get('code') == 0:
-            data = view_data.get('data', {})
-            aid = str(data.get('aid'))
-            cid = str(data.get('cid'))
-            video_title = data.get('title')
-            video_author = data.get('owner', {}).get('name')
-            logging.info(f"Found AID: {aid}, CID: {cid}, Title: {video_title}, Author: {video_author} via View API")
-            # Override CID for multi-part videos
-            if page > 1:
-                page_cid = get_cid_for_page(bvid, page, headers)
-                if page_cid:
-                    cid = page_cid
-                    logging.info(f"Overrode CID to {cid} for page {page}")
-        else:
-            # Fallback to pagelist for CID if view API fails
-            logging.warning(f"View API failed (code {view_data.get('code')}), attempting pagelist for CID")
-            page_resp = requests.get(PAGELIST_API_URL, params={'bvid': bvid}, headers=headers, timeout=10)
-            page_data = page_resp.json()
-            if page_data.get('code') == 0 and page_data.get('data'):
-                idx = page - 1 if page > 0 else 0
-                if idx < len(page_data['data']):
-                    cid = str(page_data['data'][idx]['cid'])
-                else:
-                    cid = str(page_data['data'][0]['cid'])
-                logging.info(f"Found CID via pagelist fallback: {cid} (page {page})")
-    except Exception as e:
-        logging.error(f"Error getting video info: {e}")
+    # 3. Resolve video info once (AID, CID per page, Title, Author, subtitle list) for every fetcher below
+    ctx = resolve_video_context(bvid, page, headers)
+    aid, cid = ctx.aid, ctx.cid
+    video_title, video_author = ctx.title, ctx.author
 
     # 4. Concurrent fetching
     results = {}
     with ThreadPoolExecutor(max_workers=4) as executor:
         # Fetch subtitles using the original function (passed the resolved long URL) if needed
-        future_subs = executor.submit(process_bilibili_url, resolved_url, lang_code) if need_subs else None
+        future_subs = executor.submit(process_bilibili_url, resolved_url, lang_code, ctx) if need_subs else None
         
-        # Fetch danmaku if requested
-        future_danmaku = executor.submit(fetch_danmaku, cid, danmaku_num, headers) if cid and danmaku_num > 0 else None
+        # Fetch danmaku if requested (top-N by frequency, optionally within a time window)
+        future_danmaku = executor.submit(fetch_danmaku, cid, danmaku_num, headers, aid, ctx.duration, danmaku_start, danmaku_end) if cid and danmaku_num > 0 else None
         
         # Fetch comments if requested
         future_comments = executor.submit(fetch_comments, aid, comment_num, headers) if aid and comment_num > 0 else None
@@ -713,15 +1227,22 @@ def process_bilibili_enhanced(video_input: str, lang_code: str | None = None, da
             # Cache for sprite sheets
             sheet_cache = {}
             
+            # 优先尝试 ffmpeg 高清抽帧：所有时间点一次解析流地址、批量抽取
+            hd_frames = {}
+            if hd_snapshot and cid:
+                hd_times = []
+                for t in snapshot_at_times:
+                    try:
+                        hd_times.append(float(t))
+                    except (TypeError, ValueError):
+                        pass
+                hd_frames = fetch_hd_snapshots(bvid, cid, hd_times, img_dir, headers)
+
             snapshot_text = "\n\n【请求的视频快照】\n"
             for t in snapshot_at_times:
                 try:
                     t_val = float(t)
-                    img_path = None
-
-                    # 优先尝试 ffmpeg 高清抽帧
-                    if hd_snapshot and cid:
-                        img_path = fetch_hd_snapshot(bvid, cid, t_val, img_dir, headers)
+                    img_path = hd_frames.get(t_val)
 
                     # 降级到雪碧图裁切
                     if not img_path and shot_data and shot_data.get('image'):
@@ -755,7 +1276,7 @@ def process_bilibili_enhanced(video_input: str, lang_code: str | None = None, da
 
                             if sheet_idx not in sheet_cache:
                                 logging.info(f"Downloading sprite sheet: {img_url}")
-                                img_resp = requests.get(img_url, timeout=15)
+                                img_resp = http_get(img_url, timeout=15)
                                 sheet_cache[sheet_idx] = Image.open(io.BytesIO(img_resp.content))
 
                             sheet_img = sheet_cache[sheet_idx]
@@ -847,21 +1368,14 @@ def search_bilibili(keyword: str, search_type: str = "video", page: int = 1) ->
     if user_cookie:
         headers['Cookie'] = user_cookie
 
-    img_key, sub_key = getWbiKeys(headers)
-    if not img_key or not sub_key:
-        return {"error": "Failed to get WBI keys for search"}
-
     params = {
         'keyword': keyword,
         'search_type': search_type,
         'page': page
     }
-    signed_params = encWbi(params, img_key, sub_key)
 
     try:
-        resp = requests.get(SEARCH_WBI_API_URL, params=signed_params, headers=headers, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+        data = wbi_signed_get(SEARCH_WBI_API_URL, params, headers, timeout=10)
         
         if data.get('code') != 0:
             return f"搜索失败: {data.get('message', '未知错误')}"
@@ -916,22 +1430,15 @@ def get_up_videos(mid: str, pn: int = 1, ps: int = 30) -> dict:
     if user_cookie:
         headers['Cookie'] = user_cookie
 
-    img_key, sub_key = getWbiKeys(headers)
-    if not img_key or not sub_key:
-        return {"error": "Failed to get WBI keys for space search"}
-
     params = {
         'mid': mid,
         'pn': pn,
         'ps': ps,
         'order': 'pubdate'
     }
-    signed_params = encWbi(params, img_key, sub_key)
 
     try:
-        resp = requests.get(SPACE_ARC_WBI_API_URL, params=signed_params, headers=headers, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+        data = wbi_signed_get(SPACE_ARC_WBI_API_URL, params, headers, timeout=10)
         
         if data.get('code') != 0:
             return f"获取 UP 主视频失败: {data.get('message', '未知错误')}"
@@ -957,11 +1464,12 @@ def get_up_videos(mid: str, pn: int = 1, ps: int = 30) -> dict:
 
 # --- Main execution for VCP Synchronous Plugin ---
 
-def process_bilibili_url(video_input: str, lang_code: str | None = None) -> str:
+def process_bilibili_url(video_input: str, lang_code: str | None = None, context: VideoContext | None = None) -> str:
     """
     Processes a Bilibili URL or BV ID to fetch and return subtitle text.
     Reads cookie from BILIBILI_COOKIE environment variable.
-    Accepts a language code for subtitle selection.
+    Accepts a language code for subtitle selection, and an already resolved
+    VideoContext to avoid looking the video up again.
     Returns plain text subtitle content or an empty string on failure.
     """
     user_cookie = os.environ.get('BILIBILI_COOKIE')
@@ -977,18 +1485,17 @@ def process_bilibili_url(video_input: str, lang_code: str | None = None) -> str:
         logging.error(f"Invalid input: Could not extract BV ID from '{video_input}'.")
         return ""
 
-    target_cid = None
-    if page > 1:
+    if context is None and page > 1:
         _h = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Referer': f'{BILIBILI_VIDEO_BASE_URL}{bvid}/',
         }
         if user_cookie:
             _h['Cookie'] = user_cookie
-        target_cid = get_cid_for_page(bvid, page, _h)
+        context = resolve_video_context(bvid, page, _h)
 
     try:
-        subtitle_json_string = get_subtitle_json_string(bvid, user_cookie, lang_code, target_cid=target_cid)
+        subtitle_json_string = get_subtitle_json_string(bvid, user_cookie, lang_code, context=context)
 
         # Process the subtitle JSON string to extract plain text
         try:
@@ -1041,6 +1548,8 @@ def handle_single_request(data: dict):
         lang = data.get('lang')
         danmaku_num = int(data.get('danmaku_num', 0))
         comment_num = int(data.get('comment_num', 0))
+        danmaku_start = parse_time_point(data.get('danmaku_start'))
+        danmaku_end = parse_time_point(data.get('danmaku_end'))
         
         # Parse snapshot_at_times if provided (comma separated string or list)
         snapshots_raw = data.get('snapshots')
@@ -1065,11 +1574,91 @@ def handle_single_request(data: dict):
         if isinstance(hd_snapshot, str):
             hd_snapshot = hd_snapshot.lower() in ('true', '1', 'yes')
 
-        return process_bilibili_enhanced(url, lang_code=lang, danmaku_num=danmaku_num, comment_num=comment_num, snapshot_at_times=snapshot_at_times, need_subs=need_subs, need_pbp=need_pbp, hd_snapshot=hd_snapshot)
+        return process_bilibili_enhanced(url, lang_code=lang, danmaku_num=danmaku_num, comment_num=comment_num, snapshot_at_times=snapshot_at_times, need_subs=need_subs, need_pbp=need_pbp, hd_snapshot=hd_snapshot, danmaku_start=danmaku_start, danmaku_end=danmaku_end)
+
+# 批量模式：各任务并发执行，共用 HTTP Session 与 WBI 密钥缓存。
+# 全局截止时间应短于 manifest 中 60s 的超时，留出输出结果的余量。
+BATCH_MAX_WORKERS = 4
+BATCH_DEADLINE_SECONDS = REQUEST_BUDGET_SECONDS
+
+
+def split_batch_tasks(input_data: dict) -> list:
+    """把 url1/lang1/command2… 按末尾编号拆成 [(编号, 参数字典)]，按编号数值升序。"""
+    tasks = {}
+    for key, value in input_data.items():
+        match = re.fullmatch(r'(.*?)(\d+)', key)
+        if match and match.group(1):
+            tasks.setdefault(match.group(2), {})[match.group(1)] = value
+    if not tasks:  # Fallback if no digits found but suspected serial
+        return [('', dict(input_data))]
+    return sorted(tasks.items(), key=lambda item: int(item[0]))
+
+
+def _batch_setting(value, env_name: str, default, cast):
+    """依次尝试调用参数与环境变量，取第一个能解析成有限正数的值，否则回退默认值。"""
+    for source, raw in (('argument', value), (env_name, os.environ.get(env_name))):
+        if raw is None or str(raw).strip() == '':
+            continue
+        try:
+            parsed = cast(float(raw))
+        except (TypeError, ValueError, OverflowError):
+            logging.warning(f"Ignoring invalid batch setting from {source}: {raw!r}")
+            continue
+        if parsed > 0 and parsed != float('inf'):
+            return parsed
+        logging.warning(f"Ignoring non-positive batch setting from {source}: {raw!r}")
+    return default
+
+
+def handle_batch_request(input_data: dict) -> tuple[str, bool]:
+    """
+    并发执行批量任务，按编号顺序返回各任务结果与耗时。
+    超过截止时间仍未完成的任务标记为超时，返回 (结果文本, 是否全部完成)。
+    """
+    tasks = split_batch_tasks(input_data)
+    max_workers = _batch_setting(input_data.get('max_workers'), 'BILIBILI_BATCH_WORKERS', BATCH_MAX_WORKERS, int)
+    deadline = _batch_setting(input_data.get('deadline'), 'BILIBILI_BATCH_DEADLINE', BATCH_DEADLINE_SECONDS, float)
+    max_workers = max(1, min(max_workers, len(tasks)))
+    set_request_deadline(deadline)
+    logging.info(f"Running {len(tasks)} batch tasks with {max_workers} workers, deadline {deadline:.0f}s")
+
+    started_at = {}
+    durations = {}
+
+    def run(idx: str, sub_data: dict):
+        started_at[idx] = time.perf_counter()
+        try:
+            return handle_single_request(sub_data)
+        finally:
+            durations[idx] = time.perf_counter() - started_at[idx]
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {idx: executor.submit(run, idx, sub_data) for idx, sub_data in tasks}
+    _, pending = wait(futures.values(), timeout=deadline)
+    # 不等待超时任务：取消排队中的，正在运行的留在后台。
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for idx, _ in tasks:
+        future = futures[idx]
+        if future in pending:
+            state = "仍在运行" if idx in started_at else "未开始"
+            results.append(f"--- 任务 {idx} 超时 ---\n超过批量截止时间 {deadline:.0f}s（{state}），已跳过。")
+            continue
+        elapsed = durations.get(idx, 0.0)
+        try:
+            res = future.result()
+            results.append(f"--- 任务 {idx} 结果（耗时 {elapsed:.1f}s）---\n{res if isinstance(res, str) else json.dumps(res, indent=2, ensure_ascii=False)}")
+        except Exception as e:
+            results.append(f"--- 任务 {idx} 失败（耗时 {elapsed:.1f}s）---\n错误: {e}")
+
+    return "\n\n".join(results), not pending
+
 
 if __name__ == "__main__":
     input_data_raw = sys.stdin.read()
     output = {}
+    batch_complete = True
 
     try:
         if not input_data_raw.strip():
@@ -1082,23 +1671,7 @@ if __name__ == "__main__":
         
         if is_serial:
             logging.info("Detected serial/batch request.")
-            results = []
-            # Find all indices
-            indices = sorted(list(set([re.findall(r'\d+', k)[0] for k in input_data.keys() if re.findall(r'\d+', k)])))
-            if not indices: # Fallback if no digits found but suspected serial
-                indices = ['']
-
-            for idx in indices:
-                # Extract parameters for this index
-                sub_data = {k.replace(idx, ''): v for k, v in input_data.items() if k.endswith(idx)}
-                # Map 'urlX' to 'url' etc. if needed, handle_single_request expects clean keys
-                try:
-                    res = handle_single_request(sub_data)
-                    results.append(f"--- 任务 {idx} 结果 ---\n{res if isinstance(res, str) else json.dumps(res, indent=2, ensure_ascii=False)}")
-                except Exception as e:
-                    results.append(f"--- 任务 {idx} 失败 ---\n错误: {e}")
-            
-            combined_res = "\n\n".join(results)
+            combined_res, batch_complete = handle_batch_request(input_data)
             output = {"status": "success", "result": combined_res}
         else:
             result_data = handle_single_request(input_data)
@@ -1110,10 +1683,17 @@ if __name__ == "__main__":
         logging.exception("An unexpected error occurred during plugin execution.")
         output = {"status": "error", "error": f"An unexpected error occurred: {e}"}
 
+    log_http_stats()
+
     # Output JSON to stdout
     # Use sys.stdout.buffer to write UTF-8 encoded bytes directly, avoiding Windows console encoding issues
     sys.stdout.buffer.write(json.dumps(output, indent=2, ensure_ascii=False).encode('utf-8'))
     sys.stdout.buffer.write(b'\n')
     sys.stdout.buffer.flush()
 
+    if not batch_complete:
+        # 超时任务的线程仍在运行，正常退出会等它们结束；结果已写出，直接结束进程。
+        logging.shutdown()
+        os._exit(0)
+
 # Removed main() function definition as it's replaced by the __main__ block
@@ -0,0 +1,74 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import BilibiliFetch as bf  # noqa: E402
+
+
+class SplitBatchTasksTests(unittest.TestCase):
+    def test_groups_by_trailing_number_in_numeric_order(self):
+        tasks = bf.split_batch_tasks({
+            'url10': 'c', 'url2': 'b', 'lang2': 'zh', 'action1': 'search', 'keyword1': 'k', 'max_workers': '2',
+        })
+        self.assertEqual(tasks, [
+            ('1', {'action': 'search', 'keyword': 'k'}),
+            ('2', {'url': 'b', 'lang': 'zh'}),
+            ('10', {'url': 'c'}),
+        ])
+
+    def test_without_numbered_keys_runs_one_task(self):
+        self.assertEqual(bf.split_batch_tasks({'url': 'a'}), [('', {'url': 'a'})])
+
+
+class HandleBatchRequestTests(unittest.TestCase):
+    def run_batch(self, input_data, handler=lambda data: data['url']):
+        with mock.patch.object(bf, 'handle_single_request', side_effect=handler):
+            return bf.handle_batch_request(input_data)
+
+    def test_results_in_order_with_failures_reported(self):
+        def handler(data):
+            if data['url'] == 'bad':
+                raise ValueError('boom')
+            return data['url']
+
+        text, complete = self.run_batch({'url1': 'ok', 'url2': 'bad'}, handler)
+        self.assertTrue(complete)
+        self.assertLess(text.index('任务 1 结果'), text.index('任务 2 失败'))
+        self.assertIn('错误: boom', text)
+
+    def test_invalid_settings_fall_back_to_defaults(self):
+        for settings in ({'max_workers': 'many', 'deadline': 'soon'}, {'max_workers': '0', 'deadline': '-5'},
+                         {'deadline': 'nan'}, {'deadline': 'inf'}):
+            with self.subTest(settings=settings):
+                text, complete = self.run_batch({'url1': 'a', 'url2': 'b', **settings})
+                self.assertTrue(complete)
+                self.assertIn('任务 2 结果', text)
+
+    def test_invalid_argument_falls_back_to_environment(self):
+        with mock.patch.dict('os.environ', {'BILIBILI_BATCH_DEADLINE': '0.2'}):
+            self.assertEqual(bf._batch_setting('later', 'BILIBILI_BATCH_DEADLINE', 50.0, float), 0.2)
+            self.assertEqual(bf._batch_setting('3', 'BILIBILI_BATCH_WORKERS', 4, int), 3)
+        with mock.patch.dict('os.environ', {'BILIBILI_BATCH_WORKERS': 'x'}):
+            self.assertEqual(bf._batch_setting(None, 'BILIBILI_BATCH_WORKERS', 4, int), 4)
+
+    def test_deadline_marks_unfinished_tasks(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def handler(data):
+            if data['url'] == 'slow':
+                release.wait(5)
+            return data['url']
+
+        text, complete = self.run_batch({'url1': 'fast', 'url2': 'slow', 'deadline': '0.2'}, handler)
+        self.assertFalse(complete)
+        self.assertIn('任务 1 结果', text)
+        self.assertIn('任务 2 超时', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import io
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import BilibiliFetch as bf  # noqa: E402
+
+
+def varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def danmaku_elem(progress_ms, content):
+    text = content.encode('utf-8')
+    # id(1, varint) 与 color(5, varint) 是解析时应跳过的字段
+    return (varint(1 << 3) + varint(123456789)
+            + varint(2 << 3) + varint(progress_ms)
+            + varint(5 << 3) + varint(0xFFFFFF)
+            + varint((7 << 3) | 2) + varint(len(text)) + text)
+
+
+def segment(*elems):
+    body = bytearray()
+    for progress_ms, content in elems:
+        elem = danmaku_elem(progress_ms, content)
+        body += varint((1 << 3) | 2) + varint(len(elem)) + elem
+    return bytes(body)
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+
+    def iter_content(self, chunk_size=1):
+        # 故意切成很小的块，覆盖跨块读取 varint 与内容的情况
+        for i in range(0, len(self.body), 3):
+            yield self.body[i:i + 3]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class DanmakuDecoderTests(unittest.TestCase):
+    def test_decodes_progress_and_content_across_chunks(self):
+        body = segment((1500, 'hello'), (200, '前方高能'))
+        reader = bf._ChunkReader(FakeResponse(body).iter_content())
+        self.assertEqual(list(bf.iter_danmaku_segment(reader)), [(1500, 'hello'), (200, '前方高能')])
+
+    def test_truncated_element_raises(self):
+        body = segment((1500, 'hello'))[:-2]
+        with self.assertRaises(ValueError):
+            list(bf.iter_danmaku_segment(io.BytesIO(body)))
+
+    def test_tally_counts_normalized_duplicates(self):
+        tally = bf.DanmakuTally()
+        for at, text in ((5000, '666'), (1000, ' 666 '), (3000, 'ABC'), (4000, 'abc'), (2000, '666'), (0, '  ')):
+            tally.add(text, at)
+        self.assertEqual(tally.total, 5)
+        self.assertEqual(tally.top(2), [('666', 3, 1.0), ('ABC', 2, 3.0)])
+
+    def test_tally_prunes_rare_entries_past_the_cap(self):
+        tally = bf.DanmakuTally(max_tracked=4)
+        for _ in range(3):
+            tally.add('hot', 0)
+        for i in range(5):
+            tally.add(f'rare {i}', i)
+        self.assertTrue(tally.pruned)
+        self.assertLessEqual(len(tally.entries), 4)
+        self.assertEqual(tally.top(1)[0][:2], ('hot', 3))
+
+
+class FetchDanmakuTests(unittest.TestCase):
+    def fetch(self, segments, **kwargs):
+        requested = []
+
+        def fake_get(url, params=None, **_):
+            requested.append(params['segment_index'])
+            return FakeResponse(segment(*segments.get(params['segment_index'], ())))
+
+        with mock.patch.object(bf, 'http_get', side_effect=fake_get), \
+                mock.patch.object(bf, 'fetch_danmaku_xml', return_value=None) as xml:
+            lines = bf.fetch_danmaku('1', 10, {}, **kwargs)
+        return lines, sorted(requested), xml
+
+    def test_unknown_duration_stops_at_first_empty_segment(self):
+        lines, requested, _ = self.fetch({1: [(1000, 'a')], 2: [(361000, 'b')]})
+        self.assertEqual(lines, ['[00:01] a', '[06:01] b'])
+        self.assertIn(3, requested)
+        self.assertLessEqual(max(requested), 3 + bf.DANMAKU_SEGMENT_WORKERS)
+
+    def test_segment_filtered_out_by_start_is_not_treated_as_the_end(self):
+        # 第 2 段（360–720s）里的弹幕全部早于 start=700s，过滤后为空，但视频并未结束。
+        segments = {2: [(400000, 'early')]}
+        for index in range(3, 10):
+            segments[index] = [((index - 1) * 360000 + 1000, f'seg {index}')]
+        lines, requested, xml = self.fetch(segments, start=700)
+        self.assertEqual(len(lines), 7)
+        self.assertIn('[48:01] seg 9', lines)
+        self.assertIn(10, requested)
+        xml.assert_not_called()
+
+    def test_known_duration_fetches_every_segment_in_range(self):
+        lines, requested, _ = self.fetch({3: [(730000, 'x')]}, duration=1000)
+        self.assertEqual(requested, [1, 2, 3])
+        self.assertEqual(lines, ['[12:10] x'])
+
+    def test_end_past_the_video_is_clamped_to_its_duration(self):
+        lines, requested, _ = self.fetch({1: [(5000, 'y')]}, duration=180, end=36000)
+        self.assertEqual(requested, [1])
+        self.assertEqual(lines, ['[00:05] y'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import BilibiliFetch as bf  # noqa: E402
+
+
+class FakeFfmpeg:
+    """记录每次调用的帧数与超时；fail_multi 时多帧进程写出半截文件后失败。"""
+
+    def __init__(self, fail_multi=False, fail_times=()):
+        self.fail_multi = fail_multi
+        self.fail_times = set(fail_times)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, cmd, capture_output=True, timeout=None):
+        times = [float(cmd[i + 1]) for i, arg in enumerate(cmd) if arg == '-ss']
+        outputs = [cmd[i + 2] for i, arg in enumerate(cmd) if arg == '-q:v']
+        with self.lock:
+            self.calls.append((times, timeout))
+        for path in outputs:
+            with open(path, 'wb') as f:
+                f.write(b'partial' if self.fail_multi and len(outputs) > 1 else b'jpeg')
+        failed = (self.fail_multi and len(outputs) > 1) or self.fail_times.intersection(times)
+        return subprocess.CompletedProcess(cmd, 1 if failed else 0, b'', b'boom' if failed else b'')
+
+
+class HdSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = os.path.join(tmp.name, 'frames')
+        self.img_dir = os.path.join(tmp.name, 'img')
+        os.makedirs(self.img_dir)
+        for patcher in (
+            mock.patch.object(bf, 'HD_FRAME_CACHE_DIR', self.cache_dir),
+            mock.patch.object(bf, 'get_ffmpeg_path', return_value='/usr/bin/ffmpeg'),
+            mock.patch.object(bf, 'get_video_stream_url', return_value=('https://v.test/1.m4s', 1920, 1080, 80)),
+            mock.patch.object(bf.os, 'cpu_count', return_value=2),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        bf.set_request_deadline(bf.REQUEST_BUDGET_SECONDS)
+        self.addCleanup(bf.set_request_deadline, bf.REQUEST_BUDGET_SECONDS)
+
+    def fetch(self, ffmpeg, times):
+        with mock.patch.object(bf.subprocess, 'run', side_effect=ffmpeg):
+            return bf.fetch_hd_snapshots('BV1', '42', times, self.img_dir, {})
+
+    def test_frames_are_grouped_and_cached(self):
+        ffmpeg = FakeFfmpeg()
+        frames = self.fetch(ffmpeg, [1, 2, 3, 4])
+        self.assertEqual(sorted(frames), [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(sorted(len(times) for times, _ in ffmpeg.calls), [2, 2])
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, '42_3000_q80.jpg')))
+
+        again = FakeFfmpeg()
+        self.assertEqual(sorted(self.fetch(again, [3, 4])), [3.0, 4.0])
+        self.assertEqual(again.calls, [])
+
+    def test_cache_lookup_prefers_highest_quality(self):
+        os.makedirs(self.cache_dir)
+        for qn in (32, 80, 64):
+            Path(self.cache_dir, f'42_1500_q{qn}.jpg').write_bytes(b'jpeg')
+        self.assertTrue(bf._frame_cache_lookup('42', 1500).endswith('42_1500_q80.jpg'))
+        self.assertIsNone(bf._frame_cache_lookup('42', 2500))
+
+    def test_prune_keeps_most_recent(self):
+        os.makedirs(self.cache_dir)
+        for i in range(5):
+            path = Path(self.cache_dir, f'42_{i}_q80.jpg')
+            path.write_bytes(b'jpeg')
+            os.utime(path, (1000 + i, 1000 + i))
+        with mock.patch.object(bf, 'HD_FRAME_CACHE_MAX_FILES', 2):
+            bf._prune_frame_cache()
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ['42_3_q80.jpg', '42_4_q80.jpg'])
+
+    def test_failed_group_is_retried_frame_by_frame(self):
+        ffmpeg = FakeFfmpeg(fail_multi=True, fail_times=[4.0])
+        frames = self.fetch(ffmpeg, [1, 2, 3, 4])
+        self.assertEqual(sorted(frames), [1.0, 2.0, 3.0])
+        self.assertEqual(sorted(len(times) for times, _ in ffmpeg.calls), [1, 1, 1, 1, 2, 2])
+        for t in (1, 2, 3):
+            self.assertEqual(Path(frames[float(t)]).read_bytes(), b'jpeg')
+        self.assertEqual([name for name in os.listdir(self.cache_dir) if name.startswith('.')], [])
+
+    def test_ffmpeg_timeout_is_capped_by_request_budget(self):
+        bf.set_request_deadline(bf.HD_SPRITE_RESERVE_SECONDS + 10)
+        ffmpeg = FakeFfmpeg()
+        self.fetch(ffmpeg, [float(t) for t in range(20)])
+        self.assertTrue(ffmpeg.calls)
+        self.assertTrue(all(timeout <= 10 for _, timeout in ffmpeg.calls))
+
+        bf.set_request_deadline(bf.HD_SPRITE_RESERVE_SECONDS + 1)
+        late = FakeFfmpeg()
+        self.assertEqual(self.fetch(late, [100.0]), {})
+        self.assertEqual(late.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import BilibiliFetch as bf  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = json.dumps(payload, ensure_ascii=False)
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+IMG_KEY, SUB_KEY = '7cd084941338484aae1ad9425b84077c', '4932caff0ff746eab6f01bf08b70ac45'
+
+VIEW_PAYLOAD = {
+    'code': 0,
+    'data': {
+        'aid': 170001, 'cid': 11, 'title': '合集', 'owner': {'name': 'UP'}, 'duration': 900,
+        'pages': [{'cid': 11, 'duration': 300}, {'cid': 22, 'duration': 600}],
+        'subtitle': {'list': [{'lan': 'zh-CN', 'subtitle_url': '//sub.test/p1.json'}]},
+    },
+}
+
+
+class FakeBilibili:
+    """按 URL 应答的假 http_get，记录每个接口的调用次数。"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def __call__(self, url, params=None, **kwargs):
+        self.calls.append(url)
+        reply = self.routes[url]
+        return reply(params) if callable(reply) else reply
+
+    def count(self, url):
+        return self.calls.count(url)
+
+
+class ResolveVideoContextTests(unittest.TestCase):
+    def resolve(self, routes, page):
+        self.api = FakeBilibili(routes)
+        with mock.patch.object(bf, 'http_get', self.api):
+            return bf.resolve_video_context('BV1xx', page, {})
+
+    def test_one_view_call_resolves_the_requested_part(self):
+        ctx = self.resolve({bf.VIEW_API_URL: FakeResponse(VIEW_PAYLOAD)}, page=2)
+        self.assertEqual((ctx.aid, ctx.cid, ctx.duration), ('170001', '22', 600))
+        self.assertEqual((ctx.title, ctx.author), ('合集', 'UP'))
+        # View 的字幕列表属于第 1P，换到其他分P后不能沿用
+        self.assertEqual(ctx.subtitles, [])
+        self.assertEqual(self.api.calls, [bf.VIEW_API_URL])
+
+        ctx = self.resolve({bf.VIEW_API_URL: FakeResponse(VIEW_PAYLOAD)}, page=1)
+        self.assertEqual((ctx.cid, len(ctx.subtitles)), ('11', 1))
+
+    def test_pagelist_is_only_a_fallback(self):
+        routes = {
+            bf.VIEW_API_URL: FakeResponse({'code': -404}),
+            bf.PAGELIST_API_URL: FakeResponse({'code': 0, 'data': [{'cid': 5, 'duration': 60}]}),
+        }
+        ctx = self.resolve(routes, page=3)
+        self.assertEqual((ctx.aid, ctx.cid, ctx.duration), (None, '5', 60))
+        self.assertEqual(self.api.calls, [bf.VIEW_API_URL, bf.PAGELIST_API_URL])
+
+    def test_network_errors_leave_an_empty_context(self):
+        def boom(params):
+            raise OSError('offline')
+
+        ctx = self.resolve({bf.VIEW_API_URL: boom}, page=2)
+        self.assertIsNone(ctx.cid)
+
+
+class SubtitleWithContextTests(unittest.TestCase):
+    def test_resolved_context_skips_lookups_and_fetches_keys_once(self):
+        api = FakeBilibili({
+            bf.VIEW_API_URL: FakeResponse(VIEW_PAYLOAD),
+            bf.PLAYER_WBI_API_URL: FakeResponse({'code': 0, 'data': {'subtitle': {'subtitles': []}}}),
+            bf.SUMMARY_API_URL: FakeResponse({'code': 0, 'data': {'model_result': {'subtitle': [
+                {'part_subtitle': [{'start_timestamp': 1, 'end_timestamp': 2, 'content': '你好'}]},
+            ]}}}),
+        })
+        keys = mock.Mock(return_value=(IMG_KEY, SUB_KEY))
+        with mock.patch.object(bf, 'http_get', api), mock.patch.object(bf, 'getWbiKeys', keys):
+            ctx = bf.resolve_video_context('BV1xx', 2, {})
+            text = bf.get_subtitle_json_string('BV1xx', None, context=ctx)
+        self.assertEqual(json.loads(text)['body'], [{'from': 1, 'to': 2, 'content': '你好'}])
+        self.assertEqual(api.count(bf.VIEW_API_URL), 1)
+        self.assertEqual(api.count(bf.PAGELIST_API_URL), 0)
+        self.assertEqual((api.count(bf.PLAYER_WBI_API_URL), api.count(bf.SUMMARY_API_URL)), (1, 1))
+        keys.assert_called_once_with({}, force_refresh=False)
+
+    def test_legacy_target_cid_still_overrides(self):
+        seen = []
+
+        def player(params):
+            seen.append(params['cid'])
+            return FakeResponse({'code': 0, 'data': {'subtitle': {'subtitles': [
+                {'lan': 'en', 'subtitle_url': 'https://sub.test/en.json'},
+            ]}}})
+
+        api = FakeBilibili({
+            bf.VIEW_API_URL: FakeResponse(VIEW_PAYLOAD),
+            bf.PLAYER_WBI_API_URL: player,
+            'https://sub.test/en.json': FakeResponse({'body': [{'content': 'hi'}]}),
+        })
+        with mock.patch.object(bf, 'http_get', api), mock.patch.object(bf, 'getWbiKeys', return_value=('', '')):
+            text = bf.get_subtitle_json_string('BV1xx', None, target_cid='99')
+        self.assertEqual(seen, ['99'])
+        # View 给出的 zh-CN 属于默认分P，覆盖 cid 后只剩 WBI 返回的 en
+        self.assertEqual(json.loads(text)['body'], [{'content': 'hi'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
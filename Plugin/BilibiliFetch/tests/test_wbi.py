@@ -0,0 +1,154 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import BilibiliFetch as bf  # noqa: E402
+
+
+IMG_KEY, SUB_KEY = '7cd084941338484aae1ad9425b84077c', '4932caff0ff746eab6f01bf08b70ac45'
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+
+def nav_response(img_key=IMG_KEY, sub_key=SUB_KEY):
+    return FakeResponse({'code': -101, 'data': {'wbi_img': {
+        'img_url': f'https://i0.hdslb.com/bfs/wbi/{img_key}.png',
+        'sub_url': f'https://i0.hdslb.com/bfs/wbi/{sub_key}.png',
+    }}})
+
+
+class WbiKeyCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_file = os.path.join(tmp.name, 'wbi_keys.json')
+        self.now = 1_700_000_000.0
+        self.nav = mock.Mock(return_value=nav_response())
+        for patcher in (
+            mock.patch.object(bf, 'CACHE_DIR', tmp.name),
+            mock.patch.object(bf, 'WBI_KEY_CACHE_FILE', self.cache_file),
+            mock.patch.object(bf, '_wbi_cache', {}),
+            mock.patch.object(bf, 'time', mock.Mock(wraps=time, time=lambda: self.now)),
+            mock.patch.object(bf, 'http_get', self.nav),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def new_process(self):
+        bf._wbi_cache = {}
+
+    def test_keys_persist_across_processes_until_the_ttl(self):
+        self.assertEqual(bf.getWbiKeys({}), (IMG_KEY, SUB_KEY))
+        with open(self.cache_file, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['fetched_at'], self.now)
+
+        self.new_process()
+        self.now += bf.WBI_KEY_TTL_SECONDS - 1
+        self.assertEqual(bf.getWbiKeys({}), (IMG_KEY, SUB_KEY))
+        self.assertEqual(self.nav.call_count, 1)
+
+        self.new_process()
+        self.now += 2
+        self.nav.return_value = nav_response(sub_key='f' * 32)
+        self.assertEqual(bf.getWbiKeys({}), (IMG_KEY, 'f' * 32))
+        self.assertEqual(self.nav.call_count, 2)
+
+    def test_force_refresh_and_failed_fetches(self):
+        bf.getWbiKeys({})
+        self.nav.return_value = FakeResponse({'data': {}})
+        self.assertEqual(bf.getWbiKeys({}, force_refresh=True), ('', ''))
+        # 获取失败不覆盖已有缓存
+        self.assertEqual(bf.getWbiKeys({}), (IMG_KEY, SUB_KEY))
+        self.assertEqual(self.nav.call_count, 2)
+
+    def test_corrupt_cache_file_is_ignored(self):
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            f.write('{not json')
+        self.assertEqual(bf.getWbiKeys({}), (IMG_KEY, SUB_KEY))
+        self.assertEqual(self.nav.call_count, 1)
+
+
+class WbiSignedGetTests(unittest.TestCase):
+    def test_rejected_signature_refreshes_keys_once(self):
+        replies = [FakeResponse({'code': -352}), FakeResponse({'code': 0, 'data': 'ok'})]
+        sent = []
+
+        def fake_get(url, params=None, **kwargs):
+            sent.append(params)
+            return replies.pop(0)
+
+        key_source = mock.Mock(return_value=(IMG_KEY, SUB_KEY))
+        with mock.patch.object(bf, 'http_get', fake_get):
+            data = bf.wbi_signed_get('https://api.test/wbi', {'mid': 1}, {}, key_source=key_source)
+        self.assertEqual(data, {'code': 0, 'data': 'ok'})
+        self.assertEqual([c.args for c in key_source.call_args_list], [(False,), (True,)])
+        self.assertTrue(all('w_rid' in params and params['mid'] == '1' for params in sent))
+
+    def test_persistent_rejection_is_returned_after_one_retry(self):
+        calls = []
+
+        def fake_get(url, params=None, **kwargs):
+            calls.append(params)
+            return FakeResponse({'code': -403})
+
+        with mock.patch.object(bf, 'http_get', fake_get):
+            data = bf.wbi_signed_get('https://api.test/wbi', {}, {}, key_source=lambda refresh: ('', ''))
+        self.assertEqual(data['code'], -403)
+        self.assertEqual(len(calls), 2)
+        self.assertNotIn('w_rid', calls[0])
+
+
+    def test_search_and_space_listing_sign_with_a_single_key_lookup(self):
+        keys = mock.Mock(return_value=(IMG_KEY, SUB_KEY))
+        reply = FakeResponse({'code': 0, 'data': {'result': [], 'list': {'vlist': []}}})
+        with mock.patch.object(bf, 'getWbiKeys', keys), mock.patch.object(bf, 'http_get', return_value=reply) as get:
+            self.assertEqual(bf.search_bilibili('k'), '未找到相关结果。')
+            self.assertEqual(bf.get_up_videos('42'), '该 UP 主暂无投稿视频。')
+        self.assertEqual(keys.call_count, 2)
+        self.assertTrue(all('w_rid' in call.kwargs['params'] for call in get.call_args_list))
+
+
+class SharedSessionTests(unittest.TestCase):
+    def test_all_threads_share_one_session(self):
+        with mock.patch.object(bf, '_session', None):
+            sessions = []
+            threads = [threading.Thread(target=lambda: sessions.append(bf.get_session())) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len({id(session) for session in sessions}), 1)
+            adapter = sessions[0].get_adapter('https://api.bilibili.com')
+            self.assertEqual(adapter._pool_maxsize, bf.HTTP_POOL_MAXSIZE)
+
+    def test_http_get_goes_through_the_shared_session(self):
+        session = mock.Mock(adapters={})
+        session.get.return_value = mock.Mock(status_code=200)
+        with mock.patch.object(bf, '_session', session), mock.patch.dict(bf._http_stats, {'requests': 0, 'elapsed': 0.0}):
+            bf.http_get(bf.NAV_API_URL, timeout=5)
+            bf.http_get(bf.VIEW_API_URL, params={'bvid': 'BV1'})
+            self.assertEqual(bf._http_stats['requests'], 2)
+        self.assertEqual(session.get.call_count, 2)
+        session.get.assert_called_with(bf.VIEW_API_URL, params={'bvid': 'BV1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -37,6 +37,7 @@ from .providers import (
     FearGreedSnapshot,
     FedMeetingProbability,
     FedRateProb,
+    InversionSummary,
     ExchangeRateQuery,
     ExchangeRateRecord,
     KalshiEvent,
@@ -62,6 +63,8 @@ from .providers import (
     USTreasuryProvider,
     WebPageContent,
     WebPageQuery,
+    WebResearchQuery,
+    WebResearchResult,
     WebSearchProvider,
     WebSearchQuery,
     WebSearchResult,
@@ -71,18 +74,33 @@ from .providers import (
     WorldBankQuery,
     WorldBankResult,
     YFinanceProvider,
+    OptionColumns,
     OptionContract,
     OptionGreeks,
     OptionsChain,
+    OptionsChainColumns,
     OptionsChainQuery,
     OptionsExpirations,
+    TermStructurePoint,
+    VolatilitySlice,
+    VolatilitySurface,
     black_scholes_greeks,
+    black_scholes_greeks_array,
+    build_volatility_surface,
+    YieldCurveHistory,
     YieldCurveQuery,
+    YieldCurveRangeQuery,
     YieldCurveSnapshot,
     YieldPoint,
 )
-from .concurrent import GatherError, GatherResult, gather
-from .snapshots import RecordingHttpClient, ReplayHttpClient, SnapshotMissError
+from .concurrent import DependencyError, GatherError, GatherResult, agather, gather, iter_pages
+from .snapshots import (
+    RecordingHttpClient,
+    ReplayHttpClient,
+    SnapshotArchive,
+    SnapshotMissError,
+    pack_snapshots,
+)
 
 __all__ = [
     "BisCreditGap",
@@ -125,9 +143,14 @@ __all__ = [
     "FearGreedSnapshot",
     "FedMeetingProbability",
     "FedRateProb",
+    "InversionSummary",
+    "DependencyError",
     "GatherError",
     "GatherResult",
+    "agather",
     "gather",
+    "iter_pages",
+    "pack_snapshots",
     "KalshiEvent",
     "KalshiMarket",
     "KalshiMarketQuery",
@@ -149,11 +172,14 @@ __all__ = [
     "ReplayHttpClient",
     "SignalProvider",
     "StooqProvider",
+    "SnapshotArchive",
     "SnapshotMissError",
     "YahooPriceProvider",
     "USTreasuryProvider",
     "WebPageContent",
     "WebPageQuery",
+    "WebResearchQuery",
+    "WebResearchResult",
     "WebSearchProvider",
     "WebSearchQuery",
     "WebSearchResult",
@@ -163,13 +189,22 @@ __all__ = [
     "WorldBankQuery",
     "WorldBankResult",
     "YFinanceProvider",
+    "YieldCurveHistory",
     "YieldCurveQuery",
+    "YieldCurveRangeQuery",
     "YieldCurveSnapshot",
     "YieldPoint",
+    "OptionColumns",
     "OptionContract",
     "OptionGreeks",
     "OptionsChain",
+    "OptionsChainColumns",
     "OptionsChainQuery",
     "OptionsExpirations",
+    "TermStructurePoint",
+    "VolatilitySlice",
+    "VolatilitySurface",
     "black_scholes_greeks",
+    "black_scholes_greeks_array",
+    "build_volatility_surface",
 ]
@@ -0,0 +1,510 @@
+"""asyncio-native HTTP/1.1 client implementing the ``JsonHttpClient`` protocol.
+
+:class:`AsyncJsonClient` mirrors :class:`~digital_oracle.http.UrllibJsonClient`
+but its ``get_json`` / ``get_text`` are coroutines, so hundreds of requests
+can share one event loop instead of one thread each.  Requests go through an
+:class:`AsyncConnectionPool`, which enforces a global concurrency cap plus a
+per-host connection cap and keeps idle keep-alive sockets for reuse.
+
+Existing synchronous providers can use the same loop and limits through
+:class:`BlockingJsonClient`, which runs an :class:`AsyncJsonClient` on a
+background loop thread and exposes the regular blocking protocol.
+
+Request routing (proxies, target and headers), rate-limit bookkeeping and the
+retry policy come from :mod:`digital_oracle.http`; this module only adds the
+stream-level HTTP/1.1 exchange that ``http.client`` cannot do on a loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import email.parser
+import http.client
+import json
+import ssl
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import Any, Awaitable, Mapping, TypeVar
+from urllib.parse import urljoin, urlsplit
+
+from .http import (
+    _DEFAULT_PORTS,
+    _MAX_REDIRECTS,
+    _PoolKey,
+    _REDIRECT_STATUSES,
+    HostStats,
+    HttpClientError,
+    HttpResponse,
+    HttpStatusError,
+    _build_url,
+    _decode_body,
+    _prepare_request,
+    _proxy_auth_headers,
+    _proxy_endpoint,
+    _record_rate_outcome,
+    _stats_snapshot,
+    _throttle_retry_delay,
+)
+from .ratelimit import HostRateLimiter, backoff_delay, default_rate_limiter
+from .telemetry import Span, default_telemetry
+
+T = TypeVar("T")
+
+__all__ = [
+    "AsyncConnectionPool",
+    "AsyncJsonClient",
+    "BlockingJsonClient",
+    "default_async_connection_pool",
+]
+
+_Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+# A reused keep-alive socket that the server closed while idle shows up as one
+# of these before any response byte arrives; the request is resent once, and
+# only when the connection came from the idle pool.  A body cut short after
+# the status line (``IncompleteReadError``) is not a stale socket and is
+# surfaced as ``http.client.IncompleteRead`` instead.
+_STALE_CONNECTION_ERRORS = (
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+    http.client.RemoteDisconnected,
+)
+_MAX_LINE = 65536
+_NO_BODY_STATUSES = frozenset({204, 304})
+
+
+class _AsyncHostPool:
+    def __init__(self, max_connections: int) -> None:
+        self.slots = asyncio.Semaphore(max_connections)
+        self.idle: list[tuple[_Connection, float]] = []
+        self.stats = HostStats()
+
+
+class AsyncConnectionPool:
+    """Per-event-loop pool of persistent HTTP/1.1 connections.
+
+    ``max_concurrency`` bounds in-flight requests across all hosts and
+    ``max_connections_per_host`` bounds sockets to a single upstream.  Like
+    :class:`~digital_oracle.http.ConnectionPool`, proxies come from
+    ``HTTP_PROXY`` / ``HTTPS_PROXY`` / ``NO_PROXY``; HTTPS is tunnelled with
+    ``CONNECT``.  A ``rate_limiter`` (typically the process-wide one, shared
+    with the blocking pool) spaces requests per host without holding a slot
+    while waiting.
+
+    A pool must only be used from the event loop it was first used on.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 64,
+        max_connections_per_host: int = 8,
+        max_idle_per_host: int | None = None,
+        idle_timeout_seconds: float = 60.0,
+        ssl_context: ssl.SSLContext | None = None,
+        rate_limiter: HostRateLimiter | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if max_connections_per_host < 1:
+            raise ValueError("max_connections_per_host must be >= 1")
+        self.max_concurrency = max_concurrency
+        self.max_connections_per_host = max_connections_per_host
+        self.max_idle_per_host = (
+            max_idle_per_host if max_idle_per_host is not None else max_connections_per_host
+        )
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._ssl_context = ssl_context or ssl.create_default_context()
+        self.rate_limiter = rate_limiter
+        self._global_slots = asyncio.Semaphore(max_concurrency)
+        self._hosts: dict[_PoolKey, _AsyncHostPool] = {}
+
+    # -- public API --------------------------------------------------------
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        body: bytes | None = None,
+        timeout: float | None = None,
+    ) -> HttpResponse:
+        """Send a request, following redirects, and return the full response."""
+        current_url = url
+        current_method = method.upper()
+        current_body = body
+        for _ in range(_MAX_REDIRECTS + 1):
+            response = await self._request_once(
+                current_method, current_url, headers=headers, body=current_body, timeout=timeout
+            )
+            location = response.headers.get("Location")
+            if response.status not in _REDIRECT_STATUSES or not location:
+                return response
+            current_url = urljoin(current_url, location)
+            if response.status == 303 or (response.status in (301, 302) and current_method == "POST"):
+                current_method = "GET"
+                current_body = None
+        raise HttpClientError(f"too many redirects: {url}")
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return ``{"host:port": {"requests", "handshakes", "reuses", ...}}``."""
+        return _stats_snapshot(list(self._hosts.items()))
+
+    async def close(self) -> None:
+        """Close every idle connection.  Checked-out connections are unaffected."""
+        for host_pool in list(self._hosts.values()):
+            idle, host_pool.idle = host_pool.idle, []
+            for (_reader, writer), _ in idle:
+                await _close_writer(writer)
+
+    # -- internal ----------------------------------------------------------
+
+    def _host_pool(self, key: _PoolKey) -> _AsyncHostPool:
+        host_pool = self._hosts.get(key)
+        if host_pool is None:
+            host_pool = _AsyncHostPool(self.max_connections_per_host)
+            self._hosts[key] = host_pool
+        return host_pool
+
+    async def _new_connection(self, scheme: str, host: str, port: int, proxy: str | None) -> _Connection:
+        if proxy is None:
+            if scheme == "https":
+                return await asyncio.open_connection(
+                    host, port, ssl=self._ssl_context, server_hostname=host, limit=_MAX_LINE
+                )
+            return await asyncio.open_connection(host, port, limit=_MAX_LINE)
+
+        proxy_host, proxy_port = _proxy_endpoint(proxy)
+        reader, writer = await asyncio.open_connection(proxy_host, proxy_port, limit=_MAX_LINE)
+        if scheme == "http":
+            return reader, writer
+
+        connect_lines = [f"CONNECT {host}:{port} HTTP/1.1", f"Host: {host}:{port}"]
+        connect_lines.extend(f"{name}: {value}" for name, value in _proxy_auth_headers(proxy).items())
+        writer.write(("\r\n".join(connect_lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+        status, reason, _headers = await _read_head(reader)
+        if status != 200:
+            await _close_writer(writer)
+            raise HttpClientError(f"proxy CONNECT failed: {status} {reason}")
+        if not hasattr(writer, "start_tls"):  # Python < 3.11
+            await _close_writer(writer)
+            raise HttpClientError("HTTPS through a proxy requires Python 3.11+ for AsyncJsonClient")
+        await writer.start_tls(self._ssl_context, server_hostname=host)
+        return reader, writer
+
+    async def _checkout(self, key: _PoolKey, host_pool: _AsyncHostPool) -> tuple[_Connection, bool]:
+        scheme, host, port, proxy = key
+        now = time.monotonic()
+        while host_pool.idle:
+            connection, parked_at = host_pool.idle.pop()
+            reader, writer = connection
+            if now - parked_at <= self.idle_timeout_seconds and not reader.at_eof():
+                return connection, True
+            await _close_writer(writer)
+        return await self._new_connection(scheme, host, port, proxy), False
+
+    async def _checkin(self, host_pool: _AsyncHostPool, connection: _Connection, reusable: bool) -> None:
+        if reusable and len(host_pool.idle) < self.max_idle_per_host:
+            host_pool.idle.append((connection, time.monotonic()))
+            return
+        await _close_writer(connection[1])
+
+    async def _request_once(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None,
+        body: bytes | None,
+        timeout: float | None,
+    ) -> HttpResponse:
+        prepared = _prepare_request(url, headers)
+        key = prepared.key
+        scheme, host, port, _proxy = key
+        # http.client adds Host and Content-Length itself; on raw streams they are written here.
+        request_headers = {"Host": host if port == _DEFAULT_PORTS[scheme] else f"{host}:{port}"}
+        request_headers.update(prepared.headers)
+        if body is not None:
+            request_headers["Content-Length"] = str(len(body))
+        head = f"{method} {prepared.target} HTTP/1.1\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in request_headers.items()
+        )
+        payload = head.encode("latin-1") + b"\r\n" + (body or b"")
+
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve(host)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        host_pool = self._host_pool(key)
+        async with self._global_slots, host_pool.slots:
+            for attempt in range(2):
+                connection, reused = await asyncio.wait_for(self._checkout(key, host_pool), timeout)
+                reader, writer = connection
+                try:
+                    writer.write(payload)
+                    await writer.drain()
+                    response, reusable = await asyncio.wait_for(
+                        _read_response(reader, method, url), timeout
+                    )
+                except _STALE_CONNECTION_ERRORS:
+                    await _close_writer(writer)
+                    if reused and attempt == 0:
+                        host_pool.stats.stale_retries += 1
+                        continue
+                    raise
+                except BaseException:
+                    await _close_writer(writer)
+                    raise
+
+                host_pool.stats.requests += 1
+                if reused:
+                    host_pool.stats.reuses += 1
+                else:
+                    host_pool.stats.handshakes += 1
+                await self._checkin(host_pool, connection, reusable)
+                _record_rate_outcome(self.rate_limiter, host, response.status, response.headers)
+                return response
+            raise HttpClientError(f"request failed: {url}")  # pragma: no cover
+
+
+async def _close_writer(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (OSError, ssl.SSLError):
+        pass
+
+
+async def _read_head(reader: asyncio.StreamReader) -> tuple[int, str, Message]:
+    while True:
+        status_line = await reader.readline()
+        if not status_line:
+            raise http.client.RemoteDisconnected("connection closed before response")
+        try:
+            _version, status_text, *reason = status_line.decode("latin-1").strip().split(" ", 2)
+            status = int(status_text)
+        except ValueError as exc:
+            raise http.client.BadStatusLine(status_line.decode("latin-1", "replace")) from exc
+        header_lines: list[bytes] = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            header_lines.append(line)
+        headers = email.parser.Parser(_class=http.client.HTTPMessage).parsestr(
+            b"".join(header_lines).decode("iso-8859-1")
+        )
+        if status != 100:  # skip interim "100 Continue"
+            return status, reason[0] if reason else "", headers
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks: list[bytes] = []
+    while True:
+        size_line = await reader.readline()
+        try:
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+        except ValueError as exc:
+            raise HttpClientError("invalid chunked encoding") from exc
+        if size == 0:
+            # Consume optional trailers up to the terminating blank line.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+async def _read_response(
+    reader: asyncio.StreamReader, method: str, url: str
+) -> tuple[HttpResponse, bool]:
+    status, reason, headers = await _read_head(reader)
+    connection_header = (headers.get("Connection") or "").lower()
+    reusable = "close" not in connection_header
+
+    try:
+        if method == "HEAD" or status in _NO_BODY_STATUSES or 100 <= status < 200:
+            raw_body = b""
+        elif "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+            raw_body = await _read_chunked(reader)
+        elif headers.get("Content-Length") is not None:
+            raw_body = await reader.readexactly(int(headers["Content-Length"]))
+        else:
+            raw_body = await reader.read()
+            reusable = False
+    except asyncio.IncompleteReadError as exc:
+        raise http.client.IncompleteRead(exc.partial, exc.expected) from None
+
+    response = HttpResponse(
+        url=url,
+        status=status,
+        reason=reason,
+        headers=headers,
+        body=_decode_body(raw_body, headers.get("Content-Encoding")),
+    )
+    return response, reusable
+
+
+_default_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncConnectionPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def default_async_connection_pool() -> AsyncConnectionPool:
+    """Return the pool shared by every :class:`AsyncJsonClient` on the running loop."""
+    loop = asyncio.get_running_loop()
+    pool = _default_pools.get(loop)
+    if pool is None:
+        pool = AsyncConnectionPool(rate_limiter=default_rate_limiter())
+        _default_pools[loop] = pool
+    return pool
+
+
+@dataclass
+class AsyncJsonClient:
+    """Coroutine counterpart of :class:`~digital_oracle.http.UrllibJsonClient`."""
+
+    timeout_seconds: float = 20.0
+    retry_attempts: int = 3
+    retry_delay_seconds: float = 1.0
+    headers: Mapping[str, str] = field(
+        default_factory=lambda: {
+            "Accept": "application/json,text/csv,text/plain,application/xml",
+            "User-Agent": "digital-oracle/0.1",
+        }
+    )
+    pool: AsyncConnectionPool | None = field(default=None, repr=False)
+    max_retry_after_seconds: float = 60.0
+
+    async def get_json(self, url: str, *, params: Mapping[str, object] | None = None) -> Any:
+        request_url = _build_url(url, params)
+        response = await self._open(request_url)
+        with default_telemetry().span("parse", urlsplit(request_url).hostname or "") as parse_span:
+            parse_span.bytes = len(response.body)
+            try:
+                return json.loads(response.body)
+            except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+                raise HttpClientError(f"invalid json payload: {request_url}") from exc
+
+    async def get_text(self, url: str, *, params: Mapping[str, object] | None = None) -> str:
+        request_url = _build_url(url, params)
+        response = await self._open(request_url)
+        try:
+            return response.text()
+        except (LookupError, UnicodeDecodeError) as exc:
+            raise HttpClientError(f"invalid text payload: {request_url}") from exc
+
+    async def _open(self, request_url: str) -> HttpResponse:
+        with default_telemetry().span("http", urlsplit(request_url).hostname or "") as http_span:
+            response = await self._open_with_retries(request_url, http_span)
+            http_span.status = response.status
+            http_span.bytes = len(response.body)
+            return response
+
+    async def _open_with_retries(self, request_url: str, http_span: Span) -> HttpResponse:
+        pool = self.pool or default_async_connection_pool()
+        last_error: Exception | None = None
+        for attempt in range(1, self.retry_attempts + 1):
+            http_span.retries = attempt - 1
+            try:
+                response = await pool.request(
+                    "GET", request_url, headers=dict(self.headers), timeout=self.timeout_seconds
+                )
+            except HttpClientError:
+                raise
+            except (OSError, asyncio.TimeoutError, http.client.HTTPException) as exc:
+                last_error = exc
+                if attempt >= self.retry_attempts:
+                    break
+                await asyncio.sleep(backoff_delay(attempt, base=self.retry_delay_seconds))
+                continue
+            delay = _throttle_retry_delay(
+                response, attempt, self.retry_attempts, self.retry_delay_seconds, self.max_retry_after_seconds
+            )
+            if delay is not None:
+                await asyncio.sleep(delay)
+                continue
+            if response.status >= 400:
+                http_span.status = response.status
+                raise HttpStatusError(
+                    f"request failed: {request_url}",
+                    status=response.status,
+                    headers=response.headers,
+                )
+            return response
+        raise HttpClientError(f"request failed: {request_url}") from last_error
+
+
+class _LoopThread:
+    """A daemon thread running one event loop for :class:`BlockingJsonClient`."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="digital-oracle-async-http", daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Run *coro* on the loop in a copy of the caller's context.
+
+        ``run_coroutine_threadsafe`` would use the loop thread's own context,
+        so spans recorded by the coroutine would miss the caller's telemetry
+        traces.
+        """
+        done: concurrent.futures.Future[T] = concurrent.futures.Future()
+
+        def start() -> None:
+            task = self.loop.create_task(coro)  # type: ignore[arg-type]
+
+            def finish(task: asyncio.Task[T]) -> None:
+                if task.cancelled():
+                    done.cancel()
+                elif task.exception() is not None:
+                    done.set_exception(task.exception())  # type: ignore[arg-type]
+                else:
+                    done.set_result(task.result())
+
+            task.add_done_callback(finish)
+
+        self.loop.call_soon_threadsafe(start, context=contextvars.copy_context())
+        return done.result()
+
+
+_shared_loop: _LoopThread | None = None
+_shared_loop_lock = threading.Lock()
+
+
+def _shared_loop_thread() -> _LoopThread:
+    global _shared_loop  # noqa: PLW0603
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = _LoopThread()
+        return _shared_loop
+
+
+class BlockingJsonClient:
+    """Blocking ``JsonHttpClient`` / ``TextHttpClient`` backed by :class:`AsyncJsonClient`.
+
+    Lets unmodified sync providers (typically run under ``gather`` or
+    ``agather`` worker threads) share one background event loop, and with it
+    the async pool's global and per-host limits.
+    """
+
+    def __init__(self, client: AsyncJsonClient | None = None) -> None:
+        self.client = client or AsyncJsonClient()
+        self._loop = _shared_loop_thread()
+
+    def get_json(self, url: str, *, params: Mapping[str, object] | None = None) -> Any:
+        return self._loop.run(self.client.get_json(url, params=params))
+
+    def get_text(self, url: str, *, params: Mapping[str, object] | None = None) -> str:
+        return self._loop.run(self.client.get_text(url, params=params))
@@ -0,0 +1,311 @@
+"""On-disk columnar OHLCV store for incremental price-history fetches.
+
+``YahooPriceProvider`` re-downloaded the whole ``period`` window on every
+call even though only the newest bar or two can change.  :class:`BarStore`
+keeps one binary file per ``(symbol, interval)`` holding the bars as packed
+columns (``array("i")`` date ordinals plus ``array("d")`` OHLCV, NaN for a
+missing volume), so the provider only asks upstream for the bars after the
+last stored date and merges them in.
+
+File layout (native byte order, it is a local cache)::
+
+    magic  b"DOBARS1\\0"
+    header count:uint32  fetched_at:float64  covered_from:int32
+    dates[count]:int32  open/high/low/close/volume[count]:float64
+
+``covered_from`` is the earliest date ordinal the file is known to be
+complete from (``1`` after a ``period="max"`` download), which lets the
+provider tell "the symbol did not trade yet" apart from "never fetched".
+
+Writes go through a temporary file and ``os.replace`` so concurrent worker
+processes never observe a half-written store.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import re
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+from .providers.prices import PriceBar
+
+__all__ = [
+    "BarColumns",
+    "BarStore",
+    "StoredBars",
+]
+
+_MAGIC = b"DOBARS1\0"
+_HEADER = struct.Struct("=Idi")
+_FIELDS = ("open", "high", "low", "close", "volume")
+_FRAME_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _date_ordinal(value: Any) -> int:
+    if isinstance(value, date):
+        return value.toordinal()
+    if hasattr(value, "strftime"):  # pandas.Timestamp and friends
+        return date.fromisoformat(value.strftime("%Y-%m-%d")).toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+def _as_float(value: Any) -> float | None:
+    if value is None:
+        return None
+    number = float(value)
+    return None if math.isnan(number) else number
+
+
+class BarColumns:
+    """Ascending, de-duplicated OHLCV bars stored column-wise."""
+
+    __slots__ = ("dates", "open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        dates: array | None = None,
+        open: array | None = None,  # noqa: A002 - mirrors PriceBar.open
+        high: array | None = None,
+        low: array | None = None,
+        close: array | None = None,
+        volume: array | None = None,
+    ) -> None:
+        self.dates = dates if dates is not None else array("i")
+        self.open = open if open is not None else array("d")
+        self.high = high if high is not None else array("d")
+        self.low = low if low is not None else array("d")
+        self.close = close if close is not None else array("d")
+        self.volume = volume if volume is not None else array("d")
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "BarColumns":
+        """Build columns from fetcher rows (``Date``/``Open``/…/``Volume`` keys).
+
+        Rows missing any of open/high/low/close are dropped; a later row for
+        the same date replaces an earlier one.
+        """
+        by_date: dict[int, tuple[float, float, float, float, float]] = {}
+        for row in rows:
+            raw_date = row.get("Date")
+            if raw_date is None:
+                continue
+            prices = (
+                _as_float(row.get("Open")),
+                _as_float(row.get("High")),
+                _as_float(row.get("Low")),
+                _as_float(row.get("Close")),
+            )
+            if any(value is None for value in prices):
+                continue
+            volume = _as_float(row.get("Volume"))
+            by_date[_date_ordinal(raw_date)] = (*prices, math.nan if volume is None else volume)  # type: ignore[misc]
+
+        ordered = sorted(by_date)
+        columns = cls(dates=array("i", ordered))
+        for index, name in enumerate(_FIELDS):
+            setattr(columns, name, array("d", [by_date[key][index] for key in ordered]))
+        return columns
+
+    @classmethod
+    def from_frame(cls, frame: Any) -> "BarColumns":
+        """Build columns from a yfinance history ``DataFrame`` without a per-row loop.
+
+        Same rules as :meth:`from_rows`.  Dates are the exchange-local
+        calendar dates of the (possibly tz-aware) ``DatetimeIndex``.
+        """
+        import numpy as np
+
+        if frame.empty:
+            return cls()
+        selected = frame.reindex(columns=_FRAME_COLUMNS)
+        complete = selected[_FRAME_COLUMNS[:4]].notna().all(axis=1).to_numpy()
+        values = selected.to_numpy(dtype="float64")[complete]
+        index = frame.index
+        if getattr(index, "tz", None) is not None:
+            index = index.tz_localize(None)
+        ordinals = index.to_numpy().astype("datetime64[D]").astype("int64")[complete] + _EPOCH_ORDINAL
+        if not len(ordinals):
+            return cls()
+
+        # Stable sort keeps duplicate dates in row order; keep the last of each run.
+        order = np.argsort(ordinals, kind="stable")
+        ordinals, values = ordinals[order], values[order]
+        last = np.append(ordinals[1:] != ordinals[:-1], True)
+        ordinals, values = ordinals[last], values[last]
+
+        columns = cls(dates=array("i", ordinals.astype(np.intc).tobytes()))
+        for position, name in enumerate(_FIELDS):
+            setattr(columns, name, array("d", values[:, position].tobytes()))
+        return columns
+
+    @property
+    def first_ordinal(self) -> int | None:
+        return self.dates[0] if self.dates else None
+
+    @property
+    def last_ordinal(self) -> int | None:
+        return self.dates[-1] if self.dates else None
+
+    def _take(self, start: int, stop: int) -> "BarColumns":
+        return BarColumns(*(getattr(self, name)[start:stop] for name in ("dates", *_FIELDS)))
+
+    def merge(self, newer: "BarColumns") -> "BarColumns":
+        """Replace every stored bar from ``newer``'s first date onward with ``newer``."""
+        if not newer.dates:
+            return self
+        cut = bisect_left(self.dates, newer.dates[0])
+        head = self._take(0, cut)
+        return BarColumns(
+            *(getattr(head, name) + getattr(newer, name) for name in ("dates", *_FIELDS))
+        )
+
+    def window(
+        self,
+        *,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        limit: int | None = None,
+    ) -> "BarColumns":
+        """Bars within ``[start_date, end_date]``, keeping only the last *limit*."""
+        start = bisect_left(self.dates, _date_ordinal(start_date)) if start_date else 0
+        stop = bisect_right(self.dates, _date_ordinal(end_date)) if end_date else len(self.dates)
+        if limit is not None and limit > 0:
+            start = max(start, stop - limit)
+        return self._take(start, max(start, stop))
+
+    def to_bars(self) -> tuple[PriceBar, ...]:
+        fromordinal = date.fromordinal
+        return tuple(
+            PriceBar(
+                date=fromordinal(ordinal).isoformat(),
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                volume=None if math.isnan(v) else v,
+            )
+            for ordinal, o, h, l, c, v in zip(  # noqa: E741
+                self.dates, self.open, self.high, self.low, self.close, self.volume
+            )
+        )
+
+
+@dataclass
+class StoredBars:
+    """Contents of one store file plus its bookkeeping."""
+
+    columns: BarColumns
+    fetched_at: float = 0.0
+    covered_from: int | None = None
+
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class BarStore:
+    """Directory of per-``(symbol, interval)`` columnar bar files."""
+
+    def __init__(self, root: str | Path, *, clock: Callable[[], float] = time.time) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._locks: dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def path_for(self, symbol: str, interval: str) -> Path:
+        # Yahoo symbols contain "=", "^" and "/"; keep the name readable but
+        # collision-free by appending a short digest of the exact key.
+        digest = hashlib.sha1(f"{symbol}\0{interval}".encode("utf-8")).hexdigest()[:8]
+        readable = _SAFE_NAME.sub("_", symbol).strip("_") or "symbol"
+        return self.root / f"{readable}.{interval}.{digest}.bars"
+
+    def lock_for(self, symbol: str, interval: str) -> threading.Lock:
+        """Per-file lock so one process does not delta-fetch the same series twice."""
+        path = self.path_for(symbol, interval)
+        with self._locks_guard:
+            lock = self._locks.get(path)
+            if lock is None:
+                lock = self._locks[path] = threading.Lock()
+        return lock
+
+    def today_ordinal(self) -> int:
+        return date.fromtimestamp(self._clock()).toordinal()
+
+    def age_seconds(self, stored: StoredBars) -> float:
+        return self._clock() - stored.fetched_at
+
+    def load(self, symbol: str, interval: str) -> StoredBars:
+        """Read the stored series; a missing or unreadable file yields an empty one."""
+        try:
+            blob = self.path_for(symbol, interval).read_bytes()
+        except OSError:
+            return StoredBars(BarColumns())
+        try:
+            return self._decode(blob)
+        except (ValueError, struct.error, EOFError):
+            return StoredBars(BarColumns())
+
+    def save(
+        self,
+        symbol: str,
+        interval: str,
+        columns: BarColumns,
+        *,
+        covered_from: int | None,
+        fetched_at: float | None = None,
+    ) -> None:
+        path = self.path_for(symbol, interval)
+        header = _HEADER.pack(
+            len(columns),
+            self._clock() if fetched_at is None else fetched_at,
+            0 if covered_from is None else covered_from,
+        )
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as handle:
+            handle.write(_MAGIC)
+            handle.write(header)
+            for name in ("dates", *_FIELDS):
+                getattr(columns, name).tofile(handle)
+        os.replace(tmp, path)
+
+    def clear(self) -> None:
+        for path in self.root.glob("*.bars"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _decode(blob: bytes) -> StoredBars:
+        if not blob.startswith(_MAGIC):
+            raise ValueError("not a bar store file")
+        offset = len(_MAGIC)
+        count, fetched_at, covered_from = _HEADER.unpack_from(blob, offset)
+        offset += _HEADER.size
+        columns = BarColumns()
+        for name in ("dates", *_FIELDS):
+            column = getattr(columns, name)
+            size = count * column.itemsize
+            if offset + size > len(blob):
+                raise EOFError("truncated bar store file")
+            column.frombytes(blob[offset : offset + size])
+            offset += size
+        return StoredBars(
+            columns=columns,
+            fetched_at=fetched_at,
+            covered_from=covered_from or None,
+        )
@@ -0,0 +1,399 @@
+"""On-disk TTL response cache for provider HTTP clients and price fetchers.
+
+Every tool call of the VCP plugin runs in a fresh process, so an in-memory
+cache would be useless.  :class:`ResponseCache` keeps decoded payloads in a
+single SQLite file keyed by ``snapshots._request_key`` and shares it across
+processes (WAL mode, short busy timeout).
+
+Freshness is decided per provider via :data:`DEFAULT_CACHE_POLICIES`:
+
+* ``age < ttl`` – served from disk, no upstream call.
+* ``ttl <= age < ttl + stale_while_revalidate`` – the stale payload is served
+  immediately and a background thread refreshes the entry.  With
+  ``background_revalidate=False`` (short-lived one-shot processes, which
+  would otherwise have to wait for that thread before exiting) the entry is
+  refetched synchronously instead.
+* older – fetched synchronously and stored.
+
+The store is capped at ``max_bytes``; least-recently-accessed entries are
+evicted first.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+from .barstore import _FIELDS, BarColumns
+from .http import JsonHttpClient, TextHttpClient
+from .snapshots import _request_key
+from .telemetry import default_telemetry
+
+__all__ = [
+    "CachePolicy",
+    "CachingHttpClient",
+    "CachingPriceFetcher",
+    "DEFAULT_CACHE_POLICIES",
+    "ResponseCache",
+]
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Freshness window for one provider, in seconds."""
+
+    ttl_seconds: float
+    stale_while_revalidate_seconds: float = 0.0
+
+
+_MINUTE = 60.0
+_HOUR = 3600.0
+
+DEFAULT_CACHE_POLICIES: dict[str, CachePolicy] = {
+    "deribit": CachePolicy(15.0, 45.0),
+    "polymarket": CachePolicy(1 * _MINUTE, 4 * _MINUTE),
+    "kalshi": CachePolicy(1 * _MINUTE, 4 * _MINUTE),
+    "coingecko": CachePolicy(1 * _MINUTE, 4 * _MINUTE),
+    "yahoo": CachePolicy(5 * _MINUTE, 25 * _MINUTE),
+    "fear_greed": CachePolicy(10 * _MINUTE, 50 * _MINUTE),
+    "cme_fedwatch": CachePolicy(10 * _MINUTE, 50 * _MINUTE),
+    "us_treasury": CachePolicy(1 * _HOUR, 5 * _HOUR),
+    "cftc_cot": CachePolicy(6 * _HOUR, 18 * _HOUR),
+    "sec_edgar": CachePolicy(1 * _HOUR, 5 * _HOUR),
+    "bis": CachePolicy(6 * _HOUR, 18 * _HOUR),
+    "worldbank": CachePolicy(12 * _HOUR, 36 * _HOUR),
+    # WebSearchProvider: parsed DDG results and extracted page text.
+    "web_search": CachePolicy(10 * _MINUTE, 20 * _MINUTE),
+    "web_page": CachePolicy(30 * _MINUTE, 0.0),
+}
+
+_FALLBACK_POLICY = CachePolicy(1 * _MINUTE, 0.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+def _json_default(value: object) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):  # numpy / pandas scalars
+        return value.item()
+    return str(value)
+
+
+class ResponseCache:
+    """SQLite-backed payload store shared by :class:`CachingHttpClient` wrappers."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        policies: Mapping[str, CachePolicy] | None = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        background_revalidate: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.policies = dict(DEFAULT_CACHE_POLICIES if policies is None else policies)
+        self.max_bytes = max_bytes
+        self.background_revalidate = background_revalidate
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._revalidating: dict[str, threading.Thread] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    # -- wiring ------------------------------------------------------------
+
+    def policy_for(self, namespace: str) -> CachePolicy:
+        return self.policies.get(namespace, _FALLBACK_POLICY)
+
+    def wrap(self, client: Any, *, namespace: str, refresh: bool = False) -> "CachingHttpClient":
+        """Wrap a ``JsonHttpClient`` / ``TextHttpClient`` for *namespace*."""
+        return CachingHttpClient(client, cache=self, namespace=namespace, refresh=refresh)
+
+    def attach(self, provider: Any, *, refresh: bool = False) -> Any:
+        """Route *provider*'s HTTP client (or price fetcher) through the cache.
+
+        Providers that keep derived data themselves (a ``cache`` attribute
+        left at ``None``) are handed the store as well.  Providers without a
+        cacheable transport are returned unchanged.
+        """
+        namespace = str(getattr(provider, "provider_id", "") or type(provider).__name__)
+        if hasattr(provider, "cache") and provider.cache is None:
+            provider.cache = self
+            provider.refresh = refresh
+        client = getattr(provider, "http_client", None)
+        if client is not None and (hasattr(client, "get_json") or hasattr(client, "get_text")):
+            if not isinstance(client, CachingHttpClient):
+                provider.http_client = self.wrap(client, namespace=namespace, refresh=refresh)
+            return provider
+        fetcher = getattr(provider, "_fetcher", None)
+        if fetcher is not None and hasattr(fetcher, "fetch_history"):
+            if not isinstance(fetcher, CachingPriceFetcher):
+                provider._fetcher = CachingPriceFetcher(
+                    fetcher, cache=self, namespace=namespace, refresh=refresh
+                )
+        return provider
+
+    # -- core --------------------------------------------------------------
+
+    def fetch(
+        self,
+        key: str,
+        *,
+        namespace: str,
+        loader: Callable[[], Any],
+        refresh: bool = False,
+    ) -> Any:
+        """Return the cached payload for *key*, calling *loader* when needed."""
+        policy = self.policy_for(namespace)
+        with default_telemetry().span("cache", namespace) as cache_span:
+            if not refresh and policy.ttl_seconds > 0:
+                entry = self._read(key)
+                if entry is not None:
+                    payload, stored_at = entry
+                    age = self._clock() - stored_at
+                    if age < policy.ttl_seconds:
+                        self.hits += 1
+                        cache_span.cache_hit = True
+                        return payload
+                    if self.background_revalidate and age < policy.ttl_seconds + policy.stale_while_revalidate_seconds:
+                        self.stale_hits += 1
+                        cache_span.cache_hit = True
+                        self._revalidate(key, namespace, loader)
+                        return payload
+            self.misses += 1
+            cache_span.cache_hit = False
+            payload = loader()
+            self._write(key, namespace, payload)
+            return payload
+
+    def get(self, key: str) -> Any | None:
+        """Payload stored under *key*, ignoring the freshness policies.
+
+        For callers that track their own expiry (see :meth:`put`).
+        """
+        entry = self._read(key)
+        return None if entry is None else entry[0]
+
+    def put(self, key: str, *, namespace: str, payload: Any) -> None:
+        """Store *payload* under *key*; it is evicted like any other entry."""
+        self._write(key, namespace, payload)
+
+    def drain(self, timeout_seconds: float = 5.0) -> None:
+        """Wait (bounded) for background revalidations to finish."""
+        deadline = time.monotonic() + timeout_seconds
+        with self._lock:
+            threads = list(self._revalidating.values())
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "entries": int(count),
+            "bytes": int(total),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        self.drain()
+        with self._lock:
+            self._conn.close()
+
+    # -- internal ----------------------------------------------------------
+
+    def _read(self, key: str) -> tuple[Any, float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (self._clock(), key)
+            )
+            self._conn.commit()
+        blob, stored_at = row
+        try:
+            return json.loads(zlib.decompress(blob)), float(stored_at)
+        except (zlib.error, ValueError):
+            return None
+
+    def _write(self, key: str, namespace: str, payload: Any) -> None:
+        blob = zlib.compress(
+            json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+        )
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, namespace, payload, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, namespace, blob, len(blob), now, now),
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        excess = int(total) - self.max_bytes
+        if excess <= 0:
+            return
+        doomed: list[str] = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC"):
+            doomed.append(key)
+            excess -= int(size)
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in doomed])
+
+    def _revalidate(self, key: str, namespace: str, loader: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._revalidating:
+                return
+
+            def run() -> None:
+                try:
+                    self._write(key, namespace, loader())
+                except Exception:
+                    pass  # keep serving the stale copy; the next miss retries
+                finally:
+                    with self._lock:
+                        self._revalidating.pop(key, None)
+
+            thread = threading.Thread(target=run, name=f"cache-revalidate-{namespace}", daemon=True)
+            self._revalidating[key] = thread
+        thread.start()
+
+
+class CachingHttpClient:
+    """``JsonHttpClient`` / ``TextHttpClient`` that consults a :class:`ResponseCache`."""
+
+    def __init__(
+        self,
+        client: JsonHttpClient | TextHttpClient,
+        *,
+        cache: ResponseCache,
+        namespace: str,
+        refresh: bool = False,
+    ) -> None:
+        self.client = client
+        self.cache = cache
+        self.namespace = namespace
+        self.refresh = refresh
+
+    def get_json(self, url: str, *, params: Mapping[str, object] | None = None) -> Any:
+        return self.cache.fetch(
+            _request_key("json", url, params),
+            namespace=self.namespace,
+            loader=lambda: self.client.get_json(url, params=params),  # type: ignore[union-attr]
+            refresh=self.refresh,
+        )
+
+    def get_text(self, url: str, *, params: Mapping[str, object] | None = None) -> str:
+        return self.cache.fetch(
+            _request_key("text", url, params),
+            namespace=self.namespace,
+            loader=lambda: self.client.get_text(url, params=params),  # type: ignore[union-attr]
+            refresh=self.refresh,
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        # Provider-specific helpers on the wrapped client stay reachable.
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+
+class CachingPriceFetcher:
+    """``PriceFetcher`` wrapper that caches ``fetch_history`` rows on disk.
+
+    Row dates are stored as ISO strings; ``YahooPriceProvider`` already
+    accepts string dates by slicing the first ten characters.
+    ``fetch_columns`` results are stored as plain column lists.
+    """
+
+    def __init__(
+        self,
+        fetcher: Any,
+        *,
+        cache: ResponseCache,
+        namespace: str,
+        refresh: bool = False,
+    ) -> None:
+        self.fetcher = fetcher
+        self.cache = cache
+        self.namespace = namespace
+        self.refresh = refresh
+
+    def fetch_history(self, symbol: str, *, period: str, interval: str) -> list[dict[str, Any]]:
+        def load() -> list[dict[str, Any]]:
+            rows = self.fetcher.fetch_history(symbol, period=period, interval=interval)
+            # Round-trip through JSON so fresh and cached calls return the same shapes.
+            return json.loads(json.dumps(rows, default=_json_default))
+
+        return self.cache.fetch(
+            _request_key("price_history", symbol, {"period": period, "interval": interval}),
+            namespace=self.namespace,
+            loader=load,
+            refresh=self.refresh,
+        )
+
+    def fetch_columns(self, symbol: str, *, period: str, interval: str) -> BarColumns:
+        fetch_columns = getattr(self.fetcher, "fetch_columns", None)
+        if fetch_columns is None:
+            return BarColumns.from_rows(self.fetch_history(symbol, period=period, interval=interval))
+
+        def load() -> dict[str, list[Any]]:
+            columns = fetch_columns(symbol, period=period, interval=interval)
+            return {name: getattr(columns, name).tolist() for name in ("dates", *_FIELDS)}
+
+        payload = self.cache.fetch(
+            _request_key("price_columns", symbol, {"period": period, "interval": interval}),
+            namespace=self.namespace,
+            loader=load,
+            refresh=self.refresh,
+        )
+        return BarColumns(
+            array("i", payload["dates"]),
+            *(array("d", payload[name]) for name in _FIELDS),
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "fetcher":
+            raise AttributeError(name)
+        return getattr(self.fetcher, name)
@@ -0,0 +1,399 @@
+"""Local full-text catalog of Polymarket events and Kalshi markets.
+
+``PolymarketProvider.list_events`` can only guess a ``tag_slug`` and filter
+one page client-side, so a topic that is not a tag needs many calls or is
+missed entirely.  :class:`MarketCatalog` keeps the titles of every active
+event/market in a SQLite file with an FTS5 index, so keyword lookups run
+offline in milliseconds; only the matched markets then need a live fetch
+for prices or order books.
+
+Refreshes are incremental: a full listing is streamed page by page (with
+prefetch), rows whose title/body digest is unchanged are only touched, and
+rows that disappeared from a *complete* listing (closed or delisted) are
+removed.  ``refresh_*(max_age_seconds=...)`` skips sources refreshed
+recently.
+
+Search tries, in order: every term as a prefix (``AND``), any term
+(``OR``, bm25-ranked with titles weighted higher), and finally terms
+corrected against the index vocabulary with :mod:`difflib` for typos.
+Builds of SQLite without FTS5 fall back to ``LIKE`` matching.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from .providers.kalshi import KalshiMarketQuery
+from .providers.polymarket import PolymarketEventQuery
+
+__all__ = [
+    "CatalogEntry",
+    "CatalogHit",
+    "CatalogRefresh",
+    "MarketCatalog",
+    "kalshi_entries",
+    "polymarket_entries",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    group_key TEXT,
+    digest TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    UNIQUE (source, key)
+);
+CREATE TABLE IF NOT EXISTS refresh_state (
+    source TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL,
+    entries INTEGER NOT NULL
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    title, body, prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_vocab USING fts5vocab(entries_fts, 'row');
+"""
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """One searchable document: a Polymarket event or a Kalshi market."""
+
+    source: str
+    key: str  # Polymarket event slug / Kalshi market ticker
+    title: str
+    body: str = ""
+    group_key: str | None = None  # Polymarket event id / Kalshi event ticker
+
+
+@dataclass(frozen=True)
+class CatalogHit:
+    source: str
+    key: str
+    title: str
+    group_key: str | None
+    score: float
+
+
+@dataclass(frozen=True)
+class CatalogRefresh:
+    source: str
+    added: int
+    updated: int
+    unchanged: int
+    removed: int
+    seconds: float
+
+
+def _digest(entry: CatalogEntry) -> str:
+    text = "\0".join((entry.title, entry.body, entry.group_key or ""))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _terms(text: str) -> list[str]:
+    return [token.lower() for token in _TOKEN.findall(text)]
+
+
+def polymarket_entries(provider: Any, *, max_pages: int | None = None) -> Iterator[CatalogEntry]:
+    """Every active Polymarket event, titled by the event and indexed by its market questions."""
+    query = PolymarketEventQuery(active=True, closed=False)
+    for event in provider.iter_events(query, page_size=100, max_pages=max_pages):
+        if not event.slug:
+            continue
+        questions = " ".join(market.question for market in event.markets if market.question)
+        yield CatalogEntry(
+            source="polymarket",
+            key=event.slug,
+            title=event.title,
+            body=f"{event.slug.replace('-', ' ')} {questions}".strip(),
+            group_key=event.id,
+        )
+
+
+def kalshi_entries(provider: Any, *, max_pages: int | None = None) -> Iterator[CatalogEntry]:
+    """Every open Kalshi market, indexed by title, subtitles and tickers."""
+    for market in provider.iter_markets(KalshiMarketQuery(status="open"), page_size=1000, max_pages=max_pages):
+        if not market.ticker:
+            continue
+        extra = (market.subtitle, market.yes_sub_title, market.event_ticker, market.ticker)
+        yield CatalogEntry(
+            source="kalshi",
+            key=market.ticker,
+            title=market.title,
+            body=" ".join(part for part in extra if part),
+            group_key=market.event_ticker or None,
+        )
+
+
+class MarketCatalog:
+    """SQLite catalog with an FTS5 index over event/market titles."""
+
+    def __init__(self, path: str | Path, *, clock: Callable[[], float] = time.time) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE.
+            self.fts_enabled = False
+        self._conn.commit()
+
+    # -- refresh -----------------------------------------------------------
+
+    def age_seconds(self, source: str) -> float | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT refreshed_at FROM refresh_state WHERE source = ?", (source,)
+            ).fetchone()
+        return None if row is None else self._clock() - float(row[0])
+
+    def refresh_polymarket(
+        self,
+        provider: Any,
+        *,
+        max_age_seconds: float = 0.0,
+        max_pages: int | None = None,
+    ) -> CatalogRefresh | None:
+        """Re-list active Polymarket events unless refreshed within *max_age_seconds*."""
+        age = self.age_seconds("polymarket")
+        if age is not None and age < max_age_seconds:
+            return None
+        return self.refresh_source(
+            "polymarket",
+            polymarket_entries(provider, max_pages=max_pages),
+            complete=max_pages is None,
+        )
+
+    def refresh_kalshi(
+        self,
+        provider: Any,
+        *,
+        max_age_seconds: float = 0.0,
+        max_pages: int | None = None,
+    ) -> CatalogRefresh | None:
+        """Re-list open Kalshi markets unless refreshed within *max_age_seconds*."""
+        age = self.age_seconds("kalshi")
+        if age is not None and age < max_age_seconds:
+            return None
+        return self.refresh_source(
+            "kalshi",
+            kalshi_entries(provider, max_pages=max_pages),
+            complete=max_pages is None,
+        )
+
+    def refresh_source(
+        self,
+        source: str,
+        entries: Iterable[CatalogEntry],
+        *,
+        complete: bool = True,
+    ) -> CatalogRefresh:
+        """Merge *entries* into the catalog.
+
+        Unchanged rows (same digest) are only marked as seen.  When
+        *complete* is true and the listing was consumed without error, rows
+        of *source* that were not seen are deleted.
+        """
+        started = self._clock()
+        wall = time.monotonic()
+        added = updated = unchanged = 0
+        seen_ids: list[tuple[float, int]] = []
+        with self._lock:
+            existing = {
+                key: (row_id, digest)
+                for row_id, key, digest in self._conn.execute(
+                    "SELECT id, key, digest FROM entries WHERE source = ?", (source,)
+                )
+            }
+        finished = False
+        try:
+            for entry in entries:
+                digest = _digest(entry)
+                current = existing.get(entry.key)
+                if current is not None and current[1] == digest:
+                    unchanged += 1
+                    seen_ids.append((started, current[0]))
+                    continue
+                with self._lock:
+                    if current is None:
+                        cursor = self._conn.execute(
+                            "INSERT INTO entries (source, key, title, body, group_key, digest, seen_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                            "ON CONFLICT (source, key) DO UPDATE SET title = excluded.title, "
+                            "body = excluded.body, group_key = excluded.group_key, "
+                            "digest = excluded.digest, seen_at = excluded.seen_at",
+                            (source, entry.key, entry.title, entry.body, entry.group_key, digest, started),
+                        )
+                        row_id = cursor.lastrowid
+                        existing[entry.key] = (row_id, digest)
+                        added += 1
+                    else:
+                        row_id = current[0]
+                        self._conn.execute(
+                            "UPDATE entries SET title = ?, body = ?, group_key = ?, digest = ?, seen_at = ? "
+                            "WHERE id = ?",
+                            (entry.title, entry.body, entry.group_key, digest, started, row_id),
+                        )
+                        existing[entry.key] = (row_id, digest)
+                        updated += 1
+                    if self.fts_enabled:
+                        self._conn.execute("DELETE FROM entries_fts WHERE rowid = ?", (row_id,))
+                        self._conn.execute(
+                            "INSERT INTO entries_fts (rowid, title, body) VALUES (?, ?, ?)",
+                            (row_id, entry.title, entry.body),
+                        )
+            finished = True
+        finally:
+            with self._lock:
+                self._conn.executemany("UPDATE entries SET seen_at = ? WHERE id = ?", seen_ids)
+                removed = 0
+                if finished and complete:
+                    doomed = [
+                        row_id
+                        for (row_id,) in self._conn.execute(
+                            "SELECT id FROM entries WHERE source = ? AND seen_at < ?", (source, started)
+                        )
+                    ]
+                    if self.fts_enabled:
+                        self._conn.executemany(
+                            "DELETE FROM entries_fts WHERE rowid = ?", [(row_id,) for row_id in doomed]
+                        )
+                    self._conn.executemany("DELETE FROM entries WHERE id = ?", [(row_id,) for row_id in doomed])
+                    removed = len(doomed)
+                if finished:
+                    (count,) = self._conn.execute(
+                        "SELECT COUNT(*) FROM entries WHERE source = ?", (source,)
+                    ).fetchone()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO refresh_state (source, refreshed_at, entries) VALUES (?, ?, ?)",
+                        (source, started, int(count)),
+                    )
+                self._conn.commit()
+        return CatalogRefresh(
+            source=source,
+            added=added,
+            updated=updated,
+            unchanged=unchanged,
+            removed=removed,
+            seconds=time.monotonic() - wall,
+        )
+
+    # -- search ------------------------------------------------------------
+
+    def search(
+        self,
+        text: str,
+        *,
+        sources: Sequence[str] | None = None,
+        limit: int = 20,
+    ) -> list[CatalogHit]:
+        """Rank catalog entries matching *text* (best first)."""
+        terms = _terms(text)
+        if not terms or limit <= 0:
+            return []
+        if not self.fts_enabled:
+            return self._search_like(terms, sources, limit)
+
+        hits = self._search_fts(" AND ".join(f'"{term}"*' for term in terms), sources, limit)
+        if len(hits) < limit and len(terms) > 1:
+            found = {(hit.source, hit.key) for hit in hits}
+            for hit in self._search_fts(" OR ".join(f'"{term}"*' for term in terms), sources, limit):
+                if (hit.source, hit.key) not in found and len(hits) < limit:
+                    hits.append(hit)
+        if not hits:
+            corrected = self._correct_terms(terms)
+            if corrected and corrected != terms:
+                hits = self._search_fts(" OR ".join(f'"{term}"' for term in corrected), sources, limit)
+        return hits
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, refreshed_at, entries FROM refresh_state ORDER BY source"
+            ).fetchall()
+        now = self._clock()
+        return {
+            source: {"entries": int(count), "age_seconds": round(now - float(refreshed_at), 1)}
+            for source, refreshed_at, count in rows
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -- internal ----------------------------------------------------------
+
+    def _search_fts(self, match: str, sources: Sequence[str] | None, limit: int) -> list[CatalogHit]:
+        sql = (
+            "SELECT e.source, e.key, e.title, e.group_key, bm25(entries_fts, 4.0, 1.0) AS score "
+            "FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid "
+            "WHERE entries_fts MATCH ?"
+        )
+        params: list[Any] = [match]
+        if sources:
+            sql += f" AND e.source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError:
+                return []
+        # bm25() is lower-is-better; flip it so callers see higher-is-better.
+        return [CatalogHit(source, key, title, group_key, -float(score)) for source, key, title, group_key, score in rows]
+
+    def _search_like(self, terms: list[str], sources: Sequence[str] | None, limit: int) -> list[CatalogHit]:
+        clauses = ["(lower(title) LIKE ? OR lower(body) LIKE ?)"] * len(terms)
+        params: list[Any] = []
+        for term in terms:
+            params.extend((f"%{term}%", f"%{term}%"))
+        sql = f"SELECT source, key, title, group_key FROM entries WHERE {' AND '.join(clauses)}"
+        if sources:
+            sql += f" AND source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        sql += " ORDER BY length(title) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [CatalogHit(source, key, title, group_key, 0.0) for source, key, title, group_key in rows]
+
+    def _correct_terms(self, terms: list[str]) -> list[str]:
+        corrected: list[str] = []
+        for term in terms:
+            with self._lock:
+                # Restrict the vocabulary scan to terms sharing the first letter.
+                vocabulary = [
+                    row[0]
+                    for row in self._conn.execute(
+                        "SELECT term FROM entries_vocab WHERE term >= ? AND term < ?",
+                        (term[:1], term[:1] + "￿"),
+                    )
+                ]
+            match = difflib.get_close_matches(term, vocabulary, n=1, cutoff=0.75)
+            corrected.append(match[0] if match else term)
+        return corrected
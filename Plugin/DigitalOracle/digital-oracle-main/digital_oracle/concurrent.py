@@ -2,26 +2,42 @@
 
 Uses ``concurrent.futures.ThreadPoolExecutor`` (stdlib) so that existing
 synchronous providers can be called in parallel without any code changes.
+:func:`agather` is the asyncio counterpart: coroutine tasks (e.g. built on
+``digital_oracle.async_http.AsyncJsonClient``) share one event loop, and
+plain callables are adapted onto a bounded worker pool.
 
 Thread-safety notes
 -------------------
-* ``UrllibJsonClient`` creates a fresh connection per request – no shared
-  socket state, safe across threads.
+* ``UrllibJsonClient`` checks a keep-alive connection out of the shared
+  ``ConnectionPool`` for the duration of one request – a socket is never
+  used by two threads at once, safe across threads.
 * ``RecordingHttpClient`` writes each snapshot to a unique file (keyed by
-  URL + params SHA-1 hash), so concurrent writes never collide.
-* ``ReplayHttpClient`` loads all snapshots into a ``dict`` at init and only
-  reads afterwards – concurrent dict reads are safe in CPython.
+  URL + params SHA-1 hash) via write-then-rename, or appends one record per
+  ``os.write`` to a ``SnapshotArchive``, so concurrent writes never collide.
+* ``ReplayHttpClient`` only reads after construction; archive reads share
+  one file handle under a lock, directory reads open the file per request.
 """
 
 from __future__ import annotations
 
+import asyncio
 import concurrent.futures
+import contextvars
+import inspect
+import time
 from dataclasses import dataclass, field
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Generic, Iterable, Iterator, Mapping, TypeVar
+
+from .telemetry import default_telemetry
 
 T = TypeVar("T")
+C = TypeVar("C")
+
+__all__ = ["DependencyError", "GatherError", "GatherResult", "Page", "agather", "gather", "iter_pages"]
 
-__all__ = ["GatherError", "GatherResult", "gather"]
+# Upper bound for gather()'s default pool size, so very large task maps
+# don't get one thread each.
+DEFAULT_MAX_WORKERS = 32
 
 
 class GatherError(RuntimeError):
@@ -38,16 +54,33 @@ class GatherError(RuntimeError):
         self.errors = errors
 
 
+class DependencyError(RuntimeError):
+    """A task was skipped because a task it depends on did not succeed.
+
+    *dependency* is the label of that task and *cause* its error.
+    """
+
+    def __init__(self, label: str, dependency: str, cause: BaseException) -> None:
+        super().__init__(f"task {label!r} skipped: dependency {dependency!r} failed: {cause}")
+        self.label = label
+        self.dependency = dependency
+        self.cause = cause
+
+
 @dataclass(frozen=True)
 class GatherResult:
     """Container for the outcome of a :func:`gather` call.
 
     *results* holds values keyed by the label passed to ``gather()``.
     *errors* holds exceptions for any tasks that failed.
+    *timed_out* holds the labels ``gather`` itself gave up on because of
+    *timeout_seconds* or *task_timeout_seconds*, as opposed to tasks that
+    raised a :class:`TimeoutError` of their own.
     """
 
     results: dict[str, Any] = field(default_factory=dict)
     errors: dict[str, BaseException] = field(default_factory=dict)
+    timed_out: frozenset[str] = frozenset()
 
     @property
     def ok(self) -> bool:
@@ -72,7 +105,9 @@ def gather(
     *,
     max_workers: int | None = None,
     timeout_seconds: float | None = None,
+    task_timeout_seconds: float | None = None,
     fail_fast: bool = False,
+    dependencies: Mapping[str, Iterable[str]] | None = None,
 ) -> GatherResult:
     """Run multiple callables concurrently and collect their results.
 
@@ -81,56 +116,145 @@ def gather(
     tasks:
         Mapping of *label* → *callable*.  Each callable takes no arguments
         and returns a value.  Labels identify results in the returned
-        :class:`GatherResult`.
+        :class:`GatherResult`.  Tasks are submitted in mapping order.
     max_workers:
-        Maximum thread-pool size.  Defaults to ``len(tasks)``.
+        Maximum thread-pool size.  Defaults to ``len(tasks)``, capped at
+        :data:`DEFAULT_MAX_WORKERS`.
     timeout_seconds:
         Wall-clock cap for the entire batch.  ``None`` means no limit.
+    task_timeout_seconds:
+        Wall-clock cap for each task, measured from the moment it starts
+        running (time spent queued behind *max_workers* does not count).
+        ``None`` means no limit.
     fail_fast:
         If ``True``, raise :class:`GatherError` as soon as any task fails.
         If ``False`` (the default), wait for every task and return partial
         results.
+    dependencies:
+        Mapping of *label* → labels that must succeed first.  A dependent is
+        only submitted once all of its dependencies have succeeded, so it
+        neither holds a worker while waiting nor starts its
+        *task_timeout_seconds* clock early.  If a dependency fails or times
+        out, the dependent is skipped with a :class:`DependencyError`.
 
     Returns
     -------
     GatherResult
-        Contains ``.results`` and ``.errors`` dicts keyed by label.
+        Contains ``.results`` and ``.errors`` dicts keyed by label, and the
+        ``.timed_out`` labels.
+
+    Timed-out tasks are reported as :class:`TimeoutError` and abandoned:
+    ``gather`` returns without waiting for their threads to finish.
     """
     if not tasks:
         return GatherResult()
+    waiting = _dependency_graph(tasks, dependencies)
 
-    effective_workers = max_workers if max_workers is not None else len(tasks)
+    effective_workers = (
+        max_workers if max_workers is not None else min(len(tasks), DEFAULT_MAX_WORKERS)
+    )
     results: dict[str, Any] = {}
     errors: dict[str, BaseException] = {}
+    timed_out: set[str] = set()
+    started: dict[str, float] = {}
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=effective_workers) as pool:
-        future_to_label: dict[concurrent.futures.Future[Any], str] = {
-            pool.submit(fn): label for label, fn in tasks.items()
-        }
-
-        done, not_done = concurrent.futures.wait(
-            future_to_label,
-            timeout=timeout_seconds,
-            return_when=(
-                concurrent.futures.FIRST_EXCEPTION
-                if fail_fast
-                else concurrent.futures.ALL_COMPLETED
-            ),
-        )
+    telemetry = default_telemetry()
 
-        for future in done:
-            label = future_to_label[future]
-            try:
-                results[label] = future.result(timeout=0)
-            except BaseException as exc:
-                errors[label] = exc
+    def run(label: str, fn: Callable[[], Any]) -> Any:
+        started[label] = time.monotonic()
+        with telemetry.span("task", label):
+            return fn()
+
+    deadline = time.monotonic() + timeout_seconds if timeout_seconds is not None else None
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=effective_workers)
+    future_to_label: dict[concurrent.futures.Future[Any], str] = {}
+    pending: set[concurrent.futures.Future[Any]] = set()
+
+    def submit(label: str) -> None:
+        # Each task runs in a copy of the caller's context so telemetry
+        # traces opened by the caller also see spans from worker threads.
+        future = pool.submit(contextvars.copy_context().run, run, label, tasks[label])
+        future_to_label[future] = label
+        pending.add(future)
+
+    def settle(finished: list[str], *, launch: bool = True) -> None:
+        """Submit dependents that are now ready; skip those whose dependency failed."""
+        while finished:
+            label = finished.pop(0)
+            for dependent in [name for name in tasks if label in waiting.get(name, ())]:
+                if label in errors:
+                    del waiting[dependent]
+                    errors[dependent] = DependencyError(dependent, label, errors[label])
+                    finished.append(dependent)
+                else:
+                    waiting[dependent].discard(label)
+                    if not waiting[dependent] and launch:
+                        del waiting[dependent]
+                        submit(dependent)
+
+    try:
+        for label in tasks:
+            if label not in waiting:
+                submit(label)
+
+        while pending:
+            wait_for = _next_wakeup(
+                [future_to_label[future] for future in pending],
+                started,
+                deadline,
+                task_timeout_seconds,
+            )
+            done, pending = concurrent.futures.wait(
+                pending,
+                timeout=wait_for,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+
+            finished: list[str] = []
+            for future in done:
+                label = future_to_label[future]
+                finished.append(label)
+                try:
+                    results[label] = future.result(timeout=0)
+                except BaseException as exc:
+                    errors[label] = exc
+
+            if fail_fast and errors:
+                break
+
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                settle(finished, launch=False)
+                break
+            if task_timeout_seconds is not None:
+                for future in list(pending):
+                    label = future_to_label[future]
+                    began = started.get(label)
+                    if began is not None and now - began >= task_timeout_seconds:
+                        pending.discard(future)
+                        finished.append(label)
+                        timed_out.add(label)
+                        errors[label] = TimeoutError(
+                            f"task {label!r} did not complete within {task_timeout_seconds}s"
+                        )
+            settle(finished)
 
-        for future in not_done:
+        for future in pending:
             label = future_to_label[future]
             future.cancel()
+            timed_out.add(label)
             errors[label] = TimeoutError(
                 f"task {label!r} did not complete within {timeout_seconds}s"
             )
+        # Dependents still waiting when the batch stopped never started.
+        for label in [name for name in tasks if name in waiting]:
+            timed_out.add(label)
+            errors[label] = TimeoutError(
+                f"task {label!r} did not complete within {timeout_seconds}s"
+            )
+    finally:
+        # Don't block on abandoned stragglers; queued tasks are dropped.
+        pool.shutdown(wait=False, cancel_futures=True)
 
     if fail_fast and errors:
         first_label = next(iter(errors))
@@ -140,4 +264,235 @@ def gather(
             errors=errors,
         )
 
-    return GatherResult(results=results, errors=errors)
+    return GatherResult(results=results, errors=errors, timed_out=frozenset(timed_out))
+
+
+def _dependency_graph(
+    tasks: Mapping[str, Any],
+    dependencies: Mapping[str, Iterable[str]] | None,
+) -> dict[str, set[str]]:
+    """Unmet dependencies per task label; rejects unknown labels and cycles."""
+    graph: dict[str, set[str]] = {}
+    for label, needs in (dependencies or {}).items():
+        if label not in tasks:
+            raise ValueError(f"dependencies given for unknown task {label!r}")
+        needs = set(needs)
+        unknown = needs - set(tasks)
+        if unknown:
+            raise ValueError(f"task {label!r} depends on unknown tasks {sorted(unknown)!r}")
+        if needs:
+            graph[label] = needs
+
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(label: str) -> None:
+        if label in done:
+            return
+        if label in visiting:
+            raise ValueError(f"dependency cycle through task {label!r}")
+        visiting.add(label)
+        for need in graph.get(label, ()):
+            visit(need)
+        visiting.discard(label)
+        done.add(label)
+
+    for label in graph:
+        visit(label)
+    return graph
+
+
+_POLL_SECONDS = 0.05
+
+
+def _next_wakeup(
+    labels: list[str],
+    started: dict[str, float],
+    deadline: float | None,
+    task_timeout_seconds: float | None,
+) -> float | None:
+    """Seconds until the next batch or per-task deadline, or ``None``."""
+    now = time.monotonic()
+    candidates: list[float] = []
+    if deadline is not None:
+        candidates.append(deadline - now)
+    if task_timeout_seconds is not None:
+        for label in labels:
+            began = started.get(label)
+            if began is None:
+                # Queued tasks get their clock once a worker picks them up.
+                candidates.append(_POLL_SECONDS)
+            else:
+                candidates.append(began + task_timeout_seconds - now)
+    if not candidates:
+        return None
+    return max(0.0, min(candidates))
+
+
+async def agather(
+    tasks: dict[str, Callable[[], Any]],
+    *,
+    max_concurrency: int | None = None,
+    timeout_seconds: float | None = None,
+    task_timeout_seconds: float | None = None,
+    fail_fast: bool = False,
+    executor: concurrent.futures.Executor | None = None,
+) -> GatherResult:
+    """Asyncio counterpart of :func:`gather`.
+
+    Each callable may be a coroutine function (or return an awaitable), in
+    which case it runs on the current event loop, or a plain synchronous
+    callable, which is run on *executor* (the loop's default executor when
+    ``None``) so existing sync providers work unchanged.
+
+    Parameters
+    ----------
+    tasks:
+        Mapping of *label* → *callable*, as for :func:`gather`.
+    max_concurrency:
+        Maximum number of tasks in flight at once.  ``None`` means no limit
+        beyond what the HTTP pool itself enforces.
+    timeout_seconds, task_timeout_seconds, fail_fast:
+        Same meaning as for :func:`gather`.  Timed-out coroutines are
+        cancelled; timed-out sync callables are abandoned.
+    executor:
+        Executor for synchronous callables.
+
+    Returns
+    -------
+    GatherResult
+        Contains ``.results`` and ``.errors`` dicts keyed by label.
+    """
+    if not tasks:
+        return GatherResult()
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+    timed_out: set[str] = set()
+
+    async def invoke(fn: Callable[[], Any]) -> Any:
+        if inspect.iscoroutinefunction(fn):
+            return await fn()
+        value = await loop.run_in_executor(executor, fn)
+        if inspect.isawaitable(value):
+            return await value
+        return value
+
+    async def run(label: str, fn: Callable[[], Any]) -> Any:
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            if task_timeout_seconds is None:
+                return await invoke(fn)
+            # Not ``wait_for``: a ``TimeoutError`` raised by the task itself must
+            # not be mistaken for this one.
+            inner = asyncio.ensure_future(invoke(fn))
+            try:
+                done, _ = await asyncio.wait({inner}, timeout=task_timeout_seconds)
+            except asyncio.CancelledError:
+                inner.cancel()
+                raise
+            if not done:
+                inner.cancel()
+                timed_out.add(label)
+                raise TimeoutError(f"task {label!r} did not complete within {task_timeout_seconds}s")
+            return inner.result()
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    task_to_label: dict[asyncio.Task[Any], str] = {
+        asyncio.ensure_future(run(label, fn)): label for label, fn in tasks.items()
+    }
+    done, not_done = await asyncio.wait(
+        task_to_label,
+        timeout=timeout_seconds,
+        return_when=asyncio.FIRST_EXCEPTION if fail_fast else asyncio.ALL_COMPLETED,
+    )
+
+    results: dict[str, Any] = {}
+    errors: dict[str, BaseException] = {}
+    for task in done:
+        label = task_to_label[task]
+        if task.cancelled():
+            errors[label] = asyncio.CancelledError()
+        elif task.exception() is not None:
+            errors[label] = task.exception()  # type: ignore[assignment]
+        else:
+            results[label] = task.result()
+
+    for task in not_done:
+        label = task_to_label[task]
+        task.cancel()
+        if fail_fast and errors:
+            errors[label] = asyncio.CancelledError()
+        else:
+            timed_out.add(label)
+            errors[label] = TimeoutError(
+                f"task {label!r} did not complete within {timeout_seconds}s"
+            )
+
+    if fail_fast and errors:
+        first_label = next(
+            (label for label, exc in errors.items() if not isinstance(exc, asyncio.CancelledError)),
+            next(iter(errors)),
+        )
+        raise GatherError(
+            f"task {first_label!r} failed: {errors[first_label]}",
+            results=results,
+            errors=errors,
+        )
+
+    return GatherResult(results=results, errors=errors, timed_out=frozenset(timed_out))
+
+
+@dataclass
+class Page(Generic[T, C]):
+    """One page of a paginated listing: its *items* and the token for the next page.
+
+    ``next_token`` is ``None`` on the last page.
+    """
+
+    items: list[T]
+    next_token: C | None
+
+
+def iter_pages(
+    fetch_page: Callable[[C], Page[T, C]],
+    first_token: C,
+    *,
+    max_pages: int | None = None,
+    prefetch: bool = True,
+) -> Iterator[T]:
+    """Yield items across pages, fetching page *n + 1* while page *n* is consumed.
+
+    *fetch_page* maps a page token (cursor, offset, page number …) to a
+    :class:`Page`.  At most one page is in flight and one is being yielded,
+    so memory stays bounded however long the listing is.  Closing the
+    generator early (``break``, ``itertools.islice``) discards any prefetched
+    page instead of waiting for further ones.
+    """
+    if not prefetch:
+        token: C | None = first_token
+        pages = 0
+        while token is not None and (max_pages is None or pages < max_pages):
+            page = fetch_page(token)
+            pages += 1
+            yield from page.items
+            token = page.next_token
+        return
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-prefetch")
+    try:
+        context = contextvars.copy_context()
+        pending = executor.submit(context.run, fetch_page, first_token)
+        pages = 1
+        while pending is not None:
+            page = pending.result()
+            pending = None
+            if page.next_token is not None and (max_pages is None or pages < max_pages):
+                pending = executor.submit(context.run, fetch_page, page.next_token)
+                pages += 1
+            yield from page.items
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,177 @@
+"""On-disk ticker→CIK index and submissions cache for :class:`EdgarProvider`.
+
+The plugin runs one process per tool call, so the in-memory ticker map of
+``EdgarProvider`` meant downloading the multi-megabyte
+``company_tickers.json`` on every ``edgar`` request, and each request also
+re-downloaded the company's full submissions JSON.  :class:`EdgarStore`
+keeps both in one SQLite file:
+
+* ``tickers`` – one indexed row per ticker (``ticker``, ``cik``, ``title``),
+  so a lookup is a single B-tree probe instead of parsing the whole JSON.
+* ``resources`` – per-URL validators (``ETag`` / ``Last-Modified``) and the
+  time the copy was last confirmed fresh, plus the zlib-compressed body for
+  documents such as ``CIK##########.json``.
+
+The provider decides freshness; the store only persists.  A stale copy is
+revalidated with a conditional request, so an unchanged file costs one
+``304 Not Modified`` round trip instead of a full download.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+__all__ = [
+    "EdgarStore",
+    "StoredResource",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickers (
+    ticker TEXT PRIMARY KEY,
+    cik INTEGER NOT NULL,
+    title TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS resources (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at REAL NOT NULL,
+    payload BLOB
+);
+"""
+
+
+@dataclass(frozen=True)
+class StoredResource:
+    """Validators of a stored URL and when it was last known to be current."""
+
+    url: str
+    etag: str | None
+    last_modified: str | None
+    checked_at: float
+
+
+class EdgarStore:
+    """SQLite-backed EDGAR ticker index and document cache, safe across processes."""
+
+    def __init__(self, path: str | Path, *, clock: Callable[[], float] = time.time) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def now(self) -> float:
+        return self._clock()
+
+    # -- validators --------------------------------------------------------
+
+    def resource(self, url: str) -> StoredResource | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, checked_at FROM resources WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredResource(url=url, etag=row[0], last_modified=row[1], checked_at=float(row[2]))
+
+    def touch(self, url: str) -> None:
+        """Record that *url* was just revalidated (``304 Not Modified``)."""
+        with self._lock:
+            self._conn.execute("UPDATE resources SET checked_at = ? WHERE url = ?", (self._clock(), url))
+            self._conn.commit()
+
+    # -- ticker index ------------------------------------------------------
+
+    def lookup_ticker(self, ticker: str) -> tuple[int, str] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cik, title FROM tickers WHERE ticker = ?", (ticker.upper(),)
+            ).fetchone()
+        return None if row is None else (int(row[0]), str(row[1]))
+
+    def ticker_count(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM tickers").fetchone()
+        return int(count)
+
+    def replace_tickers(
+        self,
+        url: str,
+        rows: Iterable[tuple[str, int, str]],
+        *,
+        etag: str | None,
+        last_modified: str | None,
+    ) -> int:
+        """Swap in a new ``(ticker, cik, title)`` table in one transaction."""
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM tickers")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO tickers (ticker, cik, title) VALUES (?, ?, ?)", rows
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO resources (url, etag, last_modified, checked_at, payload) "
+                    "VALUES (?, ?, ?, ?, NULL)",
+                    (url, etag, last_modified, self._clock()),
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM tickers").fetchone()
+        return int(count)
+
+    # -- documents ---------------------------------------------------------
+
+    def load_document(self, url: str) -> tuple[Any, StoredResource] | None:
+        """Return the decoded JSON stored for *url* with its validators."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, checked_at, payload FROM resources WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or row[3] is None:
+            return None
+        try:
+            payload = json.loads(zlib.decompress(row[3]))
+        except (zlib.error, ValueError):
+            return None
+        return payload, StoredResource(url=url, etag=row[0], last_modified=row[1], checked_at=float(row[2]))
+
+    def save_document(
+        self,
+        url: str,
+        body: bytes,
+        *,
+        etag: str | None,
+        last_modified: str | None,
+    ) -> None:
+        """Store the raw JSON *body* of *url* compressed."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resources (url, etag, last_modified, checked_at, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, self._clock(), zlib.compress(body, 6)),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM tickers")
+            self._conn.execute("DELETE FROM resources")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,18 +1,42 @@
 from __future__ import annotations
 
+import base64
+import gzip
+import http.client
 import json
+import ssl
+import threading
 import time
+import zlib
 from dataclasses import dataclass, field
+from email.message import Message
 from typing import Any, Mapping, Protocol
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+from urllib.parse import unquote, urlencode, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+from .ratelimit import (
+    THROTTLE_STATUSES,
+    HostRateLimiter,
+    backoff_delay,
+    default_rate_limiter,
+    parse_retry_after,
+)
+from .telemetry import Span, default_telemetry
 
 
 class HttpClientError(RuntimeError):
     pass
 
 
+class HttpStatusError(HttpClientError):
+    """Raised when the upstream answers with an HTTP error status (>= 400)."""
+
+    def __init__(self, message: str, *, status: int, headers: Message | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+
 class JsonHttpClient(Protocol):
     def get_json(self, url: str, *, params: Mapping[str, object] | None = None) -> Any: ...
 
@@ -21,6 +45,17 @@ class TextHttpClient(Protocol):
     def get_text(self, url: str, *, params: Mapping[str, object] | None = None) -> str: ...
 
 
+class ConditionalHttpClient(Protocol):
+    def get_conditional(
+        self,
+        url: str,
+        *,
+        params: Mapping[str, object] | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> "HttpResponse": ...
+
+
 def _serialize_query_value(value: object) -> str:
     if isinstance(value, bool):
         return "true" if value else "false"
@@ -40,6 +75,435 @@ def _build_url(url: str, params: Mapping[str, object] | None) -> str:
     return f"{url}?{urlencode(query_items)}"
 
 
+# ---------------------------------------------------------------------------
+# Keep-alive connection pool
+# ---------------------------------------------------------------------------
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+_MAX_REDIRECTS = 5
+# Errors that mean a pooled keep-alive socket was closed by the server while
+# idle.  The request never reached the upstream, so it is safe to resend it
+# once on a fresh connection.
+_STALE_CONNECTION_ERRORS = (
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+_PoolKey = tuple[str, str, int, str | None]
+
+
+@dataclass
+class HostStats:
+    """Per-host counters exposed by :meth:`ConnectionPool.stats`."""
+
+    requests: int = 0
+    handshakes: int = 0
+    reuses: int = 0
+    stale_retries: int = 0
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    """Fully-read, already-decompressed HTTP response."""
+
+    url: str
+    status: int
+    reason: str
+    headers: Message
+    body: bytes
+    # True when ``max_body_bytes`` cut the body short (connection not reused).
+    truncated: bool = False
+
+    def text(self, default_charset: str = "utf-8") -> str:
+        charset = self.headers.get_content_charset() or default_charset
+        return self.body.decode(charset)
+
+
+class _HostPool:
+    def __init__(self, max_connections: int) -> None:
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.idle: list[tuple[http.client.HTTPConnection, float]] = []
+        self.stats = HostStats()
+
+
+def _decode_body(body: bytes, content_encoding: str | None) -> bytes:
+    encoding = (content_encoding or "").strip().lower()
+    if not body or encoding in ("", "identity"):
+        return body
+    if encoding in ("gzip", "x-gzip"):
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Some servers send raw deflate streams without the zlib header.
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    raise HttpClientError(f"unsupported content encoding: {content_encoding}")
+
+
+_READ_CHUNK = 64 * 1024
+
+
+def _read_capped(raw: http.client.HTTPResponse, content_encoding: str | None, limit: int) -> tuple[bytes, bool]:
+    """Read and decode at most *limit* body bytes; return ``(body, truncated)``.
+
+    Compressed bodies are inflated incrementally, so the cap applies to the
+    decoded size and a small gzip bomb cannot expand past it.
+    """
+    encoding = (content_encoding or "").strip().lower()
+    if encoding not in ("", "identity", "gzip", "x-gzip", "deflate"):
+        raise HttpClientError(f"unsupported content encoding: {content_encoding}")
+    decoder: Any = None
+    out = bytearray()
+    while True:
+        chunk = raw.read(_READ_CHUNK)
+        if not chunk:
+            break
+        if encoding in ("", "identity"):
+            out += chunk
+        else:
+            if decoder is None:
+                if encoding == "deflate" and (chunk[0] & 0x0F) != 8:
+                    decoder = zlib.decompressobj(-zlib.MAX_WBITS)  # raw deflate, no zlib header
+                else:
+                    decoder = zlib.decompressobj(zlib.MAX_WBITS | (16 if encoding != "deflate" else 0))
+            out += decoder.decompress(chunk, limit - len(out) + 1)
+        if len(out) > limit:
+            del out[limit:]
+            return bytes(out), True
+    if decoder is not None:
+        out += decoder.flush()
+    return bytes(out), False
+
+
+def _proxy_auth_headers(proxy: str) -> dict[str, str]:
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    if not parts.username:
+        return {}
+    credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+    token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {token}"}
+
+
+# -- helpers shared with digital_oracle.async_http.AsyncConnectionPool ------
+
+
+def _proxy_for(scheme: str, host: str) -> str | None:
+    """Proxy URL for *scheme*/*host* from the environment, honouring ``NO_PROXY``."""
+    proxy = getproxies().get(scheme)
+    if not proxy:
+        return None
+    try:
+        if proxy_bypass(host):
+            return None
+    except OSError:
+        pass
+    return proxy
+
+
+def _proxy_endpoint(proxy: str) -> tuple[str, int]:
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    return parts.hostname or "", parts.port or _DEFAULT_PORTS.get(parts.scheme or "http", 80)
+
+
+@dataclass(frozen=True)
+class _PreparedRequest:
+    """Routing and headers for one request, before it goes on a connection."""
+
+    key: _PoolKey
+    target: str
+    headers: dict[str, str]
+
+    @property
+    def host(self) -> str:
+        return self.key[1]
+
+
+def _prepare_request(url: str, headers: Mapping[str, str] | None) -> _PreparedRequest:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        raise HttpClientError(f"unsupported url: {url}")
+    host = parts.hostname
+    port = parts.port or _DEFAULT_PORTS[scheme]
+    proxy = _proxy_for(scheme, host)
+
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    request_headers = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+    if headers:
+        request_headers.update(headers)
+    if proxy is not None and scheme == "http":
+        # Plain-HTTP proxying sends absolute URLs; credentials ride on each request.
+        target = url
+        request_headers.update(_proxy_auth_headers(proxy))
+    return _PreparedRequest((scheme, host, port, proxy), target, request_headers)
+
+
+def _stats_snapshot(items: list[tuple[_PoolKey, Any]]) -> dict[str, dict[str, int]]:
+    snapshot: dict[str, dict[str, int]] = {}
+    for (scheme, host, port, _proxy), host_pool in items:
+        label = f"{host}:{port}" if port != _DEFAULT_PORTS.get(scheme) else host
+        entry = snapshot.setdefault(
+            label, {"requests": 0, "handshakes": 0, "reuses": 0, "stale_retries": 0}
+        )
+        entry["requests"] += host_pool.stats.requests
+        entry["handshakes"] += host_pool.stats.handshakes
+        entry["reuses"] += host_pool.stats.reuses
+        entry["stale_retries"] += host_pool.stats.stale_retries
+    return snapshot
+
+
+def _record_rate_outcome(
+    rate_limiter: HostRateLimiter | None, host: str, status: int, headers: Message
+) -> None:
+    if rate_limiter is None:
+        return
+    if status in THROTTLE_STATUSES:
+        rate_limiter.record_throttle(host, parse_retry_after(headers.get("Retry-After")))
+    else:
+        rate_limiter.record_success(host)
+
+
+def _throttle_retry_delay(
+    response: HttpResponse, attempt: int, retry_attempts: int, base: float, max_retry_after: float
+) -> float | None:
+    """Seconds to wait before retrying a 429/503, or ``None`` to give up on it."""
+    if response.status not in THROTTLE_STATUSES or attempt >= retry_attempts:
+        return None
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if retry_after is not None and retry_after > max_retry_after:
+        return None
+    return backoff_delay(attempt, base=base, retry_after=retry_after)
+
+
+class ConnectionPool:
+    """Thread-safe pool of persistent HTTP/1.1 connections, keyed per host.
+
+    Each checkout holds one of ``max_connections_per_host`` slots, so the
+    number of sockets open to a single upstream stays bounded no matter how
+    many ``gather`` workers hit it.  Idle connections are parked for
+    ``idle_timeout_seconds`` and reused by the next request to the same
+    scheme/host/port, skipping the TCP + TLS handshake.
+
+    Proxies are taken from the same environment variables ``urlopen`` honours
+    (``HTTP_PROXY`` / ``HTTPS_PROXY`` / ``NO_PROXY``).
+
+    With a ``rate_limiter`` every request first takes a token for its host,
+    and ``429``/``503`` responses slow that host down for all callers.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections_per_host: int = 8,
+        max_idle_per_host: int | None = None,
+        idle_timeout_seconds: float = 60.0,
+        ssl_context: ssl.SSLContext | None = None,
+        rate_limiter: HostRateLimiter | None = None,
+    ) -> None:
+        if max_connections_per_host < 1:
+            raise ValueError("max_connections_per_host must be >= 1")
+        self.max_connections_per_host = max_connections_per_host
+        self.max_idle_per_host = (
+            max_idle_per_host if max_idle_per_host is not None else max_connections_per_host
+        )
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._ssl_context = ssl_context or ssl.create_default_context()
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        self._hosts: dict[_PoolKey, _HostPool] = {}
+
+    # -- public API --------------------------------------------------------
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        body: bytes | None = None,
+        timeout: float | None = None,
+        max_body_bytes: int | None = None,
+    ) -> HttpResponse:
+        """Send a request, following redirects, and return the full response.
+
+        With *max_body_bytes* the body is streamed and reading stops once
+        that many decoded bytes arrived (``response.truncated`` is set).
+        """
+        current_url = url
+        current_method = method.upper()
+        current_body = body
+        for _ in range(_MAX_REDIRECTS + 1):
+            response = self._request_once(
+                current_method,
+                current_url,
+                headers=headers,
+                body=current_body,
+                timeout=timeout,
+                max_body_bytes=max_body_bytes,
+            )
+            location = response.headers.get("Location")
+            if response.status not in _REDIRECT_STATUSES or not location:
+                return response
+            current_url = urljoin(current_url, location)
+            if response.status == 303 or (response.status in (301, 302) and current_method == "POST"):
+                current_method = "GET"
+                current_body = None
+        raise HttpClientError(f"too many redirects: {url}")
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return ``{"host:port": {"requests", "handshakes", "reuses", ...}}``."""
+        with self._lock:
+            items = list(self._hosts.items())
+        return _stats_snapshot(items)
+
+    def close(self) -> None:
+        """Close every idle connection.  Checked-out connections are unaffected."""
+        with self._lock:
+            host_pools = list(self._hosts.values())
+        for host_pool in host_pools:
+            with self._lock:
+                idle, host_pool.idle = host_pool.idle, []
+            for conn, _ in idle:
+                conn.close()
+
+    # -- internal ----------------------------------------------------------
+
+    def _host_pool(self, key: _PoolKey) -> _HostPool:
+        with self._lock:
+            host_pool = self._hosts.get(key)
+            if host_pool is None:
+                host_pool = _HostPool(self.max_connections_per_host)
+                self._hosts[key] = host_pool
+            return host_pool
+
+    def _new_connection(
+        self, scheme: str, host: str, port: int, proxy: str | None, timeout: float | None
+    ) -> http.client.HTTPConnection:
+        if proxy is None:
+            if scheme == "https":
+                return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+            return http.client.HTTPConnection(host, port, timeout=timeout)
+
+        proxy_host, proxy_port = _proxy_endpoint(proxy)
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(
+                proxy_host, proxy_port, timeout=timeout, context=self._ssl_context
+            )
+            conn.set_tunnel(host, port, headers=_proxy_auth_headers(proxy) or None)
+            return conn
+        return http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout)
+
+    def _checkout(
+        self, key: _PoolKey, host_pool: _HostPool, timeout: float | None
+    ) -> http.client.HTTPConnection:
+        scheme, host, port, proxy = key
+        now = time.monotonic()
+        with self._lock:
+            while host_pool.idle:
+                conn, parked_at = host_pool.idle.pop()
+                if now - parked_at <= self.idle_timeout_seconds:
+                    return conn
+                conn.close()
+        return self._new_connection(scheme, host, port, proxy, timeout)
+
+    def _checkin(self, host_pool: _HostPool, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable and conn.sock is not None:
+            with self._lock:
+                if len(host_pool.idle) < self.max_idle_per_host:
+                    host_pool.idle.append((conn, time.monotonic()))
+                    return
+        conn.close()
+
+    def _request_once(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None,
+        body: bytes | None,
+        timeout: float | None,
+        max_body_bytes: int | None = None,
+    ) -> HttpResponse:
+        prepared = _prepare_request(url, headers)
+        host = prepared.host
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(host)
+        host_pool = self._host_pool(prepared.key)
+        host_pool.slots.acquire()
+        try:
+            for attempt in range(2):
+                conn = self._checkout(prepared.key, host_pool, timeout)
+                reused = conn.sock is not None
+                if reused:
+                    conn.sock.settimeout(timeout)
+                conn.timeout = timeout
+                try:
+                    conn.request(method, prepared.target, body=body, headers=prepared.headers)
+                    raw = conn.getresponse()
+                    truncated = False
+                    if max_body_bytes is None:
+                        payload = _decode_body(raw.read(), raw.headers.get("Content-Encoding"))
+                    else:
+                        payload, truncated = _read_capped(
+                            raw, raw.headers.get("Content-Encoding"), max_body_bytes
+                        )
+                except _STALE_CONNECTION_ERRORS:
+                    conn.close()
+                    if reused and attempt == 0:
+                        with self._lock:
+                            host_pool.stats.stale_retries += 1
+                        continue
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+
+                with self._lock:
+                    host_pool.stats.requests += 1
+                    if reused:
+                        host_pool.stats.reuses += 1
+                    else:
+                        host_pool.stats.handshakes += 1
+                # A partially read body leaves the socket mid-response.
+                self._checkin(host_pool, conn, reusable=not raw.will_close and not truncated)
+                _record_rate_outcome(self.rate_limiter, host, raw.status, raw.headers)
+                return HttpResponse(
+                    url=url,
+                    status=raw.status,
+                    reason=raw.reason,
+                    headers=raw.headers,
+                    body=payload,
+                    truncated=truncated,
+                )
+            raise HttpClientError(f"request failed: {url}")  # pragma: no cover
+        finally:
+            host_pool.slots.release()
+
+
+_default_pool: ConnectionPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def default_connection_pool() -> ConnectionPool:
+    """Return the process-wide pool shared by every :class:`UrllibJsonClient`."""
+    global _default_pool  # noqa: PLW0603
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConnectionPool(rate_limiter=default_rate_limiter())
+        return _default_pool
+
+
+def connection_pool_stats() -> dict[str, dict[str, int]]:
+    """Per-host request/handshake/reuse counters of the shared pool."""
+    return default_connection_pool().stats()
+
+
 @dataclass
 class UrllibJsonClient:
     timeout_seconds: float = 20.0
@@ -51,39 +515,92 @@ class UrllibJsonClient:
             "User-Agent": "digital-oracle/0.1",
         }
     )
+    pool: ConnectionPool | None = field(default=None, repr=False)
+    # 429/503 answers asking to wait longer than this are not retried.
+    max_retry_after_seconds: float = 60.0
 
     def get_json(self, url: str, *, params: Mapping[str, object] | None = None) -> Any:
-        request_url = self._build_request(url, params)
-        try:
-            with self._open(request_url) as response:
-                return json.load(response)
-        except HTTPError as exc:
-            raise HttpClientError(f"request failed: {request_url.full_url}") from exc
-        except json.JSONDecodeError as exc:
-            raise HttpClientError(f"invalid json payload: {request_url.full_url}") from exc
+        request_url = _build_url(url, params)
+        response = self._open(request_url)
+        with default_telemetry().span("parse", urlsplit(request_url).hostname or "") as parse_span:
+            parse_span.bytes = len(response.body)
+            try:
+                return json.loads(response.body)
+            except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+                raise HttpClientError(f"invalid json payload: {request_url}") from exc
 
     def get_text(self, url: str, *, params: Mapping[str, object] | None = None) -> str:
-        request_url = self._build_request(url, params)
+        request_url = _build_url(url, params)
+        response = self._open(request_url)
         try:
-            with self._open(request_url) as response:
-                return response.read().decode("utf-8")
-        except HTTPError as exc:
-            raise HttpClientError(f"request failed: {request_url.full_url}") from exc
+            return response.text()
+        except (LookupError, UnicodeDecodeError) as exc:
+            raise HttpClientError(f"invalid text payload: {request_url}") from exc
 
-    def _build_request(self, url: str, params: Mapping[str, object] | None) -> Request:
-        request_url = _build_url(url, params)
-        return Request(request_url, headers=dict(self.headers))
+    def get_conditional(
+        self,
+        url: str,
+        *,
+        params: Mapping[str, object] | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> HttpResponse:
+        """GET with ``If-None-Match`` / ``If-Modified-Since``.
+
+        Returns the raw response; ``status == 304`` means the caller's copy
+        is still current and the body is empty.
+        """
+        headers: dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return self._open(_build_url(url, params), extra_headers=headers)
+
+    def _open(self, request_url: str, *, extra_headers: Mapping[str, str] | None = None) -> HttpResponse:
+        with default_telemetry().span("http", urlsplit(request_url).hostname or "") as http_span:
+            response = self._open_with_retries(request_url, extra_headers, http_span)
+            http_span.status = response.status
+            http_span.bytes = len(response.body)
+            return response
 
-    def _open(self, request: Request):
+    def _open_with_retries(
+        self,
+        request_url: str,
+        extra_headers: Mapping[str, str] | None,
+        http_span: Span,
+    ) -> HttpResponse:
+        pool = self.pool or default_connection_pool()
+        request_headers = dict(self.headers)
+        if extra_headers:
+            request_headers.update(extra_headers)
         last_error: Exception | None = None
         for attempt in range(1, self.retry_attempts + 1):
+            http_span.retries = attempt - 1
             try:
-                return urlopen(request, timeout=self.timeout_seconds)
-            except HTTPError:
+                response = pool.request(
+                    "GET", request_url, headers=request_headers, timeout=self.timeout_seconds
+                )
+            except HttpClientError:
                 raise
-            except (URLError, TimeoutError) as exc:
+            except (OSError, http.client.HTTPException) as exc:
                 last_error = exc
                 if attempt >= self.retry_attempts:
                     break
-                time.sleep(self.retry_delay_seconds)
-        raise HttpClientError(f"request failed: {request.full_url}") from last_error
+                time.sleep(backoff_delay(attempt, base=self.retry_delay_seconds))
+                continue
+            delay = _throttle_retry_delay(
+                response, attempt, self.retry_attempts, self.retry_delay_seconds, self.max_retry_after_seconds
+            )
+            if delay is not None:
+                time.sleep(delay)
+                continue
+            if response.status >= 400:
+                http_span.status = response.status
+                raise HttpStatusError(
+                    f"request failed: {request_url}",
+                    status=response.status,
+                    headers=response.headers,
+                )
+            return response
+        raise HttpClientError(f"request failed: {request_url}") from last_error
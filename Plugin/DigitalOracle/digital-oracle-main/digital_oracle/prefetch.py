@@ -0,0 +1,275 @@
+"""Background refresh of recurring signals into a local store.
+
+A dashboard that fans out to a dozen upstreams on demand makes every caller
+wait for the slowest one.  In a persistent process, :class:`PrefetchScheduler`
+refreshes each signal on its own cadence instead (a crypto quote every couple
+of minutes, BIS policy rates once a day) and writes the result to a
+:class:`SignalStore`; readers take whatever is stored and see its age.
+
+The store is a single SQLite file, so a one-shot process can read the
+snapshots a long-running worker keeps warm.  Values must be JSON
+serializable; they are stored zlib-compressed.  The scheduler derives its
+first due times from the stored ``fetched_at`` values, so restarting a worker
+does not refetch signals that are still current.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+__all__ = [
+    "PrefetchJob",
+    "PrefetchScheduler",
+    "SignalStore",
+    "StoredSignal",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    key TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    payload BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True)
+class StoredSignal:
+    """A stored signal value and when it was fetched (epoch seconds)."""
+
+    key: str
+    value: Any
+    fetched_at: float
+
+    def age(self, now: float | None = None) -> float:
+        return max(0.0, (time.time() if now is None else now) - self.fetched_at)
+
+
+@dataclass(frozen=True)
+class PrefetchJob:
+    """Refresh ``key`` by calling ``fetch`` every ``interval_seconds``."""
+
+    key: str
+    fetch: Callable[[], Any]
+    interval_seconds: float
+
+
+class SignalStore:
+    """SQLite-backed latest-value store keyed by signal, safe across processes."""
+
+    def __init__(self, path: str | Path, *, clock: Callable[[], float] = time.time) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def now(self) -> float:
+        return self._clock()
+
+    def save(self, key: str, value: Any) -> StoredSignal:
+        fetched_at = self._clock()
+        payload = zlib.compress(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"), 6)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO signals (key, fetched_at, payload) VALUES (?, ?, ?)",
+                (key, fetched_at, payload),
+            )
+            self._conn.commit()
+        return StoredSignal(key=key, value=value, fetched_at=fetched_at)
+
+    def load(self, key: str) -> StoredSignal | None:
+        return self.load_many([key]).get(key)
+
+    def load_many(self, keys: Iterable[str]) -> dict[str, StoredSignal]:
+        """Stored signals among *keys*; unknown or unreadable keys are left out."""
+        wanted = list(dict.fromkeys(keys))
+        if not wanted:
+            return {}
+        placeholders = ",".join("?" * len(wanted))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, fetched_at, payload FROM signals WHERE key IN ({placeholders})", wanted
+            ).fetchall()
+        signals: dict[str, StoredSignal] = {}
+        for key, fetched_at, payload in rows:
+            try:
+                value = json.loads(zlib.decompress(payload))
+            except (zlib.error, ValueError):
+                continue
+            signals[key] = StoredSignal(key=key, value=value, fetched_at=float(fetched_at))
+        return signals
+
+    def fetched_at(self, keys: Iterable[str]) -> dict[str, float]:
+        """``fetched_at`` per stored key, without decoding the payloads."""
+        wanted = list(dict.fromkeys(keys))
+        if not wanted:
+            return {}
+        placeholders = ",".join("?" * len(wanted))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, fetched_at FROM signals WHERE key IN ({placeholders})", wanted
+            ).fetchall()
+        return {key: float(fetched_at) for key, fetched_at in rows}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM signals")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PrefetchScheduler:
+    """Daemon thread that keeps every job's signal in *store* at most one interval old.
+
+    Due jobs run on a small thread pool, at most one run per key at a time.
+    A failed run is retried after ``retry_seconds``, doubling per consecutive
+    failure but never later than the job's regular interval; the stored value
+    is left untouched so readers keep the last good snapshot.
+    """
+
+    def __init__(
+        self,
+        store: SignalStore,
+        jobs: Iterable[PrefetchJob],
+        *,
+        max_workers: int = 4,
+        retry_seconds: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store
+        self.jobs = {job.key: job for job in jobs}
+        self.retry_seconds = retry_seconds
+        self._clock = clock
+        self._max_workers = max(1, max_workers)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._running: set[str] = set()
+        self._due: dict[str, float] = {}
+        self._runs: dict[str, int] = {}
+        self._failures: dict[str, int] = {}
+        self._errors: dict[str, str] = {}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            stored = self.store.fetched_at(self.jobs)
+            for key, job in self.jobs.items():
+                self._due[key] = stored.get(key, float("-inf")) + job.interval_seconds
+            self._stop.clear()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="oracle-prefetch"
+            )
+            self._thread = threading.Thread(target=self._loop, name="oracle-prefetch-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop scheduling; runs already in flight finish in the background."""
+        with self._lock:
+            thread, executor = self._thread, self._executor
+            self._thread = self._executor = None
+        self._stop.set()
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run_pending(self) -> list[str]:
+        """Submit every due job that is not already running; return their keys."""
+        now = self._clock()
+        with self._lock:
+            executor = self._executor
+            if executor is None:
+                return []
+            due = [
+                key
+                for key, when in self._due.items()
+                if when <= now and key not in self._running
+            ]
+            self._running.update(due)
+        for key in due:
+            try:
+                executor.submit(self._run_job, self.jobs[key])
+            except RuntimeError:  # shutting down
+                with self._lock:
+                    self._running.discard(key)
+        return due
+
+    def mark_refreshed(self, key: str) -> None:
+        """Note that *key* was just stored by someone else (e.g. an on-demand fetch)."""
+        job = self.jobs.get(key)
+        if job is None:
+            return
+        with self._lock:
+            self._due[key] = self._clock() + job.interval_seconds
+            self._failures.pop(key, None)
+            self._errors.pop(key, None)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """``{key: {"due_in", "runs", "failures", "last_error"}}`` per job."""
+        now = self._clock()
+        with self._lock:
+            return {
+                key: {
+                    "due_in": round(max(0.0, self._due.get(key, now) - now), 1),
+                    "runs": self._runs.get(key, 0),
+                    "failures": self._failures.get(key, 0),
+                    "last_error": self._errors.get(key),
+                }
+                for key in sorted(self.jobs)
+            }
+
+    def _run_job(self, job: PrefetchJob) -> None:
+        try:
+            value = job.fetch()
+            self.store.save(job.key, value)
+        except Exception as exc:  # noqa: BLE001 - a failing upstream must not stop the scheduler
+            with self._lock:
+                failures = self._failures.get(job.key, 0) + 1
+                self._failures[job.key] = failures
+                self._errors[job.key] = f"{type(exc).__name__}: {exc}"
+                delay = min(job.interval_seconds, self.retry_seconds * (2 ** (failures - 1)))
+                self._due[job.key] = self._clock() + delay
+        else:
+            with self._lock:
+                self._runs[job.key] = self._runs.get(job.key, 0) + 1
+                self._failures.pop(job.key, None)
+                self._errors.pop(job.key, None)
+                self._due[job.key] = self._clock() + job.interval_seconds
+        finally:
+            with self._lock:
+                self._running.discard(job.key)
+            self._wake.set()
+
+    def _next_wakeup(self) -> float:
+        now = self._clock()
+        with self._lock:
+            waiting = [when for key, when in self._due.items() if key not in self._running]
+        if not waiting:
+            return 60.0
+        return min(60.0, max(0.5, min(waiting) - now))
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            self._wake.clear()
+            self._wake.wait(self._next_wakeup())
@@ -65,14 +65,19 @@ from .yahoo import YahooPriceProvider
 from .treasury import (
     ExchangeRateQuery,
     ExchangeRateRecord,
+    InversionSummary,
     USTreasuryProvider,
+    YieldCurveHistory,
     YieldCurveQuery,
+    YieldCurveRangeQuery,
     YieldCurveSnapshot,
     YieldPoint,
 )
 from .web import (
     WebPageContent,
     WebPageQuery,
+    WebResearchQuery,
+    WebResearchResult,
     WebSearchProvider,
     WebSearchQuery,
     WebSearchResult,
@@ -94,13 +99,22 @@ from .cme_fedwatch import (
     FedRateProb,
 )
 from .yfinance_provider import (
+    OptionColumns,
     OptionContract,
     OptionGreeks,
     OptionsChain,
+    OptionsChainColumns,
     OptionsChainQuery,
     OptionsExpirations,
     YFinanceProvider,
     black_scholes_greeks,
+    black_scholes_greeks_array,
+)
+from .volatility import (
+    TermStructurePoint,
+    VolatilitySlice,
+    VolatilitySurface,
+    build_volatility_surface,
 )
 
 __all__ = [
@@ -142,6 +156,7 @@ __all__ = [
     "FearGreedSnapshot",
     "FedMeetingProbability",
     "FedRateProb",
+    "InversionSummary",
     "ExchangeRateQuery",
     "ExchangeRateRecord",
     "KalshiEvent",
@@ -167,6 +182,8 @@ __all__ = [
     "USTreasuryProvider",
     "WebPageContent",
     "WebPageQuery",
+    "WebResearchQuery",
+    "WebResearchResult",
     "WebSearchProvider",
     "WebSearchQuery",
     "WebSearchResult",
@@ -175,14 +192,23 @@ __all__ = [
     "WorldBankProvider",
     "WorldBankQuery",
     "WorldBankResult",
+    "YieldCurveHistory",
     "YieldCurveQuery",
+    "YieldCurveRangeQuery",
     "YFinanceProvider",
     "YieldCurveSnapshot",
     "YieldPoint",
+    "OptionColumns",
     "OptionContract",
     "OptionGreeks",
     "OptionsChain",
+    "OptionsChainColumns",
     "OptionsChainQuery",
     "OptionsExpirations",
+    "TermStructurePoint",
+    "VolatilitySlice",
+    "VolatilitySurface",
     "black_scholes_greeks",
+    "black_scholes_greeks_array",
+    "build_volatility_surface",
 ]
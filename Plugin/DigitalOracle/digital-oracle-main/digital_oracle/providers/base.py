@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import inspect
 from abc import ABC
 from dataclasses import dataclass
 
+from ..telemetry import traced
+
+# Public provider methods timed as ``provider`` spans ("yahoo.get_history").
+# Generators (``iter_*``) are left alone: their cost lands on the consumer.
+_TRACED_PREFIXES = ("get_", "list_", "search", "research", "fetch_")
+
 
 class ProviderError(RuntimeError):
     pass
@@ -24,6 +31,18 @@ class SignalProvider(ABC):
     display_name: str
     capabilities: tuple[str, ...] = ()
 
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        label = getattr(cls, "provider_id", None) or cls.__name__
+        for name, member in list(vars(cls).items()):
+            if (
+                name.startswith(_TRACED_PREFIXES)
+                and inspect.isfunction(member)
+                and not inspect.isgeneratorfunction(member)
+                and not getattr(member, "__digital_oracle_traced__", False)
+            ):
+                setattr(cls, name, traced("provider", f"{label}.{name}")(member))
+
     def describe(self) -> ProviderMetadata:
         return ProviderMetadata(
             provider_id=self.provider_id,
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
-from typing import Any, Mapping, Protocol
+from typing import TYPE_CHECKING, Any, Mapping, Protocol, Sequence
 
+from digital_oracle.concurrent import gather
 from digital_oracle.http import JsonHttpClient, UrllibJsonClient
+from digital_oracle.snapshots import _request_key
 
 from ._coerce import _coerce_float, _coerce_int
-from .base import ProviderParseError, SignalProvider
+from .base import ProviderError, ProviderParseError, SignalProvider
+from .volatility import VolatilitySlice, VolatilitySurface, build_volatility_surface
+
+if TYPE_CHECKING:
+    from digital_oracle.cache import ResponseCache
 
 DERIBIT_API_URL = "https://www.deribit.com/api/v2/public"
 
@@ -23,6 +30,19 @@ def _unwrap_result(payload: Any) -> Any:
     return payload["result"]
 
 
+def _instrument_key(query: DeribitInstrumentsQuery) -> tuple[str, str, bool]:
+    return (query.currency.upper(), query.kind.strip().lower(), bool(query.expired))
+
+
+def _instrument_disk_key(key: tuple[str, str, bool]) -> str:
+    currency, kind, expired = key
+    return _request_key(
+        "deribit_instruments",
+        f"{DERIBIT_API_URL}/get_instruments",
+        {"currency": currency, "kind": kind, "expired": expired},
+    )
+
+
 def _first_non_none(*values: object) -> object | None:
     for value in values:
         if value is not None:
@@ -221,13 +241,88 @@ class DeribitOptionChain:
 class DeribitProvider(SignalProvider):
     provider_id = "deribit"
     display_name = "Deribit"
-    capabilities = ("derivatives_instruments", "order_book", "futures_term_structure", "option_chain")
-
-    def __init__(self, http_client: DeribitHttpClient | None = None):
+    capabilities = (
+        "derivatives_instruments",
+        "order_book",
+        "futures_term_structure",
+        "option_chain",
+        "volatility_surface",
+    )
+
+    def __init__(
+        self,
+        http_client: DeribitHttpClient | None = None,
+        *,
+        surface_cache_seconds: float = 30.0,
+        instrument_cache_seconds: float = 600.0,
+        cache: ResponseCache | None = None,
+        refresh: bool = False,
+    ):
         self.http_client = http_client or UrllibJsonClient()
+        self.surface_cache_seconds = surface_cache_seconds
+        self.instrument_cache_seconds = instrument_cache_seconds
+        self.cache = cache
+        self.refresh = refresh
+        # currency -> (monotonic time of the last full refresh, every listed slice by label)
+        self._surface_cache: dict[str, tuple[float, dict[str, VolatilitySlice]]] = {}
+        # (currency, kind, expired) -> (wall-clock expiry, sorted instruments)
+        self._instrument_cache: dict[tuple[str, str, bool], tuple[float, list[DeribitInstrument]]] = {}
 
     def list_instruments(self, query: DeribitInstrumentsQuery | None = None) -> list[DeribitInstrument]:
+        """Listed instruments, cached until the next expiry or ``instrument_cache_seconds``.
+
+        The instrument list only changes when a contract expires (or, for
+        options, when new strikes are listed), so it is kept until the
+        earliest listed expiration passes, capped by
+        ``instrument_cache_seconds``.  With a
+        :class:`~digital_oracle.cache.ResponseCache` the list is also stored
+        on disk with that expiry, so one-shot processes reuse it too.
+        """
         query = query or DeribitInstrumentsQuery()
+        key = _instrument_key(query)
+        cached = self._cached_instruments(key)
+        if cached is not None:
+            return list(cached)
+
+        instruments = self._fetch_instruments(query)
+        valid_until = time.time() + self.instrument_cache_seconds
+        if not query.expired:
+            next_expiry_ms = min(
+                (
+                    item.expiration_timestamp
+                    for item in instruments
+                    if item.expiration_timestamp and not item.is_perpetual
+                ),
+                default=None,
+            )
+            if next_expiry_ms is not None:
+                valid_until = min(valid_until, next_expiry_ms / 1000.0)
+        if self.instrument_cache_seconds > 0:
+            self._instrument_cache[key] = (valid_until, instruments)
+            if self.cache is not None:
+                self.cache.put(
+                    _instrument_disk_key(key),
+                    namespace=self.provider_id,
+                    payload={"valid_until": valid_until, "rows": [dict(item.raw) for item in instruments]},
+                )
+        return list(instruments)
+
+    def _cached_instruments(self, key: tuple[str, str, bool]) -> list[DeribitInstrument] | None:
+        cached = self._instrument_cache.get(key)
+        if cached is None and self.cache is not None and not self.refresh:
+            stored = self.cache.get(_instrument_disk_key(key))
+            if isinstance(stored, Mapping) and isinstance(stored.get("rows"), list):
+                rows = [row for row in stored["rows"] if isinstance(row, Mapping)]
+                cached = (
+                    _coerce_float(stored.get("valid_until")) or 0.0,
+                    [self._parse_instrument(row) for row in rows],
+                )
+                self._instrument_cache[key] = cached
+        if cached is not None and time.time() < cached[0]:
+            return cached[1]
+        return None
+
+    def _fetch_instruments(self, query: DeribitInstrumentsQuery) -> list[DeribitInstrument]:
         payload = self.http_client.get_json(
             f"{DERIBIT_API_URL}/get_instruments",
             params={
@@ -274,13 +369,62 @@ class DeribitProvider(SignalProvider):
     ) -> DeribitFuturesTermStructure:
         query = query or DeribitFuturesCurveQuery()
         currency = query.currency.upper()
-        instruments = self.list_instruments(
-            DeribitInstrumentsQuery(currency=currency, kind="future", expired=query.expired)
+        instruments, summaries = self._instruments_and_summaries(
+            currency, kind="future", expired=query.expired
         )
-        summary_map = {
-            summary.instrument_name: summary
-            for summary in self._list_book_summaries(currency=currency, kind="future")
-        }
+        return self._assemble_term_structure(query, instruments, summaries)
+
+    def get_futures_term_structures(
+        self,
+        currencies: Sequence[str] = ("BTC", "ETH", "SOL"),
+        *,
+        expired: bool = False,
+        include_perpetual: bool = True,
+        max_workers: int = 6,
+    ) -> dict[str, DeribitFuturesTermStructure]:
+        """Term structures for several currencies, all sub-requests in one fan-out.
+
+        Currencies whose requests fail are left out of the result; a
+        :class:`ProviderError` is raised only when every currency fails.
+        """
+        wanted = list(dict.fromkeys(currency.upper() for currency in currencies))
+        tasks: dict[str, Any] = {}
+        for currency in wanted:
+            tasks[f"{currency}:instruments"] = (
+                lambda currency=currency: self.list_instruments(
+                    DeribitInstrumentsQuery(currency=currency, kind="future", expired=expired)
+                )
+            )
+            tasks[f"{currency}:summaries"] = (
+                lambda currency=currency: self._list_book_summaries(currency=currency, kind="future")
+            )
+        outcome = gather(tasks, max_workers=max(1, max_workers))
+
+        structures: dict[str, DeribitFuturesTermStructure] = {}
+        for currency in wanted:
+            instruments_key, summaries_key = f"{currency}:instruments", f"{currency}:summaries"
+            if instruments_key not in outcome.results or summaries_key not in outcome.results:
+                continue
+            structures[currency] = self._assemble_term_structure(
+                DeribitFuturesCurveQuery(
+                    currency=currency, expired=expired, include_perpetual=include_perpetual
+                ),
+                outcome.results[instruments_key],
+                outcome.results[summaries_key],
+            )
+        if not structures and wanted:
+            first_error = next(iter(outcome.errors.values()), None)
+            raise ProviderError(f"failed to fetch Deribit term structures for {wanted}: {first_error}")
+        return structures
+
+    def _assemble_term_structure(
+        self,
+        query: DeribitFuturesCurveQuery,
+        instruments: list[DeribitInstrument],
+        summaries: list[DeribitBookSummary],
+    ) -> DeribitFuturesTermStructure:
+        currency = query.currency.upper()
+        summary_map = {summary.instrument_name: summary for summary in summaries}
         generated_timestamp_ms = max(
             (summary.creation_timestamp or 0 for summary in summary_map.values()),
             default=0,
@@ -327,8 +471,8 @@ class DeribitProvider(SignalProvider):
     def get_option_chain(self, query: DeribitOptionChainQuery | None = None) -> DeribitOptionChain | None:
         query = query or DeribitOptionChainQuery()
         currency = query.currency.upper()
-        instruments = self.list_instruments(
-            DeribitInstrumentsQuery(currency=currency, kind="option", expired=query.expired)
+        instruments, summaries = self._instruments_and_summaries(
+            currency, kind="option", expired=query.expired
         )
         if not instruments:
             return None
@@ -348,10 +492,7 @@ class DeribitProvider(SignalProvider):
         if not chain_instruments:
             return None
 
-        summary_map = {
-            summary.instrument_name: summary
-            for summary in self._list_book_summaries(currency=currency, kind="option")
-        }
+        summary_map = {summary.instrument_name: summary for summary in summaries}
 
         strike_map: dict[float, DeribitOptionStrike] = {}
         raw_quotes: list[Mapping[str, Any]] = []
@@ -384,6 +525,104 @@ class DeribitProvider(SignalProvider):
             raw_quotes=tuple(raw_quotes),
         )
 
+    def get_surface(
+        self,
+        currency: str = "BTC",
+        expirations: Sequence[str] | None = None,
+        *,
+        max_expirations: int | None = None,
+        skew_moneyness: float = 0.1,
+    ) -> VolatilitySurface:
+        """Build a strike × expiry ``mark_iv`` surface for *currency* options.
+
+        One ``get_instruments`` + ``get_book_summary_by_currency`` pair covers
+        every expiration, so all slices of a currency are refreshed together
+        and the whole listing is cached for ``surface_cache_seconds``.  Within
+        that window every request (all expirations, a subset, or labels
+        Deribit does not list) is answered without HTTP calls.  ``mark_iv``
+        is converted from percent to a fraction.  Requested labels Deribit
+        does not list are reported in ``surface.failed_expirations``.
+        """
+        currency = currency.upper()
+        wanted = [label.upper() for label in expirations] if expirations is not None else None
+
+        entry = self._surface_cache.get(currency)
+        if entry is not None and time.monotonic() - entry[0] < self.surface_cache_seconds:
+            cached = entry[1]
+        else:
+            cached = self._refresh_surface_slices(currency)
+
+        labels = wanted if wanted is not None else list(cached)
+        if wanted is None and max_expirations is not None:
+            labels = sorted(labels, key=lambda label: cached[label].years_to_expiry or 0.0)[:max_expirations]
+        return build_volatility_surface(
+            currency,
+            [cached[label] for label in labels if label in cached],
+            skew_moneyness=skew_moneyness,
+            failed_expirations=[label for label in labels if label not in cached],
+        )
+
+    def _refresh_surface_slices(self, currency: str) -> dict[str, VolatilitySlice]:
+        instruments, summaries = self._instruments_and_summaries(currency, kind="option")
+        summary_map = {summary.instrument_name: summary for summary in summaries}
+        now_ms = time.time() * 1000.0
+
+        grouped: dict[str, dict[str, Any]] = {}
+        for instrument in instruments:
+            label = instrument.expiration_label
+            summary = summary_map.get(instrument.instrument_name)
+            if label is None or summary is None or instrument.strike is None:
+                continue
+            entry = grouped.setdefault(
+                label,
+                {"timestamp": instrument.expiration_timestamp, "underlying": None, "call": {}, "put": {}},
+            )
+            if entry["underlying"] is None and summary.underlying_price is not None:
+                entry["underlying"] = summary.underlying_price
+            if summary.mark_iv is not None and summary.mark_iv > 0 and instrument.option_type in ("call", "put"):
+                entry[instrument.option_type][instrument.strike] = summary.mark_iv / 100.0
+
+        fetched_at = time.monotonic()
+        slices: dict[str, VolatilitySlice] = {}
+        for label, entry in grouped.items():
+            timestamp = entry["timestamp"]
+            years = max(timestamp - now_ms, 0.0) / (365.0 * 86_400_000) if timestamp is not None else None
+            slices[label] = VolatilitySlice(
+                expiration=label,
+                years_to_expiry=years,
+                underlying_price=entry["underlying"],
+                call_iv=entry["call"],
+                put_iv=entry["put"],
+            )
+
+        self._surface_cache[currency] = (fetched_at, slices)
+        return slices
+
+    def _instruments_and_summaries(
+        self,
+        currency: str,
+        *,
+        kind: str,
+        expired: bool = False,
+    ) -> tuple[list[DeribitInstrument], list[DeribitBookSummary]]:
+        """Fetch the instrument list and book summaries as two concurrent requests.
+
+        When the instrument list is cached only the summaries go upstream.
+        """
+        query = DeribitInstrumentsQuery(currency=currency, kind=kind, expired=expired)
+        cached = self._cached_instruments(_instrument_key(query))
+        if cached is not None:
+            return list(cached), self._list_book_summaries(currency=currency, kind=kind)
+
+        outcome = gather(
+            {
+                "instruments": lambda: self.list_instruments(query),
+                "summaries": lambda: self._list_book_summaries(currency=currency, kind=kind),
+            },
+            max_workers=2,
+        )
+        return outcome.get("instruments"), outcome.get("summaries")
+
     def _parse_instrument(self, raw: Mapping[str, Any]) -> DeribitInstrument:
         return DeribitInstrument(
             instrument_name=str(raw.get("instrument_name", "")),
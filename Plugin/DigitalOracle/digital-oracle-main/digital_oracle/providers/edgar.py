@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import json
+import threading
 from dataclasses import dataclass
-from typing import Any, Mapping
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
 
+from digital_oracle.concurrent import gather
 from digital_oracle.http import JsonHttpClient, UrllibJsonClient
 
 from .base import ProviderError, ProviderParseError, SignalProvider
 
+if TYPE_CHECKING:
+    from digital_oracle.edgarstore import EdgarStore, StoredResource
+
 EDGAR_SUBMISSIONS_URL = "https://data.sec.gov/submissions"
 EDGAR_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
 EDGAR_SEARCH_URL = "https://efts.sec.gov/LATEST/search-index"
+# A ticker missing from a fresh index triggers one early re-download at most
+# this often, so newly listed tickers appear without hammering the endpoint.
+_MISSING_TICKER_RECHECK_SECONDS = 600.0
 
 
 @dataclass(frozen=True)
@@ -55,6 +64,24 @@ class EdgarSearchHit:
     description: str
 
 
+def _parse_ticker_rows(data: Any) -> list[tuple[str, int, str]]:
+    """``company_tickers.json`` → ``[(TICKER, cik, title), ...]``."""
+    if not isinstance(data, Mapping):
+        raise ProviderParseError("expected company_tickers.json to be an object")
+    rows: list[tuple[str, int, str]] = []
+    for entry in data.values():
+        if not isinstance(entry, Mapping):
+            continue
+        ticker = str(entry.get("ticker", "")).upper()
+        try:
+            cik = int(entry.get("cik_str"))
+        except (TypeError, ValueError):
+            continue
+        if ticker:
+            rows.append((ticker, cik, str(entry.get("title", ""))))
+    return rows
+
+
 def _extract_description(source: Mapping[str, Any]) -> str:
     """Extract description from a search hit _source."""
     display_names = source.get("display_names")
@@ -74,6 +101,10 @@ class EdgarProvider(SignalProvider):
         self,
         http_client: JsonHttpClient | None = None,
         user_email: str | None = None,
+        *,
+        store: EdgarStore | None = None,
+        ticker_ttl_seconds: float = 86400.0,
+        submissions_ttl_seconds: float = 600.0,
     ):
         if http_client is None:
             # SEC EDGAR requires User-Agent with contact email to avoid 403.
@@ -84,34 +115,103 @@ class EdgarProvider(SignalProvider):
                 "User-Agent": ua,
             })
         self.http_client: JsonHttpClient = http_client
-        self._ticker_map: dict[str, dict[str, Any]] | None = None
+        self.store = store
+        self.ticker_ttl_seconds = ticker_ttl_seconds
+        self.submissions_ttl_seconds = submissions_ttl_seconds
+        self._ticker_map: dict[str, tuple[int, str]] | None = None
+        self._ticker_lock = threading.Lock()
+
+    def _conditional_get(
+        self, url: str, resource: StoredResource | None
+    ) -> tuple[Any, bytes, str | None, str | None] | None:
+        """Fetch *url*, revalidating against *resource*.
+
+        Returns ``None`` when the server answers ``304 Not Modified``, else
+        ``(payload, body, etag, last_modified)``.  Clients without
+        ``get_conditional`` (snapshot replay, test doubles) get a plain GET.
+        """
+        getter = getattr(self.http_client, "get_conditional", None)
+        if getter is None:
+            payload = self.http_client.get_json(url)
+            return payload, json.dumps(payload).encode("utf-8"), None, None
+        response = getter(
+            url,
+            etag=resource.etag if resource else None,
+            last_modified=resource.last_modified if resource else None,
+        )
+        if response.status == 304:
+            return None
+        try:
+            payload = json.loads(response.body)
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise ProviderParseError(f"invalid json payload: {url}") from exc
+        return payload, response.body, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    def _refresh_ticker_index(self, resource: StoredResource | None) -> None:
+        assert self.store is not None
+        fetched = self._conditional_get(EDGAR_TICKERS_URL, resource)
+        if fetched is None:
+            self.store.touch(EDGAR_TICKERS_URL)
+            return
+        payload, _body, etag, last_modified = fetched
+        self.store.replace_tickers(
+            EDGAR_TICKERS_URL, _parse_ticker_rows(payload), etag=etag, last_modified=last_modified
+        )
+
+    def _lookup_ticker(self, ticker: str) -> tuple[int, str] | None:
+        if self.store is None:
+            with self._ticker_lock:
+                if self._ticker_map is None:
+                    rows = _parse_ticker_rows(self.http_client.get_json(EDGAR_TICKERS_URL))
+                    self._ticker_map = {t: (cik, title) for t, cik, title in rows}
+            return self._ticker_map.get(ticker)
+
+        with self._ticker_lock:
+            resource = self.store.resource(EDGAR_TICKERS_URL)
+            age = None if resource is None else self.store.now() - resource.checked_at
+            if self.store.ticker_count() == 0:
+                # An empty table must not be revalidated: a 304 against a
+                # leftover ETag would keep it empty, so send no validators.
+                self._refresh_ticker_index(None)
+                age = 0.0
+            elif age is None or age >= self.ticker_ttl_seconds:
+                self._refresh_ticker_index(resource)
+                age = 0.0
+            found = self.store.lookup_ticker(ticker)
+            if found is None and age >= _MISSING_TICKER_RECHECK_SECONDS:
+                self._refresh_ticker_index(self.store.resource(EDGAR_TICKERS_URL))
+                found = self.store.lookup_ticker(ticker)
+        return found
 
     def _resolve_cik(self, ticker: str) -> tuple[str, str]:
         """Return (cik_padded, company_name) for a ticker."""
-        if self._ticker_map is None:
-            data = self.http_client.get_json(EDGAR_TICKERS_URL)
-            if not isinstance(data, Mapping):
-                raise ProviderParseError("expected company_tickers.json to be an object")
-            self._ticker_map = {}
-            for entry in data.values():
-                if not isinstance(entry, Mapping):
-                    continue
-                t = str(entry.get("ticker", "")).upper()
-                if t:
-                    self._ticker_map[t] = dict(entry)
-        ticker_upper = ticker.upper()
-        entry = self._ticker_map.get(ticker_upper)
+        entry = self._lookup_ticker(ticker.upper())
         if not entry:
             raise ProviderError(f"ticker not found: {ticker}")
-        cik = str(entry["cik_str"]).zfill(10)
-        return cik, str(entry.get("title", ""))
+        cik, title = entry
+        return str(cik).zfill(10), title
+
+    def _get_submissions(self, cik: str) -> Any:
+        url = f"{EDGAR_SUBMISSIONS_URL}/CIK{cik}.json"
+        if self.store is None:
+            return self.http_client.get_json(url)
+        stored = self.store.load_document(url)
+        if stored is not None and self.store.now() - stored[1].checked_at < self.submissions_ttl_seconds:
+            return stored[0]
+        fetched = self._conditional_get(url, stored[1] if stored is not None else None)
+        if fetched is None:
+            if stored is None:  # pragma: no cover - no validators were sent
+                raise ProviderParseError(f"unexpected 304 without a cached copy: {url}")
+            self.store.touch(url)
+            return stored[0]
+        payload, body, etag, last_modified = fetched
+        self.store.save_document(url, body, etag=etag, last_modified=last_modified)
+        return payload
 
     def get_insider_transactions(self, query: EdgarInsiderQuery) -> EdgarInsiderSummary:
         """Get recent Form 4 filings (insider transactions) for a company."""
         cik, company_name = self._resolve_cik(query.ticker)
-        submissions = self.http_client.get_json(
-            f"{EDGAR_SUBMISSIONS_URL}/CIK{cik}.json"
-        )
+        submissions = self._get_submissions(cik)
         if not isinstance(submissions, Mapping):
             raise ProviderParseError("expected submissions response to be an object")
 
@@ -157,6 +257,34 @@ class EdgarProvider(SignalProvider):
             total_form4_count=total_form4_count,
         )
 
+    def get_insider_transactions_batch(
+        self,
+        tickers: Iterable[str],
+        *,
+        limit: int = 20,
+        max_workers: int = 4,
+    ) -> dict[str, EdgarInsiderSummary]:
+        """Form 4 summaries for several tickers, fetched concurrently.
+
+        The default client's pool keeps all SEC hosts under one per-second
+        budget (see ``digital_oracle.ratelimit``).  Tickers that fail
+        are left out of the result; a :class:`ProviderError` is raised only
+        when every ticker fails.
+        """
+        wanted = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+        outcome = gather(
+            {
+                ticker: (lambda ticker=ticker: self.get_insider_transactions(EdgarInsiderQuery(ticker, limit)))
+                for ticker in wanted
+            },
+            max_workers=max(1, max_workers),
+        )
+        summaries = {ticker: outcome.results[ticker] for ticker in wanted if ticker in outcome.results}
+        if not summaries and wanted:
+            first_error = next(iter(outcome.errors.values()), None)
+            raise ProviderError(f"failed to fetch EDGAR insider filings for {wanted}: {first_error}")
+        return summaries
+
     def search_filings(self, query: EdgarSearchQuery) -> list[EdgarSearchHit]:
         """Full-text search across SEC filings."""
         params: dict[str, object] = {
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Mapping, Protocol
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from typing import Any, Iterator, Mapping, Protocol
 
+from digital_oracle.concurrent import Page, iter_pages
 from digital_oracle.http import JsonHttpClient, UrllibJsonClient
 
 from ._coerce import _coerce_float
@@ -49,6 +51,7 @@ class KalshiMarketQuery:
     series_ticker: str | None = None
     tickers: tuple[str, ...] = ()
     exclude_multivariate: bool = True
+    title_contains: str | None = None  # client-side filter on market title
 
 
 @dataclass
@@ -188,6 +191,39 @@ class KalshiProvider(SignalProvider):
 
     def list_markets(self, query: KalshiMarketQuery | None = None) -> list[KalshiMarket]:
         query = query or KalshiMarketQuery()
+        return self._filter_markets(query, self._fetch_market_page(query).items)
+
+    def iter_markets(
+        self,
+        query: KalshiMarketQuery | None = None,
+        *,
+        max_items: int | None = None,
+        page_size: int = 200,
+        max_pages: int | None = None,
+    ) -> Iterator[KalshiMarket]:
+        """Walk every page of ``/markets`` following the server cursor.
+
+        The next page is prefetched while the current one is consumed.  The
+        ``title_contains`` filter is applied per page and iteration stops as
+        soon as *max_items* matches were yielded.
+        """
+        query = query or KalshiMarketQuery()
+        first = replace(query, limit=page_size)
+
+        def fetch(cursor: str) -> Page[KalshiMarket, str]:
+            page = self._fetch_market_page(replace(first, cursor=cursor or None))
+            return Page(self._filter_markets(query, page.items), page.next_token)
+
+        matches = iter_pages(fetch, query.cursor or "", max_pages=max_pages)
+        return islice(matches, max_items) if max_items is not None else matches
+
+    def _filter_markets(self, query: KalshiMarketQuery, markets: list[KalshiMarket]) -> list[KalshiMarket]:
+        if query.title_contains:
+            needle = query.title_contains.strip().lower()
+            markets = [market for market in markets if needle in market.title.lower()]
+        return markets
+
+    def _fetch_market_page(self, query: KalshiMarketQuery) -> Page[KalshiMarket, str]:
         payload = self.http_client.get_json(
             f"{KALSHI_API_URL}/markets",
             params={
@@ -206,7 +242,8 @@ class KalshiProvider(SignalProvider):
             if not isinstance(raw, Mapping):
                 raise ProviderParseError("expected Kalshi market rows to be objects")
             markets.append(self._parse_market(raw))
-        return markets
+        cursor = payload.get("cursor") if isinstance(payload, Mapping) else None
+        return Page(markets, cursor if isinstance(cursor, str) and cursor and markets else None)
 
     def get_market(self, ticker: str) -> KalshiMarket:
         payload = self.http_client.get_json(f"{KALSHI_API_URL}/markets/{ticker}")
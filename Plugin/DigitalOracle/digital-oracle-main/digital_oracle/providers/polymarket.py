@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass, field
-from typing import Any, Mapping
+from itertools import islice
+from typing import Any, Iterator, Mapping
 
+from digital_oracle.concurrent import Page, iter_pages
 from digital_oracle.http import JsonHttpClient, UrllibJsonClient
 
 from ._coerce import _coerce_float, _coerce_int
@@ -193,7 +195,33 @@ class PolymarketProvider(SignalProvider):
 
     def list_events(self, query: PolymarketEventQuery | None = None) -> list[PolymarketEvent]:
         query = query or PolymarketEventQuery()
+        return self._filter_events(query, self._fetch_event_page(query, query.limit, query.offset))
 
+    def iter_events(
+        self,
+        query: PolymarketEventQuery | None = None,
+        *,
+        max_items: int | None = None,
+        page_size: int = 100,
+        max_pages: int | None = None,
+    ) -> Iterator[PolymarketEvent]:
+        """Walk ``/events`` page by page (offset pagination) from ``query.offset``.
+
+        The next page is prefetched while the current one is parsed and
+        filtered; ``slug_contains`` / ``title_contains`` are applied per page
+        and iteration stops once *max_items* matches were yielded.
+        """
+        query = query or PolymarketEventQuery()
+
+        def fetch(offset: int) -> Page[PolymarketEvent, int]:
+            raw_events = self._fetch_event_page(query, page_size, offset)
+            next_offset = offset + page_size if len(raw_events) >= page_size else None
+            return Page(self._filter_events(query, raw_events), next_offset)
+
+        matches = iter_pages(fetch, query.offset, max_pages=max_pages)
+        return islice(matches, max_items) if max_items is not None else matches
+
+    def _fetch_event_page(self, query: PolymarketEventQuery, limit: int, offset: int) -> list[PolymarketEvent]:
         # Determine server-side tag filter.
         # If tag_slug is explicitly set, use it directly.
         # If slug_contains is set but tag_slug is not, try it as a tag_slug
@@ -206,8 +234,8 @@ class PolymarketProvider(SignalProvider):
         payload = self.http_client.get_json(
             f"{GAMMA_BASE_URL}/events",
             params={
-                "limit": query.limit,
-                "offset": query.offset,
+                "limit": limit,
+                "offset": offset,
                 "active": query.active,
                 "closed": query.closed,
                 "order": _normalize_event_order(query.order),
@@ -219,8 +247,9 @@ class PolymarketProvider(SignalProvider):
         )
         if not isinstance(payload, list):
             raise ProviderParseError("expected events payload to be a list")
-        events = [self._parse_event(item) for item in payload]
+        return [self._parse_event(item) for item in payload]
 
+    def _filter_events(self, query: PolymarketEventQuery, events: list[PolymarketEvent]) -> list[PolymarketEvent]:
         # Client-side filtering: slug_contains matches against title and slug.
         if query.slug_contains:
             needle = query.slug_contains.strip().lower()
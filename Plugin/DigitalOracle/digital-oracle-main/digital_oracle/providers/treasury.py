@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import csv
+import math
+import operator
+from array import array
 from dataclasses import dataclass, field
 from datetime import date
+from functools import cached_property
 from io import StringIO
-from typing import Any, Mapping, Protocol
+from typing import Any, Iterator, Mapping, Protocol
 
+from digital_oracle.concurrent import gather
 from digital_oracle.http import JsonHttpClient, TextHttpClient, UrllibJsonClient
 
 from ._coerce import _coerce_float
-from .base import ProviderParseError, SignalProvider
+from .base import ProviderError, ProviderParseError, SignalProvider
 
 TREASURY_RATES_CSV_URL = (
     "https://home.treasury.gov/resource-center/data-chart-center/interest-rates/daily-treasury-rates.csv"
@@ -52,6 +57,58 @@ def _normalize_tenor_label(value: str) -> str:
     return normalized.replace(" ", "")
 
 
+# Maturity order for the standard tenors; anything else sorts after them.
+_TENOR_ORDER = {tenor: index for index, tenor in enumerate(TENOR_ALIASES.values())}
+
+
+def _iso_date(value: str) -> str:
+    """Treasury CSV dates are ``MM/DD/YYYY``; ISO dates pass through."""
+    parts = value.strip().split("/")
+    if len(parts) == 3:
+        month, day, year = parts
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+    return value.strip()[:10]
+
+
+def _fast_float(value: str) -> float:
+    """CSV cell -> float, NaN for blanks and ``N/A``."""
+    if not value:
+        return math.nan
+    try:
+        return float(value)
+    except ValueError:
+        coerced = _coerce_float(value)
+        return math.nan if coerced is None else coerced
+
+
+class _LazyCsvRow(Mapping[str, str]):
+    """Read-only ``column -> cell`` view over one CSV row.
+
+    Replaces the per-row ``dict`` copy kept in ``YieldCurveSnapshot.raw``:
+    the column index is shared by every row of a file and the cells stay in
+    the list ``csv.reader`` already produced.
+    """
+
+    __slots__ = ("_columns", "_values")
+
+    def __init__(self, columns: Mapping[str, int], values: list[str]):
+        self._columns = columns
+        self._values = values
+
+    def __getitem__(self, key: str) -> str:
+        index = self._columns[key]
+        return (self._values[index] if index < len(self._values) else "") or ""
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
 def _build_in_filter(field: str, values: tuple[str, ...]) -> str | None:
     if not values:
         return None
@@ -114,6 +171,117 @@ class YieldCurveQuery:
     curve_kind: str = "nominal"
 
 
+@dataclass(frozen=True)
+class YieldCurveRangeQuery:
+    """Daily curves between two ISO dates (inclusive), possibly spanning years."""
+
+    start_date: str
+    end_date: str | None = None  # defaults to today
+    curve_kind: str = "nominal"
+
+
+@dataclass(frozen=True)
+class InversionSummary:
+    """Inversion statistics for one spread series (counts are observations)."""
+
+    long_tenor: str
+    short_tenor: str
+    observations: int
+    inverted_observations: int
+    currently_inverted: bool | None
+    current_streak: int
+    current_streak_start: str | None
+    longest_streak: int
+    longest_streak_start: str | None
+    longest_streak_end: str | None
+
+
+@dataclass(eq=False)
+class YieldCurveHistory:
+    """Date × tenor yield matrix, oldest date first.
+
+    ``columns[tenor]`` is an ``array("d")`` aligned with ``dates`` (ISO
+    strings) holding percentages, NaN where the tenor was not published.
+    Spreads and inversion statistics are computed column-wise over the whole
+    history; ``numpy.frombuffer(history.columns["10Y"])`` gives a zero-copy
+    vector when NumPy is available.
+    """
+
+    curve_kind: str
+    dates: tuple[str, ...]
+    tenors: tuple[str, ...]
+    columns: dict[str, array]
+    failed_years: tuple[int, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def series(self, tenor: str) -> array:
+        target = _normalize_tenor_label(tenor)
+        column = self.columns.get(target)
+        if column is None:
+            return array("d", [math.nan]) * len(self.dates)
+        return column
+
+    def spread_series(self, long_tenor: str, short_tenor: str) -> array:
+        """``long - short`` for every date, in percentage points."""
+        return array("d", map(operator.sub, self.series(long_tenor), self.series(short_tenor)))
+
+    @cached_property
+    def spread_2s10s(self) -> array:
+        return self.spread_series("10Y", "2Y")
+
+    @cached_property
+    def spread_3m10y(self) -> array:
+        return self.spread_series("10Y", "3M")
+
+    def snapshot(self, index: int) -> YieldCurveSnapshot:
+        """One row as a :class:`YieldCurveSnapshot` (``date`` is ISO here)."""
+        points = tuple(
+            YieldPoint(tenor=tenor, value=self.columns[tenor][index])
+            for tenor in self.tenors
+            if not math.isnan(self.columns[tenor][index])
+        )
+        return YieldCurveSnapshot(curve_kind=self.curve_kind, date=self.dates[index], points=points)
+
+    @property
+    def latest(self) -> YieldCurveSnapshot | None:
+        return self.snapshot(len(self.dates) - 1) if self.dates else None
+
+    def inversion(self, long_tenor: str = "10Y", short_tenor: str = "2Y") -> InversionSummary:
+        """Share of inverted observations and the current / longest inversion runs."""
+        spread = self.spread_series(long_tenor, short_tenor)
+        observed = inverted = streak = longest = 0
+        streak_start = longest_start = longest_end = None
+        last_state: bool | None = None
+        for day, value in zip(self.dates, spread):
+            if math.isnan(value):
+                continue
+            observed += 1
+            last_state = value < 0
+            if last_state:
+                inverted += 1
+                if streak == 0:
+                    streak_start = day
+                streak += 1
+                if streak > longest:
+                    longest, longest_start, longest_end = streak, streak_start, day
+            else:
+                streak, streak_start = 0, None
+        return InversionSummary(
+            long_tenor=_normalize_tenor_label(long_tenor),
+            short_tenor=_normalize_tenor_label(short_tenor),
+            observations=observed,
+            inverted_observations=inverted,
+            currently_inverted=last_state,
+            current_streak=streak,
+            current_streak_start=streak_start,
+            longest_streak=longest,
+            longest_streak_start=longest_start,
+            longest_streak_end=longest_end,
+        )
+
+
 @dataclass
 class ExchangeRateRecord:
     record_date: str
@@ -150,18 +318,77 @@ class USTreasuryProvider(SignalProvider):
         if curve_type is None:
             raise ValueError(f"unsupported curve kind: {query.curve_kind}")
 
-        payload = self.http_client.get_text(
-            f"{TREASURY_RATES_CSV_URL}/{query.year}/all",
-            params={"type": curve_type},
-        )
+        payload = self._fetch_year_csv(query.year, curve_type)
         return self._parse_curve_csv(payload, curve_kind=query.curve_kind)
 
     def latest_yield_curve(self, query: YieldCurveQuery | None = None) -> YieldCurveSnapshot | None:
-        observations = self.list_yield_curve(query)
-        if not observations:
-            return None
-        # Treasury CSV is newest-first; take the first row as the latest.
-        return observations[0]
+        query = query or YieldCurveQuery()
+        curve_type = CURVE_KIND_TO_TYPE.get(query.curve_kind)
+        if curve_type is None:
+            raise ValueError(f"unsupported curve kind: {query.curve_kind}")
+
+        payload = self._fetch_year_csv(query.year, curve_type)
+        # Treasury CSV is newest-first; stop parsing after the first row.
+        return next(self._iter_curve_csv(payload, curve_kind=query.curve_kind), None)
+
+    def get_yield_curve_history(
+        self,
+        query: YieldCurveRangeQuery,
+        *,
+        max_workers: int = 4,
+    ) -> YieldCurveHistory:
+        """Daily curves for ``[start_date, end_date]``, one CSV per year fetched concurrently."""
+        curve_type = CURVE_KIND_TO_TYPE.get(query.curve_kind)
+        if curve_type is None:
+            raise ValueError(f"unsupported curve kind: {query.curve_kind}")
+        start = _iso_date(query.start_date)
+        end = _iso_date(query.end_date) if query.end_date else date.today().isoformat()
+        if end < start:
+            raise ValueError(f"end_date {end} is before start_date {start}")
+
+        years = list(range(int(start[:4]), int(end[:4]) + 1))
+        outcome = gather(
+            {
+                str(year): (lambda year=year: self._fetch_year_csv(year, curve_type))
+                for year in years
+            },
+            max_workers=max(1, min(max_workers, len(years))),
+        )
+        failed = tuple(year for year in years if str(year) not in outcome.results)
+        if len(failed) == len(years):
+            first_error = next(iter(outcome.errors.values()), None)
+            raise ProviderError(f"failed to fetch Treasury {query.curve_kind} curves: {first_error}")
+
+        dates: list[str] = []
+        tenors: list[str] = []
+        columns: dict[str, array] = {}
+        for year in years:
+            if year in failed:
+                continue
+            year_dates, year_columns = self._parse_curve_columns(outcome.results[str(year)])
+            # Each file is newest-first; keep the window and flip to oldest-first.
+            keep = [index for index, day in enumerate(year_dates) if start <= day <= end]
+            keep.reverse()
+            offset = len(dates)
+            dates.extend(year_dates[index] for index in keep)
+            for tenor, values in year_columns.items():
+                column = columns.get(tenor)
+                if column is None:
+                    column = columns[tenor] = array("d", [math.nan]) * offset
+                    tenors.append(tenor)
+                column.extend(values[index] for index in keep)
+            for tenor, column in columns.items():
+                if len(column) < len(dates):
+                    column.extend(array("d", [math.nan]) * (len(dates) - len(column)))
+
+        tenors.sort(key=lambda tenor: _TENOR_ORDER.get(tenor, len(_TENOR_ORDER)))
+        return YieldCurveHistory(
+            curve_kind=query.curve_kind,
+            dates=tuple(dates),
+            tenors=tuple(tenors),
+            columns=columns,
+            failed_years=failed,
+        )
 
     def list_exchange_rates(self, query: ExchangeRateQuery | None = None) -> list[ExchangeRateRecord]:
         query = query or ExchangeRateQuery()
@@ -198,33 +425,61 @@ class USTreasuryProvider(SignalProvider):
             )
         return records
 
-    def _parse_curve_csv(self, payload: str, *, curve_kind: str) -> list[YieldCurveSnapshot]:
-        reader = csv.DictReader(StringIO(payload))
-        if not reader.fieldnames or "Date" not in reader.fieldnames:
+    def _fetch_year_csv(self, year: int, curve_type: str) -> str:
+        return self.http_client.get_text(
+            f"{TREASURY_RATES_CSV_URL}/{year}/all",
+            params={"type": curve_type},
+        )
+
+    @staticmethod
+    def _open_curve_csv(payload: str) -> tuple[Iterator[list[str]], dict[str, int]]:
+        reader = csv.reader(StringIO(payload))
+        header = next(reader, None)
+        if not header or "Date" not in header:
             raise ProviderParseError("expected Treasury CSV to include a Date column")
+        return reader, {name: index for index, name in enumerate(header)}
 
-        points_columns = [field for field in reader.fieldnames if field != "Date"]
-        observations: list[YieldCurveSnapshot] = []
+    def _parse_curve_csv(self, payload: str, *, curve_kind: str) -> list[YieldCurveSnapshot]:
+        return list(self._iter_curve_csv(payload, curve_kind=curve_kind))
+
+    def _iter_curve_csv(self, payload: str, *, curve_kind: str) -> Iterator[YieldCurveSnapshot]:
+        reader, columns = self._open_curve_csv(payload)
+        date_index = columns["Date"]
+        point_columns = [
+            (index, _normalize_tenor_label(name)) for name, index in columns.items() if name != "Date"
+        ]
         for row in reader:
-            if not row:
-                continue
-            raw_date = row.get("Date")
-            if not raw_date:
+            if len(row) <= date_index or not row[date_index]:
                 continue
 
             points: list[YieldPoint] = []
-            for column in points_columns:
-                value = _coerce_float(row.get(column))
+            for index, tenor in point_columns:
+                value = _coerce_float(row[index]) if index < len(row) else None
                 if value is None:
                     continue
-                points.append(YieldPoint(tenor=_normalize_tenor_label(column), value=value))
-
-            observations.append(
-                YieldCurveSnapshot(
-                    curve_kind=curve_kind,
-                    date=str(raw_date),
-                    points=tuple(points),
-                    raw={key: value or "" for key, value in row.items()},
-                )
+                points.append(YieldPoint(tenor=tenor, value=value))
+
+            yield YieldCurveSnapshot(
+                curve_kind=curve_kind,
+                date=row[date_index],
+                points=tuple(points),
+                raw=_LazyCsvRow(columns, row),
             )
-        return observations
+
+    def _parse_curve_columns(self, payload: str) -> tuple[list[str], dict[str, array]]:
+        """Parse straight into per-tenor float columns (file order, ISO dates)."""
+        reader, columns = self._open_curve_csv(payload)
+        date_index = columns["Date"]
+        point_columns = [
+            (index, _normalize_tenor_label(name)) for name, index in columns.items() if name != "Date"
+        ]
+        dates: list[str] = []
+        values: dict[str, array] = {tenor: array("d") for _, tenor in point_columns}
+        for row in reader:
+            if len(row) <= date_index or not row[date_index]:
+                continue
+            dates.append(_iso_date(row[date_index]))
+            width = len(row)
+            for index, tenor in point_columns:
+                values[tenor].append(_fast_float(row[index]) if index < width else math.nan)
+        return dates, values
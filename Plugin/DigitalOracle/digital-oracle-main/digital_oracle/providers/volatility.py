@@ -0,0 +1,181 @@
+"""Strike × expiry implied-volatility surfaces shared by the options providers.
+
+``YFinanceProvider.get_surface`` and ``DeribitProvider.get_surface`` reduce
+each expiration to a :class:`VolatilitySlice` and assemble them with
+:func:`build_volatility_surface`.  Implied volatilities are fractions
+(0.25 = 25%) regardless of the source's native unit.
+
+Grid rows are stdlib ``array("d")`` with NaN for strikes that have no quote,
+so ``numpy.asarray(surface.call_iv)`` yields an ``(expiries, strikes)``
+matrix without copying through Python objects.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping
+
+
+@dataclass(frozen=True)
+class VolatilitySlice:
+    """Implied volatilities for a single expiration, keyed by strike."""
+
+    expiration: str
+    years_to_expiry: float | None
+    underlying_price: float | None
+    call_iv: Mapping[float, float] = field(default_factory=dict)
+    put_iv: Mapping[float, float] = field(default_factory=dict)
+
+    def _nearest(self, side: Mapping[float, float], target: float) -> float | None:
+        if not side:
+            return None
+        strike = min(side, key=lambda candidate: abs(candidate - target))
+        return side[strike]
+
+    @property
+    def atm_strike(self) -> float | None:
+        strikes = set(self.call_iv) | set(self.put_iv)
+        if not strikes or self.underlying_price is None:
+            return None
+        return min(strikes, key=lambda strike: abs(strike - self.underlying_price))
+
+    @property
+    def atm_iv(self) -> float | None:
+        """Average of call and put IV at the strike nearest the underlying."""
+        strike = self.atm_strike
+        if strike is None:
+            return None
+        ivs = [side[strike] for side in (self.call_iv, self.put_iv) if strike in side]
+        if not ivs:
+            return None
+        return sum(ivs) / len(ivs)
+
+    def skew(self, moneyness: float) -> float | None:
+        """Put IV at ``(1 - m)·S`` minus call IV at ``(1 + m)·S`` (nearest quoted strikes)."""
+        if self.underlying_price is None:
+            return None
+        put = self._nearest(self.put_iv, self.underlying_price * (1.0 - moneyness))
+        call = self._nearest(self.call_iv, self.underlying_price * (1.0 + moneyness))
+        if put is None or call is None:
+            return None
+        return put - call
+
+
+@dataclass(frozen=True)
+class TermStructurePoint:
+    """ATM IV and skew for one expiration of a :class:`VolatilitySurface`."""
+
+    expiration: str
+    years_to_expiry: float | None
+    atm_iv: float | None
+    skew: float | None
+
+
+@dataclass(eq=False)
+class VolatilitySurface:
+    """Implied-volatility grid across expirations (rows) and strikes (columns)."""
+
+    underlying: str
+    underlying_price: float | None
+    expirations: tuple[str, ...]
+    years_to_expiry: tuple[float | None, ...]
+    strikes: tuple[float, ...]
+    call_iv: tuple[array, ...]
+    put_iv: tuple[array, ...]
+    term_structure: tuple[TermStructurePoint, ...]
+    skew_moneyness: float = 0.1
+    failed_expirations: tuple[str, ...] = ()
+
+    def iv(self, expiration: str, strike: float, option_type: str = "otm") -> float | None:
+        """IV at an exact grid point.
+
+        ``option_type="otm"`` picks the put below the underlying and the call
+        at or above it, falling back to the other side when one is missing.
+        """
+        try:
+            row = self.expirations.index(expiration)
+            column = self.strikes.index(strike)
+        except ValueError:
+            return None
+        call = self.call_iv[row][column]
+        put = self.put_iv[row][column]
+        if option_type == "call":
+            candidates = (call,)
+        elif option_type == "put":
+            candidates = (put,)
+        elif self.underlying_price is not None and strike < self.underlying_price:
+            candidates = (put, call)
+        else:
+            candidates = (call, put)
+        for value in candidates:
+            if not math.isnan(value):
+                return value
+        return None
+
+    @property
+    def term_slope(self) -> float | None:
+        """Back-month minus front-month ATM IV (negative = inverted term structure)."""
+        ivs = [point.atm_iv for point in self.term_structure if point.atm_iv is not None]
+        if len(ivs) < 2:
+            return None
+        return ivs[-1] - ivs[0]
+
+    @property
+    def is_inverted(self) -> bool | None:
+        """``True`` when near-dated ATM IV exceeds far-dated (stress signal)."""
+        slope = self.term_slope
+        if slope is None:
+            return None
+        return slope < 0
+
+
+def build_volatility_surface(
+    underlying: str,
+    slices: Iterable[VolatilitySlice],
+    *,
+    skew_moneyness: float = 0.1,
+    failed_expirations: Iterable[str] = (),
+) -> VolatilitySurface:
+    """Assemble per-expiration slices into one :class:`VolatilitySurface`."""
+    ordered = sorted(
+        slices,
+        key=lambda item: (
+            item.years_to_expiry is None,
+            item.years_to_expiry or 0.0,
+            item.expiration,
+        ),
+    )
+    strikes = tuple(sorted({strike for item in ordered for strike in (*item.call_iv, *item.put_iv)}))
+    column = {strike: index for index, strike in enumerate(strikes)}
+
+    def _row(side: Mapping[float, float]) -> array:
+        row = array("d", [math.nan]) * len(strikes)
+        for strike, value in side.items():
+            row[column[strike]] = value
+        return row
+
+    underlying_price = next(
+        (item.underlying_price for item in ordered if item.underlying_price is not None), None
+    )
+    return VolatilitySurface(
+        underlying=underlying,
+        underlying_price=underlying_price,
+        expirations=tuple(item.expiration for item in ordered),
+        years_to_expiry=tuple(item.years_to_expiry for item in ordered),
+        strikes=strikes,
+        call_iv=tuple(_row(item.call_iv) for item in ordered),
+        put_iv=tuple(_row(item.put_iv) for item in ordered),
+        term_structure=tuple(
+            TermStructurePoint(
+                expiration=item.expiration,
+                years_to_expiry=item.years_to_expiry,
+                atm_iv=item.atm_iv,
+                skew=item.skew(skew_moneyness),
+            )
+            for item in ordered
+        ),
+        skew_moneyness=skew_moneyness,
+        failed_expirations=tuple(failed_expirations),
+    )
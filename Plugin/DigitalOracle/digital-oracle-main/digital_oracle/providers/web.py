@@ -1,30 +1,40 @@
 """Web search provider – fetches search snippets and page text via DuckDuckGo.
 
 Zero API keys required.  Uses DuckDuckGo HTML endpoint for search results
-and plain urllib for page fetching.  All parsing uses stdlib only
+and the shared keep-alive pool for page fetching, so both are paced by the
+per-host rate limiter (DDG gets one request every two seconds, see
+``digital_oracle.ratelimit``).  All parsing uses stdlib only
 (``html.parser``).
 """
 
 from __future__ import annotations
 
+import http.client
 import re
-import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from html.parser import HTMLParser
-from typing import Protocol
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+from html import unescape
+from typing import TYPE_CHECKING, Any, Protocol, Sequence
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from digital_oracle.http import (
+    ConnectionPool,
+    HttpClientError,
+    HttpResponse,
+    HttpStatusError,
+    default_connection_pool,
+)
+from digital_oracle.concurrent import gather
+from digital_oracle.ratelimit import THROTTLE_STATUSES, backoff_delay, parse_retry_after
+from digital_oracle.snapshots import _request_key
+from digital_oracle.telemetry import Span, default_telemetry
 
 from .base import ProviderError, SignalProvider
 
-
-# Global rate limiter for DDG searches to avoid CAPTCHA triggers.
-_ddg_lock = threading.Lock()
-_ddg_last_request: float = 0.0
-_DDG_MIN_INTERVAL: float = 2.0  # seconds between DDG requests
+if TYPE_CHECKING:
+    from digital_oracle.cache import ResponseCache
 
 # ---------------------------------------------------------------------------
 # Protocols
@@ -46,14 +56,30 @@ class SearchHttpClient(Protocol):
 
 @dataclass
 class UrllibSearchClient:
-    """urllib-based implementation of :class:`SearchHttpClient`."""
+    """Pooled implementation of :class:`SearchHttpClient`.
+
+    Retries connection errors and ``429``/``503`` with jittered exponential
+    backoff that honours ``Retry-After``.
+    """
 
     timeout_seconds: float = 20.0
     retry_attempts: int = 3
     retry_delay_seconds: float = 1.0
     user_agent: str = "digital-oracle/0.1"
+    pool: ConnectionPool | None = field(default=None, repr=False)
+    max_retry_after_seconds: float = 60.0
 
     def fetch(self, url: str, *, headers: dict[str, str] | None = None) -> str:
+        return self.fetch_capped(url, headers=headers)[0]
+
+    def fetch_capped(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        max_bytes: int | None = None,
+    ) -> tuple[str, bool]:
+        """Like :meth:`fetch`, but stop reading after *max_bytes*; return ``(text, truncated)``."""
         hdrs = {
             "User-Agent": self.user_agent,
             "Accept": "text/html,application/xhtml+xml,text/plain,*/*",
@@ -61,20 +87,70 @@ class UrllibSearchClient:
         }
         if headers:
             hdrs.update(headers)
-        req = Request(url, headers=hdrs)
+        response = self.request("GET", url, headers=hdrs, max_bytes=max_bytes)
+        charset = response.headers.get_content_charset() or "utf-8"
+        try:
+            text = response.body.decode(charset, errors="replace")
+        except LookupError:
+            text = response.body.decode("utf-8", errors="replace")
+        return text, response.truncated
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str],
+        body: bytes | None = None,
+        max_bytes: int | None = None,
+    ) -> HttpResponse:
+        with default_telemetry().span("http", urlsplit(url).hostname or "") as http_span:
+            response = self._request_with_retries(method, url, headers, body, max_bytes, http_span)
+            http_span.status = response.status
+            http_span.bytes = len(response.body)
+            return response
+
+    def _request_with_retries(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        body: bytes | None,
+        max_bytes: int | None,
+        http_span: Span,
+    ) -> HttpResponse:
+        pool = self.pool or default_connection_pool()
         last_error: Exception | None = None
         for attempt in range(1, self.retry_attempts + 1):
+            http_span.retries = attempt - 1
             try:
-                with urlopen(req, timeout=self.timeout_seconds) as resp:
-                    charset = resp.headers.get_content_charset() or "utf-8"
-                    return resp.read().decode(charset, errors="replace")
-            except HTTPError:
+                response = pool.request(
+                    method,
+                    url,
+                    headers=headers,
+                    body=body,
+                    timeout=self.timeout_seconds,
+                    max_body_bytes=max_bytes,
+                )
+            except HttpClientError:
                 raise
-            except (URLError, TimeoutError) as exc:
+            except (OSError, http.client.HTTPException) as exc:
                 last_error = exc
                 if attempt >= self.retry_attempts:
                     break
-                time.sleep(self.retry_delay_seconds)
+                time.sleep(backoff_delay(attempt, base=self.retry_delay_seconds))
+                continue
+            if response.status in THROTTLE_STATUSES and attempt < self.retry_attempts:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is None or retry_after <= self.max_retry_after_seconds:
+                    time.sleep(backoff_delay(attempt, base=self.retry_delay_seconds, retry_after=retry_after))
+                    continue
+            if response.status >= 400:
+                http_span.status = response.status
+                raise HttpStatusError(
+                    f"web fetch failed: {url}", status=response.status, headers=response.headers
+                )
+            return response
         raise ProviderError(f"web fetch failed: {url}") from last_error
 
 
@@ -83,39 +159,46 @@ class UrllibSearchClient:
 # ---------------------------------------------------------------------------
 
 
-class _TagStripper(HTMLParser):
-    """Minimal HTML → plain-text converter."""
+# Regex passes instead of an ``HTMLParser`` subclass: each pattern runs in C
+# over the whole document, several times faster than per-tag Python callbacks.
+_INVISIBLE_BLOCK = re.compile(
+    r"<(script|style|noscript|template|svg)\b[^>]*>.*?(?:</\1\s*>|\Z)", re.DOTALL | re.IGNORECASE
+)
+_COMMENT = re.compile(r"<!--.*?(?:-->|\Z)", re.DOTALL)
+_LINE_BREAK_TAG = re.compile(
+    r"<(?:br|hr|/title|/p|/div|/li|/tr|/h[1-6]|/section|/article|/blockquote|/pre|/table|/ul|/ol)\b[^>]*>",
+    re.IGNORECASE,
+)
+_ANY_TAG = re.compile(r"<[^>]*>")
+_INLINE_SPACE = re.compile(r"[ \t\r\f\v\u00a0]+")
+_TITLE = re.compile(r"<title[^>]*>(.*?)</title>", re.DOTALL | re.IGNORECASE)
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._pieces: list[str] = []
-        self._skip = False
 
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        if tag in ("script", "style", "noscript"):
-            self._skip = True
-
-    def handle_endtag(self, tag: str) -> None:
-        if tag in ("script", "style", "noscript"):
-            self._skip = False
-        if tag in ("p", "br", "div", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6"):
-            self._pieces.append("\n")
+def _html_to_text(html: str) -> str:
+    """Visible text of *html*, one line per block element, blank lines dropped."""
+    text = _COMMENT.sub("", html)
+    text = _INVISIBLE_BLOCK.sub("", text)
+    text = _LINE_BREAK_TAG.sub("\n", text)
+    text = unescape(_ANY_TAG.sub("", text))
+    lines = (_INLINE_SPACE.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
 
-    def handle_data(self, data: str) -> None:
-        if not self._skip:
-            self._pieces.append(data)
 
-    def get_text(self) -> str:
-        raw = "".join(self._pieces)
-        # Collapse whitespace but preserve paragraph breaks.
-        lines = (line.strip() for line in raw.splitlines())
-        return "\n".join(line for line in lines if line)
+def _html_title(html: str) -> str:
+    match = _TITLE.search(html)
+    return unescape(_ANY_TAG.sub("", match.group(1))).strip() if match else ""
 
 
-def _html_to_text(html: str) -> str:
-    parser = _TagStripper()
-    parser.feed(html)
-    return parser.get_text()
+def _resolve_result_url(href: str) -> str:
+    """Unwrap DDG's ``//duckduckgo.com/l/?uddg=<target>`` redirect links."""
+    if href.startswith("//"):
+        href = "https:" + href
+    parts = urlsplit(href)
+    if parts.hostname and parts.hostname.endswith("duckduckgo.com") and parts.path.startswith("/l/"):
+        target = parse_qs(parts.query).get("uddg")
+        if target:
+            return target[0]
+    return href
 
 
 class _DuckDuckGoParser(HTMLParser):
@@ -252,6 +335,7 @@ class WebPageQuery:
 
     url: str
     max_chars: int = 8000
+    max_bytes: int = 1_000_000  # stop reading the body after this many bytes
 
 
 @dataclass(frozen=True)
@@ -265,6 +349,36 @@ class WebPageContent:
     truncated: bool = False
 
 
+@dataclass(frozen=True)
+class WebResearchQuery:
+    """Query for :meth:`WebSearchProvider.research`: several searches plus their top pages."""
+
+    queries: tuple[str, ...]
+    max_results: int = 5
+    fetch_top: int = 2  # pages opened per query, de-duplicated across queries
+    max_chars: int = 4000
+    max_bytes: int = 1_000_000
+
+
+@dataclass(frozen=True)
+class WebResearchResult:
+    """Snippets for every query and the text of the pages opened."""
+
+    searches: tuple[WebSearchResult, ...]
+    pages: tuple[WebPageContent, ...]
+    errors: tuple[tuple[str, str], ...] = ()  # (query or url, message)
+
+    def text(self) -> str:
+        """Render snippets followed by page extracts for LLM consumption."""
+        blocks = [search.text() for search in self.searches]
+        for page in self.pages:
+            suffix = " [truncated]" if page.truncated else ""
+            blocks.append(f"Page: {page.title or page.url}\n    {page.url}{suffix}\n{page.text}\n")
+        for label, message in self.errors:
+            blocks.append(f"Error: {label}: {message}")
+        return "\n".join(blocks)
+
+
 # ---------------------------------------------------------------------------
 # Provider
 # ---------------------------------------------------------------------------
@@ -275,39 +389,58 @@ DDG_HTML_URL = "https://html.duckduckgo.com/html/"
 class WebSearchProvider(SignalProvider):
     """Search the web and fetch page content.  Zero API keys required.
 
-    Uses DuckDuckGo HTML search for snippets and plain urllib for page text.
+    Uses DuckDuckGo HTML search for snippets and the shared connection pool
+    for page text.  With a :class:`~digital_oracle.cache.ResponseCache`,
+    parsed search results and extracted page text are kept on disk under the
+    ``web_search`` / ``web_page`` policies.
     """
 
     provider_id = "web"
     display_name = "Web Search"
-    capabilities = ("search", "fetch_page")
-
-    def __init__(self, http_client: SearchHttpClient | None = None) -> None:
+    capabilities = ("search", "fetch_page", "research")
+
+    def __init__(
+        self,
+        http_client: SearchHttpClient | None = None,
+        *,
+        cache: ResponseCache | None = None,
+        refresh: bool = False,
+    ) -> None:
         self.http_client = http_client or UrllibSearchClient()
+        self.cache = cache
+        self.refresh = refresh
+
+    def _cached(self, namespace: str, key: str, loader: Any) -> Any:
+        if self.cache is None:
+            return loader()
+        return self.cache.fetch(key, namespace=namespace, loader=loader, refresh=self.refresh)
 
     # -- search ------------------------------------------------------------
 
     _CAPTCHA_MARKERS = ("challenge-form", "cc=botnet", "anomaly-modal", "Please try again")
     _MAX_RETRIES = 3
-    _RETRY_BACKOFF = 3.0  # seconds, multiplied by attempt number
+    _RETRY_BACKOFF = 3.0  # base of the jittered exponential backoff, seconds
 
     def search(self, query: WebSearchQuery | str) -> WebSearchResult:
         """Run a web search and return result snippets.
 
-        Includes global rate limiting (one DDG request at a time, with a
-        minimum interval) and CAPTCHA detection with retry/backoff so that
+        DDG requests are paced by the shared per-host rate limiter, and a
+        CAPTCHA page throttles that host and is retried with backoff, so
         concurrent ``gather()`` calls don't overwhelm DDG.
         """
         if isinstance(query, str):
             query = WebSearchQuery(query=query)
+        query_text = query.query
 
-        html = self._fetch_ddg(query.query)
-
-        raw_results = _parse_ddg_results(html)
+        raw_results = self._cached(
+            "web_search",
+            _request_key("web_search", DDG_HTML_URL, {"q": query_text}),
+            lambda: _parse_ddg_results(self._fetch_ddg(query_text)),
+        )
         snippets = tuple(
             WebSearchSnippet(
                 title=r.get("title", "").strip(),
-                url=r.get("url", "").strip(),
+                url=_resolve_result_url(r.get("url", "").strip()),
                 snippet=r.get("snippet", "").strip(),
             )
             for r in raw_results[: query.max_results]
@@ -334,47 +467,52 @@ class WebSearchProvider(SignalProvider):
         return False
 
     def _fetch_ddg(self, query_text: str) -> str:
-        """POST to DDG HTML with rate limiting and CAPTCHA retry."""
-        global _ddg_last_request  # noqa: PLW0603
+        """POST to DDG HTML through the rate-limited pool, with CAPTCHA retry."""
+        pool = getattr(self.http_client, "pool", None) or default_connection_pool()
+        form_data = urlencode({"q": query_text}).encode("utf-8")
+        headers = {
+            "User-Agent": "digital-oracle/0.1",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Accept": "text/html",
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+        host = urlsplit(DDG_HTML_URL).hostname or ""
 
         last_error: Exception | None = None
         for attempt in range(1, self._MAX_RETRIES + 1):
-            # -- Rate limit: serialise DDG requests across all threads ------
-            with _ddg_lock:
-                now = time.monotonic()
-                wait = _DDG_MIN_INTERVAL - (now - _ddg_last_request)
-                if wait > 0:
-                    time.sleep(wait)
-                _ddg_last_request = time.monotonic()
-
-            form_data = urlencode({"q": query_text}).encode("utf-8")
-            req = Request(
-                DDG_HTML_URL,
-                data=form_data,
-                headers={
-                    "User-Agent": "digital-oracle/0.1",
-                    "Content-Type": "application/x-www-form-urlencoded",
-                    "Accept": "text/html",
-                    "Accept-Language": "en-US,en;q=0.9",
-                },
-                method="POST",
-            )
             try:
-                with urlopen(req, timeout=20.0) as resp:
-                    html = resp.read().decode("utf-8", errors="replace")
-            except (HTTPError, URLError, TimeoutError) as exc:
+                response = pool.request("POST", DDG_HTML_URL, headers=headers, body=form_data, timeout=20.0)
+            except (OSError, http.client.HTTPException, HttpClientError) as exc:
                 last_error = exc
                 if attempt >= self._MAX_RETRIES:
                     break
-                time.sleep(self._RETRY_BACKOFF * attempt)
+                time.sleep(backoff_delay(attempt, base=self._RETRY_BACKOFF))
                 continue
 
+            if response.status >= 400:
+                last_error = HttpStatusError(
+                    f"web search failed: {query_text}", status=response.status, headers=response.headers
+                )
+                if attempt >= self._MAX_RETRIES:
+                    break
+                retry_after = (
+                    parse_retry_after(response.headers.get("Retry-After"))
+                    if response.status in THROTTLE_STATUSES
+                    else None
+                )
+                time.sleep(backoff_delay(attempt, base=self._RETRY_BACKOFF, retry_after=retry_after))
+                continue
+
+            html = response.body.decode("utf-8", errors="replace")
             if self._is_captcha(html):
+                # A CAPTCHA is DDG's "429": slow the host down for every caller.
+                if pool.rate_limiter is not None:
+                    pool.rate_limiter.record_throttle(host)
                 if attempt >= self._MAX_RETRIES:
                     raise ProviderError(
                         f"DDG CAPTCHA detected after {self._MAX_RETRIES} retries for: {query_text}"
                     )
-                time.sleep(self._RETRY_BACKOFF * attempt)
+                time.sleep(backoff_delay(attempt, base=self._RETRY_BACKOFF))
                 continue
 
             return html
@@ -384,26 +522,101 @@ class WebSearchProvider(SignalProvider):
     # -- fetch_page --------------------------------------------------------
 
     def fetch_page(self, query: WebPageQuery | str) -> WebPageContent:
-        """Fetch a URL and extract its text content."""
+        """Fetch a URL and extract its text content.
+
+        At most ``max_bytes`` of the body are read, so huge pages cost no
+        more than the prefix the caller can use.
+        """
         if isinstance(query, str):
             query = WebPageQuery(url=query)
-
-        html = self.http_client.fetch(query.url)
-
-        # Extract <title>
-        title_match = re.search(r"<title[^>]*>(.*?)</title>", html, re.DOTALL | re.IGNORECASE)
-        title = re.sub(r"<[^>]+>", "", title_match.group(1)).strip() if title_match else ""
-
-        text = _html_to_text(html)
-        truncated = False
+        url, max_bytes = query.url, query.max_bytes
+
+        def load() -> dict[str, Any]:
+            fetch_capped = getattr(self.http_client, "fetch_capped", None)
+            if fetch_capped is not None:
+                html, capped = fetch_capped(url, max_bytes=max_bytes)
+            else:
+                html, capped = self.http_client.fetch(url), False
+            return {
+                "title": _html_title(html),
+                "text": _html_to_text(html),
+                # The body cap was reached; the extracted text is a prefix.
+                "capped": capped,
+                "fetched_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+        page = self._cached("web_page", _request_key("web_page", url, {"max_bytes": max_bytes}), load)
+        text = page["text"]
+        truncated = bool(page["capped"])
         if len(text) > query.max_chars:
             text = text[: query.max_chars]
             truncated = True
 
         return WebPageContent(
-            url=query.url,
-            title=title,
+            url=url,
+            title=page["title"],
             text=text,
-            fetched_at=datetime.now(timezone.utc).isoformat(),
+            fetched_at=page["fetched_at"],
             truncated=truncated,
         )
+
+    # -- research ----------------------------------------------------------
+
+    def research(
+        self,
+        query: WebResearchQuery | Sequence[str],
+        *,
+        max_workers: int = 6,
+    ) -> WebResearchResult:
+        """Run several searches and open their top result pages concurrently.
+
+        Each query's pages are fetched as soon as its search returns, while
+        later searches still wait for their DDG slot.  Failed searches or
+        pages are reported in ``errors`` rather than raised.
+        """
+        if not isinstance(query, WebResearchQuery):
+            query = WebResearchQuery(queries=tuple(query))
+        queries = list(dict.fromkeys(text.strip() for text in query.queries if text.strip()))
+        claimed: set[str] = set()
+
+        def run(text: str) -> tuple[WebSearchResult, list[tuple[str, Any]]]:
+            result = self.search(WebSearchQuery(query=text, max_results=query.max_results))
+            urls = []
+            for snippet in result.snippets:
+                if len(urls) >= query.fetch_top:
+                    break
+                if snippet.url.startswith(("http://", "https://")) and snippet.url not in claimed:
+                    claimed.add(snippet.url)  # set.add is atomic; a rare duplicate fetch is harmless
+                    urls.append(snippet.url)
+            pages = gather(
+                {
+                    url: (
+                        lambda url=url: self.fetch_page(
+                            WebPageQuery(url=url, max_chars=query.max_chars, max_bytes=query.max_bytes)
+                        )
+                    )
+                    for url in urls
+                },
+                max_workers=max(1, max_workers),
+            )
+            return result, [(url, pages.results[url]) for url in urls if url in pages.results] + [
+                (url, pages.errors[url]) for url in urls if url in pages.errors
+            ]
+
+        outcome = gather({text: (lambda text=text: run(text)) for text in queries}, max_workers=max(1, len(queries)))
+
+        searches: list[WebSearchResult] = []
+        pages: list[WebPageContent] = []
+        errors: list[tuple[str, str]] = []
+        for text in queries:
+            if text in outcome.errors:
+                errors.append((text, str(outcome.errors[text])))
+                continue
+            result, fetched = outcome.results[text]
+            searches.append(result)
+            for url, item in fetched:
+                if isinstance(item, WebPageContent):
+                    pages.append(item)
+                else:
+                    errors.append((url, str(item)))
+        return WebResearchResult(searches=tuple(searches), pages=tuple(pages), errors=tuple(errors))
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Mapping, Protocol
+from typing import Any, Iterator, Mapping, Protocol
 
+from digital_oracle.concurrent import Page, iter_pages
 from digital_oracle.http import JsonHttpClient, UrllibJsonClient
 
-from ._coerce import _coerce_float
+from ._coerce import _coerce_float, _coerce_int
 from .base import ProviderParseError, SignalProvider
 
 WORLDBANK_BASE = "https://api.worldbank.org/v2"
@@ -49,23 +50,45 @@ class WorldBankProvider(SignalProvider):
         self.http_client = http_client or UrllibJsonClient()
 
     def get_indicator(self, query: WorldBankQuery) -> WorldBankResult:
+        """All observations for *query*, following every page (``per_page`` rows each)."""
+        points = tuple(self.iter_indicator(query))
+        indicator_name = (
+            points[0].indicator_name if points else query.indicator
+        )
+
+        return WorldBankResult(
+            indicator_id=query.indicator,
+            indicator_name=indicator_name,
+            points=points,
+        )
+
+    def iter_indicator(
+        self,
+        query: WorldBankQuery,
+        *,
+        max_pages: int | None = None,
+    ) -> Iterator[WorldBankDataPoint]:
+        """Stream observations page by page, prefetching the next page."""
+        return iter_pages(lambda page: self._fetch_page(query, page), 1, max_pages=max_pages)
+
+    def _fetch_page(self, query: WorldBankQuery, page: int) -> Page[WorldBankDataPoint, int]:
         countries_str = ";".join(query.countries)
         url = f"{WORLDBANK_BASE}/country/{countries_str}/indicator/{query.indicator}"
-        payload = self.http_client.get_json(
-            url,
-            params={
-                "format": "json",
-                "date": query.date_range,
-                "per_page": query.per_page,
-            },
-        )
+        params: dict[str, object] = {
+            "format": "json",
+            "date": query.date_range,
+            "per_page": query.per_page,
+        }
+        if page > 1:
+            params["page"] = page
+        payload = self.http_client.get_json(url, params=params)
 
         if not isinstance(payload, list) or len(payload) < 2:
             raise ProviderParseError(
                 "expected World Bank response to be a JSON array with [metadata, data]"
             )
 
-        _meta, data = payload[0], payload[1]
+        meta, data = payload[0], payload[1]
 
         if data is None:
             data = []
@@ -93,12 +116,5 @@ class WorldBankProvider(SignalProvider):
                 )
             )
 
-        indicator_name = (
-            points[0].indicator_name if points else query.indicator
-        )
-
-        return WorldBankResult(
-            indicator_id=query.indicator,
-            indicator_name=indicator_name,
-            points=tuple(points),
-        )
+        pages = _coerce_int(meta.get("pages")) if isinstance(meta, Mapping) else None
+        return Page(points, page + 1 if pages is not None and page < pages and data else None)
@@ -9,19 +9,47 @@ OHLCV price history.  Supports stocks, ETFs, futures, forex and indices.
 from __future__ import annotations
 
 import importlib
-import math
 import os
 import sys
-from dataclasses import dataclass, field
 from typing import Any, Protocol
 
-from .base import ProviderError, ProviderParseError, SignalProvider
-from .prices import PriceBar, PriceHistory, PriceHistoryQuery
+from ..barstore import BarColumns, BarStore, _date_ordinal
+from .base import SignalProvider
+from .prices import PriceHistory, PriceHistoryQuery
 
 # Map PriceHistoryQuery interval codes to yfinance interval strings
 _INTERVAL_MAP = {"d": "1d", "w": "1wk", "m": "1mo"}
 
 
+# yfinance period strings and the calendar days they are guaranteed to span
+_PERIOD_DAYS = (
+    ("5d", 7),
+    ("1mo", 30),
+    ("3mo", 90),
+    ("6mo", 180),
+    ("1y", 365),
+    ("2y", 730),
+    ("5y", 1825),
+    ("10y", 3650),
+)
+
+# Calendar days covered by one bar of each interval
+_INTERVAL_DAYS = {"d": 1, "w": 7, "m": 31}
+
+
+def _days_to_period(days: int) -> str:
+    """Smallest yfinance ``period`` spanning at least *days* calendar days."""
+    for period, span in _PERIOD_DAYS:
+        if days <= span:
+            return period
+    return "max"
+
+
+def _period_days(period: str) -> int | None:
+    """Calendar days spanned by *period*; ``None`` for ``"max"``."""
+    return dict(_PERIOD_DAYS).get(period)
+
+
 def _limit_to_period(limit: int | None, interval: str) -> str:
     """Convert a bar *limit* into a yfinance ``period`` string.
 
@@ -40,24 +68,7 @@ def _limit_to_period(limit: int | None, interval: str) -> str:
 
     # Add generous padding so we never under-fetch
     days = int(days * 1.5) + 10
-
-    if days <= 7:
-        return "5d"
-    if days <= 30:
-        return "1mo"
-    if days <= 90:
-        return "3mo"
-    if days <= 180:
-        return "6mo"
-    if days <= 365:
-        return "1y"
-    if days <= 730:
-        return "2y"
-    if days <= 1825:
-        return "5y"
-    if days <= 3650:
-        return "10y"
-    return "max"
+    return _days_to_period(days)
 
 
 # ---------------------------------------------------------------------------
@@ -112,18 +123,28 @@ class _YFinancePriceFetcher:
     ) -> list[dict[str, Any]]:
         t = self._yf.Ticker(symbol)
         df = t.history(period=period, interval=interval)
-
-        rows: list[dict[str, Any]] = []
-        for idx, row in df.iterrows():
-            d: dict[str, Any] = {"Date": idx}
-            for col in df.columns:
-                val = row[col]
-                if isinstance(val, float) and math.isnan(val):
-                    val = None
-                d[col] = val
-            rows.append(d)
+        if df.empty:
+            return []
+
+        # Convert column-wise instead of row by row: NaN -> None and the
+        # index -> ISO dates in bulk, then let pandas emit the records.
+        frame = df.astype(object).where(df.notna(), None)
+        rows: list[dict[str, Any]] = frame.to_dict("records")
+        for date_str, row in zip(df.index.strftime("%Y-%m-%d"), rows):
+            row["Date"] = date_str
         return rows
 
+    def fetch_columns(
+        self,
+        symbol: str,
+        *,
+        period: str,
+        interval: str,
+    ) -> BarColumns:
+        """Same download as :meth:`fetch_history`, converted straight to columns."""
+        t = self._yf.Ticker(symbol)
+        return BarColumns.from_frame(t.history(period=period, interval=interval))
+
 
 # ---------------------------------------------------------------------------
 # Provider
@@ -144,8 +165,16 @@ class YahooPriceProvider(SignalProvider):
     display_name = "Yahoo Finance Prices"
     capabilities = ("price_history",)
 
-    def __init__(self, *, fetcher: PriceFetcher | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        fetcher: PriceFetcher | None = None,
+        store: BarStore | None = None,
+        store_ttl_seconds: float = 300.0,
+    ) -> None:
         self._fetcher: PriceFetcher = fetcher or _YFinancePriceFetcher()
+        self.store = store
+        self.store_ttl_seconds = store_ttl_seconds
 
     def get_history(self, query: PriceHistoryQuery) -> PriceHistory:
         interval = query.interval.lower().strip()
@@ -156,55 +185,90 @@ class YahooPriceProvider(SignalProvider):
             )
 
         symbol = query.symbol.strip()
-        period = _limit_to_period(query.limit, interval)
-
-        raw_rows = self._fetcher.fetch_history(
-            symbol, period=period, interval=yf_interval
-        )
-
-        bars: list[PriceBar] = []
-        for row in raw_rows:
-            dt = row.get("Date")
-            if dt is None:
-                continue
-
-            # Format date as YYYY-MM-DD string
-            date_str = dt.strftime("%Y-%m-%d") if hasattr(dt, "strftime") else str(dt)[:10]
-
-            if query.start_date and date_str < query.start_date:
-                continue
-            if query.end_date and date_str > query.end_date:
-                continue
-
-            open_price = row.get("Open")
-            high_price = row.get("High")
-            low_price = row.get("Low")
-            close_price = row.get("Close")
-
-            if any(v is None for v in (open_price, high_price, low_price, close_price)):
-                continue
-
-            volume_raw = row.get("Volume")
-            volume = float(volume_raw) if volume_raw is not None else None
-
-            bars.append(
-                PriceBar(
-                    date=date_str,
-                    open=float(open_price),
-                    high=float(high_price),
-                    low=float(low_price),
-                    close=float(close_price),
-                    volume=volume,
-                )
+        metadata: dict[str, object] = {}
+        if self.store is None:
+            period = _limit_to_period(query.limit, interval)
+            columns = self._fetch_columns(symbol, period, yf_interval)
+        else:
+            columns, metadata["bar_store"] = self._stored_columns(
+                self.store, symbol, interval, yf_interval, query
             )
 
-        if query.limit is not None and query.limit >= 0:
-            bars = bars[-query.limit:]
-
+        window = columns.window(
+            start_date=query.start_date,
+            end_date=query.end_date,
+            limit=query.limit,
+        )
         return PriceHistory(
             symbol=symbol,
             raw_symbol=query.symbol,
             interval=interval,
             provider_id=self.provider_id,
-            bars=tuple(bars),
+            bars=window.to_bars(),
+            metadata=metadata,
+        )
+
+    def _fetch_columns(self, symbol: str, period: str, yf_interval: str) -> BarColumns:
+        fetch_columns = getattr(self._fetcher, "fetch_columns", None)
+        if fetch_columns is not None:
+            return fetch_columns(symbol, period=period, interval=yf_interval)
+        # Snapshot and test fetchers only return rows.
+        return BarColumns.from_rows(
+            self._fetcher.fetch_history(symbol, period=period, interval=yf_interval)
         )
+
+    # -- incremental store -------------------------------------------------
+
+    @staticmethod
+    def _needed_from(query: PriceHistoryQuery, interval: str, today: int) -> int:
+        """Earliest date ordinal *query* can touch (``1`` = full history)."""
+        if query.limit is None or query.limit <= 0:
+            return _date_ordinal(query.start_date) if query.start_date else 1
+        # Count back from end_date so historical windows are covered too.
+        anchor = min(today, _date_ordinal(query.end_date)) if query.end_date else today
+        span = _period_days(_limit_to_period(query.limit, interval))
+        needed = 1 if span is None else anchor - span
+        if query.start_date:
+            needed = max(needed, _date_ordinal(query.start_date))
+        return needed
+
+    def _stored_columns(
+        self,
+        store: BarStore,
+        symbol: str,
+        interval: str,
+        yf_interval: str,
+        query: PriceHistoryQuery,
+    ) -> tuple[BarColumns, str]:
+        """Serve *query* from the bar store, fetching only what is missing.
+
+        Returns the merged columns and how they were obtained: ``"hit"``
+        (fresh on disk), ``"delta"`` (bars since the last stored date) or
+        ``"full"`` (the store did not reach back far enough).
+        """
+        with store.lock_for(symbol, interval):
+            stored = store.load(symbol, interval)
+            today = store.today_ordinal()
+            needed = self._needed_from(query, interval, today)
+            last = stored.columns.last_ordinal
+
+            if last is None or stored.covered_from is None or stored.covered_from > needed:
+                period = "max" if needed <= 1 else _days_to_period(today - needed)
+                span = _period_days(period)
+                covered_from = 1 if span is None else today - span
+                if stored.covered_from is not None:
+                    covered_from = min(covered_from, stored.covered_from)
+                mode = "full"
+            else:
+                if store.age_seconds(stored) < self.store_ttl_seconds:
+                    return stored.columns, "hit"
+                # Re-fetch from the last stored bar: it may still be forming.
+                gap = today - last + _INTERVAL_DAYS[interval]
+                period = _days_to_period(gap + 1)
+                covered_from = stored.covered_from
+                mode = "delta"
+
+            fresh = self._fetch_columns(symbol, period, yf_interval)
+            merged = stored.columns.merge(fresh)
+            store.save(symbol, interval, merged, covered_from=covered_from)
+            return merged, mode
@@ -4,17 +4,26 @@ Requires ``yfinance``: ``pip install yfinance``
 
 This provider fetches US equity options chains from Yahoo Finance and computes
 Black-Scholes Greeks using only the Python standard library (``math.erf``).
+
+For large chains, :meth:`YFinanceProvider.get_chain_columns` returns an
+array-backed :class:`OptionsChainColumns` with vectorized Greeks and
+aggregates.  It needs NumPy, which is already a dependency of yfinance;
+:class:`OptionsChain` stays available via ``.to_chain()``.
 """
 
 from __future__ import annotations
 
 import math
+import time
 from dataclasses import dataclass, field
+from functools import cached_property
 from datetime import date, datetime
 from typing import Any, Protocol, Sequence
 
+from ..concurrent import gather
 from ._coerce import _coerce_float, _coerce_int
 from .base import ProviderError, ProviderParseError, SignalProvider
+from .volatility import VolatilitySlice, VolatilitySurface, build_volatility_surface
 
 
 # ---------------------------------------------------------------------------
@@ -91,6 +100,135 @@ def black_scholes_greeks(
     return OptionGreeks(delta=delta, gamma=gamma, theta=theta, vega=vega)
 
 
+def _import_numpy() -> Any:
+    try:
+        import numpy  # type: ignore[import-not-found]
+    except ImportError:
+        raise ImportError(
+            "numpy is required for columnar options analytics but is not installed.\n"
+            "It ships with yfinance; install it with:  uv pip install --target .deps yfinance"
+        )
+    return numpy
+
+
+def _norm_cdf_array(np: Any, x: Any) -> Any:
+    """Vectorized standard normal CDF (West, 2005; double precision).
+
+    NumPy has no ``erf`` ufunc, so this uses Hart's rational approximation,
+    which agrees with :func:`_norm_cdf` to ~1e-16.
+    """
+    xa = np.abs(x)
+    e = np.exp(-xa * xa / 2.0)
+    num = 3.52624965998911e-02 * xa + 0.700383064443688
+    for coeff in (6.37396220353165, 33.912866078383, 112.079291497871, 221.213596169931, 220.206867912376):
+        num = num * xa + coeff
+    den = 8.83883476483184e-02 * xa + 1.75566716318264
+    for coeff in (
+        16.064177579207,
+        86.7807322029461,
+        296.564248779674,
+        637.333633378831,
+        793.826512519948,
+        440.413735824752,
+    ):
+        den = den * xa + coeff
+    tail = xa + 0.65
+    for coeff in (4.0, 3.0, 2.0, 1.0):
+        tail = xa + coeff / tail
+    lower = np.where(xa < 7.07106781186547, e * num / den, e / tail / 2.506628274631)
+    lower = np.where(xa > 37.0, 0.0, lower)
+    return np.where(x > 0, 1.0 - lower, lower)
+
+
+def black_scholes_greeks_array(
+    S: float,
+    K: Any,
+    T: float,
+    r: float,
+    sigma: Any,
+    option_type: str,
+) -> dict[str, Any]:
+    """Vectorized :func:`black_scholes_greeks` over arrays of strikes and IVs.
+
+    Returns ``{"delta", "gamma", "theta", "vega"}`` NumPy arrays; entries
+    whose inputs are invalid (where the scalar version returns ``None``) are
+    NaN.
+    """
+    np = _import_numpy()
+    K = np.asarray(K, dtype=float)
+    sigma = np.asarray(sigma, dtype=float)
+    valid = (K > 0) & (sigma > 0) & (T > 0) & (S > 0)
+    nan = np.full(K.shape, np.nan)
+    if not valid.any():
+        return {"delta": nan, "gamma": nan.copy(), "theta": nan.copy(), "vega": nan.copy()}
+
+    k = np.where(valid, K, 1.0)
+    vol = np.where(valid, sigma, 1.0)
+    sqrt_T = math.sqrt(T) if T > 0 else 1.0
+    spot = S if S > 0 else 1.0
+    d1 = (np.log(spot / k) + (r + vol * vol / 2.0) * T) / (vol * sqrt_T)
+    d2 = d1 - vol * sqrt_T
+    pdf_d1 = np.exp(-d1 * d1 / 2.0) / math.sqrt(2.0 * math.pi)
+    discount = r * k * math.exp(-r * T)
+
+    gamma = pdf_d1 / (spot * vol * sqrt_T)
+    vega = spot * pdf_d1 * sqrt_T / 100.0
+    decay = -spot * pdf_d1 * vol / (2.0 * sqrt_T)
+    if option_type == "call":
+        delta = _norm_cdf_array(np, d1)
+        theta = (decay - discount * _norm_cdf_array(np, d2)) / 365.0
+    else:
+        delta = _norm_cdf_array(np, d1) - 1.0
+        theta = (decay + discount * _norm_cdf_array(np, -d2)) / 365.0
+
+    return {
+        "delta": np.where(valid, delta, np.nan),
+        "gamma": np.where(valid, gamma, np.nan),
+        "theta": np.where(valid, theta, np.nan),
+        "vega": np.where(valid, vega, np.nan),
+    }
+
+
+def _max_pain_from_pairs(
+    calls: Sequence[tuple[float, float]], puts: Sequence[tuple[float, float]]
+) -> float | None:
+    """Max pain over ``(strike, open_interest)`` pairs in O(n log n).
+
+    Writer payout at test strike *s* is ``s·ΣOI_c − Σ(OI_c·K_c)`` over calls
+    with ``K_c ≤ s`` plus ``Σ(OI_p·K_p) − s·ΣOI_p`` over puts with
+    ``K_p ≥ s``; both terms come from running sums over the sorted strikes.
+    Ties resolve to the lowest strike.
+    """
+    call_oi: dict[float, float] = {}
+    put_oi: dict[float, float] = {}
+    for strike, oi in calls:
+        call_oi[strike] = call_oi.get(strike, 0.0) + oi
+    for strike, oi in puts:
+        put_oi[strike] = put_oi.get(strike, 0.0) + oi
+    strikes = sorted(call_oi.keys() | put_oi.keys())
+    if not strikes:
+        return None
+
+    put_oi_above = sum(put_oi.values())
+    put_value_above = sum(strike * oi for strike, oi in put_oi.items())
+    call_oi_below = 0.0
+    call_value_below = 0.0
+    min_pain = float("inf")
+    max_pain_strike = strikes[0]
+    for strike in strikes:
+        call_oi_below += call_oi.get(strike, 0.0)
+        call_value_below += strike * call_oi.get(strike, 0.0)
+        pain = (strike * call_oi_below - call_value_below) + (
+            put_value_above - strike * put_oi_above
+        )
+        if pain < min_pain:
+            min_pain = pain
+            max_pain_strike = strike
+        put_oi_above -= put_oi.get(strike, 0.0)
+        put_value_above -= strike * put_oi.get(strike, 0.0)
+    return max_pain_strike
+
+
 # ---------------------------------------------------------------------------
 # Data models
 # ---------------------------------------------------------------------------
@@ -135,7 +273,11 @@ class OptionsExpirations:
 
 @dataclass
 class OptionsChain:
-    """Full options chain for a single expiration date."""
+    """Full options chain for a single expiration date.
+
+    Aggregates are computed once and cached on the instance; treat
+    ``calls`` / ``puts`` as immutable after construction.
+    """
 
     ticker: str
     expiration: str
@@ -145,7 +287,7 @@ class OptionsChain:
 
     # -- convenience properties ------------------------------------------
 
-    @property
+    @cached_property
     def atm_strike(self) -> float | None:
         """Strike nearest to the underlying price."""
         if self.underlying_price is None:
@@ -157,7 +299,7 @@ class OptionsChain:
             return None
         return min(all_strikes, key=lambda s: abs(s - self.underlying_price))
 
-    @property
+    @cached_property
     def atm_call(self) -> OptionContract | None:
         """Nearest ATM call."""
         strike = self.atm_strike
@@ -165,7 +307,7 @@ class OptionsChain:
             return None
         return next((c for c in self.calls if c.strike == strike), None)
 
-    @property
+    @cached_property
     def atm_put(self) -> OptionContract | None:
         """Nearest ATM put."""
         strike = self.atm_strike
@@ -173,7 +315,7 @@ class OptionsChain:
             return None
         return next((p for p in self.puts if p.strike == strike), None)
 
-    @property
+    @cached_property
     def atm_iv(self) -> float | None:
         """ATM implied volatility (average of ATM call and put IV)."""
         ivs = [
@@ -200,7 +342,7 @@ class OptionsChain:
             return None
         return (call_mid + put_mid) / self.underlying_price
 
-    @property
+    @cached_property
     def put_call_volume_ratio(self) -> float | None:
         """Total put volume / total call volume."""
         call_vol = sum(c.volume for c in self.calls if c.volume is not None)
@@ -209,7 +351,7 @@ class OptionsChain:
             return None
         return put_vol / call_vol
 
-    @property
+    @cached_property
     def put_call_oi_ratio(self) -> float | None:
         """Total put OI / total call OI."""
         call_oi = sum(c.open_interest for c in self.calls if c.open_interest is not None)
@@ -218,14 +360,14 @@ class OptionsChain:
             return None
         return put_oi / call_oi
 
-    @property
+    @cached_property
     def total_volume(self) -> int:
         """Total volume across all contracts."""
         return sum(c.volume for c in self.calls if c.volume is not None) + sum(
             p.volume for p in self.puts if p.volume is not None
         )
 
-    @property
+    @cached_property
     def total_open_interest(self) -> int:
         """Total open interest across all contracts."""
         return sum(
@@ -239,28 +381,294 @@ class OptionsChain:
         would pay out weighted by open interest and picks the strike that
         minimises the total.
         """
-        all_strikes = sorted({c.strike for c in self.calls} | {p.strike for p in self.puts})
-        if not all_strikes:
+        return self._max_pain_strike
+
+    @cached_property
+    def _max_pain_strike(self) -> float | None:
+        return _max_pain_from_pairs(
+            [(c.strike, float(c.open_interest or 0)) for c in self.calls],
+            [(p.strike, float(p.open_interest or 0)) for p in self.puts],
+        )
+
+
+@dataclass(eq=False)
+class OptionColumns:
+    """One side (calls or puts) of a chain as parallel NumPy arrays.
+
+    Numeric columns are ``float64``; missing values (and Greeks that could
+    not be computed) are NaN.  ``in_the_money`` uses 1.0 / 0.0 / NaN.
+    """
+
+    option_type: str
+    contract_symbol: tuple[str, ...]
+    strike: Any
+    last_price: Any
+    bid: Any
+    ask: Any
+    mid: Any
+    volume: Any
+    open_interest: Any
+    implied_volatility: Any
+    in_the_money: Any
+    delta: Any
+    gamma: Any
+    theta: Any
+    vega: Any
+
+    def __len__(self) -> int:
+        return len(self.contract_symbol)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: list[dict[str, Any]],
+        option_type: str,
+        *,
+        underlying: float | None,
+        T: float,
+        risk_free_rate: float,
+        compute_greeks: bool,
+    ) -> "OptionColumns":
+        """Build columns from fetcher rows, mirroring ``_parse_contracts``."""
+        np = _import_numpy()
+        symbols: list[str] = []
+        values: dict[str, list[float]] = {
+            name: []
+            for name in ("strike", "lastPrice", "bid", "ask", "volume", "openInterest", "impliedVolatility", "inTheMoney")
+        }
+        nan = math.nan
+        for row in rows:
+            strike = _coerce_float(row.get("strike"))
+            if strike is None:
+                continue
+            symbols.append(str(row.get("contractSymbol", "")))
+            values["strike"].append(strike)
+            for name in ("lastPrice", "bid", "ask", "impliedVolatility"):
+                number = _coerce_float(row.get(name))
+                values[name].append(nan if number is None else number)
+            for name in ("volume", "openInterest"):
+                integer = _coerce_int(row.get(name))
+                values[name].append(nan if integer is None else float(integer))
+            itm = row.get("inTheMoney")
+            values["inTheMoney"].append(nan if itm is None else float(bool(itm)))
+
+        arrays = {name: np.asarray(column, dtype=float) for name, column in values.items()}
+        bid, ask, iv = arrays["bid"], arrays["ask"], arrays["impliedVolatility"]
+        if compute_greeks and underlying is not None and T > 0:
+            greeks = black_scholes_greeks_array(
+                underlying, arrays["strike"], T, risk_free_rate, np.nan_to_num(iv, nan=0.0), option_type
+            )
+        else:
+            empty = np.full(len(symbols), np.nan)
+            greeks = {"delta": empty, "gamma": empty.copy(), "theta": empty.copy(), "vega": empty.copy()}
+
+        return cls(
+            option_type=option_type,
+            contract_symbol=tuple(symbols),
+            strike=arrays["strike"],
+            last_price=arrays["lastPrice"],
+            bid=bid,
+            ask=ask,
+            mid=(bid + ask) / 2.0,
+            volume=arrays["volume"],
+            open_interest=arrays["openInterest"],
+            implied_volatility=iv,
+            in_the_money=arrays["inTheMoney"],
+            **greeks,
+        )
+
+    def to_contracts(self, expiration: str) -> tuple[OptionContract, ...]:
+        """Materialize the dataclass view of this side."""
+
+        def _opt(value: float) -> float | None:
+            return None if math.isnan(value) else float(value)
+
+        def _opt_int(value: float) -> int | None:
+            return None if math.isnan(value) else int(value)
+
+        columns = zip(
+            self.contract_symbol,
+            self.strike.tolist(),
+            self.last_price.tolist(),
+            self.bid.tolist(),
+            self.ask.tolist(),
+            self.mid.tolist(),
+            self.volume.tolist(),
+            self.open_interest.tolist(),
+            self.implied_volatility.tolist(),
+            self.in_the_money.tolist(),
+            self.delta.tolist(),
+            self.gamma.tolist(),
+            self.theta.tolist(),
+            self.vega.tolist(),
+        )
+        contracts = []
+        for symbol, strike, last, bid, ask, mid, vol, oi, iv, itm, delta, gamma, theta, vega in columns:
+            greeks = None
+            if not math.isnan(delta):
+                greeks = OptionGreeks(delta=delta, gamma=gamma, theta=theta, vega=vega)
+            contracts.append(
+                OptionContract(
+                    contract_symbol=symbol,
+                    option_type=self.option_type,
+                    expiration=expiration,
+                    strike=strike,
+                    last_price=_opt(last),
+                    bid=_opt(bid),
+                    ask=_opt(ask),
+                    mid=_opt(mid),
+                    volume=_opt_int(vol),
+                    open_interest=_opt_int(oi),
+                    implied_volatility=_opt(iv),
+                    in_the_money=None if math.isnan(itm) else bool(itm),
+                    greeks=greeks,
+                )
+            )
+        return tuple(contracts)
+
+
+@dataclass(eq=False)
+class OptionsChainColumns:
+    """Array-backed options chain for a single expiration date.
+
+    Same analytics as :class:`OptionsChain`, computed with NumPy and cached
+    on first access.  :meth:`to_chain` returns (and caches) the dataclass
+    view for code that expects :class:`OptionContract` objects.
+    """
+
+    ticker: str
+    expiration: str
+    underlying_price: float | None
+    calls: OptionColumns
+    puts: OptionColumns
+
+    @cached_property
+    def atm_strike(self) -> float | None:
+        """Strike nearest to the underlying price."""
+        if self.underlying_price is None:
+            return None
+        strikes = self.calls.strike if len(self.calls) else self.puts.strike
+        if not len(strikes):
             return None
+        np = _import_numpy()
+        return float(strikes[int(np.argmin(np.abs(strikes - self.underlying_price)))])
 
-        min_pain = float("inf")
-        max_pain_strike = all_strikes[0]
+    def _atm_index(self, side: OptionColumns) -> int | None:
+        strike = self.atm_strike
+        if strike is None:
+            return None
+        np = _import_numpy()
+        hits = np.flatnonzero(side.strike == strike)
+        return int(hits[0]) if len(hits) else None
 
-        for test_strike in all_strikes:
-            total_pain = 0.0
-            for c in self.calls:
-                oi = c.open_interest or 0
-                intrinsic = max(test_strike - c.strike, 0.0)
-                total_pain += intrinsic * oi
-            for p in self.puts:
-                oi = p.open_interest or 0
-                intrinsic = max(p.strike - test_strike, 0.0)
-                total_pain += intrinsic * oi
-            if total_pain < min_pain:
-                min_pain = total_pain
-                max_pain_strike = test_strike
+    @cached_property
+    def atm_iv(self) -> float | None:
+        """ATM implied volatility (average of ATM call and put IV)."""
+        ivs = []
+        for side in (self.calls, self.puts):
+            index = self._atm_index(side)
+            if index is not None and not math.isnan(side.implied_volatility[index]):
+                ivs.append(float(side.implied_volatility[index]))
+        if not ivs:
+            return None
+        return sum(ivs) / len(ivs)
 
-        return max_pain_strike
+    def implied_move(self) -> float | None:
+        """ATM straddle implied move as a fraction of the underlying."""
+        call_index = self._atm_index(self.calls)
+        put_index = self._atm_index(self.puts)
+        if call_index is None or put_index is None or self.underlying_price is None:
+            return None
+
+        def _price(side: OptionColumns, index: int) -> float | None:
+            for column in (side.mid, side.last_price):
+                if not math.isnan(column[index]):
+                    return float(column[index])
+            return None
+
+        call_mid = _price(self.calls, call_index)
+        put_mid = _price(self.puts, put_index)
+        if call_mid is None or put_mid is None or self.underlying_price <= 0:
+            return None
+        return (call_mid + put_mid) / self.underlying_price
+
+    @cached_property
+    def _totals(self) -> dict[str, float]:
+        np = _import_numpy()
+        return {
+            "call_volume": float(np.nansum(self.calls.volume)),
+            "put_volume": float(np.nansum(self.puts.volume)),
+            "call_oi": float(np.nansum(self.calls.open_interest)),
+            "put_oi": float(np.nansum(self.puts.open_interest)),
+        }
+
+    @property
+    def put_call_volume_ratio(self) -> float | None:
+        """Total put volume / total call volume."""
+        totals = self._totals
+        if totals["call_volume"] == 0:
+            return None
+        return totals["put_volume"] / totals["call_volume"]
+
+    @property
+    def put_call_oi_ratio(self) -> float | None:
+        """Total put OI / total call OI."""
+        totals = self._totals
+        if totals["call_oi"] == 0:
+            return None
+        return totals["put_oi"] / totals["call_oi"]
+
+    @property
+    def total_volume(self) -> int:
+        """Total volume across all contracts."""
+        return int(self._totals["call_volume"] + self._totals["put_volume"])
+
+    @property
+    def total_open_interest(self) -> int:
+        """Total open interest across all contracts."""
+        return int(self._totals["call_oi"] + self._totals["put_oi"])
+
+    def max_pain(self) -> float | None:
+        """Max pain strike, via cumulative sums over the sorted strikes."""
+        return self._max_pain_strike
+
+    @cached_property
+    def _max_pain_strike(self) -> float | None:
+        np = _import_numpy()
+        strikes = np.union1d(self.calls.strike, self.puts.strike)
+        if not len(strikes):
+            return None
+
+        def _per_strike(side: OptionColumns) -> tuple[Any, Any]:
+            slots = np.searchsorted(strikes, side.strike)
+            oi = np.nan_to_num(side.open_interest, nan=0.0)
+            at = np.bincount(slots, weights=oi, minlength=len(strikes))
+            value = np.bincount(slots, weights=oi * side.strike, minlength=len(strikes))
+            return at, value
+
+        call_oi, call_value = _per_strike(self.calls)
+        put_oi, put_value = _per_strike(self.puts)
+        call_oi_below = np.cumsum(call_oi)
+        call_value_below = np.cumsum(call_value)
+        # Puts with strike >= s: total minus the exclusive prefix.
+        put_oi_above = put_oi.sum() - (np.cumsum(put_oi) - put_oi)
+        put_value_above = put_value.sum() - (np.cumsum(put_value) - put_value)
+        pain = (strikes * call_oi_below - call_value_below) + (put_value_above - strikes * put_oi_above)
+        return float(strikes[int(np.argmin(pain))])
+
+    def to_chain(self) -> OptionsChain:
+        """Dataclass view of this chain (built once, then cached)."""
+        return self._chain
+
+    @cached_property
+    def _chain(self) -> OptionsChain:
+        return OptionsChain(
+            ticker=self.ticker,
+            expiration=self.expiration,
+            underlying_price=self.underlying_price,
+            calls=self.calls.to_contracts(self.expiration),
+            puts=self.puts.to_contracts(self.expiration),
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -368,10 +776,18 @@ class YFinanceProvider(SignalProvider):
 
     provider_id = "yfinance"
     display_name = "Yahoo Finance Options"
-    capabilities = ("options_chain", "options_expirations", "greeks")
+    capabilities = ("options_chain", "options_expirations", "greeks", "volatility_surface")
 
-    def __init__(self, *, fetcher: OptionsFetcher | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        fetcher: OptionsFetcher | None = None,
+        surface_cache_seconds: float = 300.0,
+    ) -> None:
         self._fetcher: OptionsFetcher = fetcher or _YFinanceFetcher()
+        self.surface_cache_seconds = surface_cache_seconds
+        # (ticker, expiration) -> (monotonic fetch time, slice)
+        self._slice_cache: dict[tuple[str, str], tuple[float, VolatilitySlice]] = {}
 
     # -- public API --------------------------------------------------------
 
@@ -384,31 +800,9 @@ class YFinanceProvider(SignalProvider):
         """Fetch the options chain for a specific expiration.
 
         If *query.expiration* is ``None`` the nearest available expiration is
-        used.
+        used.  For large chains prefer :meth:`get_chain_columns`.
         """
-        ticker = query.ticker.upper()
-
-        # Determine expiration
-        expiration = query.expiration
-        if expiration is None:
-            exps = self._fetcher.fetch_expirations(ticker)
-            if not exps:
-                raise ProviderParseError(
-                    f"no options expirations found for {ticker}"
-                )
-            expiration = exps[0]
-
-        # Fetch raw data
-        raw = self._fetcher.fetch_chain(ticker, expiration)
-        underlying = self._fetcher.fetch_underlying_price(ticker)
-
-        # Time to expiration (years)
-        try:
-            exp_date = datetime.strptime(expiration, "%Y-%m-%d").date()
-            days_to_exp = (exp_date - date.today()).days
-            T = max(days_to_exp, 0) / 365.0
-        except ValueError:
-            T = 0.0
+        ticker, expiration, raw, underlying, T = self._fetch_raw(query)
 
         # Parse contracts
         calls = self._parse_contracts(
@@ -438,8 +832,158 @@ class YFinanceProvider(SignalProvider):
             puts=tuple(puts),
         )
 
+    def get_chain_columns(self, query: OptionsChainQuery) -> OptionsChainColumns:
+        """Fetch the options chain as an array-backed :class:`OptionsChainColumns`.
+
+        Requires NumPy.  Use ``.to_chain()`` for the dataclass view.
+        """
+        _import_numpy()
+        ticker, expiration, raw, underlying, T = self._fetch_raw(query)
+        return self._build_columns(query, ticker, expiration, raw, underlying, T)
+
+    def get_surface(
+        self,
+        ticker: str,
+        expirations: Sequence[str] | None = None,
+        *,
+        max_expirations: int = 8,
+        max_workers: int = 4,
+        skew_moneyness: float = 0.1,
+    ) -> VolatilitySurface:
+        """Build a strike × expiry IV surface for *ticker*.
+
+        Expirations (default: the nearest *max_expirations*) are fetched
+        concurrently on at most *max_workers* threads.  Each expiration's
+        slice is cached for ``surface_cache_seconds``, so widening the set
+        only fetches the new ones.  Expirations that fail to load are listed
+        in ``surface.failed_expirations``.
+        """
+        ticker = ticker.upper()
+        if expirations is None:
+            expirations = tuple(self._fetcher.fetch_expirations(ticker))[:max_expirations]
+        wanted = list(dict.fromkeys(expirations))
+        if not wanted:
+            raise ProviderParseError(f"no options expirations found for {ticker}")
+
+        now = time.monotonic()
+        slices: dict[str, VolatilitySlice] = {}
+        for expiration in wanted:
+            cached = self._slice_cache.get((ticker, expiration))
+            if cached is not None and now - cached[0] < self.surface_cache_seconds:
+                slices[expiration] = cached[1]
+        missing = [expiration for expiration in wanted if expiration not in slices]
+
+        failed: list[str] = []
+        if missing:
+            tasks: dict[str, Any] = {
+                expiration: (lambda expiration=expiration: self._fetcher.fetch_chain(ticker, expiration))
+                for expiration in missing
+            }
+            tasks["__underlying__"] = lambda: self._fetcher.fetch_underlying_price(ticker)
+            outcome = gather(tasks, max_workers=max(1, max_workers))
+            underlying = outcome.get_or("__underlying__", None)
+            for expiration in missing:
+                if expiration not in outcome.results:
+                    failed.append(expiration)
+                    continue
+                chain_slice = self._build_slice(expiration, outcome.results[expiration], underlying)
+                self._slice_cache[(ticker, expiration)] = (time.monotonic(), chain_slice)
+                slices[expiration] = chain_slice
+            if not slices:
+                first_error = next(iter(outcome.errors.values()), None)
+                raise ProviderError(f"failed to fetch any options expiration for {ticker}: {first_error}")
+
+        return build_volatility_surface(
+            ticker,
+            [slices[expiration] for expiration in wanted if expiration in slices],
+            skew_moneyness=skew_moneyness,
+            failed_expirations=failed,
+        )
+
     # -- internal ----------------------------------------------------------
 
+    @staticmethod
+    def _build_slice(expiration: str, raw: _ChainRows, underlying: float | None) -> VolatilitySlice:
+        try:
+            days_to_exp = (datetime.strptime(expiration, "%Y-%m-%d").date() - date.today()).days
+            years: float | None = max(days_to_exp, 0) / 365.0
+        except ValueError:
+            years = None
+
+        def _side(rows: list[dict[str, Any]]) -> dict[float, float]:
+            side: dict[float, float] = {}
+            for row in rows:
+                strike = _coerce_float(row.get("strike"))
+                iv = _coerce_float(row.get("impliedVolatility"))
+                if strike is not None and iv is not None and iv > 0:
+                    side[strike] = iv
+            return side
+
+        return VolatilitySlice(
+            expiration=expiration,
+            years_to_expiry=years,
+            underlying_price=underlying,
+            call_iv=_side(raw.calls),
+            put_iv=_side(raw.puts),
+        )
+
+    def _fetch_raw(
+        self, query: OptionsChainQuery
+    ) -> tuple[str, str, _ChainRows, float | None, float]:
+        ticker = query.ticker.upper()
+
+        # Determine expiration
+        expiration = query.expiration
+        if expiration is None:
+            exps = self._fetcher.fetch_expirations(ticker)
+            if not exps:
+                raise ProviderParseError(
+                    f"no options expirations found for {ticker}"
+                )
+            expiration = exps[0]
+
+        # Fetch raw data
+        raw = self._fetcher.fetch_chain(ticker, expiration)
+        underlying = self._fetcher.fetch_underlying_price(ticker)
+
+        # Time to expiration (years)
+        try:
+            exp_date = datetime.strptime(expiration, "%Y-%m-%d").date()
+            days_to_exp = (exp_date - date.today()).days
+            T = max(days_to_exp, 0) / 365.0
+        except ValueError:
+            T = 0.0
+
+        return ticker, expiration, raw, underlying, T
+
+    @staticmethod
+    def _build_columns(
+        query: OptionsChainQuery,
+        ticker: str,
+        expiration: str,
+        raw: _ChainRows,
+        underlying: float | None,
+        T: float,
+    ) -> OptionsChainColumns:
+        sides = {
+            option_type: OptionColumns.from_rows(
+                rows,
+                option_type,
+                underlying=underlying,
+                T=T,
+                risk_free_rate=query.risk_free_rate,
+                compute_greeks=query.compute_greeks,
+            )
+            for option_type, rows in (("call", raw.calls), ("put", raw.puts))
+        }
+        return OptionsChainColumns(
+            ticker=ticker,
+            expiration=expiration,
+            underlying_price=underlying,
+            calls=sides["call"],
+            puts=sides["put"],
+        )
+
     def _parse_contracts(
         self,
         rows: list[dict[str, Any]],
@@ -0,0 +1,272 @@
+"""Per-host token-bucket scheduling with adaptive backoff.
+
+Every request sent through :class:`~digital_oracle.http.ConnectionPool` or
+:class:`~digital_oracle.async_http.AsyncConnectionPool` first takes a token
+from the bucket of its host, so a dashboard fan-out runs each upstream as
+fast as its budget allows and no faster, while unrelated hosts proceed in
+parallel.
+
+Budgets are looked up by host suffix (``"sec.gov"`` covers ``www.``,
+``data.`` and ``efts.sec.gov``, which share one SEC limit); hosts without an
+entry use :data:`DEFAULT_BUDGET`.  Feedback is AIMD: a ``429``/``503`` halves
+the bucket's effective rate and blocks the host until ``Retry-After`` has
+passed (capped at ``max_pause_seconds``, the longest ``Retry-After`` the
+clients are willing to honour), and every successful response restores a
+slice of the configured rate.
+
+Clients retry throttled or failed requests after :func:`backoff_delay`,
+a jittered exponential delay that never undercuts ``Retry-After``.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping
+
+__all__ = [
+    "DEFAULT_BUDGET",
+    "DEFAULT_HOST_BUDGETS",
+    "HostBudget",
+    "HostRateLimiter",
+    "MAX_PAUSE_SECONDS",
+    "THROTTLE_STATUSES",
+    "backoff_delay",
+    "default_rate_limiter",
+    "parse_budgets",
+    "parse_retry_after",
+]
+
+# Statuses that mean "slow down" rather than "this request is wrong".
+THROTTLE_STATUSES = frozenset({429, 503})
+
+# Longest pause a single throttle response can impose on a host; matches the
+# clients' ``max_retry_after_seconds``, beyond which they give up instead of waiting.
+MAX_PAUSE_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class HostBudget:
+    """Sustained requests per second plus the burst allowed after idling."""
+
+    rate: float
+    burst: float = 1.0
+
+
+DEFAULT_BUDGET = HostBudget(rate=20.0, burst=20.0)
+
+DEFAULT_HOST_BUDGETS: dict[str, HostBudget] = {
+    # SEC fair-access policy: 10 requests/second per client across all hosts.
+    "sec.gov": HostBudget(8.0, 8.0),
+    # The HTML endpoint serves CAPTCHAs quickly when hit in parallel.
+    "duckduckgo.com": HostBudget(0.5, 1.0),
+    # Public API: roughly 30 calls/minute.
+    "api.coingecko.com": HostBudget(0.5, 5.0),
+    "www.deribit.com": HostBudget(20.0, 20.0),
+    "api.elections.kalshi.com": HostBudget(10.0, 10.0),
+    "polymarket.com": HostBudget(10.0, 10.0),
+    "publicreporting.cftc.gov": HostBudget(4.0, 4.0),
+    "www.cmegroup.com": HostBudget(2.0, 2.0),
+}
+
+
+def parse_retry_after(value: str | None, *, now: float | None = None) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    current = datetime.now(timezone.utc).timestamp() if now is None else now
+    return max(0.0, when.timestamp() - current)
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    base: float = 1.0,
+    cap: float = 30.0,
+    retry_after: float | None = None,
+) -> float:
+    """Full-jitter exponential delay before retry number *attempt* (1-based).
+
+    A server-provided ``Retry-After`` is a floor; a little jitter is added on
+    top so threads released by the same header do not return in lockstep.
+    """
+    ceiling = min(cap, base * (2 ** max(0, attempt - 1)))
+    if retry_after is not None:
+        return retry_after + random.uniform(0.0, min(base, ceiling))
+    return random.uniform(0.0, ceiling)
+
+
+def parse_budgets(spec: str) -> dict[str, HostBudget]:
+    """Parse ``"sec.gov=8/8,api.coingecko.com=0.5"`` (``host=rate[/burst]``)."""
+    budgets: dict[str, HostBudget] = {}
+    for item in spec.split(","):
+        host, sep, value = item.partition("=")
+        host = host.strip().lower()
+        if not sep or not host:
+            continue
+        rate_text, _, burst_text = value.partition("/")
+        try:
+            rate = float(rate_text)
+            burst = float(burst_text) if burst_text.strip() else max(1.0, rate)
+        except ValueError:
+            continue
+        budgets[host] = HostBudget(rate=rate, burst=burst)
+    return budgets
+
+
+class _Bucket:
+    __slots__ = ("budget", "rate", "tokens", "updated", "granted", "waited", "throttled")
+
+    def __init__(self, budget: HostBudget, now: float) -> None:
+        self.budget = budget
+        self.rate = budget.rate
+        self.tokens = budget.burst
+        # Refill reference time; in the future while the host is paused.
+        self.updated = now
+        self.granted = 0
+        self.waited = 0.0
+        self.throttled = 0
+
+
+class HostRateLimiter:
+    """Thread-safe token buckets keyed by host (or configured host suffix)."""
+
+    def __init__(
+        self,
+        budgets: Mapping[str, HostBudget] | None = None,
+        *,
+        default_budget: HostBudget | None = DEFAULT_BUDGET,
+        max_pause_seconds: float = MAX_PAUSE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.budgets = dict(DEFAULT_HOST_BUDGETS if budgets is None else budgets)
+        self.default_budget = default_budget
+        self.max_pause_seconds = max_pause_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+
+    def configure(self, budgets: Mapping[str, HostBudget]) -> None:
+        """Add or override budgets; buckets already in use pick them up immediately."""
+        with self._lock:
+            self.budgets.update({key.lower(): budget for key, budget in budgets.items()})
+            self._buckets.clear()
+
+    def bucket_key(self, host: str) -> str | None:
+        """Configured key governing *host*, the host itself, or ``None`` if unlimited."""
+        host = host.lower()
+        labels = host.split(".")
+        for index in range(len(labels) - 1):
+            suffix = ".".join(labels[index:])
+            if suffix in self.budgets:
+                return suffix
+        return host if self.default_budget is not None else None
+
+    def reserve(self, host: str) -> float:
+        """Take one token for *host*; return how long the caller must wait first."""
+        key = self.bucket_key(host)
+        if key is None:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(key, now)
+            if bucket.rate <= 0:
+                return 0.0
+            if now > bucket.updated:
+                bucket.tokens = min(bucket.budget.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+                bucket.updated = now
+            # Tokens may go negative: each waiter reserves its own future slot,
+            # so waiters are released one interval apart instead of all at once.
+            bucket.tokens -= 1.0
+            delay = (bucket.updated - now) + max(0.0, -bucket.tokens) / bucket.rate
+            bucket.granted += 1
+            bucket.waited += delay
+        return delay
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to *host* may start; return the time slept."""
+        delay = self.reserve(host)
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+    def record_throttle(self, host: str, retry_after: float | None = None) -> None:
+        """Upstream said slow down: halve the rate and pause the host.
+
+        The pause follows ``retry_after`` but never exceeds ``max_pause_seconds``:
+        an upstream asking for an hour must not park every later request to the
+        host, on every thread, for that long.
+        """
+        key = self.bucket_key(host)
+        if key is None:
+            return
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(key, now)
+            bucket.throttled += 1
+            bucket.rate = max(bucket.budget.rate / 8.0, bucket.rate / 2.0)
+            pause = retry_after if retry_after is not None else 1.0 / max(bucket.rate, 1e-6)
+            pause = min(pause, self.max_pause_seconds)
+            # Empty the bucket and start refilling only once the pause is over.
+            bucket.tokens = min(bucket.tokens, 0.0)
+            bucket.updated = max(bucket.updated, now + pause)
+
+    def record_success(self, host: str) -> None:
+        """Recover a tenth of the configured rate after a normal response."""
+        key = self.bucket_key(host)
+        if key is None:
+            return
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None and bucket.rate < bucket.budget.rate:
+                bucket.rate = min(bucket.budget.rate, bucket.rate + bucket.budget.rate / 10.0)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """``{key: {"granted", "waited_seconds", "throttled", "rate"}}`` per active bucket."""
+        with self._lock:
+            return {
+                key: {
+                    "granted": bucket.granted,
+                    "waited_seconds": round(bucket.waited, 3),
+                    "throttled": bucket.throttled,
+                    "rate": round(bucket.rate, 3),
+                }
+                for key, bucket in sorted(self._buckets.items())
+            }
+
+    def _bucket(self, key: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            budget = self.budgets.get(key) or self.default_budget or DEFAULT_BUDGET
+            bucket = self._buckets[key] = _Bucket(budget, now)
+        return bucket
+
+
+_default_limiter: HostRateLimiter | None = None
+_default_limiter_lock = threading.Lock()
+
+
+def default_rate_limiter() -> HostRateLimiter:
+    """Return the process-wide limiter used by the shared connection pools."""
+    global _default_limiter  # noqa: PLW0603
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = HostRateLimiter()
+        return _default_limiter
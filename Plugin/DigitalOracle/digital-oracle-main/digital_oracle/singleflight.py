@@ -0,0 +1,175 @@
+"""Request coalescing ("singleflight") for identical in-flight provider calls.
+
+When several ``gather`` workers ask for the same resource at the same moment
+(e.g. the macro dashboard's ``gold`` task and a ``GC=F`` risk asset), only the
+first caller reaches upstream; the others block until it finishes and receive
+the very same parsed result (or exception).  Nothing is retained once the
+call completes, so this is not a cache – pair it with
+``digital_oracle.cache`` for that.
+
+Requests are keyed by ``snapshots._request_key``, the same normalized key
+used for snapshot recording and the response cache.
+
+Shared results are the same object for every caller; providers only read the
+decoded payloads, so they must not be mutated in place.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Mapping, TypeVar
+
+from .barstore import BarColumns
+from .http import JsonHttpClient, TextHttpClient
+from .snapshots import _request_key
+
+T = TypeVar("T")
+
+__all__ = [
+    "SingleFlight",
+    "SingleFlightHttpClient",
+    "SingleFlightPriceFetcher",
+    "default_singleflight",
+]
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one execution."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run *fn* for *key*, or wait for the identical call already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.value
+
+    def stats(self) -> dict[str, int]:
+        """``executions`` reached upstream; ``shared`` were de-duplicated."""
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "shared": self.shared,
+                "in_flight": len(self._calls),
+            }
+
+    def attach(self, provider: Any) -> Any:
+        """Route *provider*'s HTTP client (or price fetcher) through this group.
+
+        Providers without a supported transport are returned unchanged.
+        """
+        client = getattr(provider, "http_client", None)
+        if client is not None and (hasattr(client, "get_json") or hasattr(client, "get_text")):
+            if not isinstance(client, SingleFlightHttpClient):
+                provider.http_client = SingleFlightHttpClient(client, group=self)
+            return provider
+        fetcher = getattr(provider, "_fetcher", None)
+        if fetcher is not None and hasattr(fetcher, "fetch_history"):
+            if not isinstance(fetcher, SingleFlightPriceFetcher):
+                provider._fetcher = SingleFlightPriceFetcher(fetcher, group=self)
+        return provider
+
+
+_default_group = SingleFlight()
+
+
+def default_singleflight() -> SingleFlight:
+    """Return the process-wide group, so separate provider instances coalesce too."""
+    return _default_group
+
+
+class SingleFlightHttpClient:
+    """``JsonHttpClient`` / ``TextHttpClient`` wrapper backed by a :class:`SingleFlight`."""
+
+    def __init__(
+        self,
+        client: JsonHttpClient | TextHttpClient,
+        *,
+        group: SingleFlight | None = None,
+    ) -> None:
+        self.client = client
+        self.group = group or default_singleflight()
+
+    def get_json(self, url: str, *, params: Mapping[str, object] | None = None) -> Any:
+        return self.group.do(
+            _request_key("json", url, params),
+            lambda: self.client.get_json(url, params=params),  # type: ignore[union-attr]
+        )
+
+    def get_text(self, url: str, *, params: Mapping[str, object] | None = None) -> str:
+        return self.group.do(
+            _request_key("text", url, params),
+            lambda: self.client.get_text(url, params=params),  # type: ignore[union-attr]
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+
+class SingleFlightPriceFetcher:
+    """``PriceFetcher`` wrapper that coalesces identical ``fetch_history`` / ``fetch_columns`` calls."""
+
+    def __init__(self, fetcher: Any, *, group: SingleFlight | None = None) -> None:
+        self.fetcher = fetcher
+        self.group = group or default_singleflight()
+
+    def fetch_history(self, symbol: str, *, period: str, interval: str) -> list[dict[str, Any]]:
+        return self.group.do(
+            _request_key("price_history", symbol, {"period": period, "interval": interval}),
+            lambda: self.fetcher.fetch_history(symbol, period=period, interval=interval),
+        )
+
+    def fetch_columns(self, symbol: str, *, period: str, interval: str) -> BarColumns:
+        fetch_columns = getattr(self.fetcher, "fetch_columns", None)
+        if fetch_columns is None:
+            return BarColumns.from_rows(self.fetch_history(symbol, period=period, interval=interval))
+        return self.group.do(
+            _request_key("price_columns", symbol, {"period": period, "interval": interval}),
+            lambda: fetch_columns(symbol, period=period, interval=interval),
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "fetcher":
+            raise AttributeError(name)
+        return getattr(self.fetcher, name)
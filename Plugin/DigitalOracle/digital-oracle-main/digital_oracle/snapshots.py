@@ -1,11 +1,29 @@
+"""HTTP response recording and replay.
+
+Two on-disk layouts are supported, picked from the path:
+
+* a directory of pretty-printed ``*.json`` envelopes, one per request, named
+  ``<kind>__<tail>__<sha1>.json`` (the historical format, easy to diff);
+* a single packed archive (any path ending in :data:`ARCHIVE_SUFFIX`):
+  an append-only log of zlib-compressed envelopes plus a ``.idx`` sidecar
+  mapping request key -> byte offset.
+
+Replay is lazy in both cases: only file names (directory) or the index
+(archive) are read up front, and a payload is decoded when it is requested.
+"""
+
 from __future__ import annotations
 
 import hashlib
 import json
+import os
+import struct
+import threading
+import zlib
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Iterator, Mapping
 from urllib.parse import urlparse
 
 from .http import JsonHttpClient, TextHttpClient, UrllibJsonClient
@@ -61,7 +79,7 @@ class SnapshotEnvelope:
     response: Any
     captured_at: str
 
-    def to_json(self) -> str:
+    def to_json(self, *, indent: int | None = 2) -> str:
         return json.dumps(
             {
                 "kind": self.kind,
@@ -70,22 +88,276 @@ class SnapshotEnvelope:
                 "captured_at": self.captured_at,
             },
             ensure_ascii=True,
-            indent=2,
+            indent=indent,
             sort_keys=True,
         )
 
 
+# Paths ending in this suffix are treated as packed archives.
+ARCHIVE_SUFFIX = ".snappack"
+
+_RECORD_MAGIC = b"DOS1"
+_RECORD_HEADER = struct.Struct("<4sII")
+_O_BINARY = getattr(os, "O_BINARY", 0)  # Windows: no newline translation
+
+
+class SnapshotArchive(Mapping[str, Any]):
+    """Single-file, append-only snapshot store with a key -> offset index.
+
+    Every record is ``<magic, key length, payload length>`` followed by the
+    UTF-8 request key and the zlib-compressed envelope JSON.  Appends are a
+    single ``os.write`` on an ``O_APPEND`` descriptor, so concurrent
+    recorders (threads or processes) never interleave records.  The
+    ``.idx`` sidecar is only an accelerator: when it does not account for
+    every byte of the archive, the record headers are rescanned (payloads
+    are skipped, not decoded) and the index is rewritten.
+
+    As a mapping it yields decoded ``response`` payloads; the latest record
+    for a key wins.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self._lock = threading.Lock()
+        self._offsets: dict[str, tuple[int, int]] = {}
+        self._reader: Any = None
+        self._load_index()
+
+    # -- mapping -------------------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        return self.envelope(key)["response"]
+
+    def get_entry(self, key: str) -> tuple[bool, Any]:
+        if key not in self._offsets:
+            return False, None
+        return True, self[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._offsets))
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    # -- records -------------------------------------------------------------
+
+    def envelope(self, key: str) -> dict[str, Any]:
+        """Decode the full stored envelope (``kind``, ``request``, ``response``, ...)."""
+        offset, size = self._offsets[key]
+        record = self._read_at(offset, size)
+        _magic, key_size, payload_size = _RECORD_HEADER.unpack_from(record)
+        start = _RECORD_HEADER.size + key_size
+        return json.loads(zlib.decompress(record[start : start + payload_size]))
+
+    def append(self, envelope: SnapshotEnvelope, key: str) -> None:
+        key_bytes = key.encode("utf-8")
+        payload = zlib.compress(envelope.to_json(indent=None).encode("utf-8"))
+        record = _RECORD_HEADER.pack(_RECORD_MAGIC, len(key_bytes), len(payload)) + key_bytes + payload
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | _O_BINARY, 0o644)
+            try:
+                os.write(fd, record)
+                offset = os.lseek(fd, 0, os.SEEK_CUR) - len(record)
+            finally:
+                os.close(fd)
+            self._offsets[key] = (offset, len(record))
+            self._append_index_line(offset, len(record), key)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    # -- internal ------------------------------------------------------------
+
+    def _read_at(self, offset: int, size: int) -> bytes:
+        with self._lock:
+            if self._reader is None:
+                self._reader = open(self.path, "rb")
+            self._reader.seek(offset)
+            return self._reader.read(size)
+
+    def _append_index_line(self, offset: int, size: int, key: str) -> None:
+        line = f"{offset}\t{size}\t{key}\n".encode("utf-8")
+        fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | _O_BINARY, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def _load_index(self) -> None:
+        try:
+            archive_size = self.path.stat().st_size
+        except OSError:
+            return
+        offsets: dict[str, tuple[int, int]] = {}
+        seen: dict[int, int] = {}
+        try:
+            with open(self.index_path, encoding="utf-8") as handle:
+                for line in handle:
+                    offset_text, size_text, key = line.rstrip("\n").split("\t", 2)
+                    offset, size = int(offset_text), int(size_text)
+                    seen[offset] = size
+                    previous = offsets.get(key)
+                    if previous is None or previous[0] < offset:
+                        offsets[key] = (offset, size)
+        except (OSError, ValueError):
+            seen = {}
+        if seen and sum(seen.values()) == archive_size:
+            self._offsets = offsets
+            return
+        self._offsets = self._scan()
+        self._rewrite_index()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        offsets: dict[str, tuple[int, int]] = {}
+        archive_size = self.path.stat().st_size
+        with open(self.path, "rb") as handle:
+            offset = 0
+            while offset + _RECORD_HEADER.size <= archive_size:
+                handle.seek(offset)
+                magic, key_size, payload_size = _RECORD_HEADER.unpack(handle.read(_RECORD_HEADER.size))
+                size = _RECORD_HEADER.size + key_size + payload_size
+                if magic != _RECORD_MAGIC or offset + size > archive_size:
+                    # Torn write from a crashed recorder: resync on the next record.
+                    handle.seek(offset + 1)
+                    found = handle.read().find(_RECORD_MAGIC)
+                    if found < 0:
+                        break
+                    offset += 1 + found
+                    continue
+                try:
+                    key = handle.read(key_size).decode("utf-8")
+                except UnicodeDecodeError:
+                    offset += 1
+                    continue
+                offsets[key] = (offset, size)
+                offset += size
+        return offsets
+
+    def _rewrite_index(self) -> None:
+        tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8", newline="\n") as handle:
+                for key, (offset, size) in sorted(self._offsets.items(), key=lambda item: item[1][0]):
+                    handle.write(f"{offset}\t{size}\t{key}\n")
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass  # read-only corpus: keep the in-memory index
+
+
+class _DirectorySnapshots(Mapping[str, Any]):
+    """Lazy view over a directory of ``*.json`` envelopes.
+
+    Only file names are listed at construction.  A lookup derives the
+    expected file name from the request key (the SHA-1 suffix written by
+    :class:`RecordingHttpClient`) and parses just that file.  Hand-named
+    fixtures are found by parsing every file once, on the first miss.
+    """
+
+    def __init__(self, snapshot_dir: Path):
+        self.snapshot_dir = snapshot_dir
+        self._files: list[Path] = sorted(snapshot_dir.rglob("*.json")) if snapshot_dir.exists() else []
+        self._by_name = {path.name: path for path in self._files}
+        self._by_key: dict[str, Path] | None = None
+        self._lock = threading.Lock()
+
+    def _full_index(self) -> dict[str, Path]:
+        with self._lock:
+            if self._by_key is None:
+                by_key: dict[str, Path] = {}
+                for path in self._files:
+                    loaded = _read_envelope(path)
+                    if loaded is not None:
+                        by_key[loaded[0]] = path
+                self._by_key = by_key
+            return self._by_key
+
+    def get_entry(self, key: str) -> tuple[bool, Any]:
+        try:
+            request = json.loads(key)
+            path = self._by_name.get(_snapshot_filename(request["kind"], request["url"], request["params"]))
+        except (ValueError, KeyError, TypeError):
+            path = None
+        loaded = _read_envelope(path) if path is not None else None
+        if loaded is None or loaded[0] != key:
+            path = self._full_index().get(key)
+            loaded = _read_envelope(path) if path is not None else None
+        if loaded is None or loaded[0] != key:
+            return False, None
+        return True, loaded[1].get("response")
+
+    def __getitem__(self, key: str) -> Any:
+        found, response = self.get_entry(key)
+        if not found:
+            raise KeyError(key)
+        return response
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._full_index()))
+
+    def __len__(self) -> int:
+        return len(self._full_index())
+
+
+def _read_envelope(path: Path) -> tuple[str, Mapping[str, Any]] | None:
+    """Parse one snapshot file into ``(request key, envelope)``."""
+    try:
+        payload = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(payload, Mapping):
+        return None
+    kind = payload.get("kind")
+    request = payload.get("request")
+    if not isinstance(kind, str) or not isinstance(request, Mapping):
+        return None
+    url = request.get("url")
+    params = request.get("params")
+    if not isinstance(url, str):
+        return None
+    if params is not None and not isinstance(params, Mapping):
+        return None
+    key = _request_key(kind, url, params if isinstance(params, Mapping) else None)
+    return key, payload
+
+
+def _is_archive_path(path: Path) -> bool:
+    return path.name.endswith(ARCHIVE_SUFFIX)
+
+
 class RecordingHttpClient:
+    """Record every response to a snapshot directory or packed archive.
+
+    *snapshot_dir* may also be a path ending in :data:`ARCHIVE_SUFFIX` (or a
+    :class:`SnapshotArchive`), in which case records are appended to that
+    archive instead of written as individual files.
+    """
+
     def __init__(
         self,
-        snapshot_dir: str | Path,
+        snapshot_dir: str | Path | SnapshotArchive,
         *,
         json_client: JsonHttpClient | None = None,
         text_client: TextHttpClient | None = None,
     ):
         default_client = UrllibJsonClient()
-        self.snapshot_dir = Path(snapshot_dir)
-        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.archive: SnapshotArchive | None = None
+        if isinstance(snapshot_dir, SnapshotArchive):
+            self.archive = snapshot_dir
+            self.snapshot_dir = snapshot_dir.path
+        elif _is_archive_path(Path(snapshot_dir)):
+            self.archive = SnapshotArchive(snapshot_dir)
+            self.snapshot_dir = self.archive.path
+        else:
+            self.snapshot_dir = Path(snapshot_dir)
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
         self.json_client = json_client or default_client
         self.text_client = text_client or default_client
 
@@ -116,50 +388,64 @@ class RecordingHttpClient:
             response=response,
             captured_at=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         )
+        if self.archive is not None:
+            self.archive.append(envelope, _request_key(kind, url, params))
+            return
         path = self.snapshot_dir / _snapshot_filename(kind, url, params)
-        path.write_text(envelope.to_json())
+        # Write-then-rename so a concurrent replay never reads a partial file.
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(envelope.to_json())
+        os.replace(tmp, path)
 
 
 class ReplayHttpClient:
-    def __init__(self, snapshot_dir: str | Path):
-        self.snapshot_dir = Path(snapshot_dir)
-        self.snapshots: dict[str, Any] = {}
-        self._load_snapshots()
+    """Serve responses from a snapshot directory or packed archive, lazily."""
+
+    def __init__(self, snapshot_dir: str | Path | SnapshotArchive):
+        if isinstance(snapshot_dir, SnapshotArchive):
+            self.snapshot_dir = snapshot_dir.path
+            self.snapshots: Mapping[str, Any] = snapshot_dir
+        else:
+            self.snapshot_dir = Path(snapshot_dir)
+            if _is_archive_path(self.snapshot_dir):
+                self.snapshots = SnapshotArchive(self.snapshot_dir)
+            else:
+                self.snapshots = _DirectorySnapshots(self.snapshot_dir)
+
+    def _lookup(self, key: str) -> tuple[bool, Any]:
+        return self.snapshots.get_entry(key)  # type: ignore[attr-defined]
 
     def get_json(self, url: str, *, params: Mapping[str, object] | None = None) -> Any:
-        key = _request_key("json", url, params)
-        if key not in self.snapshots:
+        found, response = self._lookup(_request_key("json", url, params))
+        if not found:
             raise SnapshotMissError(f"missing json snapshot for {url} {dict(_normalize_params(params))}")
-        return self.snapshots[key]
+        return response
 
     def get_text(self, url: str, *, params: Mapping[str, object] | None = None) -> str:
-        key = _request_key("text", url, params)
-        if key not in self.snapshots:
+        found, response = self._lookup(_request_key("text", url, params))
+        if not found:
             raise SnapshotMissError(f"missing text snapshot for {url} {dict(_normalize_params(params))}")
-        response = self.snapshots[key]
         if not isinstance(response, str):
             raise SnapshotMissError(f"snapshot for {url} is not a text payload")
         return response
 
-    def _load_snapshots(self) -> None:
-        if not self.snapshot_dir.exists():
-            return
-        for path in sorted(self.snapshot_dir.rglob("*.json")):
-            try:
-                payload = json.loads(path.read_text())
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(payload, Mapping):
-                continue
-            kind = payload.get("kind")
-            request = payload.get("request")
-            if not isinstance(kind, str) or not isinstance(request, Mapping):
-                continue
-            url = request.get("url")
-            params = request.get("params")
-            if not isinstance(url, str):
-                continue
-            if params is not None and not isinstance(params, Mapping):
-                continue
-            key = _request_key(kind, url, params if isinstance(params, Mapping) else None)
-            self.snapshots[key] = payload.get("response")
+
+def pack_snapshots(snapshot_dir: str | Path, archive_path: str | Path) -> SnapshotArchive:
+    """Convert a directory of ``*.json`` snapshots into a packed archive."""
+    archive = SnapshotArchive(archive_path)
+    for path in sorted(Path(snapshot_dir).rglob("*.json")):
+        loaded = _read_envelope(path)
+        if loaded is None:
+            continue
+        key, payload = loaded
+        envelope = SnapshotEnvelope(
+            kind=payload["kind"],
+            request={
+                "url": payload["request"]["url"],
+                "params": _normalize_params(payload["request"].get("params")),
+            },
+            response=payload.get("response"),
+            captured_at=str(payload.get("captured_at", "")),
+        )
+        archive.append(envelope, key)
+    return archive
@@ -0,0 +1,384 @@
+"""Latency, size and error instrumentation for HTTP calls, providers and tasks.
+
+Hooks elsewhere in the package open a :class:`Span` around each unit of
+work:
+
+* ``http``      one :class:`~digital_oracle.http.UrllibJsonClient` or
+                :class:`~digital_oracle.async_http.AsyncJsonClient` request
+                (named by host), including its retries and body size;
+* ``parse``     decoding the JSON body of that request;
+* ``provider``  one public ``SignalProvider`` call, e.g. ``yahoo.get_history``;
+* ``task``      one :func:`~digital_oracle.concurrent.gather` task, by label;
+* ``cache``     a :class:`~digital_oracle.cache.ResponseCache` lookup
+                (``cache_hit`` tells hit from miss).
+
+Finished spans go to three places:
+
+* process-wide aggregates on :class:`Telemetry`, exported by
+  :meth:`Telemetry.prometheus_text` or :meth:`Telemetry.summary`;
+* listeners, e.g. :class:`JsonLinesSink` writing one JSON line per span;
+* every :class:`CallTrace` opened with :meth:`Telemetry.trace` in the
+  current context.  ``gather`` copies the caller's context into its worker
+  threads, so one trace sees the spans of a whole fan-out.
+
+A :class:`JsonLinesSink` file written by several processes can be folded
+back into one :class:`Telemetry` with :func:`load_json_lines`.
+
+Recording a span takes a lock and a few additions.  Set
+``Telemetry.enabled = False`` to turn the hooks into no-ops.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import json
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+__all__ = [
+    "LATENCY_BUCKETS",
+    "CallTrace",
+    "JsonLinesSink",
+    "Span",
+    "Telemetry",
+    "default_telemetry",
+    "load_json_lines",
+    "span",
+    "traced",
+]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Histogram bucket upper bounds in seconds (Prometheus ``le`` labels).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Recent durations kept per series for p50/p95.
+_RECENT_SAMPLES = 512
+
+
+@dataclass
+class Span:
+    """One timed unit of work; hooks fill in the counters before it closes."""
+
+    kind: str
+    name: str
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    bytes: int = 0
+    retries: int = 0
+    status: int | None = None
+    cache_hit: bool | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        record: dict[str, Any] = {
+            "ts": round(self.started_at, 3),
+            "kind": self.kind,
+            "name": self.name,
+            "duration_ms": round(self.duration * 1000.0, 3),
+        }
+        for key in ("bytes", "retries"):
+            value = getattr(self, key)
+            if value:
+                record[key] = value
+        for key in ("status", "cache_hit", "error"):
+            value = getattr(self, key)
+            if value is not None:
+                record[key] = value
+        return record
+
+    @classmethod
+    def from_dict(cls, record: dict[str, Any]) -> "Span":
+        """Inverse of :meth:`to_dict`."""
+        return cls(
+            kind=str(record["kind"]),
+            name=str(record["name"]),
+            started_at=float(record.get("ts", 0.0)),
+            duration=float(record.get("duration_ms", 0.0)) / 1000.0,
+            bytes=int(record.get("bytes", 0)),
+            retries=int(record.get("retries", 0)),
+            status=record.get("status"),
+            cache_hit=record.get("cache_hit"),
+            error=record.get("error"),
+        )
+
+
+class _Series:
+    __slots__ = ("count", "errors", "total", "max", "bytes", "retries", "cache_hits", "cache_misses", "buckets", "recent")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.buckets = [0] * bucket_count
+        self.recent: deque[float] = deque(maxlen=_RECENT_SAMPLES)
+
+    def observe(self, span: Span, bounds: tuple[float, ...]) -> None:
+        self.count += 1
+        self.total += span.duration
+        self.max = max(self.max, span.duration)
+        self.bytes += span.bytes
+        self.retries += span.retries
+        if span.error is not None:
+            self.errors += 1
+        if span.cache_hit is True:
+            self.cache_hits += 1
+        elif span.cache_hit is False:
+            self.cache_misses += 1
+        for index, bound in enumerate(bounds):
+            if span.duration <= bound:
+                self.buckets[index] += 1
+                break
+        self.recent.append(span.duration)
+
+    def quantile(self, q: float) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total * 1000.0, 1),
+            "p50_ms": round(self.quantile(0.5) * 1000.0, 1),
+            "p95_ms": round(self.quantile(0.95) * 1000.0, 1),
+            "max_ms": round(self.max * 1000.0, 1),
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+
+def _summarize(series: dict[tuple[str, str], _Series]) -> dict[str, dict[str, Any]]:
+    return {f"{kind}:{name}": entry.as_dict() for (kind, name), entry in sorted(series.items())}
+
+
+class CallTrace:
+    """Spans recorded in one context (one plugin call), across gather threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.spans: list[Span] = []
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Per ``"kind:name"`` aggregates of the spans seen so far."""
+        series: dict[tuple[str, str], _Series] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for item in spans:
+            entry = series.get((item.kind, item.name))
+            if entry is None:
+                entry = series[(item.kind, item.name)] = _Series(len(LATENCY_BUCKETS))
+            entry.observe(item, LATENCY_BUCKETS)
+        return _summarize(series)
+
+
+_current_traces: contextvars.ContextVar[tuple[CallTrace, ...]] = contextvars.ContextVar(
+    "digital_oracle_traces", default=()
+)
+
+
+class JsonLinesSink:
+    """Listener appending one JSON object per finished span to *path*."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = self.path.open("a", encoding="utf-8", buffering=1)
+
+    def __call__(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class Telemetry:
+    """Thread-safe span aggregation, listeners and per-context traces."""
+
+    def __init__(self, *, enabled: bool = True, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._listeners: list[Callable[[Span], None]] = []
+
+    @contextlib.contextmanager
+    def span(self, kind: str, name: str) -> Iterator[Span]:
+        """Time the block; an escaping exception is recorded as the span's error."""
+        current = Span(kind=kind, name=name)
+        if not self.enabled:
+            yield current
+            return
+        started = time.perf_counter()
+        try:
+            yield current
+        except BaseException as exc:
+            if current.error is None:
+                current.error = type(exc).__name__
+            raise
+        finally:
+            current.duration = time.perf_counter() - started
+            self.record(current)
+
+    def record(self, span: Span) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._observe(span)
+            listeners = list(self._listeners)
+        for trace in _current_traces.get():
+            trace.add(span)
+        for listener in listeners:
+            try:
+                listener(span)
+            except Exception:  # noqa: BLE001 - a broken sink must not fail the request
+                pass
+
+    @contextlib.contextmanager
+    def trace(self) -> Iterator[CallTrace]:
+        """Collect every span finished in this context until the block exits."""
+        collected = CallTrace()
+        token = _current_traces.set((*_current_traces.get(), collected))
+        try:
+            yield collected
+        finally:
+            _current_traces.reset(token)
+
+    def add_listener(self, listener: Callable[[Span], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Span], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Process-wide aggregates per ``"kind:name"``."""
+        with self._lock:
+            return _summarize(self._series)
+
+    def prometheus_text(self, prefix: str = "digital_oracle") -> str:
+        """Aggregates in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(
+                (key, entry.count, entry.errors, entry.total, entry.bytes, entry.retries,
+                 entry.cache_hits, entry.cache_misses, list(entry.buckets))
+                for key, entry in self._series.items()
+            )
+        duration = f"{prefix}_duration_seconds"
+        lines = [f"# HELP {duration} Wall time per call.", f"# TYPE {duration} histogram"]
+        counters = {
+            "errors": "Calls that raised.",
+            "bytes": "Response bytes received.",
+            "retries": "Retried attempts.",
+            "cache_hits": "Cache lookups served from the cache.",
+            "cache_misses": "Cache lookups that went upstream.",
+        }
+        counter_lines: dict[str, list[str]] = {name: [] for name in counters}
+        for (kind, name), count, errors, total, size, retries, hits, misses, buckets in items:
+            labels = f'kind="{_escape_label(kind)}",name="{_escape_label(name)}"'
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, buckets):
+                cumulative += bucket
+                lines.append(f'{duration}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{duration}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{duration}_sum{{{labels}}} {total:.6f}")
+            lines.append(f"{duration}_count{{{labels}}} {count}")
+            for metric, value in (("errors", errors), ("bytes", size), ("retries", retries), ("cache_hits", hits), ("cache_misses", misses)):
+                if value:
+                    counter_lines[metric].append(f"{prefix}_{metric}_total{{{labels}}} {value}")
+        for metric, help_text in counters.items():
+            if counter_lines[metric]:
+                lines.append(f"# HELP {prefix}_{metric}_total {help_text}")
+                lines.append(f"# TYPE {prefix}_{metric}_total counter")
+                lines.extend(counter_lines[metric])
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _observe(self, span: Span) -> None:
+        entry = self._series.get((span.kind, span.name))
+        if entry is None:
+            entry = self._series[(span.kind, span.name)] = _Series(len(self.buckets))
+        entry.observe(span, self.buckets)
+
+
+def load_json_lines(path: str | Path, *, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Telemetry:
+    """Aggregate every span in a :class:`JsonLinesSink` file.
+
+    The returned recorder is detached: loading fires no listeners and adds
+    nothing to open traces.  Unreadable lines (e.g. a torn final write) are
+    skipped; a missing file gives an empty recorder.
+    """
+    telemetry = Telemetry(buckets=buckets)
+    try:
+        handle = Path(path).open("r", encoding="utf-8")
+    except FileNotFoundError:
+        return telemetry
+    with handle, telemetry._lock:
+        for line in handle:
+            try:
+                telemetry._observe(Span.from_dict(json.loads(line)))
+            except (ValueError, KeyError, TypeError):
+                continue
+    return telemetry
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_default_telemetry = Telemetry()
+
+
+def default_telemetry() -> Telemetry:
+    """Return the process-wide recorder the built-in hooks report to."""
+    return _default_telemetry
+
+
+def span(kind: str, name: str) -> contextlib.AbstractContextManager[Span]:
+    """Shorthand for ``default_telemetry().span(kind, name)``."""
+    return _default_telemetry.span(kind, name)
+
+
+def traced(kind: str, name: str) -> Callable[[F], F]:
+    """Decorator recording each call of the function as a span."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _default_telemetry.span(kind, name):
+                return fn(*args, **kwargs)
+
+        wrapper.__digital_oracle_traced__ = True  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -1,12 +1,18 @@
+import argparse
 import json
 import os
+import socketserver
 import sys
+import threading
+import time
 import traceback
-from dataclasses import asdict, is_dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields as dataclass_fields, is_dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Mapping
 from urllib.parse import urlparse
 import re
+import sqlite3
 
 
 CURRENT_DIR = Path(__file__).resolve().parent
@@ -22,6 +28,7 @@ from digital_oracle import (  # noqa: E402
     CftcCotQuery,
     CoinGeckoPriceQuery,
     CoinGeckoProvider,
+    DependencyError,
     DeribitFuturesCurveQuery,
     DeribitOptionChainQuery,
     DeribitProvider,
@@ -35,14 +42,31 @@ from digital_oracle import (  # noqa: E402
     PolymarketProvider,
     PriceHistoryQuery,
     USTreasuryProvider,
+    WebPageQuery,
+    WebResearchQuery,
     WebSearchProvider,
     WorldBankProvider,
     WorldBankQuery,
     YahooPriceProvider,
     YFinanceProvider,
     YieldCurveQuery,
+    YieldCurveRangeQuery,
     gather,
 )
+from digital_oracle.barstore import BarStore  # noqa: E402
+from digital_oracle.cache import ResponseCache  # noqa: E402
+from digital_oracle.catalog import MarketCatalog  # noqa: E402
+from digital_oracle.edgarstore import EdgarStore  # noqa: E402
+from digital_oracle.http import connection_pool_stats  # noqa: E402
+from digital_oracle.prefetch import PrefetchJob, PrefetchScheduler, SignalStore  # noqa: E402
+from digital_oracle.ratelimit import default_rate_limiter, parse_budgets  # noqa: E402
+from digital_oracle.singleflight import default_singleflight  # noqa: E402
+from digital_oracle.telemetry import CallTrace, JsonLinesSink, default_telemetry, load_json_lines  # noqa: E402
+
+try:  # 可选：装了 orjson 时用它序列化，比标准库 json 快数倍
+    import orjson
+except ImportError:  # pragma: no cover - 可选依赖
+    orjson = None
 
 
 def normalize_proxy_url() -> str | None:
@@ -82,6 +106,40 @@ def configure_proxy_from_env() -> None:
     os.environ["https_proxy"] = proxy_url
 
 
+def configure_rate_limits_from_env() -> None:
+    """DIGITAL_ORACLE_RATE_LIMITS="sec.gov=8/8,api.coingecko.com=0.5/5" 覆盖各上游的每秒请求预算。"""
+    spec = os.environ.get("DIGITAL_ORACLE_RATE_LIMITS", "").strip()
+    if spec:
+        default_rate_limiter().configure(parse_budgets(spec))
+
+
+_telemetry_sink: JsonLinesSink | None = None
+
+
+def configure_telemetry_from_env() -> None:
+    """DIGITAL_ORACLE_TELEMETRY=off 关闭计时钩子；DIGITAL_ORACLE_TELEMETRY_FILE 按 JSON 行追加每个 span。"""
+    global _telemetry_sink  # noqa: PLW0603
+    telemetry = default_telemetry()
+    telemetry.enabled = telemetry_mode() != "off"
+    path = os.environ.get("DIGITAL_ORACLE_TELEMETRY_FILE", "").strip()
+    if path and telemetry.enabled and _telemetry_sink is None:
+        try:
+            _telemetry_sink = JsonLinesSink(path)
+        except OSError:
+            return
+        telemetry.add_listener(_telemetry_sink)
+
+
+def telemetry_mode() -> str:
+    # off：不计时；on（默认）：只做进程内聚合；append：每次调用结果后附耗时统计。
+    mode = os.environ.get("DIGITAL_ORACLE_TELEMETRY", "").strip().lower()
+    if mode in {"0", "false", "off", "no"}:
+        return "off"
+    if mode in {"append", "result"}:
+        return "append"
+    return "on"
+
+
 def read_stdin_json() -> dict[str, Any]:
     raw = sys.stdin.read().strip()
     if not raw:
@@ -124,6 +182,13 @@ def coerce_int(value: Any, default: int) -> int:
     return int(value)
 
 
+def coerce_float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
 def coerce_tuple(value: Any) -> tuple[str, ...]:
     if value is None:
         return ()
@@ -154,22 +219,244 @@ def coerce_json_object(value: Any) -> dict[str, Any]:
     raise ValueError("params/json 参数必须是 JSON 对象。")
 
 
-def simplify(value: Any) -> Any:
-    if is_dataclass(value):
-        return simplify(asdict(value))
-    if isinstance(value, dict):
-        return {str(k): simplify(v) for k, v in value.items()}
+def simplify(
+    value: Any,
+    *,
+    include_raw: bool = False,
+    fields: Mapping[str, Any] | None = None,
+    max_items: int | None = None,
+) -> Any:
+    """把 provider 返回的数据类转成可序列化的 dict/list。
+
+    直接遍历数据类字段，不经过 ``asdict`` 的整树深拷贝；数据类上的 ``raw``
+    字段（上游原始响应）默认不输出。``fields`` 是 :func:`parse_fields` 得到的
+    投影树，只保留命中的键；``max_items`` 按结构截断列表，只保留前 N 行并注明省略数量。
+    """
+    if is_dataclass(value) and not isinstance(value, type):
+        items = (
+            (field.name, getattr(value, field.name))
+            for field in dataclass_fields(value)
+            if field.name != "raw" or include_raw or (fields is not None and "raw" in fields)
+        )
+        return _simplify_items(items, include_raw, fields, max_items)
+    if isinstance(value, Mapping):
+        return _simplify_items(((str(k), v) for k, v in value.items()), include_raw, fields, max_items)
     if isinstance(value, (list, tuple, set)):
-        return [simplify(v) for v in value]
+        sequence = list(value) if isinstance(value, set) else value
+        omitted = 0
+        if max_items is not None and len(sequence) > max_items:
+            omitted = len(sequence) - max_items
+            sequence = sequence[:max_items]
+        items = [simplify(v, include_raw=include_raw, fields=fields, max_items=max_items) for v in sequence]
+        if omitted:
+            items.append(f"... 其余 {omitted} 项已省略")
+        return items
     if hasattr(value, "__dict__") and not isinstance(value, (str, bytes, int, float, bool)):
-        return simplify(vars(value))
+        return simplify(vars(value), include_raw=include_raw, fields=fields, max_items=max_items)
     return value
 
 
+def _simplify_items(
+    items: Any,
+    include_raw: bool,
+    fields: Mapping[str, Any] | None,
+    max_items: int | None,
+) -> dict[str, Any]:
+    simplified: dict[str, Any] = {}
+    for key, item in items:
+        child = None
+        if fields is not None:
+            if key not in fields:
+                continue
+            child = fields[key] or None
+        simplified[key] = simplify(item, include_raw=include_raw, fields=child, max_items=max_items)
+    return simplified
+
+
+def parse_fields(value: Any) -> dict[str, Any] | None:
+    """``"symbol,bars.date,bars.close"`` → 投影树 ``{"symbol": {}, "bars": {"date": {}, "close": {}}}``。
+
+    列表不占路径层级：投影作用于列表中的每一项。
+    """
+    names = coerce_tuple(value)
+    if not names:
+        return None
+    tree: dict[str, Any] = {}
+    for name in names:
+        node = tree
+        for part in name.split("."):
+            part = part.strip()
+            if part:
+                node = node.setdefault(part, {})
+    return tree or None
+
+
+def dumps_json(value: Any, *, indent: bool = False) -> str:
+    """序列化已 simplify 过的数据；优先用 orjson，紧凑模式不带多余空白。"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(value, default=str, option=option).decode("utf-8")
+        except TypeError:
+            pass  # 例如超出 64 位的整数，交给标准库
+    if indent:
+        return json.dumps(value, ensure_ascii=False, indent=2, default=str)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _cache_root() -> Path:
+    """本地缓存根目录：DIGITAL_ORACLE_CACHE_DIR，缺省为插件目录下的 .cache。"""
+    cache_dir = os.environ.get("DIGITAL_ORACLE_CACHE_DIR", "").strip()
+    return Path(cache_dir) if cache_dir else CURRENT_DIR / ".cache"
+
+
+class _LazyStore:
+    """按需创建的进程级单例（每个存储各自一把锁）。
+
+    创建失败（目录不可写、SQLite 文件损坏等）后本进程不再重试，调用方拿到 None 直接回源，
+    不影响正常抓取。
+    """
+
+    def __init__(self, create: Any, errors: tuple[type[BaseException], ...] = (OSError, sqlite3.Error)) -> None:
+        self._create = create
+        self._errors = errors
+        self._value: Any = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        if self._failed:
+            return None
+        with self._lock:
+            if self._value is None and not self._failed:
+                try:
+                    self._value = self._create(_cache_root())
+                except self._errors:
+                    self._failed = True
+            return self._value
+
+
+_response_cache = _LazyStore(
+    lambda root: ResponseCache(
+        root / "responses.sqlite3",
+        max_bytes=coerce_int(os.environ.get("DIGITAL_ORACLE_CACHE_MAX_MB"), 64) * 1024 * 1024,
+        # 单次调用模式下不起后台刷新线程：过期条目直接同步回源，进程输出后即可退出。
+        background_revalidate=_provider_pool is not None,
+    )
+)
+_bar_store = _LazyStore(lambda root: BarStore(root / "bars"), errors=(OSError,))
+_market_catalog = _LazyStore(lambda root: MarketCatalog(root / "catalog.sqlite3"))
+_edgar_store = _LazyStore(lambda root: EdgarStore(root / "edgar.sqlite3"))
+_signal_store = _LazyStore(lambda root: SignalStore(root / "signals.sqlite3"))
+
+
+def get_response_cache() -> ResponseCache | None:
+    if not coerce_bool(os.environ.get("DIGITAL_ORACLE_CACHE"), True):
+        return None
+    return _response_cache.get()
+
+
+def get_bar_store() -> BarStore | None:
+    """yahoo 行情本地列式存储：只增量拉取最后一根 bar 之后的数据。"""
+    if not coerce_bool(os.environ.get("DIGITAL_ORACLE_BAR_STORE"), True):
+        return None
+    return _bar_store.get()
+
+
+def get_market_catalog() -> MarketCatalog | None:
+    """Polymarket/Kalshi 事件目录的本地全文索引（缓存目录下的 catalog.sqlite3）。"""
+    return _market_catalog.get()
+
+
+def get_edgar_store() -> EdgarStore | None:
+    """SEC ticker→CIK 索引与 submissions 的本地存储（ETag/Last-Modified 条件请求复验）。"""
+    return _edgar_store.get()
+
+
+def get_signal_store() -> SignalStore | None:
+    """面板信号的最新快照（常驻模式后台预取写入，单次调用也可直接读取）。"""
+    return _signal_store.get()
+
+
+# 常驻模式（--serve）下复用 provider 实例，让 EDGAR ticker 表、yfinance 导入等保持热状态；
+# 单次调用模式下为 None，每次直接新建。
+_provider_pool: dict[tuple[Any, ...], Any] | None = None
+_provider_pool_lock = threading.Lock()
+
+
+def reuse_provider(key: tuple[Any, ...], create: Any) -> Any:
+    if _provider_pool is None:
+        return create()
+    with _provider_pool_lock:
+        provider = _provider_pool.get(key)
+        if provider is None:
+            provider = create()
+            _provider_pool[key] = provider
+    return provider
+
+
+def build_provider(factory: Any, params: dict[str, Any], **kwargs: Any) -> Any:
+    refresh = coerce_bool(pick(params, "refresh", "no_cache"), False)
+
+    def create() -> Any:
+        provider = factory(**kwargs)
+        cache = get_response_cache()
+        if cache is not None:
+            cache.attach(provider, refresh=refresh)
+        # 最外层做请求合并：并发的相同请求（如面板里 gold 与 GC=F）只回源一次。
+        default_singleflight().attach(provider)
+        return provider
+
+    return reuse_provider((factory, refresh, tuple(sorted(kwargs.items()))), create)
+
+
+def debug_enabled() -> bool:
+    return coerce_bool(os.environ.get("DIGITAL_ORACLE_DEBUG"), False)
+
+
+def render_connection_stats() -> list[str]:
+    stats = connection_pool_stats()
+    lines = ["## HTTP 连接复用统计", "| host | requests | handshakes | reuses |", "|---|---|---|---|"]
+    if not stats:
+        lines.append("| - | 0 | 0 | 0 |")
+    for host, entry in sorted(stats.items()):
+        lines.append(f"| {host} | {entry['requests']} | {entry['handshakes']} | {entry['reuses']} |")
+    limits = default_rate_limiter().stats()
+    if limits:
+        lines.extend(["", "## 限速统计", "| host | requests | waited_s | throttled | rate/s |", "|---|---|---|---|---|"])
+        for host, entry in limits.items():
+            lines.append(
+                f"| {host} | {entry['granted']} | {entry['waited_seconds']} | {entry['throttled']} | {entry['rate']} |"
+            )
+    if _prefetcher is not None:
+        lines.extend(["", "## 面板预取统计", "| signal | due_in_s | runs | failures | last_error |", "|---|---|---|---|---|"])
+        for key, entry in _prefetcher.stats().items():
+            lines.append(
+                f"| {key} | {entry['due_in']} | {entry['runs']} | {entry['failures']} | {entry['last_error'] or '-'} |"
+            )
+    flight = default_singleflight().stats()
+    lines.extend(
+        [
+            "",
+            "## 并发请求合并统计",
+            f"- 实际回源: {flight['executions']}",
+            f"- 合并复用: {flight['shared']}",
+        ]
+    )
+    return lines
+
+
+PREVIEW_ROWS = (5, 3, 1)
+
+
 def short_json(value: Any, max_length: int = 1200) -> str:
-    text = json.dumps(simplify(value), ensure_ascii=False, indent=2)
-    if len(text) <= max_length:
-        return text
+    # 先按结构截断（每个列表只保留前几行）再序列化，不再把整份数据转成文本后砍掉尾巴；
+    # 仍超长时逐步减少行数，最后才按字符截断。
+    text = ""
+    for rows in PREVIEW_ROWS:
+        text = dumps_json(simplify(value, max_items=rows), indent=True)
+        if len(text) <= max_length:
+            return text
     return text[: max_length - 20] + "\n... [已截断]"
 
 
@@ -177,11 +464,15 @@ def build_provider_registry() -> dict[str, dict[str, Any]]:
     return {
         "polymarket": {
             "summary": "预测市场事件与概率定价",
-            "params": ["slug_contains", "title_contains", "limit", "active", "closed"],
+            "params": ["slug_contains", "title_contains", "limit", "active", "closed", "scan", "max_pages"],
         },
         "kalshi": {
             "summary": "美国监管二元市场",
-            "params": ["series_ticker", "event_ticker", "limit", "status"],
+            "params": ["series_ticker", "event_ticker", "title_contains", "limit", "status", "scan", "max_pages"],
+        },
+        "market_search": {
+            "summary": "本地全文索引检索 Polymarket/Kalshi 全部在售市场，只对命中项实时拉价",
+            "params": ["query", "sources", "limit", "live", "refresh"],
         },
         "yahoo": {
             "summary": "股票/ETF/商品/外汇价格历史",
@@ -189,7 +480,7 @@ def build_provider_registry() -> dict[str, dict[str, Any]]:
         },
         "treasury": {
             "summary": "美债收益率曲线",
-            "params": ["curve_kind", "year"],
+            "params": ["curve_kind", "year", "start_date", "end_date"],
         },
         "cftc": {
             "summary": "CFTC 持仓报告（聪明钱方向）",
@@ -200,8 +491,8 @@ def build_provider_registry() -> dict[str, dict[str, Any]]:
             "params": ["coin_ids", "vs_currency", "include_market_cap"],
         },
         "deribit_futures": {
-            "summary": "加密期货期限结构",
-            "params": ["currency"],
+            "summary": "加密期货期限结构（currency 可传 BTC,ETH,SOL 一次并发抓取多币种）",
+            "params": ["currency", "currencies"],
         },
         "deribit_options": {
             "summary": "加密期权链与隐含波动率",
@@ -224,16 +515,16 @@ def build_provider_registry() -> dict[str, dict[str, Any]]:
             "params": ["countries", "start_year"],
         },
         "web": {
-            "summary": "网页搜索补充 VIX/CDS/OAS 等交易信号",
-            "params": ["query"],
+            "summary": "网页搜索补充 VIX/CDS/OAS 等交易信号（queries 批量搜索并抓取结果页正文，url 抓取单页）",
+            "params": ["query", "queries", "fetch_top", "max_chars", "url"],
         },
         "yfinance_options": {
             "summary": "美股期权链、IV、Greeks",
             "params": ["ticker", "expiration"],
         },
         "edgar": {
-            "summary": "SEC 内部人交易 Form 4",
-            "params": ["ticker", "limit"],
+            "summary": "SEC 内部人交易 Form 4（ticker 可传 AAPL,MSFT,NVDA 并发批量抓取）",
+            "params": ["ticker", "tickers", "limit"],
         },
     }
 
@@ -262,11 +553,30 @@ def list_providers_command() -> str:
     return "\n".join(lines)
 
 
+def options_analytics(chain: Any) -> dict[str, Any]:
+    """期权链汇总指标；``OptionsChainColumns`` 与 ``OptionsChain`` 接口一致。"""
+    return {
+        "underlying_price": chain.underlying_price,
+        "atm_strike": chain.atm_strike,
+        "atm_iv": chain.atm_iv,
+        "implied_move": chain.implied_move(),
+        "max_pain": chain.max_pain(),
+        "put_call_volume_ratio": chain.put_call_volume_ratio,
+        "put_call_oi_ratio": chain.put_call_oi_ratio,
+        "total_volume": chain.total_volume,
+        "total_open_interest": chain.total_open_interest,
+    }
+
+
 def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[str, Any]:
     provider = provider_name.strip().lower()
+    include_raw = coerce_bool(pick(params, "raw", "include_raw"), False)
+
+    def emit(value: Any) -> Any:
+        return simplify(value, include_raw=include_raw)
 
     if provider == "polymarket":
-        client = PolymarketProvider()
+        client = build_provider(PolymarketProvider, params)
         query = PolymarketEventQuery(
             slug_contains=pick(params, "slug_contains", "keyword", "query"),
             title_contains=pick(params, "title_contains"),
@@ -274,30 +584,115 @@ def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[st
             active=pick(params, "active", default=True),
             closed=pick(params, "closed", default=False),
         )
+        if coerce_bool(pick(params, "scan"), False):
+            # 翻页扫描全部事件，边解析边预取下一页，凑够 limit 条命中即停。
+            result = list(
+                client.iter_events(
+                    query,
+                    max_items=query.limit,
+                    max_pages=coerce_int(pick(params, "max_pages"), 50),
+                )
+            )
+            return {
+                "provider": provider,
+                "count": len(result),
+                "data": emit(result),
+            }
         result = client.list_events(query)
         return {
             "provider": provider,
             "count": len(result),
-            "data": simplify(result[:10]),
+            "data": emit(result[:10]),
         }
 
     if provider == "kalshi":
-        client = KalshiProvider()
+        client = build_provider(KalshiProvider, params)
         query = KalshiMarketQuery(
             series_ticker=pick(params, "series_ticker"),
             event_ticker=pick(params, "event_ticker"),
             limit=coerce_int(pick(params, "limit"), 10),
             status=pick(params, "status"),
+            title_contains=pick(params, "title_contains"),
         )
+        if coerce_bool(pick(params, "scan"), False):
+            result = list(
+                client.iter_markets(
+                    query,
+                    max_items=query.limit,
+                    max_pages=coerce_int(pick(params, "max_pages"), 50),
+                )
+            )
+            return {
+                "provider": provider,
+                "count": len(result),
+                "data": emit(result),
+            }
         result = client.list_markets(query)
         return {
             "provider": provider,
             "count": len(result),
-            "data": simplify(result[:10]),
+            "data": emit(result[:10]),
+        }
+
+    if provider == "market_search":
+        text = pick(params, "query", "keyword", "title_contains")
+        if not text:
+            raise ValueError("market_search 信源必须提供 query。")
+        catalog = get_market_catalog()
+        if catalog is None:
+            raise ValueError("market_search 本地目录不可用（缓存目录无法写入）。")
+        sources = coerce_tuple(pick(params, "sources", "source_filter")) or ("polymarket", "kalshi")
+        refresh = coerce_bool(pick(params, "refresh", "no_cache"), False)
+        max_age = 0.0 if refresh else float(coerce_int(os.environ.get("DIGITAL_ORACLE_CATALOG_MAX_AGE"), 3600))
+        polymarket = build_provider(PolymarketProvider, params)
+        kalshi = build_provider(KalshiProvider, params)
+        # 目录过期时整表翻页重建（增量 upsert，下架的市场会被移除）；未过期直接查本地索引。
+        refresh_tasks: dict[str, Any] = {}
+        if "polymarket" in sources:
+            refresh_tasks["polymarket"] = lambda: catalog.refresh_polymarket(polymarket, max_age_seconds=max_age)
+        if "kalshi" in sources:
+            refresh_tasks["kalshi"] = lambda: catalog.refresh_kalshi(kalshi, max_age_seconds=max_age)
+        refreshed = gather(refresh_tasks, timeout_seconds=120, fail_fast=False)
+        hits = catalog.search(str(text), sources=sources, limit=coerce_int(pick(params, "limit"), 10))
+
+        live: dict[str, Any] = {}
+        live_errors: dict[str, str] = {}
+        if coerce_bool(pick(params, "live"), True) and hits:
+            fetchers = {
+                "polymarket": polymarket.get_event,
+                "kalshi": kalshi.get_market,
+            }
+            outcome = gather(
+                {f"{hit.source}:{hit.key}": (lambda hit=hit: fetchers[hit.source](hit.key)) for hit in hits},
+                timeout_seconds=60,
+                fail_fast=False,
+            )
+            live = outcome.results
+            live_errors = {key: str(error) for key, error in outcome.errors.items()}
+        return {
+            "provider": provider,
+            "query": text,
+            "count": len(hits),
+            "catalog": catalog.stats(),
+            "refresh_errors": {source: str(error) for source, error in refreshed.errors.items()},
+            "live_errors": live_errors,
+            "data": [
+                {
+                    **emit(hit),
+                    "live": emit(live.get(f"{hit.source}:{hit.key}")),
+                }
+                for hit in hits
+            ],
         }
 
     if provider == "yahoo":
-        client = YahooPriceProvider()
+        refresh = coerce_bool(pick(params, "refresh", "no_cache"), False)
+        client = build_provider(
+            YahooPriceProvider,
+            params,
+            store=get_bar_store(),
+            store_ttl_seconds=0.0 if refresh else 300.0,
+        )
         symbol = pick(params, "symbol", "ticker")
         if not symbol:
             raise ValueError("yahoo 信源必须提供 symbol。")
@@ -313,11 +708,40 @@ def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[st
             "provider": provider,
             "symbol": symbol,
             "bar_count": len(result.bars),
-            "data": simplify(result),
+            "data": emit(result),
         }
 
     if provider == "treasury":
-        client = USTreasuryProvider()
+        client = build_provider(USTreasuryProvider, params)
+        start_date = pick(params, "start_date")
+        if start_date:
+            history = client.get_yield_curve_history(
+                YieldCurveRangeQuery(
+                    start_date=str(start_date),
+                    end_date=pick(params, "end_date"),
+                    curve_kind=str(pick(params, "curve_kind", default="nominal")),
+                )
+            )
+
+            def _last(values: Any) -> float | None:
+                for value in reversed(values):
+                    if value == value:  # skip NaN
+                        return round(value, 4)
+                return None
+
+            return {
+                "provider": provider,
+                "curve_kind": history.curve_kind,
+                "observations": len(history),
+                "start": history.dates[0] if history.dates else None,
+                "end": history.dates[-1] if history.dates else None,
+                "failed_years": list(history.failed_years),
+                "latest": emit(history.latest),
+                "spread_2s10s": _last(history.spread_2s10s),
+                "spread_3m10y": _last(history.spread_3m10y),
+                "inversion_2s10s": emit(history.inversion("10Y", "2Y")),
+                "inversion_3m10y": emit(history.inversion("10Y", "3M")),
+            }
         query = YieldCurveQuery(
             year=coerce_int(pick(params, "year"), 0) or None,
             curve_kind=str(pick(params, "curve_kind", default="nominal")),
@@ -329,7 +753,7 @@ def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[st
             result = client.latest_yield_curve(query)
             return {
                 "provider": provider,
-                "data": simplify(result),
+                "data": emit(result),
             }
         except Exception as exc:
             message = str(exc)
@@ -346,7 +770,7 @@ def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[st
             raise
 
     if provider == "cftc":
-        client = CftcCotProvider()
+        client = build_provider(CftcCotProvider, params)
         commodity_name = pick(params, "commodity_name", "commodity")
         if not commodity_name:
             raise ValueError("cftc 信源必须提供 commodity_name。")
@@ -359,11 +783,11 @@ def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[st
             "provider": provider,
             "commodity_name": commodity_name,
             "count": len(result),
-            "data": simplify(result),
+            "data": emit(result),
         }
 
     if provider == "coingecko":
-        client = CoinGeckoProvider()
+        client = build_provider(CoinGeckoProvider, params)
         coin_ids = coerce_tuple(pick(params, "coin_ids", "coins"))
         if not coin_ids:
             raise ValueError("coingecko 信源必须提供 coin_ids。")
@@ -377,22 +801,33 @@ def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[st
             "provider": provider,
             "coin_ids": list(coin_ids),
             "count": len(result),
-            "data": simplify(result),
+            "data": emit(result),
         }
 
     if provider == "deribit_futures":
-        client = DeribitProvider()
-        currency = str(pick(params, "currency", default="BTC")).upper()
+        currencies = coerce_tuple(pick(params, "currencies", "currency", default="BTC"))
+        client = build_provider(DeribitProvider, params)
+        if len(currencies) > 1:
+            # 多币种：get_futures_term_structures 内部用 gather 并发发出子请求，
+            # 共享进程级 keep-alive 连接池与每 host 连接上限。
+            results = client.get_futures_term_structures(currencies)
+            return {
+                "provider": provider,
+                "currencies": list(results),
+                "failed": [currency.upper() for currency in currencies if currency.upper() not in results],
+                "data": emit(results),
+            }
+        currency = (currencies[0] if currencies else "BTC").upper()
         query = DeribitFuturesCurveQuery(currency=currency)
         result = client.get_futures_term_structure(query)
         return {
             "provider": provider,
             "currency": currency,
-            "data": simplify(result),
+            "data": emit(result),
         }
 
     if provider == "deribit_options":
-        client = DeribitProvider()
+        client = build_provider(DeribitProvider, params)
         currency = str(pick(params, "currency", default="BTC")).upper()
         kind = str(pick(params, "kind", default="option"))
         query = DeribitOptionChainQuery(
@@ -405,28 +840,28 @@ def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[st
             "provider": provider,
             "currency": currency,
             "quote_count": len(getattr(result, "quotes", []) or []),
-            "data": simplify(result),
+            "data": emit(result),
         }
 
     if provider == "fear_greed":
-        client = FearGreedProvider()
+        client = build_provider(FearGreedProvider, params)
         result = client.get_index()
         return {
             "provider": provider,
-            "data": simplify(result),
+            "data": emit(result),
         }
 
     if provider == "cme_fedwatch":
-        client = CMEFedWatchProvider()
+        client = build_provider(CMEFedWatchProvider, params)
         result = client.get_probabilities()
         return {
             "provider": provider,
             "count": len(result),
-            "data": simplify(result),
+            "data": emit(result),
         }
 
     if provider == "worldbank":
-        client = WorldBankProvider()
+        client = build_provider(WorldBankProvider, params)
         indicator = pick(params, "indicator")
         countries = coerce_tuple(pick(params, "countries"))
         if not indicator or not countries:
@@ -440,11 +875,11 @@ def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[st
             "provider": provider,
             "indicator": indicator,
             "countries": list(countries),
-            "data": simplify(result),
+            "data": emit(result),
         }
 
     if provider == "bis":
-        client = BisProvider()
+        client = build_provider(BisProvider, params)
         countries = coerce_tuple(pick(params, "countries"))
         if not countries:
             raise ValueError("bis 信源必须提供 countries。")
@@ -457,23 +892,54 @@ def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[st
             "provider": provider,
             "countries": list(countries),
             "count": len(result),
-            "data": simplify(result),
+            "data": emit(result),
         }
 
     if provider == "web":
-        client = WebSearchProvider()
+        refresh = coerce_bool(pick(params, "refresh", "no_cache"), False)
+        client = reuse_provider(
+            (WebSearchProvider, refresh),
+            lambda: WebSearchProvider(cache=get_response_cache(), refresh=refresh),
+        )
+        url = pick(params, "url")
+        if url:
+            page = client.fetch_page(
+                WebPageQuery(url=str(url), max_chars=coerce_int(pick(params, "max_chars"), 8000))
+            )
+            return {
+                "provider": provider,
+                "url": url,
+                "data": emit(page),
+            }
+        queries = coerce_tuple(pick(params, "queries"))
+        if queries:
+            # 多个查询按 DDG 限速依次发出，每个查询返回后立即并发打开其前 fetch_top 个结果页。
+            research = client.research(
+                WebResearchQuery(
+                    queries=queries,
+                    max_results=coerce_int(pick(params, "max_results"), 5),
+                    fetch_top=coerce_int(pick(params, "fetch_top"), 2),
+                    max_chars=coerce_int(pick(params, "max_chars"), 4000),
+                )
+            )
+            return {
+                "provider": provider,
+                "queries": list(queries),
+                "page_count": len(research.pages),
+                "data": emit(research),
+            }
         query = pick(params, "query", "keyword")
         if not query:
-            raise ValueError("web 信源必须提供 query。")
+            raise ValueError("web 信源必须提供 query、queries 或 url。")
         result = client.search(str(query))
         return {
             "provider": provider,
             "query": query,
-            "data": simplify(result),
+            "data": emit(result),
         }
 
     if provider == "yfinance_options":
-        client = YFinanceProvider()
+        client = reuse_provider((YFinanceProvider,), YFinanceProvider)
         ticker = pick(params, "ticker", "symbol")
         expiration = pick(params, "expiration")
         if not ticker or not expiration:
@@ -482,31 +948,57 @@ def fetch_single_provider(provider_name: str, params: dict[str, Any]) -> dict[st
             ticker=str(ticker),
             expiration=str(expiration),
         )
-        result = client.get_chain(query)
+        try:
+            columns = client.get_chain_columns(query)
+        except ImportError:
+            # 未安装 NumPy 时退回逐合约解析。
+            result = client.get_chain(query)
+            analytics = options_analytics(result)
+        else:
+            result = columns.to_chain()
+            analytics = options_analytics(columns)
         return {
             "provider": provider,
             "ticker": ticker,
             "expiration": expiration,
-            "data": simplify(result),
+            "analytics": analytics,
+            "data": emit(result),
         }
 
     if provider == "edgar":
         email = os.environ.get("DIGITAL_ORACLE_SEC_EMAIL") or os.environ.get("SEC_USER_EMAIL")
         if not email:
             raise ValueError("edgar 信源需要环境变量 DIGITAL_ORACLE_SEC_EMAIL 或 SEC_USER_EMAIL。")
-        client = EdgarProvider(user_email=email)
-        ticker = pick(params, "ticker", "symbol")
-        if not ticker:
+        refresh = coerce_bool(pick(params, "refresh", "no_cache"), False)
+        client = build_provider(
+            EdgarProvider,
+            params,
+            user_email=email,
+            store=get_edgar_store(),
+            submissions_ttl_seconds=0.0 if refresh else 600.0,
+        )
+        tickers = coerce_tuple(pick(params, "tickers", "ticker", "symbol"))
+        if not tickers:
             raise ValueError("edgar 信源必须提供 ticker。")
+        limit = coerce_int(pick(params, "limit"), 10)
+        if len(tickers) > 1:
+            # 多个 ticker 并发抓取，整体仍受 SEC 每秒请求数限制；失败的 ticker 被跳过。
+            summaries = client.get_insider_transactions_batch(tickers, limit=limit)
+            return {
+                "provider": provider,
+                "tickers": list(tickers),
+                "missing": [ticker for ticker in (t.upper() for t in tickers) if ticker not in summaries],
+                "data": emit(summaries),
+            }
         query = EdgarInsiderQuery(
-            ticker=str(ticker).upper(),
-            limit=coerce_int(pick(params, "limit"), 10),
+            ticker=str(tickers[0]).upper(),
+            limit=limit,
         )
         result = client.get_insider_transactions(query)
         return {
             "provider": provider,
-            "ticker": ticker,
-            "data": simplify(result),
+            "ticker": tickers[0],
+            "data": emit(result),
         }
 
     raise ValueError(f"不支持的 provider/source: {provider_name}")
@@ -537,7 +1029,7 @@ def render_provider_result(result: dict[str, Any]) -> str:
     return "\n".join(summary_lines)
 
 
-def fetch_market_data_command(args: dict[str, Any]) -> str:
+def fetch_market_data_command(args: dict[str, Any]) -> str | dict[str, Any]:
     provider_name = pick(args, "provider", "source", "signal_source")
     if not provider_name:
         raise ValueError("FetchMarketData 必须提供 provider/source 参数。")
@@ -545,9 +1037,28 @@ def fetch_market_data_command(args: dict[str, Any]) -> str:
     merged = dict(args)
     merged.update(params)
     result = fetch_single_provider(str(provider_name), merged)
+    projection = parse_fields(pick(merged, "fields"))
+    max_rows = pick(merged, "max_rows")
+    if projection is not None or max_rows not in (None, ""):
+        result["data"] = simplify(
+            result.get("data"),
+            include_raw=True,
+            fields=projection,
+            max_items=coerce_int(max_rows, 0) or None,
+        )
+    if output_mode(merged) == "json":
+        # 结构化输出：结果作为 JSON 对象直接放进响应，由外层一次性序列化。
+        return result
     return render_provider_result(result)
 
 
+def output_mode(args: dict[str, Any]) -> str:
+    mode = str(pick(args, "output", default=os.environ.get("DIGITAL_ORACLE_OUTPUT")) or "markdown").strip().lower()
+    if mode in {"json", "compact", "structured"}:
+        return "json"
+    return "markdown"
+
+
 def extract_indexed_commands(args: dict[str, Any]) -> list[tuple[int, str]]:
     indexed_commands: list[tuple[int, str]] = []
     for key, value in args.items():
@@ -579,7 +1090,7 @@ def extract_args_for_command_index(args: dict[str, Any], index: int) -> dict[str
 
 def render_batch_results(results: list[dict[str, Any]]) -> str:
     lines = [
-        "# DigitalOracle 批量串行执行结果",
+        "# DigitalOracle 批量执行结果",
         "",
     ]
 
@@ -592,7 +1103,8 @@ def render_batch_results(results: list[dict[str, Any]]) -> str:
         lines.append(f"- status: {status}")
 
         if status == "success":
-            lines.append(item["result"])
+            result = item["result"]
+            lines.append(result if isinstance(result, str) else f"```json\n{dumps_json(result)}\n```")
         else:
             lines.append(f"- error: {item['error']}")
 
@@ -601,97 +1113,293 @@ def render_batch_results(results: list[dict[str, Any]]) -> str:
     return "\n".join(lines).rstrip()
 
 
+def parse_batch_dependencies(command_args: dict[str, Any], index: int, known: set[int]) -> list[int]:
+    raw = command_args.pop("after", None)
+    if raw is None:
+        raw = command_args.pop("depends_on", None)
+    if raw is None:
+        return []
+    dependencies = []
+    for item in coerce_tuple(raw):
+        text = item.strip()
+        if text.lower().startswith("command"):
+            text = text[len("command"):]
+        if not text.isdigit():
+            raise ValueError(f"指令 {index} 的依赖格式无效: {item}")
+        dependency = int(text)
+        # 只允许依赖编号更小的指令，依赖关系不会成环。
+        if dependency >= index or dependency not in known:
+            raise ValueError(f"指令 {index} 只能依赖本批次中编号更小的指令，收到: {item}")
+        dependencies.append(dependency)
+    return dependencies
+
+
 def execute_batch_commands(args: dict[str, Any]) -> str:
     indexed_commands = extract_indexed_commands(args)
     if not indexed_commands:
         raise ValueError("未检测到批量指令。")
 
-    results: list[dict[str, Any]] = []
+    max_concurrency = coerce_int(
+        pick(args, "max_concurrency", "concurrency", default=os.environ.get("DIGITAL_ORACLE_BATCH_CONCURRENCY")),
+        4,
+    )
+    command_timeout = coerce_float(
+        pick(args, "command_timeout", default=os.environ.get("DIGITAL_ORACLE_COMMAND_TIMEOUT")),
+        120.0,
+    )
+
+    known = {index for index, _ in indexed_commands}
+    tasks: dict[str, Any] = {}
+    dependencies: dict[str, list[str]] = {}
+    setup_errors: dict[int, str] = {}
 
     for index, command in indexed_commands:
         command_args = extract_args_for_command_index(args, index)
         command_args["command"] = command
-
         try:
-            result = execute_single_command(command_args)
-            results.append(
-                {
-                    "index": index,
-                    "command": command,
-                    "status": "success",
-                    "result": result,
-                }
-            )
-        except Exception as exc:
-            results.append(
-                {
-                    "index": index,
-                    "command": command,
-                    "status": "error",
-                    "error": str(exc),
-                }
-            )
+            depends_on = parse_batch_dependencies(command_args, index, known)
+        except ValueError as exc:
+            setup_errors[index] = str(exc)
+            continue
+        tasks[str(index)] = lambda command_args=command_args: execute_single_command(command_args)
+        dependencies[str(index)] = [str(dependency) for dependency in depends_on]
+
+    # 依赖本身格式错误的指令不会执行，依赖它的指令随之跳过。
+    for label, depends_on in list(dependencies.items()):
+        broken = [dependency for dependency in depends_on if int(dependency) in setup_errors]
+        if broken:
+            setup_errors[int(label)] = f"依赖的指令 {broken[0]} 未成功完成，已跳过。"
+            del tasks[label], dependencies[label]
+    for depends_on in dependencies.values():
+        depends_on[:] = [dependency for dependency in depends_on if dependency in tasks]
+
+    # 依赖完成后才提交指令：等待依赖既不占用线程，也不计入该指令自己的 command_timeout。
+    outcome = gather(
+        tasks,
+        max_workers=max(1, min(max_concurrency, len(tasks) or 1)),
+        task_timeout_seconds=command_timeout if command_timeout > 0 else None,
+        dependencies=dependencies,
+    )
+
+    results: list[dict[str, Any]] = []
+    for index, command in indexed_commands:
+        label = str(index)
+        if index in setup_errors:
+            error: BaseException | str | None = setup_errors[index]
+        else:
+            error = outcome.errors.get(label)
+        if error is None:
+            results.append({"index": index, "command": command, "status": "success", "result": outcome.results[label]})
+            continue
+        results.append({
+            "index": index,
+            "command": command,
+            "status": "error",
+            "error": error if isinstance(error, str) else describe_batch_error(label, error, outcome, command_timeout),
+        })
 
     return render_batch_results(results)
 
 
-def get_global_macro_dashboard_command(args: dict[str, Any]) -> str:
+def describe_batch_error(label: str, error: BaseException, outcome: Any, command_timeout: float) -> str:
+    if isinstance(error, DependencyError):
+        if error.dependency in outcome.timed_out:
+            return f"依赖超时：依赖的指令 {error.dependency} 执行超过 {command_timeout:g} 秒未完成，已跳过。"
+        return f"依赖的指令 {error.dependency} 未成功完成，已跳过。"
+    # 只改写 gather 自己判定的超时；指令内部抛出的 TimeoutError（如套接字超时）保留原信息。
+    if label in outcome.timed_out:
+        return f"执行超过 {command_timeout:g} 秒未完成"
+    return str(error)
+
+
+# 面板信号各自的刷新周期（秒）；快照超过两个周期视为过期。
+DASHBOARD_INTERVALS = {
+    "fear_greed": 900,
+    "fedwatch": 900,
+    "yield_curve": 3600,
+    "crypto": 120,
+    "btc_curve": 300,
+    "rates": 86400,
+    "gold": 300,
+    "oil": 300,
+}
+DASHBOARD_ASSET_INTERVAL = 300
+
+
+def dashboard_signals(args: dict[str, Any]) -> dict[str, tuple[str, dict[str, Any], int]]:
+    """面板标签 → (provider, params, 刷新周期)。"""
     risk_assets = coerce_tuple(pick(args, "risk_assets", default="SPY,QQQ,GC=F,CL=F,BTC-USD"))
     coin_ids = coerce_tuple(pick(args, "coin_ids", default="bitcoin,ethereum"))
     countries = coerce_tuple(pick(args, "countries", default="US,CN,JP,EU"))
-    tasks = {
-        "fear_greed": lambda: fetch_single_provider("fear_greed", {}),
-        "fedwatch": lambda: fetch_single_provider("cme_fedwatch", {}),
-        "yield_curve": lambda: fetch_single_provider("treasury", {"curve_kind": "nominal"}),
-        "crypto": lambda: fetch_single_provider("coingecko", {"coin_ids": list(coin_ids)}),
-        "btc_curve": lambda: fetch_single_provider("deribit_futures", {"currency": "BTC"}),
-        "rates": lambda: fetch_single_provider("bis", {"countries": list(countries), "start_year": 2023}),
-        "gold": lambda: fetch_single_provider("yahoo", {"symbol": "GC=F", "limit": 30}),
-        "oil": lambda: fetch_single_provider("yahoo", {"symbol": "CL=F", "limit": 30}),
+    signals: dict[str, tuple[str, dict[str, Any], int]] = {
+        "fear_greed": ("fear_greed", {}, DASHBOARD_INTERVALS["fear_greed"]),
+        "fedwatch": ("cme_fedwatch", {}, DASHBOARD_INTERVALS["fedwatch"]),
+        "yield_curve": ("treasury", {"curve_kind": "nominal"}, DASHBOARD_INTERVALS["yield_curve"]),
+        "crypto": ("coingecko", {"coin_ids": list(coin_ids)}, DASHBOARD_INTERVALS["crypto"]),
+        "btc_curve": ("deribit_futures", {"currency": "BTC"}, DASHBOARD_INTERVALS["btc_curve"]),
+        "rates": ("bis", {"countries": list(countries), "start_year": 2023}, DASHBOARD_INTERVALS["rates"]),
+        "gold": ("yahoo", {"symbol": "GC=F", "limit": 30}, DASHBOARD_INTERVALS["gold"]),
+        "oil": ("yahoo", {"symbol": "CL=F", "limit": 30}, DASHBOARD_INTERVALS["oil"]),
     }
-
     for symbol in risk_assets:
         label = f"asset_{symbol.replace('=', '_').replace('-', '_')}"
-        tasks[label] = lambda symbol=symbol: fetch_single_provider(
-            "yahoo", {"symbol": symbol, "limit": 30}
+        signals[label] = ("yahoo", {"symbol": symbol, "limit": 30}, DASHBOARD_ASSET_INTERVAL)
+    return signals
+
+
+def signal_key(provider: str, params: dict[str, Any]) -> str:
+    # 按 provider + 参数而不是面板标签存快照：不同参数的面板互不覆盖，相同的信号共用一份。
+    return f"{provider}:{json.dumps(params, sort_keys=True, ensure_ascii=False)}"
+
+
+def format_age(seconds: float) -> str:
+    if seconds < 90:
+        return f"{int(seconds)} 秒前"
+    if seconds < 5400:
+        return f"{int(seconds // 60)} 分钟前"
+    if seconds < 2 * 86400:
+        return f"{seconds / 3600:.1f} 小时前"
+    return f"{seconds / 86400:.1f} 天前"
+
+
+_prefetcher: PrefetchScheduler | None = None
+
+
+def start_dashboard_prefetcher() -> PrefetchScheduler | None:
+    """常驻模式下按各自周期后台刷新默认面板信号，写入快照存储。"""
+    global _prefetcher  # noqa: PLW0603
+    store = get_signal_store()
+    if store is None or _prefetcher is not None:
+        return _prefetcher
+    jobs = [
+        PrefetchJob(
+            key=signal_key(provider, params),
+            fetch=lambda provider=provider, params=params: fetch_single_provider(provider, dict(params)),
+            interval_seconds=interval,
+        )
+        for provider, params, interval in dashboard_signals({}).values()
+    ]
+    _prefetcher = PrefetchScheduler(
+        store,
+        jobs,
+        max_workers=coerce_int(os.environ.get("DIGITAL_ORACLE_PREFETCH_WORKERS"), 4),
+    )
+    _prefetcher.start()
+    return _prefetcher
+
+
+def get_global_macro_dashboard_command(args: dict[str, Any]) -> Any:
+    signals = dashboard_signals(args)
+    keys = {label: signal_key(provider, params) for label, (provider, params, _) in signals.items()}
+    refresh = coerce_bool(pick(args, "refresh"), False)
+    # 只有后台预取器在持续刷新快照时，过期快照才可以代替实时抓取；
+    # 单次调用模式下没有人会刷新它们，默认重抓过期信号，refresh_stale=false 可显式跳过。
+    refresh_stale = coerce_bool(pick(args, "refresh_stale"), _prefetcher is None)
+    max_age_raw = pick(args, "max_age")
+    store = get_signal_store()
+
+    stored = {} if refresh or store is None else store.load_many(keys.values())
+    now = time.time()
+    snapshots: dict[str, Any] = {}
+    stale: set[str] = set()
+    for label, key in keys.items():
+        snapshot = stored.get(key)
+        if snapshot is None:
+            continue
+        max_age = coerce_int(max_age_raw, 0) or 2 * signals[label][2]
+        if snapshot.age(now) > max_age:
+            stale.add(label)
+        snapshots[label] = snapshot
+
+    # 没有快照的信号必须实时抓取；过期快照按 refresh_stale 决定重抓还是标注后返回，重抓失败时仍返回旧快照。
+    live_labels = [
+        label
+        for label in signals
+        if label not in snapshots or (refresh_stale and label in stale)
+    ]
+    # refresh=true 同时跳过响应缓存，否则仍可能拿回缓存里的旧响应。
+    live_overrides = {"refresh": True} if refresh else {}
+    tasks = {
+        label: lambda provider=signals[label][0], params=signals[label][1]: fetch_single_provider(
+            provider, {**params, **live_overrides}
         )
+        for label in live_labels
+    }
+    outcome = gather(tasks, timeout_seconds=120, fail_fast=False) if tasks else None
+
+    entries: dict[str, dict[str, Any]] = {}
+    errors: dict[str, str] = {}
+    for label in signals:
+        if outcome is not None and label in outcome.results:
+            value = outcome.results[label]
+            if store is not None:
+                try:
+                    store.save(keys[label], value)
+                except sqlite3.Error:
+                    pass
+                if _prefetcher is not None:
+                    _prefetcher.mark_refreshed(keys[label])
+            entries[label] = {"source": "live", "age_seconds": 0.0, "stale": False, "data": value}
+            continue
+        if outcome is not None and label in outcome.errors:
+            errors[label] = str(outcome.errors[label])
+        snapshot = snapshots.get(label)
+        if snapshot is not None:
+            entries[label] = {
+                "source": "snapshot",
+                "age_seconds": round(snapshot.age(now), 1),
+                "stale": label in stale,
+                "data": snapshot.value,
+            }
 
-    outcome = gather(tasks, timeout_seconds=120, fail_fast=False)
+    if output_mode(args) == "json":
+        return {"signals": entries, "errors": errors}
 
     lines = [
         "# DigitalOracle 全球金融监控面板",
         "",
         "## 成功信号",
     ]
-    if outcome.results:
-        for key, value in outcome.results.items():
-            provider = value.get("provider", "unknown")
-            lines.append(f"- {key}: {provider} 成功")
+    if entries:
+        for key, entry in entries.items():
+            provider = entry["data"].get("provider", "unknown")
+            lines.append(f"- {key}: {provider} 成功（{describe_freshness(entry)}）")
     else:
         lines.append("- 无成功结果")
 
     lines.extend(["", "## 失败信号"])
-    if outcome.errors:
-        for key, error in outcome.errors.items():
-            lines.append(f"- {key}: {error}")
+    if errors:
+        for key, error in errors.items():
+            suffix = "，已返回旧快照" if key in entries else ""
+            lines.append(f"- {key}: {error}{suffix}")
     else:
         lines.append("- 无")
 
     lines.extend(["", "## 结构化数据摘要"])
-    for key, value in outcome.results.items():
+    for key, entry in entries.items():
         lines.extend(
             [
-                f"### {key}",
+                f"### {key}（{describe_freshness(entry)}）",
                 "```json",
-                short_json(value),
+                short_json(entry["data"]),
                 "```",
             ]
         )
 
+    if debug_enabled():
+        lines.extend(["", *render_connection_stats()])
+
     return "\n".join(lines)
 
 
-def execute_single_command(args: dict[str, Any]) -> str:
+def describe_freshness(entry: dict[str, Any]) -> str:
+    if entry["source"] == "live":
+        return "实时"
+    text = f"快照 · {format_age(entry['age_seconds'])}"
+    return f"{text} · 已过期" if entry["stale"] else text
+
+
+def execute_single_command(args: dict[str, Any]) -> Any:
     command = str(pick(args, "command", default="FetchMarketData")).strip()
 
     if command == "ListProviders":
@@ -700,21 +1408,88 @@ def execute_single_command(args: dict[str, Any]) -> str:
         return fetch_market_data_command(args)
     if command == "GetGlobalMacroDashboard":
         return get_global_macro_dashboard_command(args)
+    if command == "GetTelemetry":
+        return get_telemetry_command(args)
 
     raise ValueError(f"不支持的 command: {command}")
 
 
-def execute_command(args: dict[str, Any]) -> str:
+def execute_command(args: dict[str, Any]) -> Any:
+    telemetry = default_telemetry()
+    wanted = coerce_bool(pick(args, "telemetry"), telemetry_mode() == "append")
+    if not wanted or not telemetry.enabled:
+        return dispatch_command(args)
+    with telemetry.trace() as trace:
+        result = dispatch_command(args)
+    return attach_telemetry(result, trace)
+
+
+def dispatch_command(args: dict[str, Any]) -> Any:
     if extract_indexed_commands(args):
         return execute_batch_commands(args)
     return execute_single_command(args)
 
 
-def print_success(result: Any) -> None:
-    print(json.dumps({"status": "success", "result": result}, ensure_ascii=False))
+def attach_telemetry(result: Any, trace: CallTrace) -> Any:
+    summary = trace.summary()
+    if isinstance(result, dict):
+        return {**result, "telemetry": summary}
+    return f"{result}\n\n" + "\n".join(render_telemetry_summary(summary))
 
 
-def print_error(message: str, *, code: str = "PLUGIN_ERROR", details: Any = None) -> None:
+def render_telemetry_summary(summary: dict[str, dict[str, Any]]) -> list[str]:
+    lines = [
+        "## 调用耗时统计",
+        "| span | count | errors | total_ms | p95_ms | max_ms | bytes | retries | cache hit/miss |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    if not summary:
+        lines.append("| - | 0 | 0 | 0 | 0 | 0 | 0 | 0 | 0/0 |")
+    # 按总耗时降序，最拖慢本次调用的上游排在最前。
+    for key, entry in sorted(summary.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+        lines.append(
+            f"| {key} | {entry['count']} | {entry['errors']} | {entry['total_ms']} | {entry['p95_ms']} "
+            f"| {entry['max_ms']} | {entry['bytes']} | {entry['retries']} "
+            f"| {entry['cache_hits']}/{entry['cache_misses']} |"
+        )
+    return lines
+
+
+def get_telemetry_command(args: dict[str, Any]) -> Any:
+    """耗时/错误统计。
+
+    设置了 DIGITAL_ORACLE_TELEMETRY_FILE 时汇总该文件里所有进程写入的 span，
+    单次调用模式下也能看到历史调用；否则只有本进程（常驻 worker 启动以来）的统计。
+    """
+    path = os.environ.get("DIGITAL_ORACLE_TELEMETRY_FILE", "").strip()
+    telemetry = load_json_lines(path) if path else default_telemetry()
+    fmt = str(pick(args, "format", default="markdown") or "markdown").strip().lower()
+    summary = telemetry.summary()
+    prometheus = telemetry.prometheus_text() if fmt == "prometheus" else None
+    if coerce_bool(pick(args, "reset"), False):
+        default_telemetry().reset()
+        if path:
+            try:
+                open(path, "w", encoding="utf-8").close()
+            except OSError:
+                pass
+    if prometheus is not None:
+        return prometheus
+    if fmt == "json" or output_mode(args) == "json":
+        return summary
+    lines = ["# DigitalOracle 耗时统计", ""]
+    lines.extend([f"- 统计来源: {f'文件 {path}（所有进程累计）' if path else '本进程'}", ""])
+    if not default_telemetry().enabled:
+        lines.extend(["- 计时已关闭（DIGITAL_ORACLE_TELEMETRY=off）", ""])
+    lines.extend(render_telemetry_summary(summary))
+    return "\n".join(lines)
+
+
+def success_payload(result: Any) -> dict[str, Any]:
+    return {"status": "success", "result": result}
+
+
+def error_payload(message: str, *, code: str = "PLUGIN_ERROR", details: Any = None) -> dict[str, Any]:
     payload = {
         "status": "error",
         "code": code,
@@ -722,21 +1497,169 @@ def print_error(message: str, *, code: str = "PLUGIN_ERROR", details: Any = None
     }
     if details is not None:
         payload["details"] = details
-    print(json.dumps(payload, ensure_ascii=False))
+    return payload
+
+
+def print_success(result: Any) -> None:
+    print(dumps_json(success_payload(result)))
+
+
+def print_error(message: str, *, code: str = "PLUGIN_ERROR", details: Any = None) -> None:
+    print(dumps_json(error_payload(message, code=code, details=details)))
+
+
+# ---------------------------------------------------------------------------
+# 常驻 worker 模式
+#
+#   python digital_oracle_vcp.py --serve                      # stdin/stdout NDJSON
+#   python digital_oracle_vcp.py --serve --socket 127.0.0.1:8765
+#   python digital_oracle_vcp.py --serve --socket /tmp/digital_oracle.sock
+#
+# 每行一个 JSON 请求（与单次调用的 stdin 格式相同），可带 id / request_id 字段；
+# 每行返回一个 JSON 响应，原样带回 id。请求在有界线程池中并发执行，响应按完成顺序写回。
+#
+# 常驻模式需手动开启：VCP 按 plugin-manifest.json 的 entryPoint 对每次工具调用仍以单次模式
+# 启动本脚本，不会连接常驻进程。常驻进程由运维自行拉起（pm2/systemd 等），供直接连接 socket
+# 的外部调用方使用；它写入的 signals.sqlite3 快照对单次调用同样可见。
+# ---------------------------------------------------------------------------
+
+
+def handle_request_line(line: str) -> dict[str, Any]:
+    request_id = None
+    try:
+        args = json.loads(line)
+        if not isinstance(args, dict):
+            raise ValueError("请求必须是 JSON 对象。")
+        for key in ("id", "request_id", "requestId"):
+            if key in args:
+                request_id = args.pop(key)
+                break
+        if str(pick(args, "command", default="")).strip() == "Ping":
+            payload = success_payload("pong")
+        else:
+            payload = success_payload(execute_command(args))
+    except Exception as exc:
+        details = traceback.format_exc() if debug_enabled() else None
+        payload = error_payload(str(exc), details=details)
+    payload["id"] = request_id
+    return payload
+
+
+def serve_stream(reader: Any, writer: Any, executor: ThreadPoolExecutor) -> None:
+    write_lock = threading.Lock()
+    pending = []
+
+    def respond(line: str) -> None:
+        text = dumps_json(handle_request_line(line))
+        with write_lock:
+            try:
+                writer.write(text + "\n")
+                writer.flush()
+            except (OSError, ValueError):
+                pass  # 对端已断开
+
+    for raw in reader:
+        line = raw.strip()
+        if line:
+            pending.append(executor.submit(respond, line))
+        pending = [future for future in pending if not future.done()]
+    for future in pending:
+        future.result()
+
+
+def open_socket_server(address: str, executor: ThreadPoolExecutor) -> socketserver.BaseServer:
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            reader = (raw.decode("utf-8", errors="replace") for raw in self.rfile)
+            writer = _SocketWriter(self.wfile)
+            serve_stream(reader, writer, executor)
+
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        server: socketserver.BaseServer = socketserver.ThreadingTCPServer((host or "127.0.0.1", int(port)), Handler)
+    elif hasattr(socketserver, "ThreadingUnixStreamServer"):
+        if os.path.exists(address):
+            os.unlink(address)
+        server = socketserver.ThreadingUnixStreamServer(address, Handler)
+    else:
+        raise ValueError(f"无法识别的 socket 地址: {address}")
+    server.daemon_threads = True
+    return server
+
+
+class _SocketWriter:
+    def __init__(self, wfile: Any) -> None:
+        self._wfile = wfile
+
+    def write(self, text: str) -> None:
+        self._wfile.write(text.encode("utf-8"))
+
+    def flush(self) -> None:
+        self._wfile.flush()
+
+
+def serve(argv: list[str]) -> None:
+    global _provider_pool  # noqa: PLW0603
+    parser = argparse.ArgumentParser(prog="digital_oracle_vcp.py", description="DigitalOracle 常驻 worker 模式")
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--socket", help="监听地址：host:port 或 Unix socket 路径；缺省时读写 stdin/stdout")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=coerce_int(os.environ.get("DIGITAL_ORACLE_WORKERS"), 4),
+        help="并发处理请求的线程数上限",
+    )
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        default=coerce_bool(os.environ.get("DIGITAL_ORACLE_PREFETCH"), False),
+        help="后台按各自周期刷新 GetGlobalMacroDashboard 的默认信号",
+    )
+    options = parser.parse_args(argv)
+
+    configure_proxy_from_env()
+    configure_rate_limits_from_env()
+    configure_telemetry_from_env()
+    _provider_pool = {}
+    if options.prefetch:
+        start_dashboard_prefetcher()
+    executor = ThreadPoolExecutor(max_workers=max(1, options.workers), thread_name_prefix="oracle-worker")
+    try:
+        if options.socket:
+            server = open_socket_server(options.socket, executor)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+        else:
+            serve_stream(sys.stdin, sys.stdout, executor)
+    finally:
+        if _prefetcher is not None:
+            _prefetcher.stop()
+        executor.shutdown(wait=True)
+        cache = get_response_cache()
+        if cache is not None:
+            cache.close()
 
 
 def main() -> None:
     try:
         configure_proxy_from_env()
+        configure_rate_limits_from_env()
+        configure_telemetry_from_env()
         args = read_stdin_json()
         result = execute_command(args)
         print_success(result)
     except Exception as exc:
-        debug_enabled = coerce_bool(os.environ.get("DIGITAL_ORACLE_DEBUG"), False)
-        details = traceback.format_exc() if debug_enabled else None
+        details = traceback.format_exc() if debug_enabled() else None
         print_error(str(exc), details=details)
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--serve" in sys.argv[1:]:
+        serve(sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,174 @@
+import asyncio
+import http.client
+import json
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+PLUGIN_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PLUGIN_DIR))
+sys.path.insert(0, str(PLUGIN_DIR / "digital-oracle-main"))
+
+import digital_oracle_vcp as vcp  # noqa: E402
+from digital_oracle.async_http import AsyncConnectionPool, AsyncJsonClient, BlockingJsonClient  # noqa: E402
+from digital_oracle.concurrent import agather  # noqa: E402
+from digital_oracle.telemetry import default_telemetry  # noqa: E402
+
+
+def response(body=b"{}", *, length=None):
+    length = len(body) if length is None else length
+    return b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (length, body)
+
+
+class ScriptedServer:
+    """Answers the n-th request on each connection with ``script(connection, n)``.
+
+    The script returns ``(payload, close)``; ``close`` drops the socket after
+    writing, without a ``Connection: close`` header.
+    """
+
+    def __init__(self, script):
+        self.script = script
+        self.requests = 0
+        self.connections = 0
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.url = "http://127.0.0.1:%d/" % self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        connection, index = self.connections, 0
+        try:
+            while True:
+                try:
+                    await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                self.requests += 1
+                index += 1
+                payload, close = self.script(connection, index)
+                writer.write(payload)
+                await writer.drain()
+                if close:
+                    return
+        finally:
+            writer.close()
+
+
+class AsyncConnectionPoolTests(unittest.IsolatedAsyncioTestCase):
+    async def test_keep_alive_connection_is_reused(self):
+        async with ScriptedServer(lambda c, n: (response(b'{"n": %d}' % n), False)) as server:
+            pool = AsyncConnectionPool()
+            client = AsyncJsonClient(pool=pool)
+            self.assertEqual(await client.get_json(server.url), {"n": 1})
+            self.assertEqual(await client.get_json(server.url), {"n": 2})
+            await pool.close()
+        stats = next(iter(pool.stats().values()))
+        self.assertEqual((stats["handshakes"], stats["reuses"]), (1, 1))
+
+    async def test_reused_connection_dropped_by_server_is_resent_once(self):
+        def script(connection, index):
+            if connection == 1 and index == 2:
+                return b"", True
+            return response(b'{"c": %d}' % connection), False
+
+        async with ScriptedServer(script) as server:
+            pool = AsyncConnectionPool()
+            client = AsyncJsonClient(pool=pool, retry_attempts=1)
+            self.assertEqual(await client.get_json(server.url), {"c": 1})
+            self.assertEqual(await client.get_json(server.url), {"c": 2})
+            await pool.close()
+        self.assertEqual(next(iter(pool.stats().values()))["stale_retries"], 1)
+
+    async def test_fresh_connection_dropped_by_server_is_not_resent(self):
+        async with ScriptedServer(lambda c, n: (b"", True)) as server:
+            pool = AsyncConnectionPool()
+            with self.assertRaises(http.client.RemoteDisconnected):
+                await pool.request("GET", server.url)
+        self.assertEqual(server.requests, 1)
+
+    async def test_truncated_body_is_not_resent(self):
+        def script(connection, index):
+            if connection == 1 and index == 1:
+                return response(b'{"ok": 1}'), False
+            return response(b'{"tr', length=20), True
+
+        async with ScriptedServer(script) as server:
+            pool = AsyncConnectionPool()
+            await pool.request("GET", server.url)
+            with self.assertRaises(http.client.IncompleteRead):
+                await pool.request("GET", server.url)
+            await pool.close()
+        self.assertEqual(server.requests, 2)
+        self.assertEqual(next(iter(pool.stats().values()))["stale_retries"], 0)
+
+
+class AgatherTests(unittest.IsolatedAsyncioTestCase):
+    async def test_timed_out_lists_only_agather_timeouts(self):
+        async def slow():
+            await asyncio.sleep(1)
+
+        async def raises_timeout():
+            raise TimeoutError("socket")
+
+        outcome = await agather({"slow": slow, "own": raises_timeout, "ok": lambda: 1}, task_timeout_seconds=0.1)
+        self.assertEqual(outcome.results, {"ok": 1})
+        self.assertEqual(outcome.timed_out, frozenset({"slow"}))
+
+        outcome = await agather({"slow": slow}, timeout_seconds=0.1)
+        self.assertEqual(outcome.timed_out, frozenset({"slow"}))
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class BlockingJsonClientTests(unittest.TestCase):
+    def test_sync_callers_share_the_background_loop(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _JsonHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = "http://127.0.0.1:%d/x" % server.server_address[1]
+
+        client = BlockingJsonClient(AsyncJsonClient(retry_attempts=1))
+        with default_telemetry().trace() as trace:
+            self.assertEqual(client.get_json(url, params={"a": 1}), {"path": "/x?a=1"})
+            self.assertEqual(json.loads(client.get_text(url)), {"path": "/x"})
+        # Spans recorded on the loop thread still land in the caller's trace.
+        summary = trace.summary()
+        self.assertEqual(summary["http:127.0.0.1"]["count"], 2)
+        self.assertEqual(summary["parse:127.0.0.1"]["count"], 1)
+
+    def test_multi_currency_deribit_fan_out_uses_the_shared_blocking_pool(self):
+        # The fan-out runs on gather threads, so the keep-alive ConnectionPool
+        # already bounds it; a loop thread behind it would only add a hop.
+        with mock.patch.object(vcp, "build_provider", wraps=vcp.build_provider) as build, mock.patch(
+            "digital_oracle.DeribitProvider.get_futures_term_structures", return_value={}
+        ):
+            vcp.fetch_single_provider("deribit_futures", {"currencies": "BTC,ETH", "output": "json"})
+        self.assertNotIn("http_client", build.call_args.kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import math
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.barstore import BarColumns, BarStore  # noqa: E402
+from digital_oracle.cache import CachingPriceFetcher, ResponseCache  # noqa: E402
+from digital_oracle.providers.prices import PriceHistoryQuery  # noqa: E402
+from digital_oracle.providers.yahoo import YahooPriceProvider, _period_days  # noqa: E402
+from digital_oracle.singleflight import SingleFlightPriceFetcher  # noqa: E402
+
+try:
+    import pandas
+except ImportError:  # pragma: no cover - pandas ships with yfinance
+    pandas = None
+
+
+def bar(day, close, volume=100.0):
+    return {"Date": day, "Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": volume}
+
+
+class FakeFetcher:
+    """Serves one daily bar per calendar day up to the store's "today"."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.periods = []
+        self.bump = 0.0
+
+    def fetch_history(self, symbol, *, period, interval):
+        self.periods.append(period)
+        today = date.fromtimestamp(self.clock())
+        span = _period_days(period) or 3650
+        return [
+            bar((today - timedelta(days=offset)).isoformat(), 100.0 + offset + (self.bump if offset == 0 else 0))
+            for offset in range(span, -1, -1)
+        ]
+
+
+class BarColumnsTests(unittest.TestCase):
+    def test_from_rows_sorts_dedupes_and_drops_incomplete_rows(self):
+        columns = BarColumns.from_rows([
+            bar("2024-01-03", 3.0),
+            bar("2024-01-01", 1.0, volume=None),
+            {"Date": "2024-01-02", "Open": 2.0, "High": None, "Low": 1.0, "Close": 2.0},
+            bar("2024-01-03", 33.0),
+            {"Open": 1.0},
+        ])
+        bars = columns.to_bars()
+        self.assertEqual([b.date for b in bars], ["2024-01-01", "2024-01-03"])
+        self.assertEqual(bars[1].close, 33.0)
+        self.assertIsNone(bars[0].volume)
+
+    def test_merge_replaces_overlap_and_window_limits(self):
+        old = BarColumns.from_rows([bar("2024-01-0%d" % d, float(d)) for d in range(1, 6)])
+        new = BarColumns.from_rows([bar("2024-01-04", 40.0), bar("2024-01-06", 60.0)])
+        merged = old.merge(new)
+        self.assertEqual(list(merged.close), [1.0, 2.0, 3.0, 40.0, 60.0])
+        window = merged.window(start_date="2024-01-02", end_date="2024-01-05", limit=2)
+        self.assertEqual([b.date for b in window.to_bars()], ["2024-01-03", "2024-01-04"])
+        self.assertIs(old.merge(BarColumns()), old)
+
+    @unittest.skipIf(pandas is None, "pandas not installed")
+    def test_from_frame_matches_from_rows(self):
+        rows = [
+            bar("2024-01-03", 3.0),
+            bar("2024-01-01", 1.0, volume=None),
+            {"Date": "2024-01-02", "Open": 2.0, "High": None, "Low": 1.0, "Close": 2.0, "Volume": 5.0},
+            bar("2024-01-03", 33.0),
+        ]
+        index = pandas.DatetimeIndex([row["Date"] for row in rows]).tz_localize("Asia/Tokyo")
+        frame = pandas.DataFrame([{k: v for k, v in row.items() if k != "Date"} for row in rows], index=index)
+        self.assertEqual(BarColumns.from_frame(frame).to_bars(), BarColumns.from_rows(rows).to_bars())
+        self.assertEqual(len(BarColumns.from_frame(frame.iloc[2:3])), 0)
+        self.assertEqual(len(BarColumns.from_frame(frame.iloc[0:0])), 0)
+
+
+class ColumnFetcher(FakeFetcher):
+    """Same bars, also offered column-wise like the yfinance fetcher."""
+
+    def __init__(self, clock):
+        super().__init__(clock)
+        self.rows_calls = 0
+
+    def fetch_history(self, symbol, *, period, interval):
+        self.rows_calls += 1
+        return super().fetch_history(symbol, period=period, interval=interval)
+
+    def fetch_columns(self, symbol, *, period, interval):
+        rows = super().fetch_history(symbol, period=period, interval=interval)
+        return BarColumns.from_rows(rows)
+
+
+class BarStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.now = datetime(2024, 6, 14, 12).timestamp()
+        self.store = BarStore(self.tmp.name, clock=lambda: self.now)
+
+    def test_round_trip_and_corrupt_files(self):
+        columns = BarColumns.from_rows([bar("2024-01-01", 1.0, volume=None), bar("2024-01-02", 2.0)])
+        self.store.save("GC=F", "d", columns, covered_from=5)
+        stored = self.store.load("GC=F", "d")
+        self.assertEqual(stored.columns.to_bars(), columns.to_bars())
+        self.assertEqual((stored.covered_from, stored.fetched_at), (5, self.now))
+        self.assertTrue(math.isnan(stored.columns.volume[0]))
+
+        self.assertNotEqual(self.store.path_for("GC=F", "d"), self.store.path_for("GC_F", "d"))
+        path = self.store.path_for("GC=F", "d")
+        path.write_bytes(path.read_bytes()[:-4])
+        self.assertEqual(len(self.store.load("GC=F", "d").columns), 0)
+        self.assertEqual(len(self.store.load("missing", "d").columns), 0)
+
+    def test_provider_fetches_full_then_hits_then_deltas(self):
+        fetcher = FakeFetcher(lambda: self.now)
+        provider = YahooPriceProvider(fetcher=fetcher, store=self.store, store_ttl_seconds=300)
+        query = PriceHistoryQuery(symbol="SPY", limit=20)
+
+        first = provider.get_history(query)
+        self.assertEqual(first.metadata["bar_store"], "full")
+        self.assertEqual(len(first.bars), 20)
+
+        self.now += 60
+        self.assertEqual(provider.get_history(query).metadata["bar_store"], "hit")
+
+        self.now += 86400
+        fetcher.bump = 0.5
+        latest = provider.get_history(query)
+        self.assertEqual(latest.metadata["bar_store"], "delta")
+        self.assertEqual(fetcher.periods[-1], "5d")
+        self.assertEqual(latest.bars[-1].date, date.fromtimestamp(self.now).isoformat())
+        self.assertEqual(latest.bars[-1].close, 100.5)
+        self.assertEqual(latest.bars[-2].close, 101.0)
+
+        longer = provider.get_history(PriceHistoryQuery(symbol="SPY", limit=200))
+        self.assertEqual(longer.metadata["bar_store"], "full")
+        self.assertEqual(len(fetcher.periods), 3)
+
+    def test_columns_pass_through_the_cache_and_singleflight_wrappers(self):
+        fetcher = ColumnFetcher(lambda: self.now)
+        cache = ResponseCache(Path(self.tmp.name) / "cache.sqlite3", clock=lambda: self.now)
+        self.addCleanup(cache.close)
+        wrapped = SingleFlightPriceFetcher(CachingPriceFetcher(fetcher, cache=cache, namespace="yahoo"))
+        query = PriceHistoryQuery(symbol="SPY", limit=20)
+
+        bars = YahooPriceProvider(fetcher=wrapped).get_history(query).bars
+        self.assertEqual(YahooPriceProvider(fetcher=wrapped).get_history(query).bars, bars)
+        self.assertEqual((len(fetcher.periods), fetcher.rows_calls), (1, 0))
+
+        plain = FakeFetcher(lambda: self.now)
+        rows_only = SingleFlightPriceFetcher(CachingPriceFetcher(plain, cache=cache, namespace="yahoo"))
+        self.assertEqual(YahooPriceProvider(fetcher=rows_only).get_history(query).bars, bars)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PLUGIN_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PLUGIN_DIR))
+
+import digital_oracle_vcp as vcp  # noqa: E402
+
+
+def sections(text):
+    """{index: section text} of a rendered batch result."""
+    parts = {}
+    for block in text.split("## 指令 ")[1:]:
+        head, _, body = block.partition("\n")
+        parts[int(head.split(":")[0])] = body
+    return parts
+
+
+class BatchCommandTests(unittest.TestCase):
+    def run_batch(self, behaviours, **args):
+        """behaviours: {index: callable(args) -> result}."""
+        request = dict(args)
+        for index in behaviours:
+            request[f"command{index}"] = "FetchMarketData"
+            request[f"provider{index}"] = str(index)
+
+        def fake_execute(command_args):
+            return behaviours[int(command_args["provider"])](command_args)
+
+        with mock.patch.object(vcp, "execute_single_command", side_effect=fake_execute):
+            return sections(vcp.execute_batch_commands(request))
+
+    def test_results_keep_index_order(self):
+        def slow(_):
+            time.sleep(0.1)
+            return "slow"
+
+        result = self.run_batch({1: slow, 2: lambda _: "fast"})
+        self.assertEqual(list(result), [1, 2])
+        self.assertIn("slow", result[1])
+        self.assertIn("fast", result[2])
+
+    def test_invalid_command_timeout_falls_back_to_default(self):
+        result = self.run_batch({1: lambda _: "ok"}, command_timeout="abc")
+        self.assertIn("status: success", result[1])
+        with mock.patch.dict("os.environ", {"DIGITAL_ORACLE_COMMAND_TIMEOUT": "soon"}):
+            result = self.run_batch({1: lambda _: "ok"})
+        self.assertIn("status: success", result[1])
+
+    def test_only_gather_timeouts_are_relabelled(self):
+        def socket_timeout(_):
+            raise TimeoutError("timed out reading from upstream")
+
+        def hang(_):
+            time.sleep(1.0)
+
+        result = self.run_batch({1: socket_timeout, 2: hang}, command_timeout="0.2")
+        self.assertIn("timed out reading from upstream", result[1])
+        self.assertIn("执行超过 0.2 秒未完成", result[2])
+
+    def test_dependency_wait_does_not_count_towards_timeout(self):
+        order = []
+
+        def slow_dependency(_):
+            time.sleep(0.3)
+            order.append(1)
+            return "first"
+
+        def dependent(_):
+            order.append(2)
+            time.sleep(0.1)
+            return "second"
+
+        result = self.run_batch({1: slow_dependency, 2: dependent}, command_timeout="0.25", after2="1")
+        self.assertIn("执行超过 0.25 秒未完成", result[1])
+        self.assertIn("依赖超时", result[2])
+        self.assertEqual(order, [])
+
+        result = self.run_batch({1: slow_dependency, 2: dependent}, command_timeout="0.35", after2="1")
+        self.assertIn("first", result[1])
+        self.assertIn("second", result[2])
+
+    def test_waiting_dependent_does_not_hold_a_worker(self):
+        gate = threading.Event()
+
+        def blocked(_):
+            gate.wait(2)
+            return "dependency"
+
+        def independent(_):
+            gate.set()
+            return "independent"
+
+        started = time.monotonic()
+        result = self.run_batch(
+            {1: blocked, 2: lambda _: "dependent", 3: independent},
+            max_concurrency="2",
+            after2="1",
+        )
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual([("status: success" in body) for body in result.values()], [True, True, True])
+
+    def test_failed_dependency_skips_dependents(self):
+        def boom(_):
+            raise RuntimeError("boom")
+
+        calls = []
+        result = self.run_batch(
+            {1: boom, 2: lambda _: calls.append(2), 3: lambda _: calls.append(3)},
+            after2="1",
+            depends_on3="command2",
+        )
+        self.assertIn("boom", result[1])
+        self.assertIn("依赖的指令 1 未成功完成", result[2])
+        self.assertIn("依赖的指令 2 未成功完成", result[3])
+        self.assertEqual(calls, [])
+
+    def test_invalid_dependency_is_reported(self):
+        result = self.run_batch({1: lambda _: "ok", 2: lambda _: "ok", 3: lambda _: "ok"}, after1="2", after3="1")
+        self.assertIn("只能依赖本批次中编号更小的指令", result[1])
+        self.assertIn("依赖的指令 1 未成功完成", result[3])
+        self.assertIn("status: success", result[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
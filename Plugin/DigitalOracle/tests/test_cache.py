@@ -0,0 +1,111 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.cache import CachePolicy, CachingHttpClient, ResponseCache  # noqa: E402
+
+
+class FakeJsonClient:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_json(self, url, *, params=None):
+        self.release.wait(2)
+        self.calls += 1
+        return {"url": url, "params": dict(params or {}), "call": self.calls}
+
+    def ping(self):
+        return "pong"
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.now = 1000.0
+
+    def make_cache(self, **kwargs):
+        kwargs.setdefault("policies", {"test": CachePolicy(10.0, 20.0)})
+        cache = ResponseCache(Path(self.tmp.name) / "responses.sqlite3", clock=lambda: self.now, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_fresh_entries_are_served_from_disk(self):
+        cache = self.make_cache()
+        upstream = FakeJsonClient()
+        client = CachingHttpClient(upstream, cache=cache, namespace="test")
+        first = client.get_json("https://x.test/a", params={"q": 1})
+        self.now += 5
+        self.assertEqual(client.get_json("https://x.test/a", params={"q": 1}), first)
+        self.assertEqual(upstream.calls, 1)
+        client.get_json("https://x.test/a", params={"q": 2})
+        self.assertEqual(upstream.calls, 2)
+        self.assertEqual(client.ping(), "pong")
+
+    def test_entries_survive_a_new_process(self):
+        upstream = FakeJsonClient()
+        CachingHttpClient(upstream, cache=self.make_cache(), namespace="test").get_json("https://x.test/a")
+        reopened = CachingHttpClient(upstream, cache=self.make_cache(), namespace="test")
+        self.assertEqual(reopened.get_json("https://x.test/a")["call"], 1)
+        self.assertEqual(upstream.calls, 1)
+
+    def test_stale_entry_served_while_background_refresh_runs(self):
+        cache = self.make_cache()
+        upstream = FakeJsonClient()
+        client = CachingHttpClient(upstream, cache=cache, namespace="test")
+        client.get_json("https://x.test/a")
+        self.now += 15
+        upstream.release.clear()
+        self.assertEqual(client.get_json("https://x.test/a")["call"], 1)
+        upstream.release.set()
+        cache.drain()
+        self.assertEqual(client.get_json("https://x.test/a")["call"], 2)
+        self.assertEqual(cache.stats()["stale_hits"], 1)
+
+    def test_one_shot_cache_refetches_stale_entry_synchronously(self):
+        cache = self.make_cache(background_revalidate=False)
+        upstream = FakeJsonClient()
+        client = CachingHttpClient(upstream, cache=cache, namespace="test")
+        client.get_json("https://x.test/a")
+        self.now += 15
+        self.assertEqual(client.get_json("https://x.test/a")["call"], 2)
+        self.assertEqual(cache.stats()["stale_hits"], 0)
+        self.assertEqual(cache._revalidating, {})
+
+    def test_expired_and_refresh_go_upstream(self):
+        cache = self.make_cache()
+        upstream = FakeJsonClient()
+        CachingHttpClient(upstream, cache=cache, namespace="test").get_json("https://x.test/a")
+        self.now += 31
+        CachingHttpClient(upstream, cache=cache, namespace="test").get_json("https://x.test/a")
+        CachingHttpClient(upstream, cache=cache, namespace="test", refresh=True).get_json("https://x.test/a")
+        self.assertEqual(upstream.calls, 3)
+
+    def test_size_cap_evicts_least_recently_accessed(self):
+        cache = self.make_cache()
+        upstream = FakeJsonClient()
+        client = CachingHttpClient(upstream, cache=cache, namespace="test")
+        client.get_json("https://x.test/a")
+        cache.max_bytes = cache.stats()["bytes"] * 2 + 10
+        self.now += 1
+        client.get_json("https://x.test/b")
+        self.now += 1
+        client.get_json("https://x.test/a")
+        self.now += 1
+        client.get_json("https://x.test/c")
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertEqual(upstream.calls, 3)
+        client.get_json("https://x.test/a")
+        self.assertEqual(upstream.calls, 3)
+        client.get_json("https://x.test/b")
+        self.assertEqual(upstream.calls, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
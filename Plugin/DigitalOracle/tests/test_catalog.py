@@ -0,0 +1,130 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PLUGIN_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PLUGIN_DIR))
+sys.path.insert(0, str(PLUGIN_DIR / "digital-oracle-main"))
+
+import digital_oracle_vcp as vcp  # noqa: E402
+from digital_oracle.catalog import CatalogEntry, MarketCatalog  # noqa: E402
+from digital_oracle.providers.kalshi import KalshiProvider  # noqa: E402
+
+
+def entry(key, title, body="", source="polymarket"):
+    return CatalogEntry(source=source, key=key, title=title, body=body, group_key=key.upper())
+
+
+ENTRIES = [
+    entry("fed-rate-cut-june", "Fed rate cut in June?", "federal reserve fomc"),
+    entry("bitcoin-100k", "Bitcoin above 100k by December?", "btc price"),
+    entry("ukraine-ceasefire", "Russia Ukraine ceasefire in 2025?"),
+]
+
+
+class FakeKalshiHttp:
+    """Two cursor pages of ``/markets``."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_json(self, url, *, params=None):
+        self.calls += 1
+        if not params.get("cursor"):
+            return {"markets": [{"ticker": "INX-A", "event_ticker": "INX", "title": "S&P 500 close above 6000"}], "cursor": "p2"}
+        return {"markets": [{"ticker": "CPI-B", "event_ticker": "CPI", "title": "CPI above 3%", "subtitle": "inflation"}], "cursor": ""}
+
+
+class MarketCatalogTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.now = 1000.0
+        self.catalog = self.open()
+
+    def open(self):
+        catalog = MarketCatalog(Path(self.tmp.name) / "catalog.sqlite3", clock=lambda: self.now)
+        self.addCleanup(catalog.close)
+        return catalog
+
+    def keys(self, hits):
+        return [hit.key for hit in hits]
+
+    def test_refresh_is_incremental_and_removes_delisted_rows(self):
+        first = self.catalog.refresh_source("polymarket", ENTRIES)
+        self.assertEqual((first.added, first.updated, first.unchanged, first.removed), (3, 0, 0, 0))
+
+        self.now += 10
+        changed = [ENTRIES[0], entry("bitcoin-100k", "Bitcoin above 150k by December?", "btc price")]
+        second = self.catalog.refresh_source("polymarket", changed)
+        self.assertEqual((second.added, second.updated, second.unchanged, second.removed), (0, 1, 1, 1))
+        self.assertEqual(self.keys(self.catalog.search("ceasefire")), [])
+        self.assertEqual(self.keys(self.catalog.search("150k")), ["bitcoin-100k"])
+        self.assertEqual(self.open().stats(), {"polymarket": {"entries": 2, "age_seconds": 0.0}})
+
+    def test_partial_or_failed_listing_keeps_unseen_rows(self):
+        self.catalog.refresh_source("polymarket", ENTRIES)
+        self.now += 10
+        self.assertEqual(self.catalog.refresh_source("polymarket", ENTRIES[:1], complete=False).removed, 0)
+
+        def broken():
+            yield ENTRIES[0]
+            raise OSError("page 2 failed")
+
+        self.now += 10
+        with self.assertRaises(OSError):
+            self.catalog.refresh_source("polymarket", broken())
+        self.assertEqual(len(self.catalog.search("ukraine")), 1)
+        self.assertEqual(self.catalog.stats()["polymarket"]["age_seconds"], 10.0)
+
+    def test_search_prefix_fallback_typo_and_source_filter(self):
+        self.catalog.refresh_source("polymarket", ENTRIES)
+        self.catalog.refresh_source("kalshi", [entry("FED-25", "Fed funds rate", source="kalshi")])
+        self.assertEqual(self.keys(self.catalog.search("bitc dec")), ["bitcoin-100k"])
+        self.assertEqual(sorted(self.keys(self.catalog.search("bitcoin ukraine"))), ["bitcoin-100k", "ukraine-ceasefire"])
+        self.assertEqual(self.keys(self.catalog.search("ceasfire")), ["ukraine-ceasefire"])
+        self.assertEqual(self.keys(self.catalog.search("fed rate", sources=["kalshi"])), ["FED-25"])
+        self.assertEqual({hit.group_key for hit in self.catalog.search("fed")}, {"FED-RATE-CUT-JUNE", "FED-25"})
+        self.assertEqual(self.catalog.search("   "), [])
+
+    def test_like_fallback_without_fts(self):
+        self.catalog.refresh_source("polymarket", ENTRIES)
+        self.catalog.fts_enabled = False
+        self.assertEqual(self.keys(self.catalog.search("ukraine 2025")), ["ukraine-ceasefire"])
+
+    def test_refresh_kalshi_walks_pages_and_respects_max_age(self):
+        http = FakeKalshiHttp()
+        provider = KalshiProvider(http_client=http)
+        result = self.catalog.refresh_kalshi(provider, max_age_seconds=60)
+        self.assertEqual(result.added, 2)
+        self.assertEqual(self.keys(self.catalog.search("inflation")), ["CPI-B"])
+
+        self.now += 30
+        self.assertIsNone(self.catalog.refresh_kalshi(provider, max_age_seconds=60))
+        self.assertEqual(http.calls, 2)
+        self.now += 31
+        self.assertEqual(self.catalog.refresh_kalshi(provider, max_age_seconds=60).unchanged, 2)
+
+
+class LocalStoreTests(unittest.TestCase):
+    def test_catalog_is_created_once_under_the_cache_dir(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(
+            "os.environ", {"DIGITAL_ORACLE_CACHE_DIR": tmp}
+        ), mock.patch.object(vcp, "_market_catalog", vcp._LazyStore(lambda root: MarketCatalog(root / "c.sqlite3"))):
+            catalog = vcp.get_market_catalog()
+            self.assertIs(vcp.get_market_catalog(), catalog)
+            self.assertTrue((Path(tmp) / "c.sqlite3").exists())
+            catalog.close()
+
+    def test_a_failed_store_is_not_retried(self):
+        create = mock.Mock(side_effect=OSError("read-only"))
+        store = vcp._LazyStore(create)
+        self.assertIsNone(store.get())
+        self.assertIsNone(store.get())
+        self.assertEqual(create.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.concurrent import DependencyError, GatherError, gather  # noqa: E402
+
+
+class GatherTests(unittest.TestCase):
+    def test_collects_results_and_errors(self):
+        def boom():
+            raise ValueError("boom")
+
+        outcome = gather({"a": lambda: 1, "b": boom})
+        self.assertEqual(outcome.results, {"a": 1})
+        self.assertIsInstance(outcome.errors["b"], ValueError)
+        self.assertFalse(outcome.ok)
+        self.assertEqual(outcome.get_or("b", 0), 0)
+        self.assertEqual(outcome.timed_out, frozenset())
+
+    def test_fail_fast_raises(self):
+        def boom():
+            raise ValueError("boom")
+
+        with self.assertRaises(GatherError) as caught:
+            gather({"a": boom}, fail_fast=True)
+        self.assertIn("a", caught.exception.errors)
+
+    def test_task_timeout_counts_from_start_not_queue(self):
+        outcome = gather(
+            {"a": lambda: time.sleep(0.15) or "a", "b": lambda: time.sleep(0.15) or "b"},
+            max_workers=1,
+            task_timeout_seconds=0.25,
+        )
+        self.assertEqual(outcome.results, {"a": "a", "b": "b"})
+
+    def test_timed_out_only_lists_gather_timeouts(self):
+        def raises_timeout():
+            raise TimeoutError("socket")
+
+        outcome = gather(
+            {"own": raises_timeout, "slow": lambda: time.sleep(1)},
+            task_timeout_seconds=0.1,
+        )
+        self.assertIsInstance(outcome.errors["own"], TimeoutError)
+        self.assertEqual(outcome.timed_out, frozenset({"slow"}))
+
+    def test_batch_timeout(self):
+        outcome = gather({"slow": lambda: time.sleep(1)}, timeout_seconds=0.1)
+        self.assertIn("slow", outcome.timed_out)
+
+    def test_dependents_start_after_dependencies(self):
+        order = []
+        lock = threading.Lock()
+
+        def step(name, delay=0.0):
+            def run():
+                time.sleep(delay)
+                with lock:
+                    order.append(name)
+                return name
+            return run
+
+        outcome = gather(
+            {"a": step("a", 0.1), "b": step("b"), "c": step("c")},
+            dependencies={"b": ["a"], "c": ["a", "b"]},
+        )
+        self.assertEqual(order, ["a", "b", "c"])
+        self.assertTrue(outcome.ok)
+
+    def test_waiting_dependent_holds_no_worker_or_clock(self):
+        outcome = gather(
+            {"a": lambda: time.sleep(0.3) or "a", "b": lambda: "b", "c": lambda: "c"},
+            max_workers=1,
+            task_timeout_seconds=0.5,
+            dependencies={"b": ["a"]},
+        )
+        self.assertEqual(outcome.results, {"a": "a", "b": "b", "c": "c"})
+
+    def test_failed_or_timed_out_dependency_skips_dependents(self):
+        def boom():
+            raise RuntimeError("boom")
+
+        ran = []
+        outcome = gather(
+            {"a": boom, "b": lambda: ran.append("b"), "c": lambda: ran.append("c")},
+            dependencies={"b": ["a"], "c": ["b"]},
+        )
+        self.assertEqual(ran, [])
+        self.assertIsInstance(outcome.errors["b"], DependencyError)
+        self.assertEqual(outcome.errors["b"].dependency, "a")
+        self.assertEqual(outcome.errors["c"].dependency, "b")
+
+        outcome = gather(
+            {"a": lambda: time.sleep(1), "b": lambda: "b"},
+            task_timeout_seconds=0.1,
+            dependencies={"b": ["a"]},
+        )
+        self.assertEqual(outcome.timed_out, frozenset({"a"}))
+        self.assertIsInstance(outcome.errors["b"], DependencyError)
+
+    def test_dependents_pending_at_batch_deadline_time_out(self):
+        outcome = gather(
+            {"a": lambda: time.sleep(0.5), "b": lambda: "b"},
+            timeout_seconds=0.1,
+            dependencies={"b": ["a"]},
+        )
+        self.assertEqual(outcome.timed_out, frozenset({"a", "b"}))
+
+    def test_rejects_unknown_labels_and_cycles(self):
+        with self.assertRaises(ValueError):
+            gather({"a": lambda: 1}, dependencies={"a": ["missing"]})
+        with self.assertRaises(ValueError):
+            gather({"a": lambda: 1, "b": lambda: 2}, dependencies={"a": ["b"], "b": ["a"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PLUGIN_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PLUGIN_DIR))
+
+import digital_oracle_vcp as vcp  # noqa: E402
+from digital_oracle.prefetch import SignalStore  # noqa: E402
+
+FIVE_DAYS = 5 * 86400
+
+
+class DashboardSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.clock = [time.time()]
+        self.store = SignalStore(Path(self.tmp.name) / "signals.sqlite3", clock=lambda: self.clock[0])
+        self.addCleanup(self.store.close)
+        self.calls = []
+
+        def fake_fetch(provider, params):
+            self.calls.append((provider, dict(params)))
+            return {"provider": provider, "value": len(self.calls)}
+
+        for patcher in (
+            mock.patch.object(vcp, "get_signal_store", return_value=self.store),
+            mock.patch.object(vcp, "fetch_single_provider", side_effect=fake_fetch),
+            mock.patch.object(vcp, "_prefetcher", None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def dashboard(self, **args):
+        return vcp.get_global_macro_dashboard_command({"output": "json", **args})
+
+    def age_snapshots(self, seconds):
+        self.clock[0] -= seconds
+        self.dashboard(refresh=True)
+        self.clock[0] += seconds
+        self.calls.clear()
+
+    def test_first_call_fetches_every_signal_and_stores_it(self):
+        result = self.dashboard()
+        self.assertEqual(len(self.calls), len(vcp.dashboard_signals({})))
+        self.assertTrue(all(entry["source"] == "live" for entry in result["signals"].values()))
+
+        self.calls.clear()
+        result = self.dashboard()
+        self.assertEqual(self.calls, [])
+        self.assertTrue(all(entry["source"] == "snapshot" for entry in result["signals"].values()))
+
+    def test_one_shot_refetches_stale_snapshots(self):
+        self.age_snapshots(FIVE_DAYS)
+        result = self.dashboard()
+        self.assertEqual(len(self.calls), len(vcp.dashboard_signals({})))
+        self.assertTrue(all(entry["source"] == "live" for entry in result["signals"].values()))
+
+    def test_refresh_stale_false_opts_out(self):
+        self.age_snapshots(FIVE_DAYS)
+        result = self.dashboard(refresh_stale=False)
+        self.assertEqual(self.calls, [])
+        entry = result["signals"]["fear_greed"]
+        self.assertEqual(entry["source"], "snapshot")
+        self.assertTrue(entry["stale"])
+        self.assertGreaterEqual(entry["age_seconds"], FIVE_DAYS)
+
+    def test_stale_snapshots_served_while_prefetcher_owns_store(self):
+        self.age_snapshots(FIVE_DAYS)
+        with mock.patch.object(vcp, "_prefetcher", mock.Mock()):
+            result = self.dashboard()
+        self.assertEqual(self.calls, [])
+        self.assertTrue(all(entry["stale"] for entry in result["signals"].values()))
+
+    def test_failed_refetch_falls_back_to_stale_snapshot(self):
+        self.age_snapshots(FIVE_DAYS)
+        with mock.patch.object(vcp, "fetch_single_provider", side_effect=RuntimeError("upstream down")):
+            result = self.dashboard()
+        self.assertEqual(result["errors"]["fear_greed"], "upstream down")
+        self.assertEqual(result["signals"]["fear_greed"]["source"], "snapshot")
+
+    def test_refresh_bypasses_response_cache(self):
+        self.dashboard(refresh=True)
+        self.assertTrue(self.calls)
+        self.assertTrue(all(params.get("refresh") is True for _, params in self.calls))
+
+        self.age_snapshots(FIVE_DAYS)
+        self.dashboard()
+        self.assertTrue(all("refresh" not in params for _, params in self.calls))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.cache import ResponseCache  # noqa: E402
+from digital_oracle.providers import deribit  # noqa: E402
+from digital_oracle.providers.base import ProviderError  # noqa: E402
+from digital_oracle.providers.deribit import DeribitFuturesCurveQuery, DeribitProvider  # noqa: E402
+
+DAY_MS = 86_400_000
+
+
+class FakeDeribitClient:
+    """Two expirations with a put and a call at two strikes each."""
+
+    def __init__(self):
+        self.calls = []
+        now_ms = int(time.time() * 1000)
+        self.instruments = []
+        self.summaries = []
+        for label, days in (("27JUN30", 30), ("26DEC30", 180)):
+            for strike in (90000, 110000):
+                for option_type, suffix in (("call", "C"), ("put", "P")):
+                    name = f"BTC-{label}-{strike}-{suffix}"
+                    self.instruments.append({
+                        "instrument_name": name,
+                        "kind": "option",
+                        "base_currency": "BTC",
+                        "expiration_timestamp": now_ms + days * DAY_MS,
+                        "strike": strike,
+                        "option_type": option_type,
+                        "is_active": True,
+                    })
+                    self.summaries.append({
+                        "instrument_name": name,
+                        "underlying_price": 100000.0,
+                        "mark_iv": 50.0 + days / 10,
+                    })
+
+    def get_json(self, url, *, params=None):
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls.append(endpoint)
+        if endpoint == "get_instruments":
+            return {"result": self.instruments}
+        if endpoint == "get_book_summary_by_currency":
+            return {"result": self.summaries}
+        raise AssertionError(f"unexpected endpoint {endpoint}")
+
+
+class DeribitSurfaceTests(unittest.TestCase):
+    def test_surface_converts_mark_iv_and_orders_expirations(self):
+        provider = DeribitProvider(FakeDeribitClient())
+        surface = provider.get_surface("btc")
+        self.assertEqual(surface.expirations, ("27JUN30", "26DEC30"))
+        self.assertEqual(surface.strikes, (90000.0, 110000.0))
+        self.assertAlmostEqual(surface.iv("27JUN30", 110000.0, "call"), 0.53)
+
+    def test_default_call_reuses_full_refresh(self):
+        client = FakeDeribitClient()
+        provider = DeribitProvider(client, surface_cache_seconds=60, instrument_cache_seconds=0)
+        provider.get_surface("BTC")
+        calls = len(client.calls)
+        provider.get_surface("BTC")
+        provider.get_surface("BTC", ["27JUN30"])
+        self.assertEqual(len(client.calls), calls)
+
+    def test_unlisted_label_is_cached_as_not_listed(self):
+        client = FakeDeribitClient()
+        provider = DeribitProvider(client, surface_cache_seconds=60, instrument_cache_seconds=0)
+        surface = provider.get_surface("BTC", ["27JUN30", "1JAN99"])
+        self.assertEqual(surface.expirations, ("27JUN30",))
+        self.assertEqual(surface.failed_expirations, ("1JAN99",))
+        calls = len(client.calls)
+        surface = provider.get_surface("BTC", ["1JAN99"])
+        self.assertEqual(surface.failed_expirations, ("1JAN99",))
+        self.assertEqual(len(client.calls), calls)
+
+    def test_expired_cache_refetches(self):
+        client = FakeDeribitClient()
+        provider = DeribitProvider(client, surface_cache_seconds=0, instrument_cache_seconds=0)
+        provider.get_surface("BTC")
+        calls = len(client.calls)
+        provider.get_surface("BTC")
+        self.assertEqual(len(client.calls), 2 * calls)
+
+    def test_max_expirations_keeps_nearest(self):
+        provider = DeribitProvider(FakeDeribitClient())
+        surface = provider.get_surface("BTC", max_expirations=1)
+        self.assertEqual(surface.expirations, ("27JUN30",))
+
+
+class FakeFuturesClient:
+    """A perpetual plus one dated future per currency; records overlapping requests."""
+
+    def __init__(self, *, expiry_ms, failing=()):
+        self.expiry_ms = expiry_ms
+        self.failing = set(failing)
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def get_json(self, url, *, params=None):
+        endpoint, currency = url.rsplit("/", 1)[-1], params["currency"]
+        with self.lock:
+            self.calls.append((endpoint, currency))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(0.05)
+            if currency in self.failing:
+                raise OSError(f"{currency} down")
+            names = (f"{currency}-PERPETUAL", f"{currency}-27JUN30")
+            if endpoint == "get_instruments":
+                return {"result": [
+                    {"instrument_name": names[0], "kind": "future", "settlement_period": "perpetual"},
+                    {"instrument_name": names[1], "kind": "future", "expiration_timestamp": self.expiry_ms},
+                ]}
+            return {"result": [{"instrument_name": name, "mark_price": 100.0 + index} for index, name in enumerate(names)]}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class DeribitFanOutTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 1_900_000_000.0
+        clock = mock.Mock(wraps=time, time=lambda: self.now)
+        patcher = mock.patch.object(deribit, "time", clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def client(self, **kwargs):
+        return FakeFuturesClient(expiry_ms=int((self.now + 3600) * 1000), **kwargs)
+
+    def test_instruments_and_summaries_are_fetched_concurrently(self):
+        client = self.client()
+        structure = DeribitProvider(client).get_futures_term_structure(DeribitFuturesCurveQuery(currency="btc"))
+        self.assertEqual([point.instrument_name for point in structure.points], ["BTC-PERPETUAL", "BTC-27JUN30"])
+        self.assertEqual(client.peak, 2)
+
+    def test_instrument_list_is_cached_until_the_next_expiry(self):
+        client = self.client()
+        provider = DeribitProvider(client, instrument_cache_seconds=7200)
+        query = DeribitFuturesCurveQuery(currency="BTC")
+        provider.get_futures_term_structure(query)
+        self.now += 1800
+        provider.get_futures_term_structure(query)
+        self.assertEqual([endpoint for endpoint, _ in client.calls].count("get_instruments"), 1)
+        self.now += 1801
+        provider.get_futures_term_structure(query)
+        self.assertEqual([endpoint for endpoint, _ in client.calls].count("get_instruments"), 2)
+
+    def test_instrument_list_outlives_the_provider_in_the_response_cache(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cache = ResponseCache(Path(tmp.name) / "cache.sqlite3", policies={}, clock=lambda: self.now)
+        self.addCleanup(cache.close)
+        client = self.client()
+        query = DeribitFuturesCurveQuery(currency="BTC")
+
+        def instrument_calls():
+            return [endpoint for endpoint, _ in client.calls].count("get_instruments")
+
+        # 每次单次调用都会新建 provider：第二个实例从磁盘读到列表，只请求 book summary。
+        cache.attach(DeribitProvider(client, instrument_cache_seconds=7200)).get_futures_term_structure(query)
+        self.now += 1800
+        structure = cache.attach(DeribitProvider(client, instrument_cache_seconds=7200)).get_futures_term_structure(query)
+        self.assertEqual([point.instrument_name for point in structure.points], ["BTC-PERPETUAL", "BTC-27JUN30"])
+        self.assertEqual(instrument_calls(), 1)
+
+        cache.attach(DeribitProvider(client), refresh=True).get_futures_term_structure(query)
+        self.assertEqual(instrument_calls(), 2)
+        self.now += 1801
+        cache.attach(DeribitProvider(client)).get_futures_term_structure(query)
+        self.assertEqual(instrument_calls(), 3)
+
+    def test_multi_currency_fan_out_drops_failed_currencies(self):
+        client = self.client(failing={"SOL"})
+        structures = DeribitProvider(client).get_futures_term_structures(["btc", "ETH", "sol", "BTC"])
+        self.assertEqual(sorted(structures), ["BTC", "ETH"])
+        self.assertEqual(len(client.calls), 6)
+        self.assertGreater(client.peak, 2)
+        with self.assertRaises(ProviderError):
+            DeribitProvider(self.client(failing={"SOL"})).get_futures_term_structures(["SOL"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import json
+import sys
+import tempfile
+import unittest
+from email.message import Message
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.edgarstore import EdgarStore  # noqa: E402
+from digital_oracle.http import HttpResponse  # noqa: E402
+from digital_oracle.providers.base import ProviderError  # noqa: E402
+from digital_oracle.providers.edgar import (  # noqa: E402
+    EDGAR_TICKERS_URL,
+    EdgarInsiderQuery,
+    EdgarProvider,
+)
+
+SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK0000320193.json"
+
+
+def submissions(*forms):
+    return {"filings": {"recent": {"form": list(forms), "accessionNumber": ["a%d" % i for i in range(len(forms))]}}}
+
+
+class FakeConditionalClient:
+    """Serves versioned documents and answers 304 when the ETag still matches."""
+
+    def __init__(self):
+        self.documents = {
+            EDGAR_TICKERS_URL: {"0": {"cik_str": 320193, "ticker": "aapl", "title": "Apple Inc."}},
+            SUBMISSIONS_URL: submissions("4", "10-K", "4"),
+        }
+        self.versions = {url: 1 for url in self.documents}
+        self.requests = []
+
+    def get_conditional(self, url, *, etag=None, last_modified=None):
+        current = '"v%d"' % self.versions[url]
+        headers = Message()
+        headers["ETag"] = current
+        if etag == current:
+            self.requests.append((url, 304))
+            return HttpResponse(url, 304, "Not Modified", headers, b"")
+        self.requests.append((url, 200))
+        return HttpResponse(url, 200, "OK", headers, json.dumps(self.documents[url]).encode())
+
+    def get_json(self, url, *, params=None):
+        raise AssertionError("store-backed provider must use conditional requests")
+
+    def publish(self, url, document):
+        self.documents[url] = document
+        self.versions[url] += 1
+
+
+class EdgarStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.now = 1000.0
+        self.http = FakeConditionalClient()
+
+    def provider(self):
+        store = EdgarStore(Path(self.tmp.name) / "edgar.sqlite3", clock=lambda: self.now)
+        self.addCleanup(store.close)
+        return EdgarProvider(
+            http_client=self.http, store=store, ticker_ttl_seconds=3600, submissions_ttl_seconds=60
+        )
+
+    def fetch(self, provider=None):
+        return (provider or self.provider()).get_insider_transactions(EdgarInsiderQuery(ticker="aapl"))
+
+    def test_documents_persist_across_processes(self):
+        first = self.fetch()
+        self.assertEqual((first.cik, first.company_name, first.total_form4_count), ("0000320193", "Apple Inc.", 2))
+        self.now += 30
+        self.assertEqual(self.fetch().total_form4_count, 2)
+        self.assertEqual(self.http.requests, [(EDGAR_TICKERS_URL, 200), (SUBMISSIONS_URL, 200)])
+
+    def test_stale_copies_are_revalidated_with_etags(self):
+        self.fetch()
+        self.now += 120
+        self.assertEqual(self.fetch().total_form4_count, 2)
+        self.assertEqual(self.http.requests[-1], (SUBMISSIONS_URL, 304))
+
+        self.now += 30
+        self.fetch()
+        self.assertEqual(len(self.http.requests), 3)
+
+        self.now += 120
+        self.http.publish(SUBMISSIONS_URL, submissions("4"))
+        self.assertEqual(self.fetch().total_form4_count, 1)
+        self.assertEqual(self.http.requests[-1], (SUBMISSIONS_URL, 200))
+
+        self.now += 3600
+        self.fetch()
+        self.assertIn((EDGAR_TICKERS_URL, 304), self.http.requests)
+
+    def test_missing_ticker_triggers_a_rate_limited_index_recheck(self):
+        provider = self.provider()
+        self.fetch(provider)
+        with self.assertRaises(ProviderError):
+            provider.get_insider_transactions(EdgarInsiderQuery(ticker="NEWCO"))
+        self.assertEqual(len(self.http.requests), 2)
+
+        self.now += 700
+        self.http.publish(EDGAR_TICKERS_URL, {
+            "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+            "1": {"cik_str": 1, "ticker": "NEWCO", "title": "New Co"},
+        })
+        self.assertEqual(provider._resolve_cik("newco"), ("0000000001", "New Co"))
+        self.assertEqual(provider.store.ticker_count(), 2)
+
+    def test_empty_ticker_table_is_refetched_without_validators(self):
+        provider = self.provider()
+        self.fetch(provider)
+        provider.store._conn.execute("DELETE FROM tickers")
+        self.assertEqual(provider._resolve_cik("aapl"), ("0000320193", "Apple Inc."))
+        self.assertEqual(self.http.requests[-1], (EDGAR_TICKERS_URL, 200))
+
+    def test_corrupt_document_is_treated_as_missing(self):
+        provider = self.provider()
+        self.fetch(provider)
+        provider.store._conn.execute("UPDATE resources SET payload = x'00' WHERE url = ?", (SUBMISSIONS_URL,))
+        self.assertIsNone(provider.store.load_document(SUBMISSIONS_URL))
+        self.assertEqual(self.fetch(provider).total_form4_count, 2)
+        self.assertEqual(self.http.requests[-1], (SUBMISSIONS_URL, 200))
+
+
+if __name__ == "__main__":
+    unittest.main()
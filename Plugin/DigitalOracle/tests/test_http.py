@@ -0,0 +1,159 @@
+import gzip
+import json
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.http import (  # noqa: E402
+    ConnectionPool,
+    HttpClientError,
+    HttpStatusError,
+    UrllibJsonClient,
+)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.paths.append(self.path)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            route = self.path.split("?", 1)[0]
+            if route == "/redirect":
+                self.reply(302, b"", Location="/json")
+            elif route == "/gzip":
+                self.reply(200, gzip.compress(b'{"zipped": true}'), **{"Content-Encoding": "gzip"})
+            elif route == "/big":
+                self.reply(200, b"x" * 100_000)
+            elif route == "/slow":
+                time.sleep(0.1)
+                self.reply(200, b"{}")
+            elif route == "/flaky":
+                server.flaky += 1
+                if server.flaky == 1:
+                    self.reply(503, b"busy", **{"Retry-After": "0"})
+                else:
+                    self.reply(200, b'{"recovered": true}')
+            elif route == "/missing":
+                self.reply(404, b"nope")
+            elif route == "/garbage":
+                self.reply(200, b"not json")
+            else:
+                self.reply(200, json.dumps({"path": self.path}).encode())
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def reply(self, status, body, **headers):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalServerTestCase(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict("os.environ", {"NO_PROXY": "127.0.0.1", "no_proxy": "127.0.0.1"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.paths = []
+        self.server.active = self.server.peak = self.server.flaky = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = "http://127.0.0.1:%d" % self.server.server_address[1]
+        self.pool = ConnectionPool()
+        self.addCleanup(self.pool.close)
+
+    def host_stats(self):
+        return next(iter(self.pool.stats().values()))
+
+
+class ConnectionPoolTests(LocalServerTestCase):
+    def test_keep_alive_connection_is_reused(self):
+        for _ in range(3):
+            self.assertEqual(self.pool.request("GET", self.base + "/json").status, 200)
+        stats = self.host_stats()
+        self.assertEqual((stats["requests"], stats["handshakes"], stats["reuses"]), (3, 1, 2))
+
+    def test_redirects_are_followed(self):
+        response = self.pool.request("GET", self.base + "/redirect")
+        self.assertEqual(json.loads(response.body), {"path": "/json"})
+
+    def test_gzip_body_is_decoded(self):
+        self.assertEqual(json.loads(self.pool.request("GET", self.base + "/gzip").body), {"zipped": True})
+
+    def test_capped_read_truncates_and_drops_the_connection(self):
+        response = self.pool.request("GET", self.base + "/big", max_body_bytes=1000)
+        self.assertTrue(response.truncated)
+        self.assertEqual(len(response.body), 1000)
+        self.pool.request("GET", self.base + "/json")
+        self.assertEqual(self.host_stats()["handshakes"], 2)
+
+    def test_per_host_connection_cap(self):
+        pool = ConnectionPool(max_connections_per_host=2)
+        self.addCleanup(pool.close)
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(lambda _: pool.request("GET", self.base + "/slow"), range(6)))
+        self.assertLessEqual(self.server.peak, 2)
+        self.assertLessEqual(next(iter(pool.stats().values()))["handshakes"], 2)
+
+    def test_rejects_unsupported_urls(self):
+        with self.assertRaises(HttpClientError):
+            self.pool.request("GET", "ftp://example.com/file")
+
+
+class UrllibJsonClientTests(LocalServerTestCase):
+    def client(self, **kwargs):
+        return UrllibJsonClient(pool=self.pool, retry_delay_seconds=0.0, **kwargs)
+
+    def test_get_json_encodes_params(self):
+        payload = self.client().get_json(self.base + "/json", params={"id": "a b", "flag": True, "skip": None})
+        self.assertEqual(payload, {"path": "/json?id=a+b&flag=true"})
+
+    def test_throttled_response_is_retried(self):
+        self.assertEqual(self.client().get_json(self.base + "/flaky"), {"recovered": True})
+        self.assertEqual(self.server.flaky, 2)
+
+    def test_errors(self):
+        with self.assertRaises(HttpStatusError) as caught:
+            self.client().get_json(self.base + "/missing")
+        self.assertEqual(caught.exception.status, 404)
+        with self.assertRaises(HttpClientError):
+            self.client().get_json(self.base + "/garbage")
+
+    def test_conditional_request_sends_validators(self):
+        seen = {}
+
+        class Recording(Handler):
+            def do_GET(self):
+                seen.update(self.headers)
+                self.reply(304, b"")
+
+        self.server.RequestHandlerClass = Recording
+        response = self.client().get_conditional(self.base + "/x", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        self.assertEqual(response.status, 304)
+        self.assertEqual(seen["If-None-Match"], '"v1"')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import sys
+import unittest
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+PLUGIN_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PLUGIN_DIR))
+
+import digital_oracle_vcp as vcp  # noqa: E402
+
+
+@dataclass
+class Bar:
+    date: str
+    close: float
+    raw: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class History:
+    symbol: str
+    bars: list[Bar]
+    raw: dict[str, Any] = field(default_factory=dict)
+
+
+def history(rows=4):
+    bars = [Bar("2024-06-%02d" % (day + 1), 100.0 + day, raw={"v": day}) for day in range(rows)]
+    return History("SPY", bars, raw={"chart": "..."})
+
+
+class SimplifyTests(unittest.TestCase):
+    def test_raw_is_dropped_unless_requested(self):
+        plain = vcp.simplify(history(1))
+        self.assertEqual(plain, {"symbol": "SPY", "bars": [{"date": "2024-06-01", "close": 100.0}]})
+        self.assertEqual(vcp.simplify(history(1), include_raw=True)["raw"], {"chart": "..."})
+
+    def test_projection_applies_to_every_list_item(self):
+        fields = vcp.parse_fields("symbol, bars.close,bars.raw")
+        self.assertEqual(fields, {"symbol": {}, "bars": {"close": {}, "raw": {}}})
+        projected = vcp.simplify(history(2), fields=fields)
+        self.assertEqual(projected, {"symbol": "SPY", "bars": [{"close": 100.0, "raw": {"v": 0}}, {"close": 101.0, "raw": {"v": 1}}]})
+        self.assertIsNone(vcp.parse_fields(" , "))
+        self.assertEqual(vcp.parse_fields('["a.b"]'), {"a": {"b": {}}})
+
+    def test_max_items_notes_the_omitted_rows(self):
+        bars = vcp.simplify(history(5), max_items=2)["bars"]
+        self.assertEqual(len(bars), 3)
+        self.assertEqual(bars[-1], "... 其余 3 项已省略")
+        self.assertEqual(len(vcp.simplify(history(2), max_items=2)["bars"]), 2)
+
+
+class SerializationTests(unittest.TestCase):
+    def test_compact_json_with_and_without_orjson(self):
+        value = {"名称": "SPY", "rows": [1, 2]}
+        for backend in (vcp.orjson, None):
+            with mock.patch.object(vcp, "orjson", backend):
+                compact = vcp.dumps_json(value)
+                self.assertNotIn(" ", compact)
+                self.assertIn("名称", compact)
+                self.assertEqual(json.loads(vcp.dumps_json(value, indent=True)), value)
+        self.assertEqual(json.loads(vcp.dumps_json({"n": 2**70})), {"n": 2**70})
+
+    def test_short_json_truncates_by_rows_before_characters(self):
+        text = vcp.short_json(history(50), max_length=400)
+        self.assertLessEqual(len(text), 400)
+        self.assertIn("项已省略", text)
+        self.assertFalse(text.endswith("[已截断]"))
+
+
+class FetchMarketDataOutputTests(unittest.TestCase):
+    def fetch(self, **args):
+        result = {"provider": "yahoo", "data": history(6)}
+        with mock.patch.object(vcp, "fetch_single_provider", return_value=result):
+            return vcp.fetch_market_data_command({"provider": "yahoo", **args})
+
+    def test_json_output_returns_the_projected_object(self):
+        result = self.fetch(output="json", params='{"fields": "bars.date", "max_rows": 2}')
+        self.assertIsInstance(result, dict)
+        self.assertEqual(result["data"]["bars"], [{"date": "2024-06-01"}, {"date": "2024-06-02"}, "... 其余 4 项已省略"])
+        self.assertNotIn("symbol", result["data"])
+
+    def test_markdown_is_the_default(self):
+        with mock.patch.dict("os.environ", {"DIGITAL_ORACLE_OUTPUT": ""}):
+            self.assertIsInstance(self.fetch(), str)
+            self.assertEqual(vcp.output_mode({"output": "Compact"}), "json")
+        with mock.patch.dict("os.environ", {"DIGITAL_ORACLE_OUTPUT": "structured"}):
+            self.assertEqual(vcp.output_mode({}), "json")
+
+
+if __name__ == "__main__":
+    unittest.main()
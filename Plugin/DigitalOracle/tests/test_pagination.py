@@ -0,0 +1,119 @@
+import sys
+import threading
+import unittest
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.concurrent import Page, iter_pages  # noqa: E402
+from digital_oracle.providers.polymarket import PolymarketEventQuery, PolymarketProvider  # noqa: E402
+from digital_oracle.providers.worldbank import WorldBankProvider, WorldBankQuery  # noqa: E402
+
+
+class NumberedPages:
+    """Pages 1..last of three items each; records which pages were fetched."""
+
+    def __init__(self, last):
+        self.last = last
+        self.fetched = []
+        self.lock = threading.Lock()
+
+    def __call__(self, page):
+        with self.lock:
+            self.fetched.append(page)
+        return Page([page * 10 + index for index in range(3)], page + 1 if page < self.last else None)
+
+
+class IterPagesTests(unittest.TestCase):
+    def test_yields_every_page_in_order(self):
+        for prefetch in (True, False):
+            pages = NumberedPages(3)
+            self.assertEqual(list(iter_pages(pages, 1, prefetch=prefetch)), [10, 11, 12, 20, 21, 22, 30, 31, 32])
+            self.assertEqual(pages.fetched, [1, 2, 3])
+
+    def test_next_page_is_fetched_while_the_current_one_is_consumed(self):
+        second_requested = threading.Event()
+
+        def fetch(page):
+            if page == 2:
+                second_requested.set()
+            return Page([page], page + 1 if page < 3 else None)
+
+        items = iter_pages(fetch, 1)
+        self.assertEqual(next(items), 1)
+        self.assertTrue(second_requested.wait(2))
+        self.assertEqual(list(items), [2, 3])
+
+    def test_max_pages_and_early_close_bound_the_fetches(self):
+        pages = NumberedPages(100)
+        self.assertEqual(len(list(iter_pages(pages, 1, max_pages=2))), 6)
+        self.assertEqual(pages.fetched, [1, 2])
+
+        pages = NumberedPages(100)
+        self.assertEqual(list(islice(iter_pages(pages, 1), 4)), [10, 11, 12, 20])
+        self.assertLessEqual(len(pages.fetched), 3)
+
+    def test_errors_surface_to_the_consumer(self):
+        def fetch(page):
+            if page == 2:
+                raise OSError("page 2")
+            return Page([page], page + 1)
+
+        items = iter_pages(fetch, 1)
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(OSError):
+            next(items)
+
+
+class FakeWorldBankClient:
+    def __init__(self, pages):
+        self.pages = pages
+        self.params = []
+
+    def get_json(self, url, *, params=None):
+        self.params.append(dict(params))
+        page = params.get("page", 1)
+        rows = [
+            {"country": {"id": "US", "value": "United States"}, "indicator": {"id": "GDP", "value": "GDP"},
+             "date": str(2000 + page), "value": page * 1.5}
+        ]
+        return [{"page": page, "pages": self.pages}, rows]
+
+
+class FakePolymarketClient:
+    def __init__(self, total):
+        self.total = total
+        self.offsets = []
+
+    def get_json(self, url, *, params=None):
+        offset, limit = params["offset"], params["limit"]
+        self.offsets.append(offset)
+        return [
+            {"id": str(index), "slug": "btc-%d" % index if index % 3 == 0 else "eth-%d" % index, "title": "Event %d" % index}
+            for index in range(offset, min(offset + limit, self.total))
+        ]
+
+
+class ProviderPaginationTests(unittest.TestCase):
+    def test_world_bank_collects_every_page(self):
+        client = FakeWorldBankClient(pages=3)
+        result = WorldBankProvider(client).get_indicator(WorldBankQuery(indicator="GDP", per_page=1))
+        self.assertEqual([point.date for point in result.points], ["2001", "2002", "2003"])
+        self.assertNotIn("page", client.params[0])
+        self.assertEqual([params.get("page") for params in client.params[1:]], [2, 3])
+
+    def test_polymarket_scan_filters_per_page_and_stops_at_max_items(self):
+        client = FakePolymarketClient(total=1000)
+        query = PolymarketEventQuery(slug_contains="btc", tag_slug="")
+        events = list(PolymarketProvider(client).iter_events(query, page_size=10, max_items=5))
+        self.assertEqual([event.slug for event in events], ["btc-0", "btc-3", "btc-6", "btc-9", "btc-12"])
+        self.assertLessEqual(len(client.offsets), 3)
+
+        client = FakePolymarketClient(total=25)
+        self.assertEqual(len(list(PolymarketProvider(client).iter_events(page_size=10))), 25)
+        self.assertEqual(client.offsets, [0, 10, 20])
+
+
+if __name__ == "__main__":
+    unittest.main()
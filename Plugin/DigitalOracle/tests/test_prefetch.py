@@ -0,0 +1,117 @@
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.prefetch import PrefetchJob, PrefetchScheduler, SignalStore  # noqa: E402
+
+
+class FlakyFetch:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else self.calls
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class SignalStoreTests(unittest.TestCase):
+    def test_round_trip_and_unreadable_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SignalStore(Path(tmp) / "signals.sqlite3", clock=lambda: 50.0)
+            store.save("a", {"x": [1, 2]})
+            store.save("b", 2)
+            store._conn.execute("UPDATE signals SET payload = x'00' WHERE key = 'b'")
+            self.assertEqual(store.load("a").value, {"x": [1, 2]})
+            self.assertEqual(store.load("a").age(now=80.0), 30.0)
+            self.assertEqual(set(store.load_many(["a", "b", "c"])), {"a"})
+            self.assertEqual(store.fetched_at(["a", "b", "c"]), {"a": 50.0, "b": 50.0})
+            store.close()
+
+
+class PrefetchSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.now = 1000.0
+        self.store = SignalStore(Path(self.tmp.name) / "signals.sqlite3", clock=lambda: self.now)
+        self.addCleanup(self.store.close)
+
+    def start(self, *jobs, retry_seconds=10.0):
+        scheduler = PrefetchScheduler(self.store, jobs, retry_seconds=retry_seconds, clock=lambda: self.now)
+        scheduler.start()
+        self.addCleanup(scheduler.stop)
+        return scheduler
+
+    def wait_for(self, predicate):
+        deadline = time.monotonic() + 3
+        while not predicate():
+            if time.monotonic() > deadline:
+                self.fail("condition not reached")
+            time.sleep(0.01)
+
+    def test_restart_skips_signals_that_are_still_current(self):
+        self.store.save("fresh", "kept")
+        fresh, missing = FlakyFetch(), FlakyFetch("new")
+        scheduler = self.start(PrefetchJob("fresh", fresh, 60), PrefetchJob("missing", missing, 120))
+        self.wait_for(lambda: scheduler.stats()["missing"]["runs"] == 1)
+        self.assertEqual(fresh.calls, 0)
+        self.assertEqual(scheduler.stats()["fresh"]["due_in"], 60.0)
+        self.assertEqual(self.store.load("missing").value, "new")
+
+        self.now += 61
+        scheduler.run_pending()
+        self.wait_for(lambda: scheduler.stats()["fresh"]["runs"] == 1)
+        self.assertEqual(self.store.load("fresh").value, 1)
+        self.assertEqual(missing.calls, 1)
+
+    def test_failures_back_off_and_keep_the_last_good_value(self):
+        fetch = FlakyFetch("good", OSError("down"), OSError("down"), OSError("down"))
+        scheduler = self.start(PrefetchJob("quote", fetch, 35), retry_seconds=10.0)
+        self.wait_for(lambda: scheduler.stats()["quote"]["runs"] == 1)
+
+        delays = []
+        for failures in (1, 2, 3):
+            self.now += scheduler.stats()["quote"]["due_in"]
+            scheduler.run_pending()
+            self.wait_for(lambda: scheduler.stats()["quote"]["failures"] == failures)
+            delays.append(scheduler.stats()["quote"]["due_in"])
+        self.assertEqual(delays, [10.0, 20.0, 35.0])
+        self.assertEqual(scheduler.stats()["quote"]["last_error"], "OSError: down")
+        self.assertEqual(self.store.load("quote").value, "good")
+
+        scheduler.mark_refreshed("quote")
+        self.assertEqual(scheduler.stats()["quote"], {"due_in": 35.0, "runs": 1, "failures": 0, "last_error": None})
+
+    def test_a_key_never_runs_twice_at_once(self):
+        release = threading.Event()
+        entered = threading.Event()
+
+        def slow():
+            entered.set()
+            release.wait(2)
+            return "done"
+
+        scheduler = self.start(PrefetchJob("slow", slow, 60))
+        entered.wait(2)
+        self.assertEqual(scheduler.run_pending(), [])
+        release.set()
+        self.wait_for(lambda: scheduler.stats()["slow"]["runs"] == 1)
+
+    def test_stopped_scheduler_submits_nothing(self):
+        scheduler = self.start(PrefetchJob("a", FlakyFetch(), 60))
+        scheduler.stop()
+        self.now += 120
+        self.assertEqual(scheduler.run_pending(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.ratelimit import (  # noqa: E402
+    HostBudget,
+    HostRateLimiter,
+    backoff_delay,
+    parse_budgets,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(budgets=None, **kwargs):
+    clock = FakeClock()
+    limiter = HostRateLimiter(budgets or {"sec.gov": HostBudget(4.0, 4.0)}, clock=clock, sleep=clock.sleep, **kwargs)
+    return limiter, clock
+
+
+class HostRateLimiterTests(unittest.TestCase):
+    def test_burst_then_steady_rate(self):
+        limiter, clock = make_limiter()
+        delays = [limiter.reserve("www.sec.gov") for _ in range(6)]
+        self.assertEqual(delays[:4], [0.0] * 4)
+        self.assertAlmostEqual(delays[4], 0.25)
+        self.assertAlmostEqual(delays[5], 0.5)
+
+        clock.now += 10
+        self.assertEqual(limiter.reserve("www.sec.gov"), 0.0)
+
+    def test_suffix_shares_one_bucket(self):
+        limiter, _ = make_limiter()
+        self.assertEqual(limiter.bucket_key("data.sec.gov"), "sec.gov")
+        self.assertEqual(limiter.bucket_key("efts.sec.gov"), "sec.gov")
+        for _ in range(4):
+            limiter.reserve("www.sec.gov")
+        self.assertGreater(limiter.reserve("data.sec.gov"), 0.0)
+
+    def test_unknown_hosts_use_default_budget_or_are_unlimited(self):
+        limiter, _ = make_limiter(default_budget=HostBudget(1.0, 1.0))
+        self.assertEqual(limiter.bucket_key("example.com"), "example.com")
+        limiter.reserve("example.com")
+        self.assertAlmostEqual(limiter.reserve("example.com"), 1.0)
+
+        unlimited, _ = make_limiter(default_budget=None)
+        self.assertIsNone(unlimited.bucket_key("example.com"))
+        self.assertEqual([unlimited.reserve("example.com") for _ in range(50)], [0.0] * 50)
+
+    def test_acquire_sleeps_the_reserved_delay(self):
+        limiter, clock = make_limiter({"a.test": HostBudget(2.0, 1.0)})
+        limiter.acquire("a.test")
+        limiter.acquire("a.test")
+        self.assertEqual(clock.slept, [0.5])
+
+    def test_throttle_halves_rate_and_pauses_for_retry_after(self):
+        limiter, _ = make_limiter()
+        limiter.record_throttle("www.sec.gov", 10.0)
+        self.assertEqual(limiter.stats()["sec.gov"]["rate"], 2.0)
+        self.assertAlmostEqual(limiter.reserve("data.sec.gov"), 10.5)
+
+    def test_throttle_pause_is_capped(self):
+        limiter, _ = make_limiter()
+        limiter.record_throttle("www.sec.gov", 3600.0)
+        self.assertLessEqual(limiter.reserve("data.sec.gov"), 60.0 + 0.5)
+
+        strict, _ = make_limiter(max_pause_seconds=5.0)
+        strict.record_throttle("www.sec.gov", 3600.0)
+        self.assertAlmostEqual(strict.reserve("www.sec.gov"), 5.5)
+
+    def test_rate_floor_and_recovery(self):
+        limiter, _ = make_limiter()
+        for _ in range(10):
+            limiter.record_throttle("www.sec.gov", 0.0)
+        self.assertEqual(limiter.stats()["sec.gov"]["rate"], 0.5)
+        for _ in range(20):
+            limiter.record_success("www.sec.gov")
+        self.assertEqual(limiter.stats()["sec.gov"]["rate"], 4.0)
+
+    def test_configure_overrides_budgets(self):
+        limiter, _ = make_limiter()
+        limiter.reserve("www.sec.gov")
+        limiter.configure({"SEC.gov": HostBudget(1.0, 1.0)})
+        limiter.reserve("www.sec.gov")
+        self.assertAlmostEqual(limiter.reserve("www.sec.gov"), 1.0)
+
+
+class HelperTests(unittest.TestCase):
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("12"), 12.0)
+        self.assertEqual(parse_retry_after(" -3 "), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        now = 784111777.0  # Sun, 06 Nov 1994 08:49:37 GMT
+        self.assertEqual(parse_retry_after("Sun, 06 Nov 1994 08:49:57 GMT", now=now), 20.0)
+
+    def test_backoff_delay_bounds(self):
+        for attempt in range(1, 8):
+            delay = backoff_delay(attempt, base=1.0, cap=8.0)
+            self.assertGreaterEqual(delay, 0.0)
+            self.assertLessEqual(delay, min(8.0, 2 ** (attempt - 1)))
+        self.assertGreaterEqual(backoff_delay(1, retry_after=5.0), 5.0)
+
+    def test_parse_budgets(self):
+        self.assertEqual(
+            parse_budgets("sec.gov=8/8, API.coingecko.com=0.5,bad,x=,y=abc"),
+            {"sec.gov": HostBudget(8.0, 8.0), "api.coingecko.com": HostBudget(0.5, 1.0)},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import json
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+PLUGIN_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PLUGIN_DIR))
+
+import digital_oracle_vcp as vcp  # noqa: E402
+
+
+class ServeStreamTests(unittest.TestCase):
+    def serve(self, lines, workers=4):
+        reader = io.StringIO("".join(line + "\n" for line in lines))
+        writer = io.StringIO()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            vcp.serve_stream(reader, writer, executor)
+        return [json.loads(line) for line in writer.getvalue().splitlines()]
+
+    def test_responses_carry_request_ids(self):
+        responses = self.serve([
+            json.dumps({"id": 1, "command": "Ping"}),
+            json.dumps({"request_id": "b", "command": "Ping"}),
+            "",
+        ])
+        self.assertEqual(sorted(str(r["id"]) for r in responses), ["1", "b"])
+        self.assertTrue(all(r["status"] == "success" and r["result"] == "pong" for r in responses))
+
+    def test_bad_lines_get_error_responses(self):
+        responses = self.serve(["not json", json.dumps([1, 2])])
+        self.assertEqual([r["status"] for r in responses], ["error", "error"])
+        self.assertEqual([r["id"] for r in responses], [None, None])
+
+    def test_requests_run_concurrently_and_answer_in_completion_order(self):
+        release = threading.Event()
+
+        def fake_execute(args):
+            if args["command"] == "Slow":
+                release.wait(2)
+            else:
+                release.set()
+            return args["command"]
+
+        with mock.patch.object(vcp, "execute_command", side_effect=fake_execute):
+            responses = self.serve([
+                json.dumps({"id": "slow", "command": "Slow"}),
+                json.dumps({"id": "fast", "command": "Fast"}),
+            ])
+        self.assertEqual([r["id"] for r in responses], ["fast", "slow"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.singleflight import (  # noqa: E402
+    SingleFlight,
+    SingleFlightHttpClient,
+    SingleFlightPriceFetcher,
+)
+
+
+class BlockingJsonClient:
+    def __init__(self):
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.error = None
+
+    def get_json(self, url, *, params=None):
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(2)
+        if self.error is not None:
+            raise self.error
+        return {"url": url, "call": self.calls}
+
+    def ping(self):
+        return "pong"
+
+
+class SingleFlightTests(unittest.TestCase):
+    def run_concurrently(self, client, count, url="https://x.test/a", params=None):
+        group = client.group
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(client.get_json, url, params=params)]
+            client.client.entered.wait(2)
+            futures += [executor.submit(client.get_json, url, params=params) for _ in range(count - 1)]
+            for _ in range(400):
+                if group.stats()["shared"] >= count - 1:
+                    break
+                threading.Event().wait(0.005)
+            client.client.release.set()
+            return [future.exception() or future.result() for future in futures]
+
+    def test_concurrent_identical_calls_share_one_execution(self):
+        client = SingleFlightHttpClient(BlockingJsonClient(), group=SingleFlight())
+        results = self.run_concurrently(client, 5, params={"b": 2, "a": 1})
+        self.assertEqual(client.client.calls, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(client.group.stats(), {"executions": 1, "shared": 4, "in_flight": 0})
+
+    def test_errors_propagate_to_every_waiter(self):
+        upstream = BlockingJsonClient()
+        upstream.error = ValueError("boom")
+        client = SingleFlightHttpClient(upstream, group=SingleFlight())
+        results = self.run_concurrently(client, 3)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(upstream.calls, 1)
+
+    def test_sequential_calls_are_not_cached(self):
+        upstream = BlockingJsonClient()
+        upstream.release.set()
+        client = SingleFlightHttpClient(upstream, group=SingleFlight())
+        client.get_json("https://x.test/a")
+        client.get_json("https://x.test/a")
+        client.get_json("https://x.test/a", params={"q": 1})
+        self.assertEqual(upstream.calls, 3)
+        self.assertEqual(client.ping(), "pong")
+
+    def test_attach_wraps_http_client_or_price_fetcher_once(self):
+        group = SingleFlight()
+
+        class HttpProvider:
+            http_client = BlockingJsonClient()
+
+        class PriceProvider:
+            def __init__(self):
+                self._fetcher = type("Fetcher", (), {"fetch_history": lambda self, s, **kw: [s, kw]})()
+
+        provider = group.attach(group.attach(HttpProvider()))
+        self.assertIsInstance(provider.http_client, SingleFlightHttpClient)
+        self.assertNotIsInstance(provider.http_client.client, SingleFlightHttpClient)
+
+        prices = group.attach(PriceProvider())
+        self.assertIsInstance(prices._fetcher, SingleFlightPriceFetcher)
+        self.assertEqual(
+            prices._fetcher.fetch_history("SPY", period="1mo", interval="1d"),
+            ["SPY", {"period": "1mo", "interval": "1d"}],
+        )
+
+        bare = object()
+        self.assertIs(group.attach(bare), bare)
+
+
+if __name__ == "__main__":
+    unittest.main()
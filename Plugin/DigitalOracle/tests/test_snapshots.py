@@ -0,0 +1,110 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle import snapshots  # noqa: E402
+from digital_oracle.snapshots import (  # noqa: E402
+    RecordingHttpClient,
+    ReplayHttpClient,
+    SnapshotArchive,
+    SnapshotMissError,
+    pack_snapshots,
+)
+
+
+class FakeClient:
+    def __init__(self):
+        self.version = 1
+
+    def get_json(self, url, *, params=None):
+        return {"url": url, "params": dict(params or {}), "version": self.version}
+
+    def get_text(self, url, *, params=None):
+        return "text:%s:%d" % (url, self.version)
+
+
+class SnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+
+    def record(self, target, upstream=None):
+        upstream = upstream or FakeClient()
+        recorder = RecordingHttpClient(target, json_client=upstream, text_client=upstream)
+        recorder.get_json("https://x.test/a", params={"b": 2, "a": [1, "x"]})
+        recorder.get_text("https://x.test/page")
+        return recorder, upstream
+
+    def test_directory_round_trip(self):
+        self.record(self.root / "snaps")
+        replay = ReplayHttpClient(self.root / "snaps")
+        self.assertEqual(replay.get_json("https://x.test/a", params={"a": [1, "x"], "b": 2})["version"], 1)
+        self.assertEqual(replay.get_text("https://x.test/page"), "text:https://x.test/page:1")
+        with self.assertRaises(SnapshotMissError):
+            replay.get_json("https://x.test/a", params={"b": 3})
+
+    def test_directory_replay_parses_only_the_requested_file(self):
+        self.record(self.root / "snaps")
+        replay = ReplayHttpClient(self.root / "snaps")
+        with mock.patch.object(snapshots, "_read_envelope", wraps=snapshots._read_envelope) as read:
+            replay.get_text("https://x.test/page")
+        self.assertEqual(read.call_count, 1)
+
+    def test_hand_named_fixture_is_found_by_full_scan(self):
+        snaps = self.root / "snaps"
+        snaps.mkdir()
+        (snaps / "fixture.json").write_text(json.dumps({
+            "kind": "json",
+            "request": {"url": "https://x.test/h", "params": {"q": "1"}},
+            "response": {"hand": True},
+        }))
+        (snaps / "broken.json").write_text("{")
+        self.assertEqual(ReplayHttpClient(snaps).get_json("https://x.test/h", params={"q": "1"}), {"hand": True})
+
+    def test_archive_latest_record_wins_and_index_is_reused(self):
+        path = self.root / "corpus.snappack"
+        recorder, upstream = self.record(path)
+        upstream.version = 2
+        recorder.get_text("https://x.test/page")
+        recorder.archive.close()
+
+        archive = SnapshotArchive(path)
+        self.addCleanup(archive.close)
+        self.assertEqual(len(archive), 2)
+        self.assertEqual(ReplayHttpClient(archive).get_text("https://x.test/page"), "text:https://x.test/page:2")
+        with mock.patch.object(SnapshotArchive, "_scan", side_effect=AssertionError("rescanned")):
+            SnapshotArchive(path).close()
+
+    def test_archive_recovers_from_stale_index_and_torn_tail(self):
+        path = self.root / "corpus.snappack"
+        recorder, _ = self.record(path)
+        recorder.archive.close()
+        Path(str(path) + ".idx").unlink()
+        with open(path, "ab") as handle:
+            handle.write(b"DOS1\x05\x00\x00\x00garbage")
+
+        archive = SnapshotArchive(path)
+        self.addCleanup(archive.close)
+        replay = ReplayHttpClient(archive)
+        self.assertEqual(replay.get_text("https://x.test/page"), "text:https://x.test/page:1")
+        self.assertEqual(len(archive), 2)
+        self.assertTrue(Path(str(path) + ".idx").exists())
+
+    def test_pack_directory_into_archive(self):
+        self.record(self.root / "snaps")
+        archive = pack_snapshots(self.root / "snaps", self.root / "packed.snappack")
+        self.addCleanup(archive.close)
+        replay = ReplayHttpClient(self.root / "packed.snappack")
+        self.addCleanup(replay.snapshots.close)
+        self.assertEqual(replay.get_json("https://x.test/a", params={"b": 2, "a": [1, "x"]})["version"], 1)
+        self.assertEqual(archive.envelope(next(iter(archive)))["kind"], "json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import json
+import sys
+import tempfile
+import unittest
+from email.message import Message
+from pathlib import Path
+from unittest import mock
+
+PLUGIN_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PLUGIN_DIR))
+sys.path.insert(0, str(PLUGIN_DIR / "digital-oracle-main"))
+
+import digital_oracle_vcp as vcp  # noqa: E402
+
+from digital_oracle.concurrent import gather  # noqa: E402
+from digital_oracle.http import HttpResponse, UrllibJsonClient  # noqa: E402
+from digital_oracle.providers.base import SignalProvider  # noqa: E402
+from digital_oracle.telemetry import (  # noqa: E402
+    JsonLinesSink,
+    Span,
+    Telemetry,
+    default_telemetry,
+    load_json_lines,
+)
+
+
+class FakePool:
+    """Answers each request with the next ``(status, body)`` in *replies*."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+
+    def request(self, method, url, *, headers=None, timeout=None, **kwargs):
+        status, body = self.replies.pop(0)
+        return HttpResponse(url, status, "", Message(), body)
+
+
+class EchoProvider(SignalProvider):
+    provider_id = "echo"
+    display_name = "Echo"
+
+    def get_value(self, value):
+        if value is None:
+            raise ValueError("no value")
+        return value
+
+
+class TelemetryTests(unittest.TestCase):
+    def test_aggregates_quantiles_and_prometheus_buckets(self):
+        telemetry = Telemetry(buckets=(0.1, 1.0))
+        for duration in (0.05, 0.2, 0.3, 2.0):
+            telemetry.record(Span("http", 'api "x"', duration=duration, bytes=10))
+        telemetry.record(Span("http", 'api "x"', duration=0.01, error="OSError", retries=2))
+
+        summary = telemetry.summary()['http:api "x"']
+        self.assertEqual((summary["count"], summary["errors"], summary["retries"], summary["bytes"]), (5, 1, 2, 40))
+        self.assertEqual((summary["p50_ms"], summary["p95_ms"], summary["max_ms"]), (200.0, 2000.0, 2000.0))
+
+        text = telemetry.prometheus_text(prefix="t")
+        labels = 'kind="http",name="api \\"x\\""'
+        self.assertIn('t_duration_seconds_bucket{%s,le="0.1"} 2' % labels, text)
+        self.assertIn('t_duration_seconds_bucket{%s,le="1"} 4' % labels, text)
+        self.assertIn('t_duration_seconds_bucket{%s,le="+Inf"} 5' % labels, text)
+        self.assertIn("t_errors_total{%s} 1" % labels, text)
+        self.assertNotIn("t_cache_hits_total", text)
+
+    def test_span_records_errors_and_disabled_is_a_no_op(self):
+        telemetry = Telemetry()
+        with self.assertRaises(KeyError):
+            with telemetry.span("task", "boom"):
+                raise KeyError("x")
+        self.assertEqual(telemetry.summary()["task:boom"]["errors"], 1)
+
+        telemetry.enabled = False
+        with telemetry.span("task", "quiet"):
+            pass
+        self.assertNotIn("task:quiet", telemetry.summary())
+
+    def test_listeners_and_json_lines_sink(self):
+        telemetry = Telemetry()
+        with tempfile.TemporaryDirectory() as tmp:
+            sink = JsonLinesSink(Path(tmp) / "spans.jsonl")
+            telemetry.add_listener(lambda span: 1 / 0)
+            telemetry.add_listener(sink)
+            telemetry.record(Span("cache", "ns", duration=0.002, cache_hit=True))
+            sink.close()
+            telemetry.record(Span("cache", "ns"))
+            lines = (Path(tmp) / "spans.jsonl").read_text().splitlines()
+        self.assertEqual(len(lines), 1)
+        record = json.loads(lines[0])
+        self.assertEqual((record["kind"], record["cache_hit"], record["duration_ms"]), ("cache", True, 2.0))
+        self.assertNotIn("bytes", record)
+
+
+class JsonLinesAggregationTests(unittest.TestCase):
+    def write_spans(self, path, *spans):
+        sink = JsonLinesSink(path)
+        for item in spans:
+            sink(item)
+        sink.close()
+
+    def test_spans_from_several_processes_are_aggregated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "spans.jsonl"
+            self.write_spans(path, Span("http", "api.test", duration=0.1, bytes=5, status=200))
+            self.write_spans(path, Span("http", "api.test", duration=0.3, retries=1, error="OSError"))
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write('{"kind": "http", "na')
+            summary = load_json_lines(path).summary()["http:api.test"]
+            self.assertEqual(load_json_lines(Path(tmp) / "missing.jsonl").summary(), {})
+        self.assertEqual((summary["count"], summary["errors"], summary["retries"], summary["bytes"]), (2, 1, 1, 5))
+        self.assertEqual(summary["max_ms"], 300.0)
+
+    def test_get_telemetry_reads_the_shared_file(self):
+        default_telemetry().reset()
+        self.addCleanup(default_telemetry().reset)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "spans.jsonl"
+            self.write_spans(path, Span("provider", "yahoo.get_history", duration=0.2))
+            with mock.patch.dict("os.environ", {"DIGITAL_ORACLE_TELEMETRY_FILE": str(path)}):
+                summary = vcp.get_telemetry_command({"format": "json"})
+                self.assertEqual(summary["provider:yahoo.get_history"]["count"], 1)
+                self.assertIn("所有进程累计", vcp.get_telemetry_command({"reset": "true"}))
+                self.assertEqual(path.read_text(), "")
+            with mock.patch.dict("os.environ", {"DIGITAL_ORACLE_TELEMETRY_FILE": ""}):
+                self.assertEqual(vcp.get_telemetry_command({"format": "json"}), {})
+
+
+class HookTests(unittest.TestCase):
+    def setUp(self):
+        self.telemetry = default_telemetry()
+        self.telemetry.reset()
+        self.addCleanup(self.telemetry.reset)
+
+    def test_http_span_counts_retries_and_bytes(self):
+        client = UrllibJsonClient(pool=FakePool((503, b"busy"), (200, b'{"ok": 1}')), retry_delay_seconds=0.0)
+        with self.telemetry.trace() as trace:
+            self.assertEqual(client.get_json("https://api.test/x"), {"ok": 1})
+        http_span = next(span for span in trace.spans if span.kind == "http")
+        self.assertEqual((http_span.name, http_span.retries, http_span.bytes, http_span.status), ("api.test", 1, 9, 200))
+        self.assertIn("parse:api.test", trace.summary())
+
+    def test_trace_sees_provider_spans_from_gather_threads(self):
+        provider = EchoProvider()
+        with self.telemetry.trace() as trace:
+            outcome = gather({"a": lambda: provider.get_value(1), "b": lambda: provider.get_value(None)})
+        self.assertEqual(outcome.results, {"a": 1})
+        summary = trace.summary()
+        self.assertEqual(summary["provider:echo.get_value"]["count"], 2)
+        self.assertEqual(summary["provider:echo.get_value"]["errors"], 1)
+        self.assertEqual(sorted(key for key in summary if key.startswith("task:")), ["task:a", "task:b"])
+
+        provider.get_value(2)
+        self.assertEqual(len(trace.spans), 4)
+        self.assertEqual(self.telemetry.summary()["provider:echo.get_value"]["count"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import math
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.providers.base import ProviderError  # noqa: E402
+from digital_oracle.providers.treasury import (  # noqa: E402
+    USTreasuryProvider,
+    YieldCurveQuery,
+    YieldCurveRangeQuery,
+)
+
+# Treasury files are newest-first with MM/DD/YYYY dates.
+CSV_BY_YEAR = {
+    2022: "Date,2 Yr,10 Yr\n12/30/2022,4.41,3.88\n07/05/2022,2.82,2.81\n01/03/2022,0.78,1.63\n",
+    2023: "Date,1.5 Month,2 Yr,10 Yr\n01/04/2023,4.60,4.36,3.69\n01/03/2023,,4.40,N/A\n",
+}
+
+
+class FakeTreasuryClient:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.years = []
+
+    def get_text(self, url, *, params=None):
+        year = int(url.rstrip("/").split("/")[-2])
+        self.years.append(year)
+        if year in self.failing or year not in CSV_BY_YEAR:
+            raise OSError("no file for %d" % year)
+        return CSV_BY_YEAR[year]
+
+
+class YieldCurveHistoryTests(unittest.TestCase):
+    def history(self, start, end, **kwargs):
+        provider = USTreasuryProvider(http_client=FakeTreasuryClient(**kwargs))
+        return provider.get_yield_curve_history(YieldCurveRangeQuery(start_date=start, end_date=end))
+
+    def test_multi_year_range_is_oldest_first_and_aligned(self):
+        history = self.history("2022-07-01", "2023-01-04")
+        self.assertEqual(history.dates, ("2022-07-05", "2022-12-30", "2023-01-03", "2023-01-04"))
+        self.assertEqual(history.tenors, ("1.5M", "2Y", "10Y"))
+        self.assertEqual(len(history.series("1.5M")), 4)
+        self.assertTrue(math.isnan(history.series("1.5M")[0]))
+        self.assertTrue(math.isnan(history.series("30Y")[0]))
+        self.assertAlmostEqual(history.spread_2s10s[0], -0.01)
+        self.assertTrue(math.isnan(history.spread_2s10s[2]))
+        self.assertEqual(history.latest.yield_for("1.5 Month"), 4.60)
+
+    def test_inversion_streaks_skip_missing_observations(self):
+        summary = self.history("2022-01-01", "2023-12-31").inversion()
+        self.assertEqual((summary.observations, summary.inverted_observations), (4, 3))
+        self.assertEqual((summary.current_streak, summary.current_streak_start), (3, "2022-07-05"))
+        self.assertEqual((summary.longest_streak, summary.longest_streak_end), (3, "2023-01-04"))
+        self.assertTrue(summary.currently_inverted)
+
+    def test_failed_years_are_reported_not_fatal(self):
+        history = self.history("2022-01-01", "2023-12-31", failing={2023})
+        self.assertEqual(history.failed_years, (2023,))
+        self.assertEqual(len(history), 3)
+        with self.assertRaises(ProviderError):
+            self.history("2021-01-01", "2021-12-31")
+        with self.assertRaises(ValueError):
+            self.history("2023-01-02", "2023-01-01")
+
+
+class YieldCurveSnapshotTests(unittest.TestCase):
+    def test_latest_curve_parses_only_the_newest_row(self):
+        provider = USTreasuryProvider(http_client=FakeTreasuryClient())
+        latest = provider.latest_yield_curve(YieldCurveQuery(year=2023))
+        self.assertEqual(latest.date, "01/04/2023")
+        self.assertAlmostEqual(latest.spread("10Y", "2Y"), -0.67)
+        self.assertEqual(latest.raw["10 Yr"], "3.69")
+        curves = provider.list_yield_curve(YieldCurveQuery(year=2023))
+        self.assertEqual([point.tenor for point in curves[1].points], ["2Y"])
+
+
+if __name__ == "__main__":
+    unittest.main()
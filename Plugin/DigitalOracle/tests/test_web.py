@@ -0,0 +1,113 @@
+import gzip
+import io
+import sys
+import tempfile
+import threading
+import unittest
+from email.message import Message
+from pathlib import Path
+from urllib.parse import parse_qs, quote
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "digital-oracle-main"))
+
+from digital_oracle.cache import ResponseCache  # noqa: E402
+from digital_oracle.http import HttpResponse, _read_capped  # noqa: E402
+from digital_oracle.providers.web import (  # noqa: E402
+    UrllibSearchClient,
+    WebPageQuery,
+    WebResearchQuery,
+    WebSearchProvider,
+    _html_to_text,
+)
+
+
+def ddg_page(*urls):
+    links = "".join(
+        '<a class="result__a" href="//duckduckgo.com/l/?uddg=%s&rut=x">Title %d</a>'
+        '<a class="result__snippet" href="#">Snippet %d</a>' % (quote(url, safe=""), index, index)
+        for index, url in enumerate(urls)
+    )
+    return "<html><body>%s</body></html>" % links
+
+
+class FakeSearchPool:
+    """DDG answers per query; pages are ``<title>`` + body, ``/broken`` pages 404."""
+
+    rate_limiter = None
+
+    def __init__(self, results):
+        self.results = results
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, *, headers=None, body=None, timeout=None, max_body_bytes=None):
+        with self.lock:
+            self.requests.append((method, url))
+        headers_out = Message()
+        headers_out["Content-Type"] = "text/html; charset=utf-8"
+        if method == "POST":
+            query = parse_qs(body.decode())["q"][0]
+            return HttpResponse(url, 200, "OK", headers_out, ddg_page(*self.results[query]).encode())
+        if url.endswith("/broken"):
+            return HttpResponse(url, 404, "Not Found", headers_out, b"")
+        page = ("<title>%s</title><p>%s</p>" % (url, "x" * 5000)).encode()
+        cap = max_body_bytes or len(page)
+        return HttpResponse(url, 200, "OK", headers_out, page[:cap], truncated=len(page) > cap)
+
+    def page_fetches(self):
+        return sorted(url for method, url in self.requests if method == "GET")
+
+
+class WebResearchTests(unittest.TestCase):
+    def provider(self, results, **kwargs):
+        self.pool = FakeSearchPool(results)
+        return WebSearchProvider(UrllibSearchClient(pool=self.pool, retry_delay_seconds=0.0), **kwargs)
+
+    def test_research_dedupes_pages_and_reports_failures(self):
+        provider = self.provider({
+            "fed": ["https://a.test/1", "https://b.test/2", "https://c.test/3"],
+            "cpi": ["https://b.test/2", "https://d.test/broken"],
+        })
+        result = provider.research(WebResearchQuery(queries=("fed", "cpi", "fed "), fetch_top=2, max_chars=100))
+        self.assertEqual([search.query for search in result.searches], ["fed", "cpi"])
+        self.assertEqual(result.searches[0].snippets[0].url, "https://a.test/1")
+        fetched = self.pool.page_fetches()
+        self.assertEqual(fetched.count("https://b.test/2"), 1)
+        self.assertNotIn("https://c.test/3", fetched)
+        self.assertEqual(len(result.pages), 2)
+        self.assertTrue(all(page.truncated and len(page.text) == 100 for page in result.pages))
+        self.assertEqual([label for label, _ in result.errors], ["https://d.test/broken"])
+
+    def test_page_reads_are_capped_and_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(Path(tmp) / "web.sqlite3")
+            self.addCleanup(cache.close)
+            provider = self.provider({}, cache=cache)
+            query = WebPageQuery(url="https://a.test/big", max_bytes=300)
+            first = provider.fetch_page(query)
+            second = provider.fetch_page(query)
+        self.assertTrue(first.truncated)
+        self.assertEqual(first.title, "https://a.test/big")
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(self.pool.page_fetches(), ["https://a.test/big"])
+
+
+class ExtractionTests(unittest.TestCase):
+    def test_html_to_text_drops_invisible_blocks(self):
+        html = (
+            "<html><head><title>T</title><style>p{}</style></head><body>"
+            "<script>var x = '<p>no</p>';</script><!-- hidden --><h1>Head&amp;line</h1>"
+            "<p>one&nbsp; two</p><div>three<br>four</div></body></html>"
+        )
+        self.assertEqual(_html_to_text(html), "T\nHead&line\none two\nthree\nfour")
+
+    def test_capped_read_limits_the_decoded_size(self):
+        bomb = gzip.compress(b"a" * 5_000_000)
+        body, truncated = _read_capped(io.BytesIO(bomb), "gzip", 1000)
+        self.assertEqual((len(body), truncated), (1000, True))
+        body, truncated = _read_capped(io.BytesIO(gzip.compress(b"small")), "gzip", 1000)
+        self.assertEqual((body, truncated), (b"small", False))
+
+
+if __name__ == "__main__":
+    unittest.main()
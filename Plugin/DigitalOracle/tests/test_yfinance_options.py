@@ -0,0 +1,96 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PLUGIN_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PLUGIN_DIR))
+
+import digital_oracle_vcp as vcp  # noqa: E402
+from digital_oracle.providers.yfinance_provider import (  # noqa: E402
+    OptionsChainQuery,
+    YFinanceProvider,
+    _ChainRows,
+)
+
+try:
+    import numpy  # noqa: F401
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def row(symbol, strike, *, bid, ask, volume, oi, iv):
+    return {
+        "contractSymbol": symbol,
+        "strike": strike,
+        "lastPrice": (bid + ask) / 2,
+        "bid": bid,
+        "ask": ask,
+        "volume": volume,
+        "openInterest": oi,
+        "impliedVolatility": iv,
+        "inTheMoney": None,
+    }
+
+
+class FakeFetcher:
+    def __init__(self):
+        self.chain_calls = 0
+
+    def fetch_expirations(self, ticker):
+        return ("2030-01-18",)
+
+    def fetch_chain(self, ticker, expiration):
+        self.chain_calls += 1
+        calls = [
+            row("C90", 90.0, bid=11.0, ask=12.0, volume=10, oi=100, iv=0.30),
+            row("C100", 100.0, bid=4.0, ask=5.0, volume=50, oi=400, iv=0.25),
+            row("C110", 110.0, bid=1.0, ask=1.5, volume=30, oi=300, iv=0.22),
+        ]
+        puts = [
+            row("P90", 90.0, bid=0.8, ask=1.2, volume=20, oi=250, iv=0.33),
+            row("P100", 100.0, bid=4.5, ask=5.5, volume=60, oi=500, iv=0.27),
+            row("P110", 110.0, bid=10.0, ask=11.0, volume=5, oi=50, iv=0.24),
+        ]
+        return _ChainRows(calls=calls, puts=puts)
+
+    def fetch_underlying_price(self, ticker):
+        return 101.0
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class YFinanceOptionsTests(unittest.TestCase):
+    def setUp(self):
+        self.fetcher = FakeFetcher()
+        self.provider = YFinanceProvider(fetcher=self.fetcher)
+        patcher = mock.patch.object(vcp, "reuse_provider", return_value=self.provider)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch(self):
+        return vcp.fetch_single_provider(
+            "yfinance_options", {"ticker": "spy", "expiration": "2030-01-18", "output": "json"}
+        )
+
+    def test_columnar_analytics_match_dataclass_chain(self):
+        query = OptionsChainQuery(ticker="SPY", expiration="2030-01-18")
+        expected = self.provider.get_chain(query)
+        with mock.patch.object(self.provider, "get_chain", side_effect=AssertionError("stdlib path")):
+            result = self.fetch()
+        analytics = result["analytics"]
+        self.assertEqual(analytics, vcp.options_analytics(expected))
+        self.assertEqual(analytics["atm_strike"], 100.0)
+        self.assertAlmostEqual(analytics["atm_iv"], 0.26)
+        self.assertEqual(analytics["total_volume"], 175)
+        self.assertEqual([c["contract_symbol"] for c in result["data"]["calls"]], ["C90", "C100", "C110"])
+
+    def test_falls_back_to_per_contract_chain_without_numpy(self):
+        with mock.patch.object(self.provider, "get_chain_columns", side_effect=ImportError("numpy")):
+            result = self.fetch()
+        self.assertEqual(result["analytics"]["atm_strike"], 100.0)
+        self.assertEqual(len(result["data"]["puts"]), 3)
+        self.assertEqual(self.fetcher.chain_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()